@@ -4,6 +4,7 @@ import java.awt.*;
 import java.awt.image.*;
 import java.io.*;
 import java.util.*;
+import javax.imageio.ImageIO;
 
 /**
  * Class to show a frame-based animation.<br>
@@ -13,18 +14,40 @@ import java.util.*;
 public class AnimationPanel extends JComponent {
     /////////////// fields /////////////////////
 
-    /** list of image objects */
+    /**
+     * list of image objects (null for frames that are read from their
+     * files when they're shown)
+     */
     private List<Image> imageList = new ArrayList<Image>();
 
     /** List of the file names */
     private List<String> nameList = new ArrayList<String>();
 
+    /**
+     * the files that were written for added pictures (only their
+     * images may be dropped, since only they hold what was added)
+     */
+    private Set<String> writtenFiles = new HashSet<String>();
+
     /** index of currently displayed image */
     private int currIndex = 0;
 
     /** number of frames per second */
     private int framesPerSec = 16;
 
+    /** the image being shown, and which frame it is */
+    private Image shownImage = null;
+    private int shownIndex = -1;
+
+    /** plays the frames for showAll and showAllFromCurrent */
+    private FramePlayer player = null;
+
+    /**
+     * how many of the latest added pictures keep their images in
+     * memory (older ones are read back from their files)
+     */
+    private static final int MAX_ADDED_IMAGES = 16;
+
 
     private static final long serialVersionUID = 7526471155622776147L;
 
@@ -38,25 +61,34 @@ public class AnimationPanel extends JComponent {
     }
 
     /**
-     * Constructor that takes a list of pictures
-     * @param pictList the list of pictures
+     * Constructor that takes a list of frames.  Each frame is a
+     * picture, which is kept in memory, or the name of a picture
+     * file, which is read when it's shown.
+     * @param frames the list of frames
      */
-    public AnimationPanel(List<Picture> pictList) {
+    public AnimationPanel(List<?> frames) {
         Image image = null;
-        Picture picture = null;
-        for (int i = 0; i < pictList.size(); i++) {
-            picture = pictList.get(i);
-            nameList.add(picture.getFileName());
-            image = picture.getImage();
-            imageList.add(image);
+        for (Object frame : frames) {
+            if (frame instanceof Picture) {
+                Picture picture = (Picture) frame;
+                nameList.add(picture.getFileName());
+                image = picture.getImage();
+                imageList.add(image);
+            } else {
+                nameList.add(frame.toString());
+                imageList.add(null);
+            }
         }
 
-        BufferedImage bi = (BufferedImage) image;
-        int width = bi.getWidth();
-        int height = bi.getHeight();
-        this.setSize(new Dimension(width, height));
-        this.setMinimumSize(new Dimension(width, height));
-        this.setPreferredSize(new Dimension(width, height));
+        // set size of this panel
+        image = (imageList.size() > 0) ? getImage(0) : null;
+        if (image != null) {
+            int width = image.getWidth(null);
+            int height = image.getHeight(null);
+            this.setSize(new Dimension(width, height));
+            this.setMinimumSize(new Dimension(width, height));
+            this.setPreferredSize(new Dimension(width, height));
+        }
     }
 
     /**
@@ -64,26 +96,23 @@ public class AnimationPanel extends JComponent {
      * @param directory the directory to read from
      */
     public AnimationPanel(String directory) {
+        this(listFrames(directory));
+    }
 
-        // get the list of files in the directory
-        File dirObj = new File(directory);
-        String[] fileArray = dirObj.list();
-        ImageIcon imageIcon = null;
-        Image image = null;
-
-        // loop through the files
-        for (int i = 0; i < fileArray.length; i++) {
-            if (fileArray[i].indexOf(".jpg") >= 0) {
-
-                imageIcon = new ImageIcon(directory + fileArray[i]);
-                nameList.add(directory + fileArray[i]);
-                imageList.add(imageIcon.getImage());
-            }
+    /**
+     * Constructor that takes the names of the frame files.  Only the
+     * names are kept; each frame is read from its file when it's shown.
+     * @param fileNames the names of the frame files, in order
+     */
+    public AnimationPanel(String[] fileNames) {
+        for (int i = 0; i < fileNames.length; i++) {
+            nameList.add(fileNames[i]);
+            imageList.add(null);
         }
 
         // set size of this panel
-        if (imageIcon != null) {
-            image = (Image) imageList.get(0);
+        Image image = (imageList.size() > 0) ? getImage(0) : null;
+        if (image != null) {
             int width = image.getWidth(null);
             int height = image.getHeight(null);
             this.setSize(new Dimension(width,
@@ -95,6 +124,26 @@ public class AnimationPanel extends JComponent {
         }
     }
 
+    /**
+     * Method to get the names of the JPEG frames in a directory
+     * @param directory the directory to look in
+     * @return the names of the frame files, in frame order
+     */
+    private static String[] listFrames(String directory) {
+        File dirObj = new File(directory);
+        String[] fileArray = dirObj.list();
+        List<String> frames = new ArrayList<String>();
+        if (fileArray != null) {
+            Arrays.sort(fileArray);
+            for (int i = 0; i < fileArray.length; i++) {
+                if (fileArray[i].indexOf(".jpg") >= 0) {
+                    frames.add(directory + fileArray[i]);
+                }
+            }
+        }
+        return frames.toArray(new String[frames.size()]);
+    }
+
     /**
      * Constructor that takes the directory to
      * read from and the number of frames per
@@ -135,13 +184,71 @@ public class AnimationPanel extends JComponent {
         return this.framesPerSec;
     }
     /**
-     * Method to add a picture
+     * Method to get the number of frames dropped the last time the
+     * frames were played, because they couldn't be shown in time
+     * @return the number of frames dropped
+     */
+    public int getFramesDropped() {
+        return (player == null) ? 0 : player.getFramesDropped();
+    }
+
+    /**
+     * Method to get the image for a frame, reading it from its file
+     * if it isn't kept in memory
+     * @param index the index of the frame
+     * @return the image, or null if it can't be read
+     */
+    private Image getImage(int index) {
+        try {
+            return readImage(index);
+        } catch (IOException ex) {
+            System.out.println("trouble reading " + nameList.get(index));
+            return null;
+        }
+    }
+
+    private Image readImage(int index) throws IOException {
+        Image image = imageList.get(index);
+        if (image == null) {
+            image = ImageIO.read(new File(nameList.get(index)));
+            if (image == null) {
+                throw new IOException("not an image");
+            }
+        }
+        return image;
+    }
+
+    /**
+     * Method to add a picture.  Its image is kept in memory, since
+     * its file (if it has one) may not hold what it looks like now.
      * @param picture the picture to add
      */
     public void add(Picture picture) {
+        add(picture, false);
+    }
+
+    /**
+     * Method to add a picture, saying whether it was just written to
+     * its file.  Only the latest few added pictures are kept in memory;
+     * the images of written ones are dropped when enough newer ones
+     * have been added, and read back from their files when shown.
+     * @param picture the picture to add
+     * @param written true if the picture was written to its file name
+     * (or will be, before enough newer ones are added)
+     */
+    public void add(Picture picture, boolean written) {
         Image image = picture.getImage();
         imageList.add(image);
         nameList.add(picture.getFileName());
+        if (written && picture.getFileName() != null) {
+            writtenFiles.add(picture.getFileName());
+        }
+
+        int old = imageList.size() - 1 - MAX_ADDED_IMAGES;
+        if (old >= 0 && imageList.get(old) != null &&
+                writtenFiles.contains(nameList.get(old))) {
+            imageList.set(old, null);
+        }
     }
 
     /**
@@ -170,48 +277,46 @@ public class AnimationPanel extends JComponent {
      * show all frames starting at 0
      */
     public void showAll() {
-        Graphics g = null;
-        long startTime = 0;
-        long endTime = 0;
-        int timeToSleep =  1000 / framesPerSec;
-        for (int i = 0; i < imageList.size(); i++) {
-            startTime = System.currentTimeMillis();
-            this.currIndex = i;
-            g = this.getGraphics();
-            draw(g);
-            g.dispose();
-            endTime = System.currentTimeMillis();
-
-            // sleep
-            try {
-                if (endTime - startTime < timeToSleep) {
-                    Thread.sleep(timeToSleep - (endTime - startTime));
-                }
-            } catch (InterruptedException ex) {
-            }
-            // reset curr index
-            currIndex = imageList.size() - 1;
-        }
+        showFrom(0);
     }
 
     /**
     * show animation from current index
     */
     public void showAllFromCurrent() {
-        Graphics g = null;
-        int timeToSleep = (int)(1000 / framesPerSec);
-        for (; currIndex < imageList.size(); currIndex++) {
-            // draw current image
-            g = this.getGraphics();
-            draw(g);
-            g.dispose();
+        showFrom(currIndex);
+    }
 
-            // sleep
-            try {
-                Thread.sleep(timeToSleep);
-            } catch (InterruptedException ex) {
+    /**
+     * Method to play the frames from the given one to the end.  Frames
+     * are read a few at a time just before they're needed, and ones
+     * that can't be shown in time are dropped.
+     * @param first the index of the first frame to show
+     */
+    private void showFrom(int first) {
+        player = new FramePlayer(new FramePlayer.Frames() {
+            public int size() {
+                return imageList.size();
             }
-        }
+
+            public Image getFrame(int index) throws IOException {
+                return readImage(index);
+            }
+        });
+        player.play(first, framesPerSec, FramePlayer.DROP_LATE,
+                    new FramePlayer.Display() {
+            public void show(int index, Image image) {
+                currIndex = index;
+                shownIndex = index;
+                shownImage = image;
+                Graphics g = getGraphics();
+                if (g != null) {
+                    draw(g);
+                    g.dispose();
+                }
+            }
+        });
+
         // reset curr index
         currIndex = imageList.size() - 1;
     }
@@ -224,13 +329,16 @@ public class AnimationPanel extends JComponent {
         File f = null;
         boolean result = false;
         for (int i = 0; i <= currIndex; i++) {
-            f = new File(nameList.get(i));
+            f = new File(nameList.get(0));
             result = f.delete();
             if (result != true)
                 System.out.println("trouble deleting " +
-                                   nameList.get(i));
+                                   nameList.get(0));
             imageList.remove(0);
+            writtenFiles.remove(nameList.remove(0));
         }
+        currIndex = 0;
+        shownIndex = -1;
     }
 
     /**
@@ -238,17 +346,18 @@ public class AnimationPanel extends JComponent {
      */
     public void removeAllAfter() {
         int i = currIndex + 1;
-        int index = i;
         File f = null;
         boolean result = false;
         while (i < imageList.size()) {
-            f = new File(nameList.get(index++));
+            f = new File(nameList.get(i));
             result = f.delete();
             if (result != true)
                 System.out.println("trouble deleting " +
-                                   nameList.get(index - 1));
+                                   nameList.get(i));
             imageList.remove(i);
+            writtenFiles.remove(nameList.remove(i));
         }
+        shownIndex = -1;
     }
 
     /**
@@ -256,8 +365,13 @@ public class AnimationPanel extends JComponent {
      * @param g the graphics context to draw to
      */
     public void draw(Graphics g) {
-        Image image = (Image) imageList.get(this.currIndex);
-        g.drawImage(image, 0, 0, this);
+        if (shownIndex != this.currIndex) {
+            shownImage = getImage(this.currIndex);
+            shownIndex = this.currIndex;
+        }
+        if (shownImage != null) {
+            g.drawImage(shownImage, 0, 0, this);
+        }
     }
 
     /**
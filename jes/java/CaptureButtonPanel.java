@@ -10,9 +10,6 @@ import java.net.*;
  * Class that holds buttons for video capture<br>
  * Copyright Georgia Institute of Technology 2005
  * @author Barb Ericson ericson@cc.gatech.edu
- *
- * Line 199: warning: [deprecation] stop() in java.lang.Thread has been deprecated
- * Buck Scharfnorth 22 May 2008
  */
 public class CaptureButtonPanel extends JPanel {
 
@@ -38,6 +35,8 @@ public class CaptureButtonPanel extends JPanel {
     private RegionInterface regionHandler = null; // area to select region
     /** thread for video capture */
     private Thread t = null;
+    /** the video capture running on that thread */
+    private StartMovieCapture capture = null;
     /** text field for the directory to write to */
     private JTextField dirTextField = null;
     /** list for the frame rate */
@@ -172,9 +171,10 @@ public class CaptureButtonPanel extends JPanel {
                     java.awt.Rectangle region = videoHandler.getRegion();
                     FrameSequencer frameSequencer = videoHandler.getFrameSequencer();
                     int framesPerSec = videoHandler.getFramesPerSecond();
-                    t = new Thread(new StartMovieCapture(frameSequencer,
-                                                         framesPerSec,
-                                                         region));
+                    capture = new StartMovieCapture(frameSequencer,
+                                                    framesPerSec,
+                                                    region);
+                    t = new Thread(capture);
                     startButton.setEnabled(false);
                     stopButton.setEnabled(true);
                     t.start();
@@ -190,11 +190,24 @@ public class CaptureButtonPanel extends JPanel {
         stopButton.addActionListener(new ActionListener() {
             public void actionPerformed(ActionEvent e) {
                 if (videoHandler != null && t != null) {
-                    t.stop();
+                    // let the frames already captured be written out,
+                    // waiting for them off the event thread
+                    capture.stop();
+                    final Thread capturing = t;
                     t = null;
-                    startButton.setEnabled(true);
+                    capture = null;
                     stopButton.setEnabled(false);
-                    playButton.setEnabled(true);
+                    new SwingWorker<Void, Void>() {
+                        protected Void doInBackground() throws InterruptedException {
+                            capturing.join();
+                            return null;
+                        }
+
+                        protected void done() {
+                            startButton.setEnabled(true);
+                            playButton.setEnabled(true);
+                        }
+                    }.execute();
                 }
             }
         });
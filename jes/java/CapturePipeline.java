@@ -0,0 +1,257 @@
+import java.awt.Rectangle;
+import java.awt.image.BufferedImage;
+import java.util.concurrent.ArrayBlockingQueue;
+import java.util.concurrent.CountDownLatch;
+import java.util.concurrent.Executors;
+import java.util.concurrent.ScheduledExecutorService;
+import java.util.concurrent.ThreadFactory;
+import java.util.concurrent.TimeUnit;
+
+/**
+ * Captures frames at a fixed rate on one thread and writes them out on
+ * another, so the time it takes to encode a frame doesn't slow down
+ * the capturing.
+ * <p>
+ * A timer captures a frame from the <code>FrameSource</code> at the
+ * start of each frame's time slot and puts it in a small queue.  The
+ * thread that called <code>capture</code> takes frames from the queue
+ * and adds them to the <code>FrameSequencer</code>.  If a capture runs
+ * so long that whole slots go by, or the queue is full because writing
+ * has fallen behind, those frames are dropped (and counted), rather
+ * than letting the capture drift or memory fill up.
+ *
+ * @see MovieCapturer
+ */
+public class CapturePipeline {
+
+    /** How many captured frames can wait to be written, unless told otherwise. */
+    public static final int DEFAULT_QUEUE_SIZE = 8;
+
+    private final FrameSource source;
+    private final FrameSequencer sequencer;
+    private final int queueSize;
+
+    private volatile boolean stopped = false;
+
+    // Counted on the capturing thread, read anywhere
+    private volatile int framesCaptured = 0;
+    private volatile int framesDropped = 0;
+    private volatile long captureTime = 0;
+
+    private int framesWritten = 0;
+
+    /**
+     * Creates a pipeline that lets <code>DEFAULT_QUEUE_SIZE</code>
+     * frames wait to be written.
+     * @param source where to capture frames from
+     * @param sequencer where to write the frames to
+     */
+    public CapturePipeline(FrameSource source, FrameSequencer sequencer) {
+        this(source, sequencer, DEFAULT_QUEUE_SIZE);
+    }
+
+    /**
+     * @param source where to capture frames from
+     * @param sequencer where to write the frames to
+     * @param queueSize how many captured frames can wait to be written
+     */
+    public CapturePipeline(FrameSource source, FrameSequencer sequencer,
+                           int queueSize) {
+        if (queueSize < 1) {
+            throw new IllegalArgumentException("The queue must hold at least one frame");
+        }
+        this.source = source;
+        this.sequencer = sequencer;
+        this.queueSize = queueSize;
+    }
+
+    /**
+     * Captures frames until <code>numFrames</code> time slots have gone
+     * by (or <code>stop</code> is called), and returns once every
+     * captured frame has been added to the sequencer.
+     *
+     * @param area the part of the source to capture
+     * @param framesPerSec how many frames to capture each second
+     * @param numFrames how many frame slots to capture for, or -1 to
+     * keep going until <code>stop</code> is called
+     */
+    public void capture(final Rectangle area, int framesPerSec, final int numFrames) {
+        if (framesPerSec <= 0) {
+            throw new IllegalArgumentException("The frame rate must be positive");
+        }
+        final long period = 1000000000L / framesPerSec;
+        final ArrayBlockingQueue<BufferedImage> queue =
+            new ArrayBlockingQueue<BufferedImage>(queueSize);
+        final CountDownLatch done = new CountDownLatch(1);
+
+        framesCaptured = 0;
+        framesDropped = 0;
+        framesWritten = 0;
+        captureTime = 0;
+
+        ScheduledExecutorService timer =
+            Executors.newSingleThreadScheduledExecutor(new ThreadFactory() {
+                public Thread newThread(Runnable r) {
+                    Thread thread = new Thread(r, "Frame capture");
+                    thread.setDaemon(true);
+                    return thread;
+                }
+            });
+
+        final long start = System.nanoTime();
+        timer.scheduleAtFixedRate(new Runnable() {
+            /** the slot of the next frame to capture */
+            private long slot = 0;
+            private boolean finished = false;
+
+            public void run() {
+                if (finished) {
+                    return;
+                }
+                long now = System.nanoTime();
+                long current = (now - start) / period;
+                long last = (numFrames < 0) ? Long.MAX_VALUE : numFrames;
+
+                if (current < slot) {
+                    // A late run catching up; this slot has been done
+                    return;
+                }
+                if (current > slot) {
+                    // Whole slots went by while the last frame was captured
+                    framesDropped += (int) (Math.min(current, last) - slot);
+                    slot = current;
+                }
+                if (stopped || slot >= last) {
+                    finish(now);
+                    return;
+                }
+
+                try {
+                    BufferedImage image = source.capture(area);
+                    if (queue.offer(image)) {
+                        framesCaptured++;
+                    } else {
+                        framesDropped++;
+                    }
+                } catch (Exception ex) {
+                    System.out.println("Couldn't capture a frame: " + ex.getMessage());
+                    finish(now);
+                    return;
+                }
+                slot++;
+            }
+
+            private void finish(long now) {
+                finished = true;
+                captureTime = now - start;
+                done.countDown();
+            }
+        }, 0, period, TimeUnit.NANOSECONDS);
+
+        try {
+            // Write frames until the capturing is done and the queue is empty
+            while (done.getCount() > 0 || !queue.isEmpty()) {
+                BufferedImage image = queue.poll(10, TimeUnit.MILLISECONDS);
+                if (image != null) {
+                    sequencer.addFrame(new Picture(image));
+                    framesWritten++;
+                }
+            }
+        } catch (InterruptedException ex) {
+            stopped = true;
+            Thread.currentThread().interrupt();
+        } finally {
+            timer.shutdownNow();
+        }
+    }
+
+    /**
+     * Stops capturing, from any thread.  Frames already captured are
+     * still written before <code>capture</code> returns.  Once stopped,
+     * a pipeline stays stopped (even if it hadn't started yet).
+     */
+    public void stop() {
+        stopped = true;
+    }
+
+    /**
+     * @return the number of frames captured by the last
+     * <code>capture</code>
+     */
+    public int getFramesCaptured() {
+        return framesCaptured;
+    }
+
+    /**
+     * @return the number of frames dropped by the last
+     * <code>capture</code>, because capturing or writing fell behind
+     */
+    public int getFramesDropped() {
+        return framesDropped;
+    }
+
+    /**
+     * @return the number of frames added to the sequencer by the last
+     * <code>capture</code>
+     */
+    public int getFramesWritten() {
+        return framesWritten;
+    }
+
+    /**
+     * @return the number of frames actually captured each second by the
+     * last <code>capture</code>
+     */
+    public double getFrameRate() {
+        return (captureTime <= 0) ? 0.0 : framesCaptured * 1e9 / captureTime;
+    }
+
+    /**
+     * Captures made-up frames for a few seconds (no screen needed) and
+     * reports how well the pipeline kept up.  Takes the directory to
+     * write to, and optionally the frame rate, frame size and seconds.
+     */
+    public static void main(String[] args) {
+        String dir = (args.length > 0) ? args[0] :
+                     System.getProperty("java.io.tmpdir") + "/capture-benchmark/";
+        int framesPerSec = (args.length > 1) ? Integer.parseInt(args[1]) : 30;
+        int width = (args.length > 2) ? Integer.parseInt(args[2]) : 640;
+        int height = (args.length > 3) ? Integer.parseInt(args[3]) : 480;
+        int seconds = (args.length > 4) ? Integer.parseInt(args[4]) : 5;
+
+        FrameSource synthetic = new FrameSource() {
+            private int count = 0;
+
+            public BufferedImage capture(Rectangle area) {
+                BufferedImage image = new BufferedImage(area.width, area.height,
+                                                        BufferedImage.TYPE_INT_RGB);
+                int[] row = new int[area.width];
+                for (int y = 0; y < area.height; y++) {
+                    for (int x = 0; x < area.width; x++) {
+                        row[x] = ((x + count) & 0xff) << 16 | (y & 0xff) << 8 | (count & 0xff);
+                    }
+                    image.setRGB(0, y, area.width, 1, row, 0, area.width);
+                }
+                count++;
+                return image;
+            }
+        };
+
+        FrameSequencer sequencer = new FrameSequencer(dir, "bench");
+        sequencer.setAsynchronous(true);
+        CapturePipeline pipeline = new CapturePipeline(synthetic, sequencer);
+        long start = System.nanoTime();
+        pipeline.capture(new Rectangle(0, 0, width, height), framesPerSec,
+                         framesPerSec * seconds);
+        sequencer.flush();
+        double elapsed = (System.nanoTime() - start) / 1e9;
+
+        System.out.println("Asked for " + framesPerSec + " fps, " + width + "x" + height +
+                           ", for " + seconds + " seconds");
+        System.out.println("Captured " + pipeline.getFramesCaptured() + " frames (" +
+                           String.format("%.1f", pipeline.getFrameRate()) + " fps), dropped " +
+                           pipeline.getFramesDropped());
+        System.out.println("Wrote " + pipeline.getFramesWritten() + " frames to " + dir +
+                           " in " + String.format("%.2f", elapsed) + " s");
+    }
+}
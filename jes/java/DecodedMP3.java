@@ -0,0 +1,225 @@
+import java.io.*;
+import java.lang.ref.SoftReference;
+import java.util.HashMap;
+import javax.sound.sampled.AudioFormat;
+import javazoom.jl.decoder.*;
+
+/**
+ * The samples of an MP3 file, decoded straight into memory (or into a
+ * paged <code>SoundBuffer</code>, for long files) without writing a WAV
+ * file first.
+ * <p>
+ * Frames are decoded only when their samples are first asked for, so a
+ * sound can start playing (or be looked at near its start) before the
+ * whole file has been decoded.  MP3 frames depend on the ones before
+ * them, so asking for a sample late in the file decodes everything up
+ * to it.
+ * <p>
+ * Decoded files are shared: opening the same file again (while it
+ * hasn't changed) reuses the samples decoded the first time.  Sounds
+ * never change a <code>DecodedMP3</code>; they use a copy-on-write
+ * copy of it instead.
+ *
+ * @see SoundBuffer#copyOnWrite()
+ */
+public class DecodedMP3 extends SoundBuffer {
+
+    /**
+     * The files decoded so far, by path, modification time and size.
+     * The samples can be dropped if memory gets short; they'll just
+     * be decoded again.
+     */
+    private static final HashMap<String, SoftReference<DecodedMP3>> cache =
+        new HashMap<String, SoftReference<DecodedMP3>>();
+
+    private final AudioFormat format;
+    private final int frameLength;
+    private final SoundBuffer decoded;
+
+    /** How many bytes have been decoded so far. */
+    private long decodedLength = 0;
+
+    private Bitstream bitstream;
+    private Decoder decoder;
+
+    /**
+     * Returns the decoded samples of an MP3 file, reusing the ones
+     * decoded earlier if the file hasn't changed since.
+     *
+     * @param file the MP3 file
+     * @return its samples
+     * @throws IOException if the file can't be read, or isn't an MP3
+     */
+    public static DecodedMP3 open(File file) throws IOException {
+        file = file.getCanonicalFile();
+        String key = file.getPath() + "|" + file.lastModified() + "|" + file.length();
+
+        synchronized (cache) {
+            SoftReference<DecodedMP3> ref = cache.get(key);
+            DecodedMP3 mp3 = (ref == null) ? null : ref.get();
+            if (mp3 == null) {
+                mp3 = new DecodedMP3(file);
+                cache.put(key, new SoftReference<DecodedMP3>(mp3));
+            }
+            return mp3;
+        }
+    }
+
+    /**
+     * Reads the frame headers (which is quick) to find out how long the
+     * sound is and what format it's in.  Nothing is decoded yet.
+     */
+    private DecodedMP3(File file) throws IOException {
+        int sampleRate = 0;
+        int channels = 0;
+        long frames = 0;
+
+        Bitstream headers = openBitstream(file);
+        try {
+            Header header;
+            while ((header = headers.readFrame()) != null) {
+                if (sampleRate == 0) {
+                    sampleRate = header.frequency();
+                    channels = (header.mode() == Header.SINGLE_CHANNEL) ? 1 : 2;
+                }
+                frames += samplesPerFrame(header);
+                headers.closeFrame();
+            }
+        } catch (BitstreamException e) {
+            // Whatever came before the damage is still usable
+            if (sampleRate == 0) {
+                throw new IOException("Couldn't read the MP3 file " + file, e);
+            }
+        } finally {
+            closeQuietly(headers);
+        }
+
+        if (sampleRate == 0) {
+            throw new IOException(file + " doesn't contain any MP3 frames");
+        }
+
+        this.format = new AudioFormat(sampleRate, 16, channels, true, false);
+        this.frameLength = (int) Math.min(frames, Integer.MAX_VALUE);
+        this.decoded = SoundBuffer.allocate((long) frameLength * format.getFrameSize());
+
+        this.bitstream = openBitstream(file);
+        this.decoder = new Decoder();
+    }
+
+    private static Bitstream openBitstream(File file) throws IOException {
+        return new Bitstream(new BufferedInputStream(new FileInputStream(file)));
+    }
+
+    private static void closeQuietly(Bitstream stream) {
+        try {
+            stream.close();
+        } catch (BitstreamException e) {
+            // It was only being read
+        }
+    }
+
+    /**
+     * @return the number of samples (per channel) in one frame
+     */
+    private static int samplesPerFrame(Header header) {
+        if (header.layer() == 1) {
+            return 384;
+        } else if (header.layer() == 3 && header.version() != Header.MPEG1) {
+            return 576;
+        } else {
+            return 1152;
+        }
+    }
+
+    /**
+     * @return the format of the decoded samples (16-bit signed PCM,
+     * little-endian)
+     */
+    public AudioFormat getFormat() {
+        return format;
+    }
+
+    /**
+     * @return the number of sample frames in the sound
+     */
+    public int getFrameLength() {
+        return frameLength;
+    }
+
+    /**
+     * Decodes the whole file now, rather than as it's used.
+     */
+    public synchronized void decodeAll() {
+        decodeThrough(decoded.length());
+    }
+
+    /**
+     * Decodes frames until the first <code>end</code> bytes are ready.
+     */
+    private void decodeThrough(long end) {
+        byte[] bytes = null;
+        while (decodedLength < end && bitstream != null) {
+            try {
+                Header header = bitstream.readFrame();
+                if (header == null) {
+                    // The rest stays silent
+                    finishDecoding();
+                    break;
+                }
+
+                SampleBuffer output = (SampleBuffer) decoder.decodeFrame(header, bitstream);
+                bitstream.closeFrame();
+
+                short[] samples = output.getBuffer();
+                int count = (int) Math.min(output.getBufferLength(),
+                                           (decoded.length() - decodedLength) / 2);
+                if (bytes == null || bytes.length < count * 2) {
+                    bytes = new byte[count * 2];
+                }
+                for (int i = 0; i < count; i++) {
+                    bytes[2 * i] = (byte) samples[i];
+                    bytes[2 * i + 1] = (byte) (samples[i] >> 8);
+                }
+                decoded.put(decodedLength, bytes, 0, count * 2);
+                decodedLength += count * 2;
+
+                if (decodedLength >= decoded.length()) {
+                    finishDecoding();
+                }
+            } catch (JavaLayerException e) {
+                // A damaged frame ends the sound early, like a short file
+                finishDecoding();
+            }
+        }
+    }
+
+    private void finishDecoding() {
+        closeQuietly(bitstream);
+        bitstream = null;
+        decoder = null;
+    }
+
+    ///////////////////////// SoundBuffer /////////////////////////
+
+    public long length() {
+        return decoded.length();
+    }
+
+    public synchronized byte get(long index) {
+        decodeThrough(index + 1);
+        return decoded.get(index);
+    }
+
+    public synchronized void get(long index, byte[] dest, int offset, int count) {
+        decodeThrough(index + count);
+        decoded.get(index, dest, offset, count);
+    }
+
+    public void put(long index, byte value) {
+        throw new UnsupportedOperationException("Decoded MP3s are shared; change a copy");
+    }
+
+    public void put(long index, byte[] src, int offset, int count) {
+        throw new UnsupportedOperationException("Decoded MP3s are shared; change a copy");
+    }
+}
@@ -0,0 +1,264 @@
+import java.awt.Image;
+import java.io.IOException;
+import java.util.concurrent.ArrayBlockingQueue;
+import java.util.concurrent.atomic.AtomicInteger;
+
+/**
+ * Plays a sequence of frames at a steady rate, decoding them on a
+ * background thread just ahead of when they're shown.
+ * <p>
+ * Only a few decoded frames (the buffer size) are kept at any time, so
+ * playing a long movie takes no more memory than playing a short one.
+ * Each frame is due at a fixed time after the first one was shown,
+ * measured with <code>System.nanoTime()</code>, so small delays don't
+ * add up over the movie.
+ * <p>
+ * When frames can't be decoded (or shown) fast enough, the player either
+ * drops the ones that are already too late (<code>DROP_LATE</code>) or
+ * shows every frame and lets the movie run long
+ * (<code>SHOW_ALL</code>).  Either way, it counts the dropped frames and
+ * how late the shown ones were, so the timing can be checked.
+ *
+ * @see AnimationPanel#showAll()
+ */
+public class FramePlayer {
+
+    /**
+     * Skip frames whose time has passed (the next frame is already
+     * due), to keep up with the clock.
+     */
+    public static final int DROP_LATE = 0;
+
+    /**
+     * Show every frame; when one is late, the ones after it are shown
+     * later too.
+     */
+    public static final int SHOW_ALL = 1;
+
+    /** How many decoded frames are kept ready, unless told otherwise. */
+    public static final int DEFAULT_BUFFER_SIZE = 8;
+
+    /**
+     * The frames to play.  <code>getFrame</code> is called on the
+     * decoding thread, in order.
+     */
+    public interface Frames {
+        /** @return how many frames there are */
+        int size();
+
+        /**
+         * @param index which frame (from 0)
+         * @return the frame's image
+         * @throws IOException if the frame can't be read
+         */
+        Image getFrame(int index) throws IOException;
+    }
+
+    /**
+     * Shows frames.  <code>show</code> is called on the thread that
+     * called <code>play</code>, when each frame is due.
+     */
+    public interface Display {
+        /**
+         * @param index which frame this is
+         * @param image the frame's image
+         */
+        void show(int index, Image image);
+    }
+
+    /** A decoded frame waiting in the buffer. */
+    private static class Frame {
+        final int index;
+        final Image image;
+
+        Frame(int index, Image image) {
+            this.index = index;
+            this.image = image;
+        }
+    }
+
+    /** Put in the buffer after the last frame. */
+    private static final Frame END = new Frame(-1, null);
+
+    private final Frames frames;
+    private final int bufferSize;
+
+    private volatile boolean stopped = false;
+
+    /** When the first frame was shown, or -1 before then. */
+    private volatile long startTime = -1;
+
+    private int framesShown = 0;
+    private final AtomicInteger framesDropped = new AtomicInteger();
+    private long maxLateness = 0;
+    private long totalLateness = 0;
+
+    /**
+     * Creates a player that keeps <code>DEFAULT_BUFFER_SIZE</code>
+     * frames ready.
+     * @param frames the frames to play
+     */
+    public FramePlayer(Frames frames) {
+        this(frames, DEFAULT_BUFFER_SIZE);
+    }
+
+    /**
+     * @param frames the frames to play
+     * @param bufferSize how many decoded frames to keep ready (at least 1)
+     */
+    public FramePlayer(Frames frames, int bufferSize) {
+        if (bufferSize < 1) {
+            throw new IllegalArgumentException("The buffer must hold at least one frame");
+        }
+        this.frames = frames;
+        this.bufferSize = bufferSize;
+    }
+
+    /**
+     * Plays the frames from <code>first</code> to the end, returning
+     * once the last one has been shown (or <code>stop</code> is called).
+     *
+     * @param first the frame to start at
+     * @param framesPerSec how many frames to show each second
+     * @param policy <code>DROP_LATE</code> or <code>SHOW_ALL</code>
+     * @param display what to show the frames on
+     */
+    public void play(final int first, int framesPerSec, final int policy,
+                     Display display) {
+        if (framesPerSec <= 0) {
+            throw new IllegalArgumentException("The frame rate must be positive");
+        }
+        final long period = 1000000000L / framesPerSec;
+        final ArrayBlockingQueue<Frame> buffer = new ArrayBlockingQueue<Frame>(bufferSize);
+
+        stopped = false;
+        startTime = -1;
+        framesShown = 0;
+        framesDropped.set(0);
+        maxLateness = 0;
+        totalLateness = 0;
+
+        Thread decoder = new Thread("Frame decoder") {
+            public void run() {
+                try {
+                    int count = frames.size();
+                    for (int i = first; i < count && !stopped; i++) {
+                        // Don't decode frames that will be dropped anyway
+                        long start = startTime;
+                        if (policy == DROP_LATE && start >= 0 &&
+                                System.nanoTime() > start + (i - first + 1) * period) {
+                            framesDropped.incrementAndGet();
+                            continue;
+                        }
+
+                        Image image;
+                        try {
+                            image = frames.getFrame(i);
+                        } catch (IOException e) {
+                            System.err.println("Couldn't read frame " + i + ": " + e.getMessage());
+                            framesDropped.incrementAndGet();
+                            continue;
+                        } catch (RuntimeException e) {
+                            // A frame that can't be decoded is dropped too, so
+                            // the player still gets to the end
+                            System.err.println("Couldn't decode frame " + i + ": " + e);
+                            framesDropped.incrementAndGet();
+                            continue;
+                        }
+                        buffer.put(new Frame(i, image));
+                    }
+                    buffer.put(END);
+                } catch (InterruptedException e) {
+                    // The player has stopped
+                }
+            }
+        };
+        decoder.setDaemon(true);
+        decoder.start();
+
+        try {
+            Frame frame;
+            while (!stopped && (frame = buffer.take()) != END) {
+                long now = System.nanoTime();
+                if (startTime < 0) {
+                    startTime = now;
+                }
+                long due = startTime + (frame.index - first) * period;
+
+                if (now > due + period) {
+                    if (policy == DROP_LATE) {
+                        framesDropped.incrementAndGet();
+                        continue;
+                    }
+                    // Slip the clock, so the frames after this aren't rushed
+                    startTime += now - due;
+                    due = now;
+                }
+                while (now < due) {
+                    long wait = due - now;
+                    Thread.sleep(wait / 1000000, (int) (wait % 1000000));
+                    now = System.nanoTime();
+                }
+
+                display.show(frame.index, frame.image);
+
+                long lateness = System.nanoTime() - due;
+                maxLateness = Math.max(maxLateness, lateness);
+                totalLateness += lateness;
+                framesShown++;
+            }
+        } catch (InterruptedException e) {
+            // Stop playing, but let the caller see it was interrupted
+            Thread.currentThread().interrupt();
+        } finally {
+            stopped = true;
+            decoder.interrupt();
+        }
+    }
+
+    /**
+     * Stops playing, from any thread.  <code>play</code> returns once
+     * the frame being shown (if any) is done.
+     */
+    public void stop() {
+        stopped = true;
+    }
+
+    /**
+     * @return the number of frames shown by the last <code>play</code>
+     */
+    public int getFramesShown() {
+        return framesShown;
+    }
+
+    /**
+     * @return the number of frames dropped by the last <code>play</code>
+     * (because they were late, or couldn't be read)
+     */
+    public int getFramesDropped() {
+        return framesDropped.get();
+    }
+
+    /**
+     * @return how late the latest frame was shown in the last
+     * <code>play</code>, in milliseconds
+     */
+    public double getMaxLateness() {
+        return maxLateness / 1e6;
+    }
+
+    /**
+     * @return how late frames were shown on average in the last
+     * <code>play</code>, in milliseconds
+     */
+    public double getMeanLateness() {
+        return (framesShown == 0) ? 0.0 : totalLateness / 1e6 / framesShown;
+    }
+
+    /**
+     * @return how many decoded frames are kept ready
+     */
+    public int getBufferSize() {
+        return bufferSize;
+    }
+}
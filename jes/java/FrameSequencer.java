@@ -1,4 +1,5 @@
 import java.util.*;
+import java.util.concurrent.*;
 import java.text.*;
 import java.io.*;
 import java.awt.Image;
@@ -9,6 +10,11 @@ import java.awt.Image;
  * class tracks the directory, base file name, current
  * frame number, and whether this sequence is being shown.
  * <br>
+ * Only the file names of the frames are kept, not the pictures, so
+ * a long sequence doesn't fill up memory.  Frames can also be written
+ * in the background (see <code>setAsynchronous</code>), so adding a
+ * frame doesn't have to wait for it to be encoded.
+ * <br>
  * Copyright Georgia Institute of Technology 2005
  * @author Barbara Ericson ericson@cc.gatech.edu
  */
@@ -30,8 +36,20 @@ public class FrameSequencer {
     /** the movie player used to show this sequence */
     private MoviePlayer moviePlayer = null;
 
-    /** List of all the pictures so far */
-    private List<Picture> pictureList = new ArrayList<Picture>();
+    /** List of the file names of all the frames so far */
+    private List<String> frameList = new ArrayList<String>();
+
+    /** writes frames in the background (null to write them right away) */
+    private ExecutorService encoder = null;
+
+    /** permits for frames waiting to be written (limits how many) */
+    private Semaphore encodeSlots = null;
+
+    /** number of frames added but not written yet */
+    private int pendingFrames = 0;
+
+    /** the first frame that couldn't be written in the background */
+    private String failedFrame = null;
 
     /** Use this to format the number for the frame */
     private NumberFormat numberFormat =
@@ -128,7 +146,99 @@ public class FrameSequencer {
      * @return the number of frames
      */
     public int getNumFrames() {
-        return pictureList.size();
+        return frameList.size();
+    }
+
+    /**
+     * Method to get the file names of the frames so far
+     * @return the frame file names, in order
+     */
+    public String[] getFrameNames() {
+        return frameList.toArray(new String[frameList.size()]);
+    }
+
+    /**
+     * Method to check if frames are written in the background
+     * @return true if they are and false otherwise
+     */
+    public boolean isAsynchronous() {
+        return encoder != null;
+    }
+
+    /**
+     * Method to write frames in the background (or not).  Frames are
+     * written by a thread for each processor (up to 4), and at most
+     * twice that many can be waiting.
+     * @param value true to write frames in the background
+     */
+    public void setAsynchronous(boolean value) {
+        if (value) {
+            int threads = Math.min(4, Runtime.getRuntime().availableProcessors());
+            setAsynchronous(threads, 2 * threads);
+        } else {
+            flush();
+            if (encoder != null) {
+                encoder.shutdown();
+                encoder = null;
+                encodeSlots = null;
+            }
+        }
+    }
+
+    /**
+     * Method to write frames in the background.  A copy of each frame
+     * is kept until it has been written; when <code>maxPending</code>
+     * frames are waiting, <code>addFrame</code> waits for one of them
+     * to be written before adding another.
+     * @param numThreads the number of threads to write frames with
+     * @param maxPending the most frames that can be waiting to be written
+     */
+    public void setAsynchronous(int numThreads, int maxPending) {
+        if (numThreads < 1 || maxPending < 1) {
+            throw new IllegalArgumentException("Need at least one thread and one frame");
+        }
+        setAsynchronous(false);
+        encodeSlots = new Semaphore(maxPending);
+        encoder = Executors.newFixedThreadPool(numThreads, new ThreadFactory() {
+            public Thread newThread(Runnable r) {
+                Thread thread = new Thread(r, "Frame encoder");
+                thread.setDaemon(true);
+                return thread;
+            }
+        });
+    }
+
+    /**
+     * Method to wait until all the frames added so far have been
+     * written, so they can be read back (to play them, or make a
+     * movie from them)
+     * @return true if every frame was written and false otherwise
+     */
+    public boolean flush() {
+        boolean interrupted = false;
+        synchronized (this) {
+            while (pendingFrames > 0) {
+                try {
+                    wait();
+                } catch (InterruptedException ex) {
+                    interrupted = true;
+                }
+            }
+        }
+        if (interrupted) {
+            Thread.currentThread().interrupt();
+        }
+
+        String failed;
+        synchronized (this) {
+            failed = failedFrame;
+            failedFrame = null;
+        }
+        if (failed != null) {
+            System.out.println("There was an error trying to write " + failed);
+            return false;
+        }
+        return true;
     }
 
     /**
@@ -169,25 +279,32 @@ public class FrameSequencer {
      */
     public void addFrame(Picture picture) {
 
-        // add this picture to the list
-        pictureList.add(picture);
-
         // get the file name
         String fileName = directory + baseName +
                           numberFormat.format(frameNumber) + ".jpg";
 
+        // add this frame to the list
+        frameList.add(fileName);
+
         // set the file name
         picture.setFileName(fileName);
 
         // write out this frame
-        picture.write(fileName);
+        if (encoder == null) {
+            picture.write(fileName);
+        } else {
+            writeInBackground(picture, fileName);
+        }
 
-        // if this sequence is being shown update the frame
+        // if this sequence is being shown update the frame (the player
+        // keeps only the latest frames' images, and reads older ones
+        // back from the files written for them)
         if (shown) {
             if (moviePlayer != null) {
-                moviePlayer.addPicture(picture);
+                moviePlayer.addPicture(picture, true);
             } else {
-                moviePlayer = new MoviePlayer(pictureList);
+                flush();
+                moviePlayer = new MoviePlayer(getFrameNames());
             }
         }
 
@@ -195,10 +312,47 @@ public class FrameSequencer {
         frameNumber++;
     }
 
+    /**
+     * Method to write a copy of a frame in the background, waiting
+     * first if too many frames are waiting to be written already
+     * @param picture the frame to write
+     * @param fileName the file to write it to
+     */
+    private void writeInBackground(Picture picture, final String fileName) {
+        // copy the frame, since the picture may be changed for the next one
+        final Picture copy = new Picture(MovieWriter.copyFrame(picture.getBufferedImage()));
+
+        encodeSlots.acquireUninterruptibly();
+        synchronized (this) {
+            pendingFrames++;
+        }
+        final Semaphore slots = encodeSlots;
+        encoder.execute(new Runnable() {
+            public void run() {
+                try {
+                    copy.writeOrFail(fileName);
+                } catch (Exception ex) {
+                    synchronized (FrameSequencer.this) {
+                        if (failedFrame == null) {
+                            failedFrame = fileName;
+                        }
+                    }
+                } finally {
+                    slots.release();
+                    synchronized (FrameSequencer.this) {
+                        pendingFrames--;
+                        FrameSequencer.this.notifyAll();
+                    }
+                }
+            }
+        });
+    }
+
     /**
      * Method to delete the last frame
      */
     public void deleteLastFrame() {
+        flush();
         frameNumber--;
         File f = new File(directory + baseName +
                           numberFormat.format(frameNumber) + ".jpg");
@@ -206,7 +360,7 @@ public class FrameSequencer {
         if (result != true) {
             System.out.println("trouble removing last frame");
         }
-        pictureList.remove(pictureList.size() - 1);
+        frameList.remove(frameList.size() - 1);
     }
 
     /**
@@ -218,10 +372,9 @@ public class FrameSequencer {
             shown = true;
 
             // if there is a picture show the last one
-            if (pictureList.size() > 0) {
-                int lastIndex = pictureList.size() - 1;
-                Picture lastPicture = (Picture) pictureList.get(lastIndex);
-                moviePlayer = new MoviePlayer(pictureList);
+            if (frameList.size() > 0) {
+                flush();
+                moviePlayer = new MoviePlayer(getFrameNames());
                 moviePlayer.setVisible(true);
             } else
                 System.out.println("There are no frames to show yet.  " +
@@ -235,10 +388,11 @@ public class FrameSequencer {
      * between frames
      */
     public void play(int framesPerSecond) {
-        if (pictureList.size() > 0) {
+        if (frameList.size() > 0) {
             shown = true;
+            flush();
             if (moviePlayer == null) {
-                moviePlayer = new MoviePlayer(pictureList);
+                moviePlayer = new MoviePlayer(getFrameNames());
             }
             moviePlayer.playMovie(framesPerSecond);
         }
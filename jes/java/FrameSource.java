@@ -0,0 +1,20 @@
+import java.awt.Rectangle;
+import java.awt.image.BufferedImage;
+
+/**
+ * Something that frames of a movie can be captured from, like the
+ * screen.
+ *
+ * @see CapturePipeline
+ * @see ScreenFrameSource
+ */
+public interface FrameSource {
+
+    /**
+     * Method to capture one frame
+     * @param area the part of the source to capture
+     * @return the captured image
+     * @throws Exception if the frame couldn't be captured
+     */
+    public BufferedImage capture(Rectangle area) throws Exception;
+}
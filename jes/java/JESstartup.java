@@ -28,6 +28,8 @@ public class JESstartup {
         System.out.println("--properties:       Print Java system properties");
         System.out.println("--jython [args]:    Run JES's copy of Jython with all provided arguments");
         System.out.println("                    (use --jython --help for details)");
+        System.out.println("--batch [args]:     Run many programs without the editor, writing");
+        System.out.println("                    results as JSON lines (use --batch --help for details)");
         System.out.println();
         System.out.println("Additional debugging options are available.");
         System.out.println("View the source of JESstartup.java for details.");
@@ -120,7 +122,8 @@ public class JESstartup {
             } else {
                 // All remaining arguments should get copied into the
                 // Jython arguments array for jes.__main__
-                if (option.equals("--run") || option.equals("--shell")) {
+                if (option.equals("--run") || option.equals("--shell") ||
+                    option.equals("--batch")) {
                     showSplash = false;
                 }
                 break;
@@ -1,14 +1,76 @@
 import javax.sound.midi.*;
 import java.io.*;
+import java.util.HashMap;
+import java.util.Map;
+import java.util.concurrent.Executors;
+import java.util.concurrent.ScheduledExecutorService;
+import java.util.concurrent.ScheduledFuture;
+import java.util.concurrent.ThreadFactory;
+import java.util.concurrent.TimeUnit;
 
 /**
  * A class with wrapper methods for JavaMusic (specifically playNote)
+ * <p>
+ * <code>playNote</code> waits until the note is over.  <code>startNote</code>
+ * and <code>playNotes</code> return right away, and turn their notes off
+ * (and on) later, on one shared timer thread, so notes can overlap.
  */
 public class JavaMusic {
 
     private static Synthesizer synthr;
     private static MidiChannel channel;
 
+    /** Turns notes on and off at the right time; created when first needed. */
+    private static ScheduledExecutorService scheduler;
+
+    /** The note-off waiting for each note that is sounding. */
+    private static final Map<HeldNote, NoteOff> pendingOffs = new HashMap<HeldNote, NoteOff>();
+
+    /** A pitch sounding on a channel. */
+    private static class HeldNote {
+        final MidiChannel channel;
+        final int note;
+
+        HeldNote(MidiChannel channel, int note) {
+            this.channel = channel;
+            this.note = note;
+        }
+
+        public boolean equals(Object other) {
+            if (!(other instanceof HeldNote)) {
+                return false;
+            }
+            HeldNote held = (HeldNote) other;
+            return held.channel == channel && held.note == note;
+        }
+
+        public int hashCode() {
+            return System.identityHashCode(channel) * 31 + note;
+        }
+    }
+
+    /** Turns a held note off, unless it has been started again since. */
+    private static class NoteOff implements Runnable {
+        final HeldNote held;
+        final int intensity;
+        ScheduledFuture<?> future;
+
+        NoteOff(HeldNote held, int intensity) {
+            this.held = held;
+            this.intensity = intensity;
+        }
+
+        public void run() {
+            synchronized (pendingOffs) {
+                // If the note was started again, a newer note-off is waiting
+                if (pendingOffs.get(held) == this) {
+                    pendingOffs.remove(held);
+                    held.channel.noteOff(held.note, intensity);
+                }
+            }
+        }
+    }
+
     /**
      * Obtains the MIDI channel to use from the default synthesizer.
      */
@@ -33,9 +95,43 @@ public class JavaMusic {
 
     /**
      * Obtains the MIDI channel to use from the default synthesizer.
+     * Notes waiting to be started or stopped are forgotten, and every
+     * note is turned off (including notes held on other channels).
      */
     public static void cleanUp() {
-        getChannel().allNotesOff();
+        synchronized (pendingOffs) {
+            if (scheduler != null) {
+                scheduler.shutdownNow();
+                scheduler = null;
+            }
+            // Their note-offs won't run now, so turn them off here
+            for (NoteOff off : pendingOffs.values()) {
+                off.held.channel.noteOff(off.held.note, off.intensity);
+            }
+            pendingOffs.clear();
+        }
+        MidiChannel defaultChannel = getChannel();
+        if (defaultChannel != null) {
+            defaultChannel.allNotesOff();
+        }
+    }
+
+    /**
+     * Returns the timer thread that turns notes on and off, starting it
+     * if needed.  Call only while holding the <code>pendingOffs</code> lock.
+     * @return the scheduler
+     */
+    private static ScheduledExecutorService getScheduler() {
+        if (scheduler == null) {
+            scheduler = Executors.newSingleThreadScheduledExecutor(new ThreadFactory() {
+                public Thread newThread(Runnable r) {
+                    Thread thread = new Thread(r, "Note scheduler");
+                    thread.setDaemon(true);
+                    return thread;
+                }
+            });
+        }
+        return scheduler;
     }
 
     /**
@@ -72,6 +168,101 @@ public class JavaMusic {
         playNote(note, duration, 64);
     }
 
+    /**
+     * Starts a note and returns right away; the note is turned off after
+     * <code>duration</code> milliseconds.  If the same note is started
+     * again before then, it keeps sounding until the new duration is over.
+     * @param note the note (a number > 0) you want to be played.
+     * @param duration the duration you want the note to be played in milliseconds.
+     * @param intensity the intensity (a number between 0 and 127) you want the note to be played.
+     */
+    public static void startNote(int note, int duration, int intensity) {
+        startNote(getChannel(), note, duration, intensity);
+    }
+
+    /**
+     * Starts a note on the given channel and returns right away; the note
+     * is turned off after <code>duration</code> milliseconds.  If the same
+     * note is started again on the channel before then, it keeps sounding
+     * until the new duration is over.
+     * @param channel the MIDI channel to play the note on
+     * @param note the note (a number > 0) you want to be played.
+     * @param duration the duration you want the note to be played in milliseconds.
+     * @param intensity the intensity (a number between 0 and 127) you want the note to be played.
+     */
+    public static void startNote(MidiChannel channel, int note, int duration, int intensity) {
+        synchronized (pendingOffs) {
+            NoteOff off = new NoteOff(new HeldNote(channel, note), intensity);
+            off.future = getScheduler().schedule(off, Math.max(duration, 0), TimeUnit.MILLISECONDS);
+            noteOn(off);
+        }
+    }
+
+    /**
+     * Turns a note on, to be turned off by the given (scheduled) note-off.
+     * Call only while holding the <code>pendingOffs</code> lock.
+     * @param off the note-off for the note
+     */
+    private static void noteOn(NoteOff off) {
+        // A note started again cancels the note-off of the earlier one
+        NoteOff earlier = pendingOffs.remove(off.held);
+        if (earlier != null) {
+            earlier.future.cancel(false);
+        }
+        off.held.channel.noteOn(off.held.note, off.intensity);
+        pendingOffs.put(off.held, off);
+    }
+
+    /**
+     * Plays a phrase (notes one after the other) and returns right away.
+     * Each note starts when the one before it is due to end.
+     * @param notes the notes (numbers > 0) you want to be played.
+     * @param durations how long to play each note, in milliseconds.
+     * @param intensities the intensity (a number between 0 and 127) of each note.
+     */
+    public static void playNotes(int[] notes, int[] durations, int[] intensities) {
+        playNotes(getChannel(), notes, durations, intensities);
+    }
+
+    /**
+     * Plays a phrase (notes one after the other) on the given channel, and
+     * returns right away.  Each note starts when the one before it is due
+     * to end (after it is turned off); all times are measured from this
+     * call, so delays in starting one note don't add up over the phrase.
+     * @param channel the MIDI channel to play the notes on
+     * @param notes the notes (numbers > 0) you want to be played.
+     * @param durations how long to play each note, in milliseconds.
+     * @param intensities the intensity (a number between 0 and 127) of each note.
+     */
+    public static void playNotes(MidiChannel channel, int[] notes, int[] durations,
+                                 int[] intensities) {
+        if (notes.length != durations.length || notes.length != intensities.length) {
+            throw new IllegalArgumentException("There must be a duration and an intensity for each note");
+        }
+        synchronized (pendingOffs) {
+            final ScheduledExecutorService timer = getScheduler();
+            long start = 0;
+            for (int i = 0; i < notes.length; i++) {
+                final NoteOff off = new NoteOff(new HeldNote(channel, notes[i]), intensities[i]);
+                timer.schedule(new Runnable() {
+                    public void run() {
+                        synchronized (pendingOffs) {
+                            // Unless cleanUp() has been called since
+                            if (scheduler == timer) {
+                                noteOn(off);
+                            }
+                        }
+                    }
+                }, start, TimeUnit.MILLISECONDS);
+                start += Math.max(durations[i], 0);
+
+                // Scheduled before the next note-on (due at the same time),
+                // so it runs first
+                off.future = timer.schedule(off, start, TimeUnit.MILLISECONDS);
+            }
+        }
+    }
+
     public static void main(String[] argv) {
         playNote(66, 1000);
         playNote(68, 1000);
@@ -81,6 +272,18 @@ public class JavaMusic {
         playNote(75, 1000);
         playNote(77, 1000);
         playNote(78, 1000);
+
+        // A chord, then an arpeggio over a held note
+        try {
+            startNote(66, 1000, 64);
+            startNote(70, 1000, 64);
+            startNote(73, 1000, 64);
+            Thread.sleep(1000);
+            startNote(54, 1000, 64);
+            playNotes(new int[] {66, 70, 73, 78}, new int[] {250, 250, 250, 250},
+                      new int[] {64, 64, 64, 64});
+            Thread.sleep(1200);
+        } catch (InterruptedException e) {}
         close();
         System.exit(0);
     }
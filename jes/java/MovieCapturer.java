@@ -1,9 +1,5 @@
 import java.awt.AWTException;
-import java.awt.Robot;
-import java.awt.Toolkit;
 import java.awt.image.BufferedImage;
-import java.io.*;
-import javax.imageio.ImageIO;
 
 /**
  * Class that captures a movie to a series of jpg frames
@@ -23,6 +19,15 @@ public class MovieCapturer implements VideoCapturer {
     /** rectangular region to capture */
     private java.awt.Rectangle region = null;
 
+    /** captures the screen (reusing one Robot for every frame) */
+    private ScreenFrameSource screen = new ScreenFrameSource();
+
+    /** the pipeline doing the current (or last) capture */
+    private volatile CapturePipeline pipeline = null;
+
+    /** the thread doing the current capture (null once it's stopped) */
+    private volatile Thread active = null;
+
     ////////////////// Constructors ////////////////////////
 
     /** Constructor that takes the directory to write the
@@ -83,8 +88,7 @@ public class MovieCapturer implements VideoCapturer {
     public Picture captureScreen() throws Exception {
 
         // capture the whole screen
-        BufferedImage image = new Robot().createScreenCapture(
-            new java.awt.Rectangle(Toolkit.getDefaultToolkit().getScreenSize()));
+        BufferedImage image = screen.capture(ScreenFrameSource.getScreenArea());
         Picture pict = new Picture(image);
 
         return pict;
@@ -102,10 +106,10 @@ public class MovieCapturer implements VideoCapturer {
                                  int width, int height)
     throws AWTException {
 
-        // capture the whole screen
-        BufferedImage screen = new Robot().createScreenCapture(
+        // capture the region
+        BufferedImage screenImage = screen.capture(
             new java.awt.Rectangle(x1, y1, width, height));
-        Picture pict = new Picture(screen);
+        Picture pict = new Picture(screenImage);
         return pict;
     }
 
@@ -115,8 +119,7 @@ public class MovieCapturer implements VideoCapturer {
      */
     public Picture captureRegion() throws Exception {
         if (region != null) {
-            BufferedImage image =
-                new Robot().createScreenCapture(region);
+            BufferedImage image = screen.capture(region);
             Picture pict = new Picture(image);
             return pict;
         } else {
@@ -125,27 +128,68 @@ public class MovieCapturer implements VideoCapturer {
     }
 
     /**
-     * Method to capture a movie until the done
-     * flag is set to true
+     * Method to get the area to capture: the region if there is one,
+     * else the whole screen
+     * @return the area to capture
      */
-    public void captureMovie() {
-        boolean done = false;
-        Picture image = null;
-        long startTime = 0;
-        long endTime = 0;
-        int timeToSleep = (int)(1000 / framesPerSec);
-        while (!done) {
-            try {
-                startTime = System.currentTimeMillis();
-                image = captureRegion();
-                frameSequencer.addFrame(image);
-                endTime = System.currentTimeMillis();
-                Thread.sleep(timeToSleep - (endTime - startTime));
-            } catch (Exception ex) {
+    private java.awt.Rectangle getCaptureArea() {
+        if (region != null) {
+            return region;
+        } else {
+            return ScreenFrameSource.getScreenArea();
+        }
+    }
+
+    /**
+     * Method to capture frames of an area of the screen.  Frames are
+     * captured at a steady rate on one thread while they're written
+     * on this one (and encoded in the background), so writing them
+     * doesn't slow the capture down.
+     * @param area the area of the screen to capture
+     * @param numFrames the number of frames to capture, or -1 to
+     * capture until stopCapture is called
+     */
+    private void captureFrames(java.awt.Rectangle area, int numFrames) {
+        active = Thread.currentThread();
+        boolean wasAsynchronous = frameSequencer.isAsynchronous();
+        if (!wasAsynchronous) {
+            frameSequencer.setAsynchronous(true);
+        }
+        try {
+            CapturePipeline current = new CapturePipeline(screen, frameSequencer);
+            pipeline = current;
+            if (active == null) {
+                // stopCapture was called before the pipeline was made
+                return;
+            }
+            current.capture(area, framesPerSec, numFrames);
+        } finally {
+            active = null;
+            if (!wasAsynchronous) {
+                // waits for the last frames to be written
+                frameSequencer.setAsynchronous(false);
+            } else {
+                frameSequencer.flush();
             }
         }
     }
 
+    /**
+     * Method to get the number of frames dropped in the last capture,
+     * because they couldn't be captured or written fast enough
+     * @return the number of frames dropped
+     */
+    public int getFramesDropped() {
+        return (pipeline == null) ? 0 : pipeline.getFramesDropped();
+    }
+
+    /**
+     * Method to capture a movie until stopCapture is called
+     */
+    public void captureMovie() {
+        captureFrames(getCaptureArea(), -1);
+    }
+
     /**
      * Method to run the captured movie
      */
@@ -159,25 +203,11 @@ public class MovieCapturer implements VideoCapturer {
      * @param numSeconds the number of seconds to capture
      */
     public void captureMovie(int numSeconds) {
-        Picture image = null;
-        int timeToSleep = (int)(1000 / framesPerSec);
-        long startTime = 0;
-        long endTime = 0;
-        for (int i = 0; i < framesPerSec * numSeconds; i++) {
-            try {
-                startTime = System.currentTimeMillis();
-                image = captureRegion();
-                frameSequencer.addFrame(image);
-                endTime = System.currentTimeMillis();
-                Thread.sleep(timeToSleep - (endTime - startTime));
-            } catch (Exception ex) {
-            }
-        }
+        captureFrames(getCaptureArea(), framesPerSec * numSeconds);
     }
 
     /**
-     * Method to capture a movie until the done
-     * flag is set to true
+     * Method to capture a movie until stopCapture is called
      * @param x1 the top left x value
      * @param y1 the top left y value
      * @param width the width of the region to capture
@@ -185,21 +215,7 @@ public class MovieCapturer implements VideoCapturer {
      */
     public void captureMovie(int x1, int y1,
                              int width, int height) {
-        boolean done = false;
-        long startTime = 0;
-        long endTime = 0;
-        Picture image = null;
-        int timeToSleep = (int)(1000 / framesPerSec);
-        while (!done) {
-            try {
-                startTime = System.currentTimeMillis();
-                image = captureRegion(x1, y1, width, height);
-                frameSequencer.addFrame(image);
-                endTime = System.currentTimeMillis();
-                Thread.sleep(timeToSleep - (endTime - startTime));
-            } catch (Exception ex) {
-            }
-        }
+        captureFrames(new java.awt.Rectangle(x1, y1, width, height), -1);
     }
 
     /**
@@ -214,20 +230,8 @@ public class MovieCapturer implements VideoCapturer {
     public void captureMovie(int x1, int y1,
                              int width, int height,
                              int numSeconds) {
-        long startTime = 0;
-        long endTime = 0;
-        Picture image = null;
-        int timeToSleep = (int)(1000 / framesPerSec);
-        for (int i = 0; i < numSeconds * framesPerSec; i++) {
-            try {
-                startTime = System.currentTimeMillis();
-                image = captureRegion(x1, y1, width, height);
-                frameSequencer.addFrame(image);
-                endTime = System.currentTimeMillis();
-                Thread.sleep(timeToSleep - (endTime - startTime));
-            } catch (Exception ex) {
-            }
-        }
+        captureFrames(new java.awt.Rectangle(x1, y1, width, height),
+                      numSeconds * framesPerSec);
     }
 
     /**
@@ -277,8 +281,11 @@ public class MovieCapturer implements VideoCapturer {
      * Method to stop capturing the movie
      */
     public void stopCapture() {
-        // need a separate thread to stop the capture
-        //this.done = true;
+        active = null;
+        CapturePipeline current = pipeline;
+        if (current != null) {
+            current.stop();
+        }
     }
 
     public static void main(String args[]) {
@@ -24,15 +24,20 @@ public class MoviePlayer {
     //////////////////// constructors ////////////////////
 
     /**
-     * Constructor that takes a list of pictures
-     * @param pictureList the list of pictures to show
+     * Constructor that takes a list of frames to show.  Each frame is
+     * a picture, or the name of a picture file, which is read only
+     * when it's shown.
+     * @param frames the list of frames to show
      */
-    public MoviePlayer(List<Picture> pictureList) {
-        animationPanel = new AnimationPanel(pictureList);
-        Picture p = pictureList.get(0);
-        String fileName =  p.getFileName();
-        File f = new File(fileName);
-        dir =  f.getParent() + "/";
+    public MoviePlayer(List<?> frames) {
+        animationPanel = new AnimationPanel(frames);
+        Object first = frames.get(0);
+        String fileName = (first instanceof Picture) ?
+                          ((Picture) first).getFileName() : first.toString();
+        if (fileName != null) {
+            File f = new File(fileName);
+            dir =  f.getParent() + "/";
+        }
         init();
     }
 
@@ -47,6 +52,18 @@ public class MoviePlayer {
         init();
     }
 
+    /**
+     * Constructor that takes the names of the frame files and shows
+     * a movie from them
+     * @param fileNames the names of the frame files, in order
+     */
+    public MoviePlayer(String[] fileNames) {
+        animationPanel = new AnimationPanel(fileNames);
+        File f = new File(fileNames[0]);
+        dir = f.getParent() + "/";
+        init();
+    }
+
     /**
      * Constructor to create a movie player by asking
      * the user to pick the directory that contains
@@ -90,8 +107,12 @@ public class MoviePlayer {
         frameLabel.setText("Playing Movie");
         frame.repaint();
         animationPanel.showAll();
-        frameLabel.setText("Frame Number " +
-                           animationPanel.getCurrIndex());
+        String text = "Frame Number " + animationPanel.getCurrIndex();
+        int dropped = animationPanel.getFramesDropped();
+        if (dropped > 0) {
+            text = text + " (" + dropped + " frames dropped)";
+        }
+        frameLabel.setText(text);
         frame.repaint();
     }
 
@@ -159,6 +180,18 @@ public class MoviePlayer {
         showNext();
     }
 
+    /**
+     * Method to add a picture that was just written to its file (so
+     * the player may read it back from there, instead of keeping it
+     * in memory)
+     * @param picture the picture to add
+     * @param written true if the picture was written to its file name
+     */
+    public void addPicture(Picture picture, boolean written) {
+        animationPanel.add(picture, written);
+        showNext();
+    }
+
     /**
      * Method to set up the gui
      */
@@ -2,13 +2,17 @@ import java.io.*;
 import java.util.*;
 import java.net.*;
 import javax.imageio.ImageIO;
+import java.awt.Graphics2D;
+import java.awt.Image;
 import java.awt.image.BufferedImage;
 
 import ch.randelshofer.media.avi.AVIOutputStream;
 
 /**
  * Class to write out an AVI or Quicktime movie from
- * a series of JPEG (jpg) frames in a directory
+ * a series of JPEG (jpg) frames in a directory.  AVI
+ * movies can also be written straight from pictures
+ * in memory, without saving each frame to a file first.
  * @author Barb Ericson ericson@cc.gatech.edu
  *
  * Depreciated File.toURL() replaced with File.toURI().toURL()
@@ -32,6 +36,14 @@ public class MovieWriter {
     private String movieName = null;
     /** the output url for the movie */
     private String outputURL = null;
+    /** the AVI being written a frame at a time (null if none) */
+    private AVIOutputStream aviOut = null;
+
+    /**
+     * the JPEG quality for frames encoded from pictures (the same
+     * as the frames Picture.write saves)
+     */
+    private static final float FRAME_QUALITY = 0.75f;
 
     ////////////////// constructors //////////////////////
 
@@ -92,6 +104,7 @@ public class MovieWriter {
      * the frame rate, and the output url (dir,name,
      * and extendsion)
      * @param theFramesDir the directory that holds the frame
+     * (or null when the frames will be passed in)
      * @param theFrameRate the number of frames per second
      * @param theOutputURL the complete path name for the output
      * movie
@@ -100,7 +113,7 @@ public class MovieWriter {
                        int theFrameRate,
                        String theOutputURL) {
         this.framesDir = theFramesDir;
-        if (!framesDir.endsWith(File.separator) && !framesDir.endsWith("/")) { //Makes sure framesDir ends with the file separator
+        if (framesDir != null && !framesDir.endsWith(File.separator) && !framesDir.endsWith("/")) { //Makes sure framesDir ends with the file separator
             framesDir += File.separator;
         }
         this.frameRate = theFrameRate;
@@ -198,30 +211,172 @@ public class MovieWriter {
         // archive in the jars folder or at http://www.randelshofer.ch
 
         List<String> frameNames = getFrameNames();
+
+        try {
+            //Copy each JPEG frame into the movie
+            writeAVI(frameNames);
+        } catch (Exception e) {
+            SimpleOutput.showError("Couldn't write the movie " + movieName +
+                                   ": " + e.getMessage());
+        }
+
+    }
+
+    /**
+     * Method to get the name of the AVI file to write
+     * @return the file name (from the output url, ending in .avi)
+     */
+    private String getAVIFileName() throws MalformedURLException {
         if (!outputURL.endsWith(".avi")) {
             outputURL = outputURL + ".avi";
         }
-        Picture p = new Picture((String) frameNames.get(0));
+        return (new URL(outputURL)).getFile();
+    }
+
+    /**
+     * Method to start writing an AVI movie a frame at a time.  Add
+     * the frames with addFrame, then call finishAVI.
+     * @throws IOException if the movie file can't be created
+     */
+    public void startAVI() throws IOException {
+        if (aviOut != null) {
+            throw new IllegalStateException("An AVI is already being written");
+        }
+        aviOut = new AVIOutputStream(new File(getAVIFileName()), AVIOutputStream.VideoFormat.JPG);
+        aviOut.setVideoCompressionQuality(FRAME_QUALITY);
+        aviOut.setFrameRate(frameRate);
+    }
+
+    /**
+     * Method to add a picture as the next frame of the AVI
+     * being written
+     * @param picture the picture to add
+     * @throws IOException if the frame can't be written
+     */
+    public void addFrame(Picture picture) throws IOException {
+        addFrame(picture.getBufferedImage());
+    }
+
+    /**
+     * Method to add an image as the next frame of the AVI
+     * being written.  It's encoded as a JPEG in memory and
+     * written straight into the movie.
+     * @param image the image to add (the same size as the other frames)
+     * @throws IOException if the frame can't be written
+     */
+    public void addFrame(BufferedImage image) throws IOException {
+        if (aviOut == null) {
+            throw new IllegalStateException("Call startAVI before adding frames");
+        }
+        // JPEGs can only hold RGB images
+        if (image.getType() != BufferedImage.TYPE_INT_RGB &&
+                image.getType() != BufferedImage.TYPE_3BYTE_BGR) {
+            image = copyFrame(image);
+        }
+        aviOut.writeFrame(image);
+    }
+
+    /**
+     * Method to add a JPEG file as the next frame of the AVI
+     * being written.  The file is copied into the movie as it is.
+     * @param fileName the name of the JPEG file
+     * @throws IOException if the frame can't be read or written
+     */
+    public void addFrame(String fileName) throws IOException {
+        if (aviOut == null) {
+            throw new IllegalStateException("Call startAVI before adding frames");
+        }
+        String lower = fileName.toLowerCase();
+        if (lower.endsWith(".jpg") || lower.endsWith(".jpeg")) {
+            aviOut.writeFrame(new File(fileName));
+        } else {
+            BufferedImage image = ImageIO.read(new File(fileName));
+            if (image == null) {
+                throw new IOException(fileName + " isn't a picture");
+            }
+            addFrame(image);
+        }
+    }
 
+    /**
+     * Method to finish writing the AVI, so it has the
+     * proper format
+     * @throws IOException if the movie can't be finished
+     */
+    public void finishAVI() throws IOException {
+        if (aviOut != null) {
+            try {
+                aviOut.close();
+            } finally {
+                aviOut = null;
+            }
+        }
+    }
+
+    /**
+     * Method to write an AVI movie from a list of frames.  Each
+     * frame can be a Picture, a BufferedImage, or the name of a
+     * picture file; pictures and images are encoded in memory
+     * rather than saved to files first.
+     * @param frames the frames of the movie, in order
+     * @throws IOException if the movie can't be written
+     */
+    public void writeAVI(List<?> frames) throws IOException {
+        if (frames.isEmpty()) {
+            throw new IllegalArgumentException("The movie has no frames");
+        }
+        startAVI();
         try {
-            //Convert the URL into a filename
-            String filename = (new URL(outputURL)).getFile();
-
-            //Setup the output stream
-            AVIOutputStream AVIout = new AVIOutputStream(new File(filename), AVIOutputStream.VideoFormat.JPG);
-            AVIout.setVideoCompressionQuality(1);
-            AVIout.setFrameRate(frameRate);
-            AVIout.setVideoDimension(p.getWidth(), p.getHeight());
-
-            //Write each frame
-            for (int i = 0; i < frameNames.size(); i++) {
-                AVIout.writeFrame(new File(frameNames.get(i)));
+            // frames copied from files need the size given up front
+            BufferedImage first = getFrameImage(frames.get(0));
+            aviOut.setVideoDimension(first.getWidth(), first.getHeight());
+
+            for (Object frame : frames) {
+                if (frame instanceof String) {
+                    addFrame((String) frame);
+                } else {
+                    addFrame(getFrameImage(frame));
+                }
             }
+        } finally {
+            finishAVI();
+        }
+    }
 
-            //Close the output stream so the AVI has proper format
-            AVIout.close();
-        } catch (Exception e) {    }
+    /**
+     * Method to get the image for a frame
+     * @param frame a Picture, BufferedImage or file name
+     * @return the frame's image
+     */
+    private static BufferedImage getFrameImage(Object frame) throws IOException {
+        if (frame instanceof SimplePicture) {
+            return ((SimplePicture) frame).getBufferedImage();
+        } else if (frame instanceof BufferedImage) {
+            return (BufferedImage) frame;
+        } else if (frame instanceof String) {
+            BufferedImage image = ImageIO.read(new File((String) frame));
+            if (image == null) {
+                throw new IOException(frame + " isn't a picture");
+            }
+            return image;
+        } else {
+            throw new IllegalArgumentException("A frame must be a picture or a file name, not " + frame);
+        }
+    }
 
+    /**
+     * Method to copy an image into a new RGB image, for use as
+     * a frame (which can't change when the original does)
+     * @param image the image to copy
+     * @return the copy
+     */
+    public static BufferedImage copyFrame(Image image) {
+        BufferedImage copy = new BufferedImage(image.getWidth(null), image.getHeight(null),
+                                               BufferedImage.TYPE_INT_RGB);
+        Graphics2D g = copy.createGraphics();
+        g.drawImage(image, 0, 0, null);
+        g.dispose();
+        return copy;
     }
 
     /**
@@ -238,7 +393,92 @@ public class MovieWriter {
                                    frameRate, frameNames, outputURL);
     }
 
-    public static void main(String[] args) {
+    /**
+     * Method to make a frame for the benchmark
+     * @param width the width of the frame
+     * @param height the height of the frame
+     * @param number which frame it is
+     * @return the frame
+     */
+    private static BufferedImage makeTestFrame(int width, int height, int number) {
+        BufferedImage image = new BufferedImage(width, height, BufferedImage.TYPE_INT_RGB);
+        int[] row = new int[width];
+        for (int y = 0; y < height; y++) {
+            for (int x = 0; x < width; x++) {
+                row[x] = ((x + number) & 0xff) << 16 | ((y + 2 * number) & 0xff) << 8 | (x * y & 0xff);
+            }
+            image.setRGB(0, y, width, 1, row, 0, width);
+        }
+        return image;
+    }
+
+    /**
+     * Method to compare writing an AVI by saving JPEG frames to
+     * files first with encoding the frames in memory, on a made-up
+     * movie.  Prints how long each took and how much it wrote to
+     * (and read from) the disk.
+     * @param dir the directory to write to
+     * @param numFrames the number of frames in the movie
+     */
+    public static void benchmark(String dir, int numFrames) throws IOException {
+        int width = 320;
+        int height = 240;
+        File framesDir = new File(dir, "frames");
+        framesDir.mkdirs();
+        File[] oldFrames = framesDir.listFiles();
+        for (int i = 0; oldFrames != null && i < oldFrames.length; i++) {
+            oldFrames[i].delete();
+        }
+        File filesMovie = new File(dir, "through-files.avi");
+        File memoryMovie = new File(dir, "in-memory.avi");
+
+        // save each frame to a file, then copy the files into the movie
+        long start = System.nanoTime();
+        FrameSequencer sequencer = new FrameSequencer(framesDir.getPath());
+        for (int i = 0; i < numFrames; i++) {
+            sequencer.addFrame(new Picture(makeTestFrame(width, height, i)));
+        }
+        MovieWriter writer = new MovieWriter(framesDir.getPath(), 16,
+                                             filesMovie.toURI().toURL().toString());
+        writer.writeAVI();
+        double filesTime = (System.nanoTime() - start) / 1e9;
+
+        long frameBytes = 0;
+        File[] frames = framesDir.listFiles();
+        for (int i = 0; i < frames.length; i++) {
+            frameBytes += frames[i].length();
+        }
+
+        // encode each frame straight into the movie
+        start = System.nanoTime();
+        writer = new MovieWriter(null, 16, memoryMovie.toURI().toURL().toString());
+        writer.startAVI();
+        for (int i = 0; i < numFrames; i++) {
+            writer.addFrame(makeTestFrame(width, height, i));
+        }
+        writer.finishAVI();
+        double memoryTime = (System.nanoTime() - start) / 1e9;
+
+        System.out.println(numFrames + " frames, " + width + "x" + height);
+        System.out.println(String.format("Through files: %.2f s, wrote %d bytes of frames " +
+                                         "(and read them back) and a %d byte movie",
+                                         filesTime, frameBytes, filesMovie.length()));
+        System.out.println(String.format("In memory:     %.2f s, wrote a %d byte movie",
+                                         memoryTime, memoryMovie.length()));
+    }
+
+    /**
+     * Run with "benchmark" (and optionally a directory and a number
+     * of frames) to compare the two ways of writing an AVI
+     */
+    public static void main(String[] args) throws IOException {
+        if (args.length > 0 && args[0].equals("benchmark")) {
+            String dir = (args.length > 1) ? args[1] :
+                         System.getProperty("java.io.tmpdir") + "/avi-benchmark";
+            int numFrames = (args.length > 2) ? Integer.parseInt(args[2]) : 500;
+            benchmark(dir, numFrames);
+            return;
+        }
         MovieWriter writer =
             new MovieWriter("c:/Temp/testmovie/");
         writer.writeQuicktime();
@@ -0,0 +1,402 @@
+import javax.sound.sampled.AudioFormat;
+
+/**
+ * Changes the sampling rate of sounds (and of streams of samples) with
+ * a windowed-sinc filter.
+ * <p>
+ * The filter is a sinc function shaped by a Kaiser window, and is
+ * precomputed at a few hundred fractional offsets ("phases") so that
+ * each output sample just takes a weighted sum of the input samples
+ * around it.  When the rate goes down, the filter's cutoff is lowered
+ * to match, so frequencies the new rate can't hold are filtered out
+ * instead of folding back as aliasing.
+ * <p>
+ * There are three qualities: <code>LINEAR</code> just draws a line
+ * between neighbouring samples (quick, but it doesn't filter anything),
+ * <code>MEDIUM</code> uses a short filter, and <code>HIGH</code> a long
+ * one.
+ * <p>
+ * A <code>Resampler</code> keeps the last few input samples of each
+ * channel between calls to <code>process</code>, so a long stream can
+ * be converted one block at a time.
+ *
+ * @see SimpleSound#getSampleBlock(int, int, int[][])
+ */
+public class Resampler {
+
+    /** Straight lines between samples.  Fast, with no filtering. */
+    public static final int LINEAR = 0;
+
+    /** A short windowed-sinc filter. */
+    public static final int MEDIUM = 1;
+
+    /** A long windowed-sinc filter, for the best sound. */
+    public static final int HIGH = 2;
+
+    /** The zero crossings on each side of the filter, by quality. */
+    private static final int[] ZERO_CROSSINGS = {1, 8, 32};
+
+    /** The Kaiser window's shape parameter, by quality. */
+    private static final double[] BETA = {0, 6.0, 9.6};
+
+    /** How many fractional offsets the filter is computed at, by quality. */
+    private static final int[] PHASES = {1, 128, 512};
+
+    /**
+     * How far below the new Nyquist frequency the filter starts cutting,
+     * to leave room for the filter's slope.
+     */
+    private static final double ROLLOFF = 0.95;
+
+    /** How many frames <code>resample</code> converts at once. */
+    private static final int BLOCK_FRAMES = 4096;
+
+    private final int channels;
+
+    /** Input samples per output sample. */
+    private final double step;
+
+    /** Half the filter's width, in input samples. */
+    private final int halfWidth;
+
+    private final int phases;
+
+    /**
+     * <code>filter[p][k]</code> is the weight of input sample
+     * <code>base - halfWidth + 1 + k</code> for an output that falls
+     * <code>p / phases</code> of the way past sample <code>base</code>.
+     * (It's <code>null</code> for <code>LINEAR</code>.)
+     */
+    private final float[][] filter;
+
+    /** The input samples that later outputs still need, by channel. */
+    private float[][] history;
+    private int historyCount;
+
+    /** The index (in the whole input) of <code>history[c][0]</code>. */
+    private long historyStart;
+
+    /** How many input samples have been given so far. */
+    private long inputCount = 0;
+
+    /** How many output samples have been made so far. */
+    private long outputCount = 0;
+
+    /**
+     * Makes a resampler.
+     *
+     * @param fromRate the sampling rate of the input
+     * @param toRate the sampling rate wanted
+     * @param channels the number of channels in each block
+     * @param quality <code>LINEAR</code>, <code>MEDIUM</code> or
+     *                <code>HIGH</code>
+     */
+    public Resampler(double fromRate, double toRate, int channels, int quality) {
+        if (fromRate <= 0 || toRate <= 0) {
+            throw new IllegalArgumentException("Sampling rates must be positive");
+        }
+        if (quality < LINEAR || quality > HIGH) {
+            throw new IllegalArgumentException("Unknown quality " + quality);
+        }
+
+        this.channels = channels;
+        this.step = fromRate / toRate;
+
+        if (quality == LINEAR) {
+            this.halfWidth = 1;
+            this.phases = 1;
+            this.filter = null;
+        } else {
+            double cutoff = Math.min(1.0, toRate / fromRate) * ROLLOFF;
+            this.halfWidth = (int) Math.ceil(ZERO_CROSSINGS[quality] / cutoff);
+            this.phases = PHASES[quality];
+            this.filter = makeFilter(cutoff, halfWidth, phases, BETA[quality]);
+        }
+
+        // Start with silence before the first sample, so the first
+        // outputs have something on their left.
+        this.history = new float[channels][Math.max(BLOCK_FRAMES, 4 * halfWidth)];
+        this.historyCount = halfWidth;
+        this.historyStart = -halfWidth;
+    }
+
+    /**
+     * Works out the filter's weights at every phase (plus one more, so
+     * the last phase has a neighbour to interpolate with).
+     */
+    private static float[][] makeFilter(double cutoff, int halfWidth,
+                                        int phases, double beta) {
+        int taps = 2 * halfWidth;
+        double i0Beta = besselI0(beta);
+        float[][] filter = new float[phases + 1][taps];
+
+        for (int p = 0; p <= phases; p++) {
+            double frac = (double) p / phases;
+            for (int k = 0; k < taps; k++) {
+                // How far the output is from this input sample
+                double x = frac + halfWidth - 1 - k;
+                double u = x / halfWidth;
+                if (Math.abs(u) >= 1.0) {
+                    continue;
+                }
+                double window = besselI0(beta * Math.sqrt(1 - u * u)) / i0Beta;
+                filter[p][k] = (float) (cutoff * sinc(cutoff * x) * window);
+            }
+        }
+        return filter;
+    }
+
+    private static double sinc(double x) {
+        if (x == 0) {
+            return 1.0;
+        }
+        return Math.sin(Math.PI * x) / (Math.PI * x);
+    }
+
+    /**
+     * The zeroth-order modified Bessel function of the first kind,
+     * which the Kaiser window is made from.
+     */
+    private static double besselI0(double x) {
+        double sum = 1.0;
+        double term = 1.0;
+        double half = x / 2;
+        for (int k = 1; k < 50; k++) {
+            term *= (half / k) * (half / k);
+            sum += term;
+            if (term < sum * 1e-12) {
+                break;
+            }
+        }
+        return sum;
+    }
+
+    /**
+     * @param inCount a number of input samples
+     * @return the most output samples that giving <code>process</code>
+     *         that many input samples (or calling <code>flush</code>)
+     *         can make
+     */
+    public int maxOutput(int inCount) {
+        return (int) Math.ceil((inCount + 2 * halfWidth) / step) + 2;
+    }
+
+    /**
+     * Converts a block of input.  Outputs come out a little behind the
+     * inputs (by half the filter's width), so the last few are only
+     * made by later blocks, or by <code>flush</code>.
+     *
+     * @param in the input samples, <code>in[channel][frame]</code>
+     * @param inCount how many frames of <code>in</code> to use
+     * @param out where to put the output samples; it needs room for
+     *            <code>maxOutput(inCount)</code> frames
+     * @return how many output frames were made
+     */
+    public int process(float[][] in, int inCount, float[][] out) {
+        append(in, inCount);
+        inputCount += inCount;
+        return produce(out, Long.MAX_VALUE);
+    }
+
+    /**
+     * Makes the outputs still waiting on input that will never come
+     * (treating it as silence), up to the end of the input.
+     *
+     * @param out where to put the output samples; it needs room for
+     *            <code>maxOutput(0)</code> frames
+     * @return how many output frames were made
+     */
+    public int flush(float[][] out) {
+        append(new float[channels][halfWidth + 1], halfWidth + 1);
+        return produce(out, inputCount);
+    }
+
+    /**
+     * Adds input samples to the end of the history, dropping the ones
+     * no output needs any more.
+     */
+    private void append(float[][] in, int inCount) {
+        long base = (long) Math.floor(outputCount * step);
+        int unused = (int) Math.max(0, Math.min(historyCount,
+                                                base - halfWidth + 1 - historyStart));
+        int keep = historyCount - unused;
+
+        if (keep + inCount > history[0].length) {
+            float[][] grown = new float[channels][Math.max(keep + inCount,
+                                                           2 * history[0].length)];
+            for (int c = 0; c < channels; c++) {
+                System.arraycopy(history[c], unused, grown[c], 0, keep);
+            }
+            history = grown;
+        } else if (unused > 0) {
+            for (int c = 0; c < channels; c++) {
+                System.arraycopy(history[c], unused, history[c], 0, keep);
+            }
+        }
+
+        for (int c = 0; c < channels; c++) {
+            System.arraycopy(in[c], 0, history[c], keep, inCount);
+        }
+        historyStart += unused;
+        historyCount = keep + inCount;
+    }
+
+    /**
+     * Makes every output whose inputs are all in the history, stopping
+     * before the first one at or past input sample <code>end</code>.
+     */
+    private int produce(float[][] out, long end) {
+        int made = 0;
+        int taps = 2 * halfWidth;
+        long available = historyStart + historyCount;
+
+        while (true) {
+            // The output's position in the input.  It's worked out from
+            // the output's index, so rounding errors don't add up.
+            double t = outputCount * step;
+            long base = (long) Math.floor(t);
+            if (base + halfWidth >= available || t >= end) {
+                break;
+            }
+
+            double frac = t - base;
+            int first = (int) (base - halfWidth + 1 - historyStart);
+
+            if (filter == null) {
+                float a = (float) (1 - frac);
+                float b = (float) frac;
+                for (int c = 0; c < channels; c++) {
+                    float[] h = history[c];
+                    out[c][made] = a * h[first] + b * h[first + 1];
+                }
+            } else {
+                double position = frac * phases;
+                int p = Math.min((int) position, phases - 1);
+                float mix = (float) (position - p);
+                float[] lower = filter[p];
+                float[] upper = filter[p + 1];
+                for (int c = 0; c < channels; c++) {
+                    float[] h = history[c];
+                    float sumLower = 0;
+                    float sumUpper = 0;
+                    for (int k = 0; k < taps; k++) {
+                        float sample = h[first + k];
+                        sumLower += lower[k] * sample;
+                        sumUpper += upper[k] * sample;
+                    }
+                    out[c][made] = sumLower + mix * (sumUpper - sumLower);
+                }
+            }
+
+            made++;
+            outputCount++;
+        }
+        return made;
+    }
+
+    /**
+     * Copies samples from one channel layout to another.  Going to mono
+     * averages the channels, going from mono copies the one channel to
+     * all of them, and otherwise channels are matched up in order
+     * (repeating the input channels if there are more outputs).
+     *
+     * @param in the input samples, <code>in[channel][frame]</code>
+     * @param out where to put the samples, with a row for each channel
+     *            wanted
+     * @param count how many frames to copy
+     */
+    public static void remapChannels(float[][] in, float[][] out, int count) {
+        int inChannels = in.length;
+        int outChannels = out.length;
+
+        if (outChannels == 1 && inChannels > 1) {
+            float scale = 1.0f / inChannels;
+            for (int i = 0; i < count; i++) {
+                float sum = 0;
+                for (int c = 0; c < inChannels; c++) {
+                    sum += in[c][i];
+                }
+                out[0][i] = sum * scale;
+            }
+        } else {
+            for (int c = 0; c < outChannels; c++) {
+                System.arraycopy(in[c % inChannels], 0, out[c], 0, count);
+            }
+        }
+    }
+
+    /**
+     * Makes a copy of a sound at another sampling rate (and, perhaps,
+     * with another number of channels).  The copy has 16-bit samples,
+     * and plays for as long as the original.
+     *
+     * @param sound the sound to convert
+     * @param toRate the sampling rate wanted
+     * @param toChannels the number of channels wanted
+     * @param quality <code>LINEAR</code>, <code>MEDIUM</code> or
+     *                <code>HIGH</code>
+     * @return the new sound
+     * @throws SoundException if the sound's samples can't be read
+     */
+    public static Sound resample(SimpleSound sound, double toRate,
+                                 int toChannels, int quality)
+    throws SoundException {
+        AudioFormat format = sound.getAudioFileFormat().getFormat();
+        double fromRate = format.getSampleRate();
+        int fromChannels = format.getChannels();
+        int inFrames = sound.getLengthInFrames();
+        int outFrames = (int) Math.min(Integer.MAX_VALUE,
+                                       Math.round(inFrames * toRate / fromRate));
+
+        // Samples come back in the sound's own range; the copy is 16-bit.
+        boolean isLaw = format.getEncoding().equals(AudioFormat.Encoding.ALAW) ||
+                        format.getEncoding().equals(AudioFormat.Encoding.ULAW);
+        float scale = isLaw ? 1.0f :
+                      (float) (32768.0 / Math.pow(2, format.getSampleSizeInBits() - 1));
+
+        Sound result = new Sound(outFrames, (int) Math.round(toRate), toChannels);
+        Resampler resampler = new Resampler(fromRate, toRate, toChannels, quality);
+
+        int[][] raw = new int[fromChannels][BLOCK_FRAMES];
+        float[][] in = new float[fromChannels][BLOCK_FRAMES];
+        float[][] mapped = new float[toChannels][BLOCK_FRAMES];
+        float[][] out = new float[toChannels][resampler.maxOutput(BLOCK_FRAMES)];
+        int[][] samples = new int[toChannels][out[0].length];
+        int written = 0;
+
+        for (int done = 0; done < inFrames; done += BLOCK_FRAMES) {
+            int n = Math.min(BLOCK_FRAMES, inFrames - done);
+            sound.getSampleBlock(done, n, raw);
+            for (int c = 0; c < fromChannels; c++) {
+                for (int i = 0; i < n; i++) {
+                    in[c][i] = raw[c][i] * scale;
+                }
+            }
+            remapChannels(in, mapped, n);
+            int made = resampler.process(mapped, n, out);
+            written += store(result, written, outFrames, out, made, samples);
+        }
+        int made = resampler.flush(out);
+        store(result, written, outFrames, out, made, samples);
+
+        return result;
+    }
+
+    /**
+     * Rounds a block of output into a sound (without going past its
+     * end).
+     * @return how many frames were stored
+     */
+    private static int store(SimpleSound sound, int at, int length,
+                             float[][] out, int count, int[][] samples)
+    throws SoundException {
+        count = Math.max(0, Math.min(count, length - at));
+        for (int c = 0; c < out.length; c++) {
+            for (int i = 0; i < count; i++) {
+                samples[c][i] = Math.round(out[c][i]);
+            }
+        }
+        sound.setSampleBlock(at, count, samples);
+        return count;
+    }
+}
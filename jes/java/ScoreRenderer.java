@@ -0,0 +1,428 @@
+import java.io.File;
+import java.io.IOException;
+import java.util.Arrays;
+import java.util.Comparator;
+import java.util.Random;
+import javax.sound.sampled.AudioFileFormat;
+import javax.sound.sampled.AudioFormat;
+
+/**
+ * Renders notes (such as the notes of a jMusic score) to samples with a
+ * simple wavetable synthesizer, as fast as it can, instead of playing
+ * them in real time.  No sound device is needed.
+ * <p>
+ * Each note is one cycle of a wavetable (a few harmonics), with a short
+ * linear attack and release, panned between the left and right channels
+ * and mixed into blocks of samples.  The blocks go either into a
+ * <code>Sound</code> or straight into a WAV file, so a long piece can be
+ * rendered without keeping all of it in memory.
+ * <p>
+ * The wavetable and pan gains are computed with <code>StrictMath</code>,
+ * and notes are mixed one at a time in a fixed order, so the same notes
+ * always render to exactly the same samples.
+ *
+ * @see SoundWriter
+ */
+public class ScoreRenderer {
+
+    /** The sample rate used, unless told otherwise. */
+    public static final int DEFAULT_SAMPLE_RATE = 22050;
+
+    /** The relative strengths of the harmonics in the wavetable, unless told otherwise. */
+    public static final double[] DEFAULT_HARMONICS = {1.0, 0.5, 0.25, 0.125};
+
+    /** How long notes take to fade in, in milliseconds. */
+    public static final int ATTACK_MILLIS = 10;
+
+    /** How long notes take to fade out after they end, in milliseconds. */
+    public static final int RELEASE_MILLIS = 50;
+
+    /** How many samples make up one cycle of the wavetable. */
+    private static final int TABLE_SIZE = 4096;
+
+    /** How many frames are mixed at a time. */
+    private static final int BLOCK_FRAMES = 4096;
+
+    /** The largest sample value (16-bit samples). */
+    private static final int MAX_SAMPLE = 32767;
+
+    /** Where to put the mixed blocks of samples. */
+    private interface Sink {
+        void write(int[][] samples, long startFrame, int numFrames)
+            throws IOException, SoundException;
+    }
+
+    private final int sampleRate;
+    private final int numChannels;
+    private final float[] table;
+    private final int attackFrames;
+    private final int releaseFrames;
+    private double gain = 0.25;
+
+    // The notes, in the order they were added
+    private int numNotes = 0;
+    private long[] startFrames = new long[64];
+    private long[] lengthFrames = new long[64];
+    private double[] frequencies = new double[64];
+    private float[][] channelGains = new float[64][];
+
+    private long renderNanos = 0;
+    private long renderedFrames = 0;
+
+    /**
+     * Creates a stereo renderer with the default sample rate and harmonics.
+     */
+    public ScoreRenderer() {
+        this(DEFAULT_SAMPLE_RATE, 2, DEFAULT_HARMONICS);
+    }
+
+    /**
+     * @param sampleRate how many frames per second to render
+     * @param numChannels 1 for mono, 2 for stereo
+     * @param harmonics the relative strength of each harmonic (the
+     *                  first is the fundamental) in the wavetable
+     */
+    public ScoreRenderer(int sampleRate, int numChannels, double[] harmonics) {
+        if (sampleRate <= 0) {
+            throw new IllegalArgumentException("The sample rate must be positive");
+        }
+        if (numChannels != 1 && numChannels != 2) {
+            throw new IllegalArgumentException("Only mono and stereo sounds can be rendered");
+        }
+        this.sampleRate = sampleRate;
+        this.numChannels = numChannels;
+        this.table = makeTable(harmonics);
+        this.attackFrames = Math.max(1, (int) ((long) ATTACK_MILLIS * sampleRate / 1000));
+        this.releaseFrames = Math.max(1, (int) ((long) RELEASE_MILLIS * sampleRate / 1000));
+    }
+
+    /**
+     * Makes one cycle of the waveform, scaled to peak at 1, with the first
+     * sample repeated at the end (for interpolating).
+     */
+    private static float[] makeTable(double[] harmonics) {
+        double[] wave = new double[TABLE_SIZE];
+        for (int h = 0; h < harmonics.length; h++) {
+            for (int i = 0; i < TABLE_SIZE; i++) {
+                wave[i] += harmonics[h] * StrictMath.sin(2 * StrictMath.PI * (h + 1) * i / TABLE_SIZE);
+            }
+        }
+        double peak = 0;
+        for (int i = 0; i < TABLE_SIZE; i++) {
+            peak = Math.max(peak, Math.abs(wave[i]));
+        }
+        float[] table = new float[TABLE_SIZE + 1];
+        for (int i = 0; i < TABLE_SIZE; i++) {
+            table[i] = (float) ((peak == 0) ? 0 : wave[i] / peak);
+        }
+        table[TABLE_SIZE] = table[0];
+        return table;
+    }
+
+    /**
+     * Sets how loud one note at full velocity is, as a fraction of the
+     * largest sample value.  Where notes add up to more than that, the
+     * samples are clipped.
+     * @param gain the loudness of one note (0.25 unless set)
+     */
+    public void setGain(double gain) {
+        this.gain = gain;
+    }
+
+    /**
+     * Adds a note to render.  Notes can be added in any order.
+     *
+     * @param startMillis when the note starts, in milliseconds
+     * @param durationMillis how long the note lasts, in milliseconds (it
+     *                       fades out after that)
+     * @param frequency the note's frequency, in Hz
+     * @param velocity how loud the note is (0 to 127)
+     * @param panning where the note is, from left (0) to right (127)
+     */
+    public void addNote(int startMillis, int durationMillis, double frequency,
+                        int velocity, int panning) {
+        if (numNotes == startFrames.length) {
+            int size = numNotes * 2;
+            startFrames = Arrays.copyOf(startFrames, size);
+            lengthFrames = Arrays.copyOf(lengthFrames, size);
+            frequencies = Arrays.copyOf(frequencies, size);
+            channelGains = Arrays.copyOf(channelGains, size);
+        }
+        double amplitude = Math.max(0, Math.min(127, velocity)) / 127.0;
+        double pan = Math.max(0, Math.min(127, panning)) / 127.0;
+        float[] gains;
+        if (numChannels == 1) {
+            gains = new float[] {(float) amplitude};
+        } else {
+            gains = new float[] {(float) (amplitude * StrictMath.cos(pan * StrictMath.PI / 2)),
+                                 (float) (amplitude * StrictMath.sin(pan * StrictMath.PI / 2))};
+        }
+
+        startFrames[numNotes] = (long) Math.max(0, startMillis) * sampleRate / 1000;
+        lengthFrames[numNotes] = (long) Math.max(0, durationMillis) * sampleRate / 1000;
+        frequencies[numNotes] = frequency;
+        channelGains[numNotes] = gains;
+        numNotes++;
+    }
+
+    /**
+     * @return how many notes have been added
+     */
+    public int getNumNotes() {
+        return numNotes;
+    }
+
+    /**
+     * @return how many frames the rendered sound has (until the last note
+     *         has faded out)
+     */
+    public long getLengthInFrames() {
+        long end = 0;
+        for (int i = 0; i < numNotes; i++) {
+            end = Math.max(end, endFrame(i));
+        }
+        return end;
+    }
+
+    /**
+     * @return the frame just after a note has faded out (the release
+     *         reaches silence on the frame before it)
+     */
+    private long endFrame(int note) {
+        return startFrames[note] + lengthFrames[note] + releaseFrames + 1;
+    }
+
+    /**
+     * @return the sample rate, in frames per second
+     */
+    public int getSampleRate() {
+        return sampleRate;
+    }
+
+    /**
+     * Renders the notes into a new sound.
+     * @return the sound (16-bit, at this renderer's sample rate and
+     *         number of channels)
+     * @throws SoundException if the sound can't be made
+     */
+    public Sound renderToSound() throws SoundException {
+        long length = getLengthInFrames();
+        if (length > Integer.MAX_VALUE) {
+            throw new SoundException("The score is too long for a sound - render it to a file instead");
+        }
+        // (a sound needs at least one frame, even with no notes)
+        final Sound sound = new Sound((int) Math.max(1, length), sampleRate, numChannels);
+        try {
+            render(new Sink() {
+                public void write(int[][] samples, long startFrame, int numFrames)
+                throws SoundException {
+                    sound.setSampleBlock((int) startFrame, numFrames, samples);
+                }
+            });
+        } catch (IOException ex) {
+            // Nothing is written to a file
+            throw new SoundException(ex.getMessage());
+        }
+        return sound;
+    }
+
+    /**
+     * Renders the notes straight into a (16-bit) WAV file, a block at a
+     * time.
+     * @param fileName the file to write
+     * @throws IOException if the file can't be written
+     */
+    public void renderToFile(String fileName) throws IOException {
+        AudioFormat format = new AudioFormat(sampleRate, 16, numChannels, true, false);
+        final SoundWriter writer = SoundWriter.create(new File(fileName), format,
+                                                      AudioFileFormat.Type.WAVE);
+        try {
+            render(new Sink() {
+                public void write(int[][] samples, long startFrame, int numFrames)
+                throws IOException {
+                    writer.appendSamples(samples, numFrames);
+                }
+            });
+        } catch (SoundException ex) {
+            // Nothing is written to a sound
+            throw new IOException(ex.getMessage());
+        } finally {
+            writer.close();
+        }
+    }
+
+    /**
+     * Mixes the notes a block at a time, and passes each block to the sink.
+     */
+    private void render(Sink sink) throws IOException, SoundException {
+        long start = System.nanoTime();
+        long length = getLengthInFrames();
+        Integer[] order = getNotesByStart();
+
+        float[][] mix = new float[numChannels][BLOCK_FRAMES];
+        int[][] samples = new int[numChannels][BLOCK_FRAMES];
+        int[] active = new int[Math.max(1, numNotes)];
+        int numActive = 0;
+        int next = 0;
+        double scale = gain * MAX_SAMPLE;
+
+        for (long blockStart = 0; blockStart < length; blockStart += BLOCK_FRAMES) {
+            int n = (int) Math.min(BLOCK_FRAMES, length - blockStart);
+            long blockEnd = blockStart + n;
+
+            // Start the notes that begin in this block
+            while (next < numNotes && startFrames[order[next]] < blockEnd) {
+                active[numActive++] = order[next++];
+            }
+
+            for (int c = 0; c < numChannels; c++) {
+                Arrays.fill(mix[c], 0, n, 0f);
+            }
+
+            // Mix the notes sounding, and drop the ones that have ended
+            int stillActive = 0;
+            for (int a = 0; a < numActive; a++) {
+                int note = active[a];
+                mixNote(note, blockStart, n, mix);
+                if (endFrame(note) > blockEnd) {
+                    active[stillActive++] = note;
+                }
+            }
+            numActive = stillActive;
+
+            for (int c = 0; c < numChannels; c++) {
+                float[] row = mix[c];
+                int[] out = samples[c];
+                for (int i = 0; i < n; i++) {
+                    long value = Math.round(row[i] * scale);
+                    out[i] = (int) Math.max(-MAX_SAMPLE, Math.min(MAX_SAMPLE, value));
+                }
+            }
+            sink.write(samples, blockStart, n);
+        }
+
+        renderNanos = System.nanoTime() - start;
+        renderedFrames = length;
+    }
+
+    /**
+     * @return the indices of the notes, by start time (and the order they
+     *         were added, for notes starting together)
+     */
+    private Integer[] getNotesByStart() {
+        Integer[] order = new Integer[numNotes];
+        for (int i = 0; i < numNotes; i++) {
+            order[i] = i;
+        }
+        // A stable sort, so the mixing order is always the same
+        Arrays.sort(order, new Comparator<Integer>() {
+            public int compare(Integer a, Integer b) {
+                long difference = startFrames[a] - startFrames[b];
+                return (difference < 0) ? -1 : (difference > 0) ? 1 : 0;
+            }
+        });
+        return order;
+    }
+
+    /**
+     * Adds the part of a note that falls in a block to the mix.
+     */
+    private void mixNote(int note, long blockStart, int numFrames, float[][] mix) {
+        long noteStart = startFrames[note];
+        long length = lengthFrames[note];
+        long end = endFrame(note);
+        int first = (int) Math.max(0, noteStart - blockStart);
+        int last = (int) Math.min(numFrames, end - blockStart);
+
+        // Where in the wavetable the note is at the first frame
+        double step = frequencies[note] * TABLE_SIZE / sampleRate;
+        long offset = blockStart + first - noteStart;
+        double position = (offset * step) % TABLE_SIZE;
+        float[] gains = channelGains[note];
+
+        for (int i = first; i < last; i++, offset++) {
+            int index = (int) position;
+            float fraction = (float) (position - index);
+            float value = table[index] + fraction * (table[index + 1] - table[index]);
+
+            // Linear attack, then linear release once the note ends
+            float envelope = Math.min(1f, (float) offset / attackFrames);
+            if (offset >= length) {
+                envelope *= 1f - (float) (offset - length) / releaseFrames;
+            }
+            value *= envelope;
+
+            for (int c = 0; c < numChannels; c++) {
+                mix[c][i] += value * gains[c];
+            }
+
+            position += step;
+            if (position >= TABLE_SIZE) {
+                position %= TABLE_SIZE;
+            }
+        }
+    }
+
+    /**
+     * @return how many times faster than real time the last render was
+     *         (or 0 before anything has been rendered)
+     */
+    public double getRenderSpeed() {
+        if (renderNanos <= 0) {
+            return 0.0;
+        }
+        return ((double) renderedFrames / sampleRate) / (renderNanos / 1e9);
+    }
+
+    /**
+     * @return how long the last render took, in milliseconds
+     */
+    public double getRenderTime() {
+        return renderNanos / 1e6;
+    }
+
+    /**
+     * Renders a made-up 4-part score (a minute long, unless told
+     * otherwise) twice, and reports how fast it rendered and whether
+     * both renders came out the same.  Takes the number of seconds, and
+     * optionally a WAV file to write the score to.
+     */
+    public static void main(String[] args) throws Exception {
+        int seconds = (args.length > 0) ? Integer.parseInt(args[0]) : 60;
+
+        ScoreRenderer renderer = new ScoreRenderer();
+        Random random = new Random(49);
+        int[] notesPerBeat = {1, 2, 4, 1};
+        for (int part = 0; part < 4; part++) {
+            int beat = 500 / notesPerBeat[part];
+            for (int start = 0; start < seconds * 1000; start += beat) {
+                int pitch = 36 + 12 * part + random.nextInt(12);
+                double frequency = 440.0 * Math.pow(2, (pitch - 69) / 12.0);
+                renderer.addNote(start, beat * 9 / 10, frequency, 60 + random.nextInt(60),
+                                 part * 127 / 3);
+            }
+        }
+
+        Sound first = renderer.renderToSound();
+        double speed = renderer.getRenderSpeed();
+        Sound second = renderer.renderToSound();
+
+        int numFrames = first.getLengthInFrames();
+        int[][] a = new int[2][numFrames];
+        int[][] b = new int[2][numFrames];
+        first.getSampleBlock(0, numFrames, a);
+        second.getSampleBlock(0, numFrames, b);
+        boolean same = Arrays.deepEquals(a, b);
+
+        System.out.println("Rendered " + renderer.getNumNotes() + " notes (" + seconds +
+                           " seconds, 4 parts) in " +
+                           String.format("%.1f", renderer.getRenderTime()) + " ms");
+        System.out.println(String.format("%.1f", speed) + "x real time; renders " +
+                           (same ? "are" : "are NOT") + " identical");
+
+        if (args.length > 1) {
+            renderer.renderToFile(args[1]);
+            System.out.println("Wrote " + args[1]);
+        }
+    }
+}
@@ -0,0 +1,36 @@
+import java.awt.AWTException;
+import java.awt.Rectangle;
+import java.awt.Robot;
+import java.awt.Toolkit;
+import java.awt.image.BufferedImage;
+
+/**
+ * Captures frames from the screen.  One <code>Robot</code> is made
+ * (the first time it's needed) and used for every frame, since making
+ * one takes longer than a capture does.
+ */
+public class ScreenFrameSource implements FrameSource {
+
+    private Robot robot = null;
+
+    /**
+     * Method to capture part of the screen
+     * @param area the part of the screen to capture
+     * @return the captured image
+     * @throws AWTException if the screen can't be captured here
+     */
+    public synchronized BufferedImage capture(Rectangle area) throws AWTException {
+        if (robot == null) {
+            robot = new Robot();
+        }
+        return robot.createScreenCapture(area);
+    }
+
+    /**
+     * Method to get the area covering the whole screen
+     * @return the screen's area
+     */
+    public static Rectangle getScreenArea() {
+        return new Rectangle(Toolkit.getDefaultToolkit().getScreenSize());
+    }
+}
@@ -1,5 +1,7 @@
 import javax.sound.sampled.*;
 import java.io.*;
+import java.nio.file.Files;
+import java.nio.file.StandardCopyOption;
 import java.util.Vector;
 import javazoom.jl.converter.*;
 
@@ -65,9 +67,11 @@ public class SimpleSound {
     private static final boolean DEBUG = false;
 
     /**
-     * An array of bytes representing the sound.
+     * The bytes representing the sound.  Long sounds are paged in from
+     * their file as they're used, instead of all being read at once.
+     * @see SoundBuffer
      */
-    private byte[] buffer;
+    private SoundBuffer buffer;
 
     /**
      * Contains information about this sound such as its length,
@@ -95,6 +99,34 @@ public class SimpleSound {
      */
     private String fileName = null;
 
+    /**
+     * The file this sound was last written to (or read from), if that
+     * file should still have exactly this sound's samples apart from
+     * the ones changed since.  Writing to it again then only has to
+     * write the changed ones, if there are any.
+     */
+    private WrittenFile written = null;
+
+    /**
+     * The bytes changed since the sound was last written, from
+     * <code>changedFrom</code> up to (but not including)
+     * <code>changedTo</code>.
+     */
+    private long changedFrom = Long.MAX_VALUE;
+    private long changedTo = 0;
+
+    /**
+     * Whether the sound's byte array has been handed out (or in), so
+     * it could be changed without the sound knowing.
+     */
+    private boolean arrayShared = false;
+
+    /**
+     * How many times this sound's samples have been changed (or
+     * replaced), so views of it can tell when to look again.
+     */
+    private long changeCount = 0;
+
     ////////////////////////// constructors /////////////////////
 
     /**
@@ -142,7 +174,7 @@ public class SimpleSound {
          * sample (2 bytes per sample)
          */
         int lengthInFrames = numChannels * numFrames;
-        int lengthInBytes = lengthInFrames * bytesPerSample;
+        long lengthInBytes = (long) lengthInFrames * bytesPerSample;
 
         /*
          Make a new WAV file format, with the AudioFormat described above
@@ -152,7 +184,7 @@ public class SimpleSound {
                                 audioFormat, lengthInFrames);
 
         // create the buffer
-        buffer = new byte[lengthInBytes];
+        buffer = SoundBuffer.allocate(lengthInBytes);
 
     }
 
@@ -194,7 +226,7 @@ public class SimpleSound {
          * sample (2 bytes per sample)
          */
         int lengthInFrames = numChannels * numFrames;
-        int lengthInBytes = lengthInFrames * bytesPerSample;
+        long lengthInBytes = (long) lengthInFrames * bytesPerSample;
 
         /*
          Make a new WAV file format, with the AudioFormat described above
@@ -204,8 +236,31 @@ public class SimpleSound {
                                 audioFormat, lengthInFrames);
 
         // create the buffer
-        buffer = new byte[lengthInBytes];
+        buffer = SoundBuffer.allocate(lengthInBytes);
+
+    }
+
+    /**
+     * Constructs a silent 16-bit WAV <code>SimpleSound</code> with the
+     * given length, sampling rate and number of channels.
+     *
+     * @param numFrames the number of frames (samples per channel)
+     * @param sampleRate the number of frames per second
+     * @param numChannels the number of channels (1 for mono, 2 for stereo)
+     */
+    public SimpleSound(int numFrames, int sampleRate, int numChannels) {
+        int bytesPerSample = NUM_BITS_PER_SAMPLE / 8;
+
+        AudioFormat audioFormat =
+            new AudioFormat(sampleRate, NUM_BITS_PER_SAMPLE,
+                            numChannels, true, false);
+
+        audioFileFormat =
+            new AudioFileFormat(AudioFileFormat.Type.WAVE,
+                                audioFormat, numFrames);
 
+        // create the buffer
+        buffer = SoundBuffer.allocate((long) numFrames * numChannels * bytesPerSample);
     }
 
     /**
@@ -236,7 +291,7 @@ public class SimpleSound {
                                 (numBytesInSample * numberOfChannels));
 
         // create the buffer
-        buffer = new byte[lengthInBytes];
+        buffer = SoundBuffer.allocate(lengthInBytes);
     }
 
     /**
@@ -249,7 +304,7 @@ public class SimpleSound {
             // load the sound from the file
             loadFromFile(fileName);
         } catch (Exception ex) {
-            printError("Exception during load of file " + fileName + "\n Please ensure this file exists and uses a filetype supported by JES (wav, aiff, au).");
+            printError("Exception during load of file " + fileName + "\n Please ensure this file exists and uses a filetype supported by JES (wav, aiff, au, mp3).");
         }
     }
 
@@ -264,10 +319,7 @@ public class SimpleSound {
 
         // copy the samples
         if (sound.buffer != null) {
-            this.buffer = new byte[sound.buffer.length];
-            for (int i = 0; i < sound.buffer.length; i++) {
-                this.buffer[i] = sound.buffer[i];
-            }
+            this.buffer = sound.buffer.copy();
         }
     }
 
@@ -275,9 +327,28 @@ public class SimpleSound {
 
     /**
      * Method that returns the byte array representation of this simple sound.
+     * If the sound was paged, it is read into memory first, so that changes
+     * to the array change the sound.
      * @return the sound represented as a byte array
      */
     public byte[] getBuffer() {
+        if (!buffer.hasArray()) {
+            SoundBuffer paged = buffer;
+            buffer = SoundBuffer.wrap(paged.array());
+            paged.close();
+        }
+        arrayShared = true;
+        forgetWritten();
+        return buffer.array();
+    }
+
+    /**
+     * Method that returns the bytes of this sound, without reading
+     * a paged sound into memory.
+     * @return the bytes of this sound
+     * @see SoundBuffer
+     */
+    public SoundBuffer getSoundBuffer() {
         return buffer;
     }
 
@@ -324,6 +395,16 @@ public class SimpleSound {
         return playbacks;
     }
 
+    /**
+     * Returns a number that goes up whenever this sound's samples are
+     * changed or replaced.  (Changes made through the array from
+     * <code>getBuffer</code> aren't counted.)
+     * @return how many times the samples have changed
+     */
+    public long getChangeCount() {
+        return changeCount;
+    }
+
     /**
      * Method that returns the name of the file this sound came from.
      * If this sound did not originate with a file, this value will
@@ -343,6 +424,29 @@ public class SimpleSound {
      * want this to represent.
      */
     public void setBuffer(byte[] newBuffer) {
+        buffer = SoundBuffer.wrap(newBuffer);
+        arrayShared = true;
+        noteReplaced();
+    }
+
+    /**
+     * Changes the bytes that represent this sound.
+     * @param newBuffer the bytes of the new sound we want this to represent
+     */
+    public void setSoundBuffer(SoundBuffer newBuffer) {
+        buffer = newBuffer;
+        arrayShared = false;
+        noteReplaced();
+    }
+
+    /**
+     * Puts other bytes in place of this sound's for a while (such as a
+     * view of some of them, to play).  Unlike
+     * <code>setSoundBuffer</code>, the samples don't count as changed,
+     * so the bytes put back afterwards must be the sound's own.
+     * @param newBuffer the bytes to put in place of the sound's
+     */
+    private void swapBuffer(SoundBuffer newBuffer) {
         buffer = newBuffer;
     }
 
@@ -351,7 +455,9 @@ public class SimpleSound {
      * @param newBuffer an integer with the number of bytes in the buffer
      */
     public void setBuffer(int newBuffer) {
-        buffer = new byte[newBuffer];
+        buffer = SoundBuffer.allocate(newBuffer);
+        arrayShared = false;
+        noteReplaced();
     }
 
     /**
@@ -384,13 +490,12 @@ public class SimpleSound {
      * @see AudioInputStream
      */
     public AudioInputStream makeAIS() {
-        AudioFileFormat.Type fileType = audioFileFormat.getType();
-        ByteArrayInputStream bais = new ByteArrayInputStream(buffer);
         int frameSize = audioFileFormat.getFormat().getFrameSize();
 
+        // (This reads from the sound's own bytes, rather than a copy.)
         AudioInputStream audioInputStream =
-            new AudioInputStream(bais, audioFileFormat.getFormat(),
-                                 buffer.length / frameSize);
+            new AudioInputStream(buffer.openStream(), audioFileFormat.getFormat(),
+                                 buffer.length() / frameSize);
         return audioInputStream;
     }
 
@@ -458,12 +563,17 @@ public class SimpleSound {
     }
 
     /**
-     * Creates an audioInputStream from this sound, and then writes
-     * this stream out to the file with the specified name.  If no
+     * Writes this sound out to the file with the specified name.  If no
      * file exists, one is created.  If a file already exists, then it
      * is overwritten.  This does not check the extension of the
      * fileName passed in to make sure it agrees with the
      * <code>AudioFileFormat.Type</code> of this sound.
+     * <p>
+     * PCM WAV and AIFF sounds are written a block at a time, straight
+     * from the sound's bytes.  If the file was the last one this sound
+     * was written to (or read from), and it hasn't changed since, only
+     * the samples changed since then are written, in place; if none
+     * have changed, nothing is written at all.
      *
      * @param outFileName The name of the file to write this sound to
      * @throws SoundException if any error is encountered while
@@ -471,25 +581,20 @@ public class SimpleSound {
      */
     public void writeToFile(String outFileName)
     throws SoundException {
-
-        /*
-         get an audioInputStream that represents this sound.
-         then, we will write from the stream to the file
-         */
-        AudioInputStream audioInputStream = makeAIS();
         AudioFileFormat.Type type = audioFileFormat.getType();
-
-        try {
-            audioInputStream.reset();
-        }//try reset audioInputStream
-        catch (Exception e) {
-            printError("Unable to reset the Audio stream.  Please " +
-                       "try again.", e);
-        }//catch
-
+        AudioFormat format = audioFileFormat.getFormat();
 
         //get the file to write to
         File file = new File(outFileName);
+
+        if (written != null && written.isStill(file, audioFileFormat)) {
+            if (changedFrom >= changedTo ||
+                    (written.dataOffset >= 0 && rewriteChanges())) {
+                this.fileName = outFileName;
+                return;
+            }
+        }
+
         if (!file.exists()) {
             //if the file doesn't exist, make one
             try {
@@ -504,18 +609,101 @@ public class SimpleSound {
         }//if
 
 
+        /* If this sound is paged in from the file we're writing to, we
+         * can't overwrite it while we're still reading it.  So write to
+         * a new file, then put that one in its place.
+         */
+        File target = file;
+        boolean replacingSource = buffer.readsFrom(file);
+        if (replacingSource) {
+            try {
+                file = File.createTempFile("jes-sound", ".wav",
+                                           target.getAbsoluteFile().getParentFile());
+            } catch (IOException e) {
+                printError("Problems writing to file: " + outFileName, e);
+            }
+        }
+
+        boolean streamed = SoundWriter.canWrite(format, type);
+        if (streamed) {
+            writeSamples(file);
+        } else {
+            writeWithAudioSystem(file);
+        }
+
+        // the write was successful, so set the file name to the new name
+        this.fileName = outFileName;
+
+        if (replacingSource) {
+            replaceSource(file, target);
+        }
+
+        if (streamed) {
+            rememberWritten(target, SoundWriter.getFileFormat(format, type),
+                            SoundWriter.getDataOffset(type));
+        } else {
+            rememberWritten(target, format, -1);
+        }
+
+    }//writeToFile(String outFileName)
+
+    /**
+     * Writes this sound to a file a block at a time, with a
+     * <code>SoundWriter</code>.
+     *
+     * @param file the file to write
+     * @throws SoundException if the file can't be written
+     */
+    private void writeSamples(File file) throws SoundException {
+        SoundWriter writer = null;
+        try {
+            writer = SoundWriter.create(file, audioFileFormat.getFormat(),
+                                        audioFileFormat.getType());
+            writer.appendSound(this);
+            writer.close();
+        } catch (IOException e) {
+            if (writer != null) {
+                try {
+                    writer.close();
+                } catch (IOException e2) {
+                    // We're already reporting a problem with this file
+                }
+            }
+            printError("Problems writing to file: " + file.getPath(), e);
+        }
+    }
+
+    /**
+     * Creates an audioInputStream from this sound, and then writes
+     * this stream out to a file with JavaSound.  This handles the
+     * formats a <code>SoundWriter</code> doesn't.
+     *
+     * @param file the file to write
+     * @throws SoundException if the file can't be written
+     */
+    private void writeWithAudioSystem(File file) throws SoundException {
+
+        /*
+         get an audioInputStream that represents this sound.
+         then, we will write from the stream to the file
+         */
+        AudioInputStream audioInputStream = makeAIS();
+        AudioFileFormat.Type type = audioFileFormat.getType();
+
+        try {
+            audioInputStream.reset();
+        }//try reset audioInputStream
+        catch (Exception e) {
+            printError("Unable to reset the Audio stream.  Please " +
+                       "try again.", e);
+        }//catch
+
         //write to the file
         try {
             if (AudioSystem.write(audioInputStream, type, file) == -1) {
                 printError("Problems writing to file.  Please " +
                            "try again.");
             }
-
-            // if the write was successful then set the file name to the
-            // new name
-            else {
-                this.fileName = outFileName;
-            }
         }//try
         catch (FileNotFoundException e) {
             printError("The file you specified did not already exist " +
@@ -523,7 +711,7 @@ public class SimpleSound {
                        "to do so.  Please try again.  If problems " +
                        "persit see your TA.", e);
         } catch (Exception e) {
-            printError("Problems writing to file: " + outFileName, e);
+            printError("Problems writing to file: " + file.getPath(), e);
         }//catch
 
 
@@ -534,8 +722,183 @@ public class SimpleSound {
         catch (Exception e) {
             printError("Unable to close the Audio stream.");
         }//catch
+    }
 
-    }//writeToFile(String outFileName)
+    /**
+     * Writes just the samples changed since this sound was last written
+     * into the file it was written to, in place.
+     *
+     * @return true if that worked, false if the whole sound should be
+     * written out instead
+     */
+    private boolean rewriteChanges() {
+        AudioFormat format = audioFileFormat.getFormat();
+        int chunk = REWRITE_CHUNK - REWRITE_CHUNK % format.getFrameSize();
+        byte[] bytes = new byte[(int) Math.min(chunk, changedTo - changedFrom)];
+        SoundWriter writer = null;
+
+        try {
+            writer = SoundWriter.reopen(written.file, written.fileFormat,
+                                        audioFileFormat.getType(),
+                                        written.dataOffset, buffer.length());
+            for (long at = changedFrom; at < changedTo; at += bytes.length) {
+                int n = (int) Math.min(bytes.length, changedTo - at);
+                buffer.get(at, bytes, 0, n);
+                writer.rewrite(at, bytes, 0, n, format);
+            }
+            writer.close();
+        } catch (Exception e) {
+            if (writer != null) {
+                try {
+                    writer.close();
+                } catch (IOException e2) {
+                    // It's being written in full instead
+                }
+            }
+            return false;
+        }
+
+        rememberWritten(written.file, written.fileFormat, written.dataOffset);
+        return true;
+    }
+
+    /**
+     * How many bytes <code>rewriteChanges</code> writes at once.
+     */
+    private static final int REWRITE_CHUNK = 64 * 1024;
+
+    /**
+     * Notes that this sound's samples are all in a file (which has
+     * just been written, or read from), so writing to it again can
+     * skip the samples that haven't changed.
+     *
+     * @param file the file
+     * @param fileFormat the format of the samples in the file
+     * @param dataOffset where the samples start in the file, or -1 if
+     *                   it isn't known (so they can't be changed in place)
+     */
+    private void rememberWritten(File file, AudioFormat fileFormat, long dataOffset) {
+        forgetWritten();
+        if (!arrayShared) {
+            try {
+                written = new WrittenFile(file, audioFileFormat, fileFormat, dataOffset);
+            } catch (IOException e) {
+                // Then it'll be written in full next time
+            }
+        }
+    }
+
+    /**
+     * Forgets the last file this sound was written to, so the next
+     * write writes all of it.
+     */
+    private void forgetWritten() {
+        written = null;
+        changedFrom = Long.MAX_VALUE;
+        changedTo = 0;
+    }
+
+    /**
+     * Notes that all of this sound's bytes have been replaced.
+     */
+    private void noteReplaced() {
+        forgetWritten();
+        changeCount++;
+    }
+
+    /**
+     * Notes that some of this sound's bytes have changed.
+     */
+    private void noteChange(long from, long to) {
+        changeCount++;
+        if (written != null) {
+            changedFrom = Math.min(changedFrom, from);
+            changedTo = Math.max(changedTo, to);
+        }
+    }
+
+    /**
+     * A file this sound was written to (or read from), and what it was
+     * like just afterwards.
+     */
+    private static class WrittenFile {
+        final File file;
+        final AudioFileFormat audioFileFormat;
+        final AudioFormat fileFormat;
+        final long dataOffset;
+        final long modified;
+        final long length;
+
+        WrittenFile(File file, AudioFileFormat audioFileFormat,
+                    AudioFormat fileFormat, long dataOffset) throws IOException {
+            this.file = file.getCanonicalFile();
+            this.audioFileFormat = audioFileFormat;
+            this.fileFormat = fileFormat;
+            this.dataOffset = dataOffset;
+            this.modified = this.file.lastModified();
+            this.length = this.file.length();
+        }
+
+        /**
+         * @return whether the file is the same one, unchanged since, and
+         * the sound is still in the same format
+         */
+        boolean isStill(File other, AudioFileFormat currentFormat) {
+            try {
+                return currentFormat == audioFileFormat &&
+                       file.equals(other.getCanonicalFile()) &&
+                       file.lastModified() == modified &&
+                       file.length() == length;
+            } catch (IOException e) {
+                return false;
+            }
+        }
+    }
+
+    /**
+     * Puts a newly written copy of this sound in place of the file it's
+     * paged in from, and then pages it in from there.
+     *
+     * @param written the new copy
+     * @param source the file this sound is paged in from
+     * @throws SoundException if the file can't be replaced
+     */
+    private void replaceSource(File written, File source)
+    throws SoundException {
+        Exception problem = null;
+        try {
+            Files.move(written.toPath(), source.toPath(),
+                       StandardCopyOption.REPLACE_EXISTING);
+        } catch (IOException e) {
+            // Some systems won't replace a file that is still open,
+            // but the new copy has all the bytes, so we can let go of it
+            buffer.close();
+            try {
+                Files.move(written.toPath(), source.toPath(),
+                           StandardCopyOption.REPLACE_EXISTING);
+            } catch (IOException e2) {
+                problem = e2;
+            }
+        }
+
+        // Page the sound in from whichever file has it now
+        File current = (problem == null) ? source : written;
+        buffer.close();
+        try {
+            AudioInputStream audioInputStream =
+                AudioSystem.getAudioInputStream(current);
+            buffer = readSamples(current, audioInputStream);
+            arrayShared = false;
+            audioInputStream.close();
+        } catch (Exception e) {
+            problem = e;
+        }
+
+        if (problem != null) {
+            written.deleteOnExit();
+            printError("Problems writing to file: " + source.getPath(), problem);
+        }
+    }
 
 
     /**
@@ -564,6 +927,13 @@ public class SimpleSound {
             printError("The file: " + inFileName + " doesn't exist");
         }
 
+        // MP3s are decoded directly, rather than through JavaSound
+        if (inFileName.toLowerCase().endsWith(".mp3")) {
+            loadFromMP3(file);
+            this.fileName = inFileName;
+            return;
+        }
+
         // create an audioInputStream from this file
 
         AudioInputStream audioInputStream;
@@ -580,46 +950,18 @@ public class SimpleSound {
             return;
         }//catch
 
-        /* We need to make an array representing this sound, so the
-         * number of bytes we will be storing cannot be greater than
-         * Integer.MAX_VALUE.  The JavaSound API also supports only
-         * integer length frame lengths.
+        /* The JavaSound API supports only integer length frame lengths.
          * (See AudioFileFormat.getFrameLength().  I don't know why
          * this is inconsistent with AudioInputStream.getFrameLength().)
          */
-        if ((audioInputStream.getFrameLength() *
-                audioInputStream.getFormat().getFrameSize()) >
-                Integer.MAX_VALUE) {
+        if (audioInputStream.getFrameLength() > Integer.MAX_VALUE) {
             printError("The sound in file: " + inFileName +
                        " is too long." +
                        "  Try using a shorter sound.");
         }
-        int bufferSize = (int)audioInputStream.getFrameLength() *
-                         audioInputStream.getFormat().getFrameSize();
-
-        buffer = new byte[bufferSize];
-
-        int numBytesRead = 0;
-        int offset = 0;
 
-        //read all the bytes into the buffer
-        while (true) {
-            try {
-                numBytesRead =
-                    audioInputStream.read(buffer, offset, bufferSize);
-                if (numBytesRead == -1) { //no more data
-                    break;
-                } else {
-                    offset += numBytesRead;
-                }
-            } catch (Exception e) {
-                printError("Problems reading the input stream.  " +
-                           "You might want to try again using this " +
-                           " file: " + inFileName + "or a different" +
-                           " file.  If problems persist, ask your TA."
-                           , e);
-            }//catch
-        }//while
+        buffer = readSamples(file, audioInputStream);
+        noteReplaced();
 
 
         /* set the format of the file, assuming that the extension
@@ -655,9 +997,165 @@ public class SimpleSound {
         }
 
         this.fileName = inFileName;
+        arrayShared = false;
+
+        // The file has exactly these samples, so writing it back can
+        // skip whatever isn't changed
+        rememberWritten(file, audioInputStream.getFormat(),
+                        audioFileFormat.getType().equals(AudioFileFormat.Type.WAVE) ?
+                        findWaveData(file) : -1);
+
+        try {
+            audioInputStream.close();
+        } catch (IOException e) {
+            // We already have everything we need from it
+        }
 
     }//loadFromFile(String inFileName)
 
+    /**
+     * Makes this sound represent the samples in an MP3 file.  They're
+     * decoded as they're used, and shared with any other sounds made
+     * from the same file (each sound keeps its own copy of whatever
+     * parts it changes).  The sound is treated as a WAV sound when it's
+     * written out.
+     *
+     * @param file the MP3 file
+     * @throws SoundException if the file can't be decoded
+     */
+    private void loadFromMP3(File file) throws SoundException {
+        DecodedMP3 mp3;
+        try {
+            mp3 = DecodedMP3.open(file);
+        } catch (IOException e) {
+            printError("Unable to read from file " + file.getPath() +
+                       ".  It doesn't seem to be an MP3 file.", e);
+            return;
+        }
+
+        buffer = mp3.copyOnWrite();
+        arrayShared = false;
+        noteReplaced();
+        audioFileFormat =
+            new AudioFileFormat(AudioFileFormat.Type.WAVE,
+                                mp3.getFormat(), mp3.getFrameLength());
+    }
+
+    /**
+     * Reads the bytes of a sound.  Long PCM WAV files are paged in from
+     * the file as they're used; everything else is read into memory.
+     *
+     * @param file the sound's file
+     * @param audioInputStream a stream reading the sound from that file
+     * @return the sound's bytes
+     * @throws SoundException if there's a problem reading them
+     */
+    private SoundBuffer readSamples(File file, AudioInputStream audioInputStream)
+    throws SoundException {
+        long bufferSize = audioInputStream.getFrameLength() *
+                          audioInputStream.getFormat().getFrameSize();
+
+        if (bufferSize > SoundBuffer.IN_MEMORY_LIMIT &&
+                file.getName().toLowerCase().endsWith(".wav")) {
+            long dataOffset = findWaveData(file);
+            if (dataOffset >= 0 && dataOffset + bufferSize <= file.length()) {
+                try {
+                    return SoundBuffer.page(file, dataOffset, bufferSize);
+                } catch (IOException e) {
+                    // Then we'll just read it all in, like a short sound
+                }
+            }
+        }
+
+        /* Anything else has to fit in an array, so the number of bytes
+         * we will be storing cannot be greater than Integer.MAX_VALUE.
+         */
+        if (bufferSize > Integer.MAX_VALUE) {
+            printError("The sound in file: " + file.getPath() +
+                       " is too long." +
+                       "  Try using a shorter sound, or a WAV file.");
+        }
+
+        byte[] bytes = new byte[(int) bufferSize];
+
+        int numBytesRead = 0;
+        int offset = 0;
+
+        //read all the bytes into the buffer
+        while (offset < bytes.length) {
+            try {
+                numBytesRead =
+                    audioInputStream.read(bytes, offset, bytes.length - offset);
+                if (numBytesRead == -1) { //no more data
+                    break;
+                } else {
+                    offset += numBytesRead;
+                }
+            } catch (Exception e) {
+                printError("Problems reading the input stream.  " +
+                           "You might want to try again using this " +
+                           " file: " + file.getPath() + "or a different" +
+                           " file.  If problems persist, ask your TA."
+                           , e);
+            }//catch
+        }//while
+
+        return SoundBuffer.wrap(bytes);
+    }
+
+    /**
+     * Finds where the samples start in a WAV file, if they're stored as
+     * plain PCM (so the bytes in the file are the bytes of the sound).
+     *
+     * @param file the WAV file
+     * @return the offset of the samples in the file, or -1 if the file
+     * isn't a PCM WAV file
+     */
+    private static long findWaveData(File file) {
+        RandomAccessFile in = null;
+        try {
+            in = new RandomAccessFile(file, "r");
+            byte[] id = new byte[4];
+
+            in.readFully(id);
+            if (!new String(id, "US-ASCII").equals("RIFF")) {
+                return -1;
+            }
+            in.skipBytes(4);
+            in.readFully(id);
+            if (!new String(id, "US-ASCII").equals("WAVE")) {
+                return -1;
+            }
+
+            // Walk the chunks until we find the samples
+            boolean isPCM = false;
+            while (in.getFilePointer() + 8 <= in.length()) {
+                in.readFully(id);
+                String chunk = new String(id, "US-ASCII");
+                long size = Integer.reverseBytes(in.readInt()) & 0xFFFFFFFFL;
+                long next = in.getFilePointer() + size + (size & 1);
+
+                if (chunk.equals("fmt ")) {
+                    isPCM = Short.reverseBytes(in.readShort()) == 1;
+                } else if (chunk.equals("data")) {
+                    return isPCM ? in.getFilePointer() : -1;
+                }
+                in.seek(next);
+            }
+            return -1;
+        } catch (IOException e) {
+            return -1;
+        } finally {
+            if (in != null) {
+                try {
+                    in.close();
+                } catch (IOException e) {
+                    // It was only open for reading
+                }
+            }
+        }
+    }
+
     //////////////////////// Methods for playing the sound //////////
 
     /**
@@ -875,7 +1373,7 @@ public class SimpleSound {
          we want to save the current buffer and audioFileFormat
          so we can return to them when we're finished.
          */
-        byte[] oldBuffer = buffer;
+        SoundBuffer oldBuffer = buffer;
         AudioFileFormat oldAFF = getAudioFileFormat();
 
         //just to make the code easier to read
@@ -885,13 +1383,11 @@ public class SimpleSound {
             System.out.println("\tnew durInFrames = " + durInFrames);
         }
 
-        //we want to make a new buffer, only as long as we need
-        int newBufferSize = durInFrames * frameSize;
-
-        byte[] newBuffer = new byte[newBufferSize];
-        for (int i = 0; i <  newBufferSize; i++) {
-            newBuffer[i] = oldBuffer[(startFrame * frameSize) + i];
-        }
+        //we want a buffer only as long as we need; a view of the
+        //sound's bytes does that without copying them
+        SoundBuffer newBuffer =
+            oldBuffer.view((long) startFrame * frameSize,
+                           (long) durInFrames * frameSize);
 
         //now we want to make a new audioFormat with the same information
         //except a different rate
@@ -913,7 +1409,7 @@ public class SimpleSound {
         /*
          change the values in this Sound
          */
-        setBuffer(newBuffer);
+        swapBuffer(newBuffer);
         setAudioFileFormat(newAFF);
         if (DEBUG) {
             System.out.println("playAtRateInRange(" + rate + ", " +
@@ -945,7 +1441,7 @@ public class SimpleSound {
             ;
         } */ 
 
-        setBuffer(oldBuffer);//restore the buffer
+        swapBuffer(oldBuffer);//restore the buffer
         setAudioFileFormat(oldAFF);//restore the file format
     }
 
@@ -997,9 +1493,7 @@ public class SimpleSound {
 
         int frameSize = getAudioFileFormat().getFormat().getFrameSize();
         byte[] theFrame = new byte[frameSize];
-        for (int i = 0; i < frameSize; i++) {
-            theFrame[i] = buffer[frameNum * frameSize + i];
-        }
+        buffer.get((long) frameNum * frameSize, theFrame, 0, frameSize);
         return theFrame;
     }
 
@@ -1144,9 +1638,9 @@ public class SimpleSound {
                 return -1;
             }
         } else if (format.getEncoding().equals(AudioFormat.Encoding.ALAW)) {
-            return TConversionTool.alaw2linear(buffer[0]);
+            return TConversionTool.alaw2linear(buffer.get(0));
         } else if (format.getEncoding().equals(AudioFormat.Encoding.ULAW)) {
-            return TConversionTool.ulaw2linear(buffer[0]);
+            return TConversionTool.ulaw2linear(buffer.get(0));
         } else {
             printError("unsupported audio encoding: " +
                        format.getEncoding() + ".  Currently only PCM, " +
@@ -1238,9 +1732,9 @@ public class SimpleSound {
                 return -1;
             }
         } else if (format.getEncoding().equals(AudioFormat.Encoding.ALAW)) {
-            return TConversionTool.alaw2linear(buffer[1]);
+            return TConversionTool.alaw2linear(buffer.get(1));
         } else if (format.getEncoding().equals(AudioFormat.Encoding.ULAW)) {
-            return TConversionTool.ulaw2linear(buffer[1]);
+            return TConversionTool.ulaw2linear(buffer.get(1));
         } else {
             printError("unsupported audio encoding: " +
                        format.getEncoding() + ".  Currently only PCM, " +
@@ -1259,7 +1753,7 @@ public class SimpleSound {
      * @return the sound length in bytes
      */
     public int getLengthInBytes() {
-        return buffer.length;
+        return (int) Math.min(buffer.length(), Integer.MAX_VALUE);
     }
 
     /**
@@ -1282,6 +1776,210 @@ public class SimpleSound {
     }
 
 
+    /**************************************************************************/
+    /************************** BLOCKS OF SAMPLES *****************************/
+    /**************************************************************************/
+
+    /**
+     * Reads the samples of every channel for a run of frames at once.
+     * This works on the sound's bytes directly, so it doesn't make an
+     * object (or an array) for each sample like <code>getSampleValue</code>
+     * does.
+     *
+     * @param startFrame the index of the first frame to read
+     * @param numFrames how many frames to read
+     * @param samples where to put them: <code>samples[c][i]</code> gets
+     *                the sample for channel <code>c</code> of frame
+     *                <code>startFrame + i</code>.  It needs a row for
+     *                every channel.
+     * @throws SoundException if the frames don't exist, or the sound's
+     *                            encoding isn't supported
+     */
+    public void getSampleBlock(int startFrame, int numFrames, int[][] samples)
+    throws SoundException {
+        AudioFormat format = checkBlock(startFrame, numFrames, samples);
+        int frameSize = format.getFrameSize();
+        int sampleSize = frameSize / format.getChannels();
+        int channels = format.getChannels();
+        byte[] bytes = new byte[Math.min(numFrames, BLOCK_FRAMES) * frameSize];
+
+        for (int done = 0; done < numFrames; done += BLOCK_FRAMES) {
+            int n = Math.min(BLOCK_FRAMES, numFrames - done);
+            buffer.get((long) (startFrame + done) * frameSize, bytes, 0, n * frameSize);
+            for (int c = 0; c < channels; c++) {
+                int[] row = samples[c];
+                for (int i = 0, at = c * sampleSize; i < n; i++, at += frameSize) {
+                    row[done + i] = decodeSample(format, bytes, at);
+                }
+            }
+        }
+    }
+
+    /**
+     * Changes the samples of every channel for a run of frames at once.
+     * Values outside of the range a sample can hold are clipped to it.
+     *
+     * @param startFrame the index of the first frame to change
+     * @param numFrames how many frames to change
+     * @param samples the new samples, as for <code>getSampleBlock</code>
+     * @throws SoundException if the frames don't exist, or the sound's
+     *                            encoding isn't supported
+     * @see #getSampleBlock(int, int, int[][])
+     */
+    public void setSampleBlock(int startFrame, int numFrames, int[][] samples)
+    throws SoundException {
+        AudioFormat format = checkBlock(startFrame, numFrames, samples);
+        int frameSize = format.getFrameSize();
+        int sampleSize = frameSize / format.getChannels();
+        int channels = format.getChannels();
+        byte[] bytes = new byte[Math.min(numFrames, BLOCK_FRAMES) * frameSize];
+
+        for (int done = 0; done < numFrames; done += BLOCK_FRAMES) {
+            int n = Math.min(BLOCK_FRAMES, numFrames - done);
+            for (int c = 0; c < channels; c++) {
+                int[] row = samples[c];
+                for (int i = 0, at = c * sampleSize; i < n; i++, at += frameSize) {
+                    encodeSample(format, row[done + i], bytes, at);
+                }
+            }
+            buffer.put((long) (startFrame + done) * frameSize, bytes, 0, n * frameSize);
+        }
+        noteChange((long) startFrame * frameSize, (long) (startFrame + numFrames) * frameSize);
+    }
+
+    /**
+     * How many frames the block methods convert at once.
+     */
+    private static final int BLOCK_FRAMES = 4096;
+
+    /**
+     * Makes sure a block of frames exists, there's room for the samples,
+     * and the encoding is one the block methods can handle.
+     * @return the sound's format
+     */
+    private AudioFormat checkBlock(int startFrame, int numFrames, int[][] samples)
+    throws SoundException {
+        AudioFormat format = getAudioFileFormat().getFormat();
+        if (startFrame < 0 || numFrames < 0 ||
+                (long) startFrame + numFrames > getLengthInFrames()) {
+            printError("You asked for " + numFrames + " samples starting at " +
+                       "index " + startFrame + ", but the sound only has " +
+                       getLengthInFrames() + " samples.");
+        }
+        if (samples.length < format.getChannels()) {
+            printError("There need to be samples for all " +
+                       format.getChannels() + " channels.");
+        }
+        for (int c = 0; c < format.getChannels(); c++) {
+            if (samples[c].length < numFrames) {
+                printError("There isn't room for " + numFrames + " samples.");
+            }
+        }
+
+        AudioFormat.Encoding encoding = format.getEncoding();
+        int bits = format.getSampleSizeInBits();
+        boolean isPCM = encoding.equals(AudioFormat.Encoding.PCM_SIGNED) ||
+                        encoding.equals(AudioFormat.Encoding.PCM_UNSIGNED);
+        boolean isLaw = encoding.equals(AudioFormat.Encoding.ALAW) ||
+                        encoding.equals(AudioFormat.Encoding.ULAW);
+        if (!((isPCM && (bits == 8 || bits == 16 || bits == 24 || bits == 32)) ||
+                (isLaw && bits == 8))) {
+            printError("unsupported audio encoding: " + encoding + " with " +
+                       bits + " bit samples.  Currently only PCM, ALAW " +
+                       "and ULAW are supported.");
+        }
+        return format;
+    }
+
+    /**
+     * Reads one sample out of an array of sound bytes.
+     */
+    private static int decodeSample(AudioFormat format, byte[] bytes, int at) {
+        AudioFormat.Encoding encoding = format.getEncoding();
+        boolean isBigEndian = format.isBigEndian();
+
+        if (encoding.equals(AudioFormat.Encoding.PCM_SIGNED)) {
+            switch (format.getSampleSizeInBits()) {
+            case 8:
+                return bytes[at];
+            case 16:
+                return TConversionTool.bytesToInt16(bytes, at, isBigEndian);
+            case 24:
+                return TConversionTool.bytesToInt24(bytes, at, isBigEndian);
+            default:
+                return TConversionTool.bytesToInt32(bytes, at, isBigEndian);
+            }
+        } else if (encoding.equals(AudioFormat.Encoding.PCM_UNSIGNED)) {
+            switch (format.getSampleSizeInBits()) {
+            case 8:
+                return TConversionTool.unsignedByteToInt(bytes[at]) - (1 << 7);
+            case 16:
+                return TConversionTool.unsignedByteToInt16(bytes, at, isBigEndian) - (1 << 15);
+            case 24:
+                return TConversionTool.unsignedByteToInt24(bytes, at, isBigEndian) - (1 << 23);
+            default:
+                return TConversionTool.unsignedByteToInt32(bytes, at, isBigEndian) - (1 << 31);
+            }
+        } else if (encoding.equals(AudioFormat.Encoding.ALAW)) {
+            return TConversionTool.alaw2linear(bytes[at]);
+        } else {
+            return TConversionTool.ulaw2linear(bytes[at]);
+        }
+    }
+
+    /**
+     * Writes one sample into an array of sound bytes, clipping it to
+     * the range the format can hold.
+     */
+    private static void encodeSample(AudioFormat format, int sample,
+                                     byte[] bytes, int at) {
+        AudioFormat.Encoding encoding = format.getEncoding();
+        boolean isBigEndian = format.isBigEndian();
+        int bits = encoding.equals(AudioFormat.Encoding.ALAW) ||
+                   encoding.equals(AudioFormat.Encoding.ULAW) ?
+                   16 : format.getSampleSizeInBits();
+
+        if (bits < 32) {
+            int max = (1 << (bits - 1)) - 1;
+            sample = Math.max(-max - 1, Math.min(max, sample));
+        }
+
+        if (encoding.equals(AudioFormat.Encoding.PCM_SIGNED)) {
+            switch (bits) {
+            case 8:
+                bytes[at] = (byte) sample;
+                break;
+            case 16:
+                TConversionTool.intToBytes16(sample, bytes, at, isBigEndian);
+                break;
+            case 24:
+                TConversionTool.intToBytes24(sample, bytes, at, isBigEndian);
+                break;
+            default:
+                TConversionTool.intToBytes32(sample, bytes, at, isBigEndian);
+            }
+        } else if (encoding.equals(AudioFormat.Encoding.PCM_UNSIGNED)) {
+            switch (bits) {
+            case 8:
+                bytes[at] = TConversionTool.intToUnsignedByte(sample);
+                break;
+            case 16:
+                TConversionTool.intToUnsignedBytes16(sample, bytes, at, isBigEndian);
+                break;
+            case 24:
+                TConversionTool.intToUnsignedBytes24(sample, bytes, at, isBigEndian);
+                break;
+            default:
+                TConversionTool.intToUnsignedBytes32(sample, bytes, at, isBigEndian);
+            }
+        } else if (encoding.equals(AudioFormat.Encoding.ALAW)) {
+            bytes[at] = TConversionTool.linear2alaw((short) sample);
+        } else {
+            bytes[at] = TConversionTool.linear2ulaw(sample);
+        }
+    }
+
+
     /**************************************************************************/
     /************************** CHANGING THE SOUND ****************************/
     /**************************************************************************/
@@ -1304,9 +2002,8 @@ public class SimpleSound {
         if (frameSize != theFrame.length)
             printError("Frame size doesn't match, line 383.  This should" +
                        " never happen.  Please report the problem to a TA.");
-        for (int i = 0; i < frameSize; i++) {
-            buffer[frameNum * frameSize + i] = theFrame[i];
-        }
+        buffer.put((long) frameNum * frameSize, theFrame, 0, frameSize);
+        noteChange((long) frameNum * frameSize, (long) (frameNum + 1) * frameSize);
     }
 
     /**
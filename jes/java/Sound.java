@@ -1,3 +1,5 @@
+import javax.sound.sampled.AudioFileFormat;
+import javax.sound.sampled.AudioFormat;
 
 /**
  * Class that represents a sound.  This class is used by the students
@@ -13,6 +15,13 @@
  *     specified portion of this sound
  *
  * Kalamazoo and other additional methods merged by Buck Scharfnorth 22 May 2008
+ *
+ * Modified 19 Oct 2026
+ *    Added editing methods (changing the volume, normalizing, reversing,
+ *     inserting, mixing, echoing, fading, crossfading and clipping) that
+ *     work on blocks of samples instead of one sample at a time
+ *    copySoundInto and cropSound copy blocks of samples too, and
+ *     cropSound no longer copies more samples than were asked for
  */
 public class Sound extends SimpleSound {
 
@@ -48,6 +57,18 @@ public class Sound extends SimpleSound {
         super(numSamples, sampleRate);
     }
 
+    /**
+     * Constructor that takes the number of samples, the sample rate
+     * and the number of channels
+     * @param numSamples the number of samples (per channel) desired
+     * @param sampleRate the number of samples per second
+     * @param numChannels the number of channels (2 for stereo)
+     */
+    public Sound(int numSamples, int sampleRate, int numChannels) {
+        // let the parent class handle this
+        super(numSamples, sampleRate, numChannels);
+    }
+
     /**
      * Constructor that takes a sound to copy
      * @param copySound the Sound to copy
@@ -57,6 +78,9 @@ public class Sound extends SimpleSound {
         super(copySound);
     }
 
+    /** the number of frames the editing methods work on at once */
+    private static final int BLOCK_FRAMES = 4096;
+
     ////////////////// methods ////////////////////////////////////
 
     /**
@@ -86,12 +110,7 @@ public class Sound extends SimpleSound {
      */
     public void copySoundInto(Sound dest, int startIndex)throws SoundException {
         int numSamplesToCopy = Math.min(this.getLength(), dest.getLength() - startIndex);
-
-        for (int i = 0; i < numSamplesToCopy; i++) {
-            int value = this.getSampleValueAt(i);
-            dest.setSampleValueAt(i + startIndex, value);
-
-        }
+        copySamples(this, 0, dest, startIndex, numSamplesToCopy);
     }
 
     /**
@@ -103,18 +122,362 @@ public class Sound extends SimpleSound {
      * @throws SoundException
      */
     public Sound cropSound(int startIndex, int numSamples) throws SoundException {
-        int numSamplesToCopy;
-        if (startIndex + numSamples < this.getLength()) {
-            numSamplesToCopy = startIndex + numSamples;
-        } else {
-            numSamplesToCopy = this.getLength() - startIndex;
+        int numSamplesToCopy = Math.min(numSamples, this.getLength() - startIndex);
+        if (startIndex < 0 || numSamplesToCopy <= 0) {
+            printError("You can't crop " + numSamples + " samples starting at " +
+                       "index " + startIndex + " from a sound with " +
+                       this.getLength() + " samples.");
+        }
+        Sound newSound = makeLike(this, numSamplesToCopy);
+        copySamples(this, startIndex, newSound, 0, numSamplesToCopy);
+        return newSound;
+    }
+
+    /**
+     * Method to multiply every sample by a factor (so 2.0 is twice as
+     * loud, and 0.5 half as loud).  Samples that get too big are clipped.
+     * @param factor the amount to multiply by
+     * @throws SoundException
+     */
+    public void changeVolume(double factor) throws SoundException {
+        changeVolume(0, getLength(), factor, factor);
+    }
+
+    /**
+     * Method to change the volume of part of this sound gradually, from
+     * one factor at the start of the part to another at the end.
+     * @param startIndex the index of the first sample to change
+     * @param numSamples how many samples to change
+     * @param startFactor the factor for the first sample
+     * @param endFactor the factor for the last sample
+     * @throws SoundException
+     */
+    public void changeVolume(int startIndex, int numSamples,
+                             double startFactor, double endFactor)
+    throws SoundException {
+        checkRange(startIndex, numSamples);
+        int[][] block = new int[getChannels()][BLOCK_FRAMES];
+        double step = (numSamples > 1) ? (endFactor - startFactor) / (numSamples - 1) : 0;
+
+        for (int done = 0; done < numSamples; done += BLOCK_FRAMES) {
+            int n = Math.min(BLOCK_FRAMES, numSamples - done);
+            getSampleBlock(startIndex + done, n, block);
+            for (int c = 0; c < block.length; c++) {
+                int[] row = block[c];
+                for (int i = 0; i < n; i++) {
+                    row[i] = (int) Math.round(row[i] * (startFactor + (done + i) * step));
+                }
+            }
+            setSampleBlock(startIndex + done, n, block);
+        }
+    }
+
+    /**
+     * Method to fade in the start of this sound, from silence to its
+     * full volume
+     * @param numSamples how many samples the fade lasts
+     * @throws SoundException
+     */
+    public void fadeIn(int numSamples) throws SoundException {
+        changeVolume(0, Math.min(numSamples, getLength()), 0.0, 1.0);
+    }
+
+    /**
+     * Method to fade out the end of this sound, from its full volume
+     * to silence
+     * @param numSamples how many samples the fade lasts
+     * @throws SoundException
+     */
+    public void fadeOut(int numSamples) throws SoundException {
+        numSamples = Math.min(numSamples, getLength());
+        changeVolume(getLength() - numSamples, numSamples, 1.0, 0.0);
+    }
+
+    /**
+     * Method to find the biggest sample (ignoring its sign) in this sound
+     * @return the largest absolute sample value
+     * @throws SoundException
+     */
+    public int getMaxAmplitude() throws SoundException {
+        int[][] block = new int[getChannels()][BLOCK_FRAMES];
+        int largest = 0;
+        for (int done = 0; done < getLength(); done += BLOCK_FRAMES) {
+            int n = Math.min(BLOCK_FRAMES, getLength() - done);
+            getSampleBlock(done, n, block);
+            for (int c = 0; c < block.length; c++) {
+                int[] row = block[c];
+                for (int i = 0; i < n; i++) {
+                    largest = Math.max(largest, Math.abs(row[i]));
+                }
+            }
         }
-        Sound newSound = new Sound(numSamplesToCopy);
+        return largest;
+    }
 
-        for (int i = 0; i < numSamplesToCopy; i++) {
-            int value = this.getSampleValueAt(i + startIndex);
-            newSound.setSampleValueAt(i, value);
+    /**
+     * Method to make this sound as loud as it can be without clipping,
+     * by scaling it so its biggest sample is the biggest one possible.
+     * (This takes two passes: one to find the biggest sample, and one to
+     * scale.)  A silent sound is left alone.
+     * @throws SoundException
+     */
+    public void normalize() throws SoundException {
+        int largest = getMaxAmplitude();
+        if (largest > 0) {
+            changeVolume((double) getMaxSampleValue() / largest);
         }
+    }
+
+    /**
+     * Method to limit every sample to between -limit and limit, which
+     * distorts the sound like an overdriven amplifier
+     * @param limit the largest value samples may have
+     * @throws SoundException
+     */
+    public void clip(int limit) throws SoundException {
+        limit = Math.abs(limit);
+        int[][] block = new int[getChannels()][BLOCK_FRAMES];
+        for (int done = 0; done < getLength(); done += BLOCK_FRAMES) {
+            int n = Math.min(BLOCK_FRAMES, getLength() - done);
+            getSampleBlock(done, n, block);
+            for (int c = 0; c < block.length; c++) {
+                int[] row = block[c];
+                for (int i = 0; i < n; i++) {
+                    row[i] = Math.max(-limit, Math.min(limit, row[i]));
+                }
+            }
+            setSampleBlock(done, n, block);
+        }
+    }
+
+    /**
+     * Method to reverse this sound, so it plays backwards
+     * @throws SoundException
+     */
+    public void reverse() throws SoundException {
+        int channels = getChannels();
+        int[][] front = new int[channels][BLOCK_FRAMES];
+        int[][] back = new int[channels][BLOCK_FRAMES];
+        int low = 0;
+        int high = getLength();
+
+        // swap blocks from the two ends, reversing each, until they meet
+        while (high - low > 1) {
+            int n = Math.min(BLOCK_FRAMES, (high - low) / 2);
+            getSampleBlock(low, n, front);
+            getSampleBlock(high - n, n, back);
+            for (int c = 0; c < channels; c++) {
+                reverseRow(front[c], n);
+                reverseRow(back[c], n);
+            }
+            setSampleBlock(low, n, back);
+            setSampleBlock(high - n, n, front);
+            low += n;
+            high -= n;
+        }
+    }
+
+    private static void reverseRow(int[] row, int n) {
+        for (int i = 0, j = n - 1; i < j; i++, j--) {
+            int temp = row[i];
+            row[i] = row[j];
+            row[j] = temp;
+        }
+    }
+
+    /**
+     * Method to make a new sound that is this sound with another one
+     * inserted into it
+     * @param other the sound to insert
+     * @param index where to insert it (0 puts it before this sound,
+     *              and this sound's length puts it after)
+     * @return the new sound
+     * @throws SoundException
+     */
+    public Sound insert(Sound other, int index) throws SoundException {
+        if (index < 0 || index > getLength()) {
+            printError("You can't insert a sound at index " + index +
+                       " of a sound with " + getLength() + " samples.");
+        }
+        Sound newSound = makeLike(this, getLength() + other.getLength());
+        copySamples(this, 0, newSound, 0, index);
+        copySamples(other, 0, newSound, index, other.getLength());
+        copySamples(this, index, newSound, index + other.getLength(),
+                    getLength() - index);
         return newSound;
     }
+
+    /**
+     * Method to mix another sound into this one.  Each sample becomes
+     * <code>gain * this sample + otherGain * the other sound's sample</code>,
+     * for as much of the other sound as fits.  Samples that get too big
+     * are clipped.
+     * @param other the sound to mix in
+     * @param startIndex where in this sound the other one starts
+     * @param gain how much of this sound to keep
+     * @param otherGain how much of the other sound to add
+     * @throws SoundException
+     */
+    public void mix(Sound other, int startIndex, double gain, double otherGain)
+    throws SoundException {
+        int numSamples = Math.min(other.getLength(), getLength() - startIndex);
+        if (numSamples <= 0) {
+            return;
+        }
+        checkRange(startIndex, numSamples);
+
+        int[][] block = new int[getChannels()][BLOCK_FRAMES];
+        int[][] otherBlock = new int[other.getChannels()][BLOCK_FRAMES];
+        for (int done = 0; done < numSamples; done += BLOCK_FRAMES) {
+            int n = Math.min(BLOCK_FRAMES, numSamples - done);
+            getSampleBlock(startIndex + done, n, block);
+            other.getSampleBlock(done, n, otherBlock);
+            for (int c = 0; c < block.length; c++) {
+                int[] row = block[c];
+                int[] otherRow = otherBlock[Math.min(c, otherBlock.length - 1)];
+                for (int i = 0; i < n; i++) {
+                    row[i] = (int) Math.round(gain * row[i] + otherGain * otherRow[i]);
+                }
+            }
+            setSampleBlock(startIndex + done, n, block);
+        }
+    }
+
+    /**
+     * Method to add an echo to this sound: each sample has the sample
+     * from <code>delay</code> samples before it (echo and all) added,
+     * scaled by <code>decay</code>, so the echoes repeat and die away.
+     * @param delay how many samples later the echo comes
+     * @param decay how loud each echo is compared to the one before
+     * @throws SoundException
+     */
+    public void echo(int delay, double decay) throws SoundException {
+        if (delay <= 0) {
+            printError("The echo's delay must be more than 0 samples.");
+        }
+        int channels = getChannels();
+        int limit = getMaxSampleValue();
+        int[][] block = new int[channels][BLOCK_FRAMES];
+        // the last delay samples (after echoing), to echo from next
+        int[][] history = new int[channels][Math.min(delay, getLength())];
+        int position = 0;
+
+        for (int done = 0; done < getLength() && delay < getLength(); done += BLOCK_FRAMES) {
+            int n = Math.min(BLOCK_FRAMES, getLength() - done);
+            getSampleBlock(done, n, block);
+            int start = position;
+            for (int c = 0; c < channels; c++) {
+                int[] row = block[c];
+                int[] past = history[c];
+                position = start;
+                for (int i = 0; i < n; i++) {
+                    int value = (int) Math.round(row[i] + decay * past[position]);
+                    value = Math.max(-limit - 1, Math.min(limit, value));
+                    row[i] = value;
+                    past[position] = value;
+                    if (++position == past.length) {
+                        position = 0;
+                    }
+                }
+            }
+            setSampleBlock(done, n, block);
+        }
+    }
+
+    /**
+     * Method to make a new sound that is this sound followed by another
+     * one, with the end of this sound fading out as the start of the
+     * other fades in
+     * @param other the sound that comes next
+     * @param overlap how many samples the two overlap for
+     * @return the new sound
+     * @throws SoundException
+     */
+    public Sound crossfade(Sound other, int overlap) throws SoundException {
+        overlap = Math.max(0, Math.min(overlap, Math.min(getLength(), other.getLength())));
+        int start = getLength() - overlap;
+        Sound newSound = makeLike(this, start + other.getLength());
+        copySamples(this, 0, newSound, 0, getLength());
+
+        if (overlap > 0) {
+            newSound.changeVolume(start, overlap, 1.0, 0.0);
+            Sound fadingIn = other.cropSound(0, overlap);
+            fadingIn.changeVolume(0, overlap, 0.0, 1.0);
+            newSound.mix(fadingIn, start, 1.0, 1.0);
+        }
+        copySamples(other, overlap, newSound, getLength(), other.getLength() - overlap);
+        return newSound;
+    }
+
+    /**
+     * Method to make a silent sound in the same format (sampling rate,
+     * sample size, channels and so on) as another one
+     */
+    private static Sound makeLike(Sound sound, int numSamples) {
+        AudioFileFormat fileFormat = sound.getAudioFileFormat();
+        AudioFormat format = fileFormat.getFormat();
+        Sound newSound = new Sound(0, (int) format.getSampleRate());
+        newSound.setAudioFileFormat(new AudioFileFormat(fileFormat.getType(),
+                                                        format, numSamples));
+        newSound.setSoundBuffer(SoundBuffer.allocate((long) numSamples *
+                                                     format.getFrameSize()));
+
+        // silence isn't all zeros in some formats
+        if (!format.getEncoding().equals(AudioFormat.Encoding.PCM_SIGNED)) {
+            try {
+                newSound.changeVolume(0.0);
+            } catch (SoundException ex) {
+                // it's the same format as a sound that could be read
+            }
+        }
+        return newSound;
+    }
+
+    /**
+     * Method to copy samples from one sound to another, a block at a
+     * time.  If the destination has more channels than the source, the
+     * source's last channel is used for the extra ones.
+     */
+    private static void copySamples(SimpleSound source, int sourceIndex,
+                                    SimpleSound dest, int destIndex, int numSamples)
+    throws SoundException {
+        if (numSamples <= 0) {
+            return;
+        }
+        int[][] from = new int[source.getChannels()][BLOCK_FRAMES];
+        int[][] to = new int[dest.getChannels()][];
+        for (int c = 0; c < to.length; c++) {
+            to[c] = from[Math.min(c, from.length - 1)];
+        }
+
+        for (int done = 0; done < numSamples; done += BLOCK_FRAMES) {
+            int n = Math.min(BLOCK_FRAMES, numSamples - done);
+            source.getSampleBlock(sourceIndex + done, n, from);
+            dest.setSampleBlock(destIndex + done, n, to);
+        }
+    }
+
+    /**
+     * Method to check that a range of samples is in this sound
+     */
+    private void checkRange(int startIndex, int numSamples) throws SoundException {
+        if (startIndex < 0 || numSamples < 0 ||
+                (long) startIndex + numSamples > getLength()) {
+            printError("You asked for " + numSamples + " samples starting at " +
+                       "index " + startIndex + ", but the sound only has " +
+                       getLength() + " samples.");
+        }
+    }
+
+    /**
+     * Method to get the biggest value a sample in this sound can have
+     */
+    private int getMaxSampleValue() {
+        AudioFormat format = getAudioFileFormat().getFormat();
+        if (format.getEncoding().equals(AudioFormat.Encoding.ALAW) ||
+                format.getEncoding().equals(AudioFormat.Encoding.ULAW)) {
+            return MAX_POS;
+        }
+        return (int) (Math.pow(2, format.getSampleSizeInBits() - 1) - 1);
+    }
 } // end of class Sound, put all new methods before this
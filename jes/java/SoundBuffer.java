@@ -0,0 +1,664 @@
+import java.io.*;
+import java.nio.ByteBuffer;
+import java.nio.channels.FileChannel;
+import java.util.HashMap;
+import java.util.Iterator;
+import java.util.LinkedHashMap;
+import java.util.Map;
+
+/**
+ * The bytes of a <code>SimpleSound</code>.
+ * <p>
+ * Short sounds are kept in a byte array, just as they always were.
+ * Long sounds are paged: they are split into fixed-size pages, which
+ * are read from the sound's file only when they are first used. Only a
+ * limited number of pages are kept in memory. A page that was changed
+ * is written out to a scratch file when it's evicted, and a page that
+ * wasn't is just dropped (and read from the sound's file again later),
+ * so the sound's file itself is never changed.
+ * <p>
+ * Offsets are <code>long</code>s, so a paged sound can be longer than
+ * an array can.
+ *
+ * @see SimpleSound
+ */
+public abstract class SoundBuffer {
+
+    /**
+     * Sounds with more bytes than this are paged instead of kept in
+     * an array.
+     */
+    public static final long IN_MEMORY_LIMIT = 32L * 1024 * 1024;
+
+    /**
+     * The size of a page, in bytes.
+     */
+    public static final int PAGE_SIZE = 256 * 1024;
+
+    /**
+     * How many pages a paged sound keeps in memory at once.
+     */
+    public static final int MAX_RESIDENT_PAGES = 64;
+
+    /**
+     * How many bytes are copied at once by the bulk operations.
+     */
+    private static final int COPY_CHUNK = 64 * 1024;
+
+    ///////////////////////// making buffers ////////////////////////
+
+    /**
+     * Makes a buffer of silence (zeros) of the given length.  Long
+     * buffers are paged.
+     * @param length the length in bytes
+     * @return the new buffer
+     */
+    public static SoundBuffer allocate(long length) {
+        if (length <= IN_MEMORY_LIMIT) {
+            return new ArrayBuffer(new byte[(int) length]);
+        } else {
+            return new PagedBuffer(length);
+        }
+    }
+
+    /**
+     * Makes a buffer that uses the given array (without copying it).
+     * @param bytes the bytes of the sound
+     * @return the new buffer
+     */
+    public static SoundBuffer wrap(byte[] bytes) {
+        return new ArrayBuffer(bytes);
+    }
+
+    /**
+     * Makes a paged buffer whose bytes are read (as they're needed)
+     * from part of a file.
+     * @param file the file to read from
+     * @param offset where the sound's bytes start in the file
+     * @param length how many bytes the sound has
+     * @return the new buffer
+     */
+    public static SoundBuffer page(File file, long offset, long length)
+    throws IOException {
+        PagedBuffer buffer = new PagedBuffer(length);
+        buffer.openSource(file, offset);
+        return buffer;
+    }
+
+    ///////////////////////// the bytes /////////////////////////////
+
+    /**
+     * @return the number of bytes in this buffer
+     */
+    public abstract long length();
+
+    /**
+     * @param index the index of a byte
+     * @return the byte at that index
+     */
+    public abstract byte get(long index);
+
+    /**
+     * Changes one byte.
+     * @param index the index of the byte
+     * @param value its new value
+     */
+    public abstract void put(long index, byte value);
+
+    /**
+     * Copies bytes out of this buffer.
+     * @param index the index of the first byte to copy
+     * @param dest the array to copy them into
+     * @param offset where in <code>dest</code> to put the first one
+     * @param count how many bytes to copy
+     */
+    public abstract void get(long index, byte[] dest, int offset, int count);
+
+    /**
+     * Copies bytes into this buffer.
+     * @param index the index in this buffer of the first byte
+     * @param src the array to copy them from
+     * @param offset where in <code>src</code> the first one is
+     * @param count how many bytes to copy
+     */
+    public abstract void put(long index, byte[] src, int offset, int count);
+
+    /**
+     * @return true if this buffer's bytes are in an array, which
+     * <code>array()</code> will return without copying
+     */
+    public boolean hasArray() {
+        return false;
+    }
+
+    /**
+     * Returns all the bytes in this buffer as an array.  If
+     * <code>hasArray()</code> is true, this is the buffer's own array;
+     * otherwise, it's a copy.
+     * @return the bytes
+     */
+    public byte[] array() {
+        if (length() > Integer.MAX_VALUE) {
+            throw new IllegalStateException("This sound is too long to fit in an array");
+        }
+        byte[] bytes = new byte[(int) length()];
+        get(0, bytes, 0, bytes.length);
+        return bytes;
+    }
+
+    /**
+     * Makes a copy of this buffer, which can be changed without
+     * changing this one.
+     * @return the copy
+     */
+    public SoundBuffer copy() {
+        return copyRange(0, length());
+    }
+
+    /**
+     * Makes a copy of part of this buffer.
+     * @param index the index of the first byte to copy
+     * @param count how many bytes to copy
+     * @return the copy
+     */
+    public SoundBuffer copyRange(long index, long count) {
+        SoundBuffer copy = allocate(count);
+        byte[] chunk = new byte[(int) Math.min(COPY_CHUNK, count)];
+        for (long done = 0; done < count; done += chunk.length) {
+            int n = (int) Math.min(chunk.length, count - done);
+            get(index + done, chunk, 0, n);
+            copy.put(done, chunk, 0, n);
+        }
+        return copy;
+    }
+
+    /**
+     * Makes a buffer that shows part of this one.  Changes to either
+     * are visible in the other.
+     * @param index the index of the first byte in the view
+     * @param count how many bytes the view has
+     * @return the view
+     */
+    public SoundBuffer view(long index, long count) {
+        return new ViewBuffer(this, index, count);
+    }
+
+    /**
+     * Makes a copy of this buffer without copying any bytes yet.  The
+     * copy reads from this buffer, until a page of it is changed; then
+     * it keeps its own copy of that page, up to
+     * <code>MAX_RESIDENT_PAGES</code> of them; past that, it copies all
+     * of this buffer and stops reading from it.  (This buffer shouldn't
+     * be changed while the copy is reading from it.)
+     * @return the copy
+     */
+    public SoundBuffer copyOnWrite() {
+        return new OverlayBuffer(this);
+    }
+
+    /**
+     * Opens a stream that reads this buffer from the start.  The stream
+     * supports <code>mark</code> and <code>reset</code>.
+     * @return the stream
+     */
+    public InputStream openStream() {
+        return new BufferInputStream(this);
+    }
+
+    /**
+     * Returns true if this buffer reads any of its bytes from the given
+     * file, in which case that file mustn't be overwritten while this
+     * buffer is still in use.
+     * @param file a file
+     * @return whether this buffer reads from it
+     */
+    public boolean readsFrom(File file) {
+        return false;
+    }
+
+    /**
+     * Lets go of any files this buffer has open.  The buffer can't be
+     * used afterwards.
+     */
+    public void close() {
+    }
+
+    ///////////////////////// the kinds of buffer ///////////////////
+
+    /**
+     * A buffer kept in an array.
+     */
+    private static class ArrayBuffer extends SoundBuffer {
+        private final byte[] bytes;
+
+        ArrayBuffer(byte[] bytes) {
+            this.bytes = bytes;
+        }
+
+        public long length() {
+            return bytes.length;
+        }
+
+        public byte get(long index) {
+            return bytes[(int) index];
+        }
+
+        public void put(long index, byte value) {
+            bytes[(int) index] = value;
+        }
+
+        public void get(long index, byte[] dest, int offset, int count) {
+            System.arraycopy(bytes, (int) index, dest, offset, count);
+        }
+
+        public void put(long index, byte[] src, int offset, int count) {
+            System.arraycopy(src, offset, bytes, (int) index, count);
+        }
+
+        public boolean hasArray() {
+            return true;
+        }
+
+        public byte[] array() {
+            return bytes;
+        }
+
+        public InputStream openStream() {
+            return new ByteArrayInputStream(bytes);
+        }
+    }
+
+    /**
+     * A part of another buffer.
+     */
+    private static class ViewBuffer extends SoundBuffer {
+        private final SoundBuffer base;
+        private final long start;
+        private final long length;
+
+        ViewBuffer(SoundBuffer base, long start, long length) {
+            this.base = base;
+            this.start = start;
+            this.length = length;
+        }
+
+        public long length() {
+            return length;
+        }
+
+        public byte get(long index) {
+            return base.get(start + index);
+        }
+
+        public void put(long index, byte value) {
+            base.put(start + index, value);
+        }
+
+        public void get(long index, byte[] dest, int offset, int count) {
+            base.get(start + index, dest, offset, count);
+        }
+
+        public void put(long index, byte[] src, int offset, int count) {
+            base.put(start + index, src, offset, count);
+        }
+
+        public boolean readsFrom(File file) {
+            return base.readsFrom(file);
+        }
+    }
+
+    /**
+     * A buffer that reads from another one, except for the pages it has
+     * changed, which it keeps itself.
+     * <p>
+     * At most <code>MAX_RESIDENT_PAGES</code> changed pages are kept in
+     * memory this way.  Changing one more page than that makes the
+     * buffer copy itself (changes and all) into a buffer of its own,
+     * which is paged as usual, and stop reading from the other one; the
+     * changed pages are then dropped.  So a sound that's only slightly
+     * edited costs a few pages, and one that's edited throughout costs
+     * no more memory than any other paged sound.
+     */
+    private static class OverlayBuffer extends SoundBuffer {
+        private SoundBuffer base;
+        private boolean ownsBase = false;
+        private final HashMap<Integer, byte[]> changed =
+            new HashMap<Integer, byte[]>();
+
+        OverlayBuffer(SoundBuffer base) {
+            this.base = base;
+        }
+
+        public long length() {
+            return base.length();
+        }
+
+        public synchronized byte get(long index) {
+            byte[] page = changed.get(Integer.valueOf((int) (index / PAGE_SIZE)));
+            if (page == null) {
+                return base.get(index);
+            }
+            return page[(int) (index % PAGE_SIZE)];
+        }
+
+        public synchronized void put(long index, byte value) {
+            if (overlays(index)) {
+                ownPage(index)[(int) (index % PAGE_SIZE)] = value;
+            } else {
+                base.put(index, value);
+            }
+        }
+
+        public synchronized void get(long index, byte[] dest, int offset, int count) {
+            while (count > 0) {
+                int inPage = (int) (index % PAGE_SIZE);
+                int n = Math.min(count, PAGE_SIZE - inPage);
+                byte[] page = changed.get(Integer.valueOf((int) (index / PAGE_SIZE)));
+                if (page == null) {
+                    base.get(index, dest, offset, n);
+                } else {
+                    System.arraycopy(page, inPage, dest, offset, n);
+                }
+                index += n;
+                offset += n;
+                count -= n;
+            }
+        }
+
+        public synchronized void put(long index, byte[] src, int offset, int count) {
+            while (count > 0) {
+                int inPage = (int) (index % PAGE_SIZE);
+                int n = Math.min(count, PAGE_SIZE - inPage);
+                if (overlays(index)) {
+                    System.arraycopy(src, offset, ownPage(index), inPage, n);
+                } else {
+                    base.put(index, src, offset, n);
+                }
+                index += n;
+                offset += n;
+                count -= n;
+            }
+        }
+
+        public synchronized boolean readsFrom(File file) {
+            return base.readsFrom(file);
+        }
+
+        public synchronized void close() {
+            if (ownsBase) {
+                base.close();
+            }
+            changed.clear();
+        }
+
+        /**
+         * Gets ready to change the page holding the given byte, copying
+         * this whole buffer if that would be one changed page too many.
+         * @return true if the buffer still reads from the other one
+         */
+        private boolean overlays(long index) {
+            if (!ownsBase && changed.size() >= MAX_RESIDENT_PAGES &&
+                    !changed.containsKey(Integer.valueOf((int) (index / PAGE_SIZE)))) {
+                SoundBuffer own = copy();
+                changed.clear();
+                base = own;
+                ownsBase = true;
+            }
+            return !ownsBase;
+        }
+
+        private byte[] ownPage(long index) {
+            Integer number = Integer.valueOf((int) (index / PAGE_SIZE));
+            byte[] page = changed.get(number);
+            if (page == null) {
+                long start = (long) number.intValue() * PAGE_SIZE;
+                page = new byte[(int) Math.min(PAGE_SIZE, length() - start)];
+                base.get(start, page, 0, page.length);
+                changed.put(number, page);
+            }
+            return page;
+        }
+    }
+
+    /**
+     * A buffer split into pages, which are read from a file (or start
+     * out as silence) and kept in memory only while they're in use.
+     */
+    private static class PagedBuffer extends SoundBuffer {
+        private File sourceFile = null;
+        private FileChannel source = null;
+        private long sourceOffset = 0;
+        private final long length;
+
+        /** Changed pages that were evicted are kept in here. */
+        private RandomAccessFile scratch = null;
+        private final boolean[] spilled;
+
+        /** The pages in memory, least recently used first. */
+        private final LinkedHashMap<Integer, Page> resident =
+            new LinkedHashMap<Integer, Page>(MAX_RESIDENT_PAGES, 0.75f, true);
+
+        PagedBuffer(long length) {
+            this.length = length;
+            this.spilled = new boolean[(int) ((length + PAGE_SIZE - 1) / PAGE_SIZE)];
+        }
+
+        void openSource(File file, long offset) throws IOException {
+            this.sourceFile = file.getCanonicalFile();
+            this.source = new FileInputStream(file).getChannel();
+            this.sourceOffset = offset;
+        }
+
+        public long length() {
+            return length;
+        }
+
+        public synchronized byte get(long index) {
+            checkIndex(index, 1);
+            return page(index).bytes[(int) (index % PAGE_SIZE)];
+        }
+
+        public synchronized void put(long index, byte value) {
+            checkIndex(index, 1);
+            Page page = page(index);
+            page.bytes[(int) (index % PAGE_SIZE)] = value;
+            page.dirty = true;
+        }
+
+        public synchronized void get(long index, byte[] dest, int offset, int count) {
+            checkIndex(index, count);
+            while (count > 0) {
+                int inPage = (int) (index % PAGE_SIZE);
+                int n = Math.min(count, PAGE_SIZE - inPage);
+                System.arraycopy(page(index).bytes, inPage, dest, offset, n);
+                index += n;
+                offset += n;
+                count -= n;
+            }
+        }
+
+        public synchronized void put(long index, byte[] src, int offset, int count) {
+            checkIndex(index, count);
+            while (count > 0) {
+                int inPage = (int) (index % PAGE_SIZE);
+                int n = Math.min(count, PAGE_SIZE - inPage);
+                Page page = page(index);
+                System.arraycopy(src, offset, page.bytes, inPage, n);
+                page.dirty = true;
+                index += n;
+                offset += n;
+                count -= n;
+            }
+        }
+
+        public boolean readsFrom(File file) {
+            try {
+                return sourceFile != null && sourceFile.equals(file.getCanonicalFile());
+            } catch (IOException e) {
+                return false;
+            }
+        }
+
+        public synchronized void close() {
+            try {
+                if (source != null) {
+                    source.close();
+                }
+                if (scratch != null) {
+                    scratch.close();
+                }
+            } catch (IOException e) {
+                // There's nothing more to do with them anyway
+            }
+            source = null;
+            scratch = null;
+            resident.clear();
+        }
+
+        private void checkIndex(long index, int count) {
+            if (index < 0 || count < 0 || index + count > length) {
+                throw new IndexOutOfBoundsException("Byte " + index +
+                    " is outside of a sound with " + length + " bytes");
+            }
+        }
+
+        /**
+         * Returns the page holding the given byte, reading it in (and
+         * evicting the least recently used page) if it isn't in memory.
+         */
+        private Page page(long index) {
+            Integer number = Integer.valueOf((int) (index / PAGE_SIZE));
+            Page page = resident.get(number);
+            if (page == null) {
+                if (resident.size() >= MAX_RESIDENT_PAGES) {
+                    evictOldest();
+                }
+                page = readPage(number.intValue());
+                resident.put(number, page);
+            }
+            return page;
+        }
+
+        private void evictOldest() {
+            Iterator<Map.Entry<Integer, Page>> entries = resident.entrySet().iterator();
+            Map.Entry<Integer, Page> eldest = entries.next();
+            Page page = eldest.getValue();
+            if (page.dirty) {
+                writeScratch(eldest.getKey().intValue(), page);
+            }
+            entries.remove();
+        }
+
+        private int pageLength(int number) {
+            return (int) Math.min(PAGE_SIZE, length - (long) number * PAGE_SIZE);
+        }
+
+        private Page readPage(int number) {
+            Page page = new Page(pageLength(number));
+            long position = (long) number * PAGE_SIZE;
+            try {
+                if (spilled[number]) {
+                    scratch.seek(position);
+                    scratch.readFully(page.bytes);
+                    // It's still changed, compared to the sound's file
+                    page.dirty = true;
+                } else if (source != null) {
+                    ByteBuffer into = ByteBuffer.wrap(page.bytes);
+                    long from = sourceOffset + position;
+                    while (into.hasRemaining()) {
+                        int n = source.read(into, from + into.position());
+                        if (n < 0) {
+                            // The file is shorter than it claimed; the
+                            // rest of the page stays silent
+                            break;
+                        }
+                    }
+                }
+            } catch (IOException e) {
+                throw new RuntimeException("Couldn't read part of the sound", e);
+            }
+            return page;
+        }
+
+        private void writeScratch(int number, Page page) {
+            try {
+                if (scratch == null) {
+                    File file = File.createTempFile("jes-sound", ".pages");
+                    file.deleteOnExit();
+                    scratch = new RandomAccessFile(file, "rw");
+                }
+                scratch.seek((long) number * PAGE_SIZE);
+                scratch.write(page.bytes);
+                spilled[number] = true;
+            } catch (IOException e) {
+                throw new RuntimeException("Couldn't save part of the sound", e);
+            }
+        }
+
+        protected void finalize() {
+            close();
+        }
+    }
+
+    private static class Page {
+        final byte[] bytes;
+        boolean dirty = false;
+
+        Page(int length) {
+            bytes = new byte[length];
+        }
+    }
+
+    /**
+     * Reads a buffer from the start, remembering a mark.
+     */
+    private static class BufferInputStream extends InputStream {
+        private final SoundBuffer buffer;
+        private long position = 0;
+        private long mark = 0;
+
+        BufferInputStream(SoundBuffer buffer) {
+            this.buffer = buffer;
+        }
+
+        public int read() {
+            if (position >= buffer.length()) {
+                return -1;
+            }
+            return buffer.get(position++) & 0xFF;
+        }
+
+        public int read(byte[] dest, int offset, int count) {
+            long left = buffer.length() - position;
+            if (left <= 0) {
+                return -1;
+            }
+            int n = (int) Math.min(count, left);
+            buffer.get(position, dest, offset, n);
+            position += n;
+            return n;
+        }
+
+        public long skip(long count) {
+            long n = Math.max(0, Math.min(count, buffer.length() - position));
+            position += n;
+            return n;
+        }
+
+        public int available() {
+            return (int) Math.min(Integer.MAX_VALUE, buffer.length() - position);
+        }
+
+        public boolean markSupported() {
+            return true;
+        }
+
+        public void mark(int readLimit) {
+            mark = position;
+        }
+
+        public void reset() {
+            position = mark;
+        }
+    }
+}
@@ -2,6 +2,13 @@ import java.awt.*;
 import java.awt.event.*;
 import javax.swing.*;
 import java.util.Vector;
+import java.util.HashSet;
+import java.util.LinkedHashMap;
+import java.util.Map;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.ThreadFactory;
+import java.awt.image.BufferedImage;
 import javax.sound.sampled.*;
 import java.lang.Math;
 import java.awt.geom.*;
@@ -23,6 +30,11 @@ import java.awt.geom.*;
  *    sounds.
  *
  * Kalamazoo code merged by Buck Scharfnorth 22 May 2008
+ *
+ * Modified 19 Oct 2026
+ *   Added a spectrogram, which is worked out in tiles in the background
+ *   and kept, so scrolling back and zooming back don't redo it (until the sound
+ *   is edited).
  */
 public class SoundExplorer implements MouseMotionListener, ActionListener,
     MouseListener, LineListener {
@@ -92,6 +104,8 @@ public class SoundExplorer implements MouseMotionListener, ActionListener,
     private SamplingPanel leftSamplePanel;
     /** panel that displays the right sound wave */
     private SamplingPanel rightSamplePanel;
+    /** panel that displays the spectrogram (made when it's first shown) */
+    private SpectrogramPanel spectrogramPanel;
 
     ////////////////  parts of the information panel //////////////
 
@@ -115,6 +129,8 @@ public class SoundExplorer implements MouseMotionListener, ActionListener,
     private JPanel zoomButtonPanel;
     /** zoom in and out button */
     private JButton zoomButton;
+    /** button to show or hide the spectrogram */
+    private JButton spectrogramButton;
     /** button to go to the previous index */
     private JButton prevButton;
     /** button to go to the next index */
@@ -164,6 +180,15 @@ public class SoundExplorer implements MouseMotionListener, ActionListener,
     private static final Color waveColor = Color.white;
     private static final Color barColor = Color.cyan;
 
+    /** how many pixels wide each piece of the spectrogram is */
+    private static final int SPECTROGRAM_TILE_WIDTH = 128;
+    /** how many samples each column of the spectrogram looks at */
+    private static final int SPECTROGRAM_FFT_SIZE = 512;
+    /** how many pieces of the spectrogram are kept */
+    private static final int SPECTROGRAM_MAX_TILES = 256;
+    /** the quietest level (in dB) the spectrogram shows */
+    private static final double SPECTROGRAM_FLOOR_DB = -100.0;
+
     ///////////////////////// class fields ///////////////////////////
     private static String leftSampleText = "Sample Value: ";
     private static String rightSampleText = "Right (Bottom) Sample Value: ";
@@ -265,6 +290,13 @@ public class SoundExplorer implements MouseMotionListener, ActionListener,
         frameContainer.setLayout(new BorderLayout());
         soundFrame.setDefaultCloseOperation(JFrame.DISPOSE_ON_CLOSE);
         //also on close we need to remove the soundView listener?
+        soundFrame.addWindowListener(new WindowAdapter() {
+            public void windowClosed(WindowEvent e) {
+                if (spectrogramPanel != null) {
+                    spectrogramPanel.stop();
+                }
+            }
+        });
 
         //creates the play panel
         createPlayPanel();
@@ -646,6 +678,8 @@ public class SoundExplorer implements MouseMotionListener, ActionListener,
         zoomButtonPanel = new JPanel();
         zoomButton = makeButton("Zoom In", true, zoomButtonPanel);
         zoomButton.setToolTipText(zoomInHint);
+        spectrogramButton = makeButton("Show Spectrogram", true, zoomButtonPanel);
+        spectrogramButton.setToolTipText("Show which frequencies are in the sound over time");
 
         infoPanel.add(BorderLayout.NORTH, indexPanel);
         infoPanel.add(BorderLayout.SOUTH, zoomButtonPanel);
@@ -826,6 +860,10 @@ public class SoundExplorer implements MouseMotionListener, ActionListener,
             handleZoomIn(true);
         } else if (e.getActionCommand().equals("Zoom Out")) {
             handleZoomOut();
+        } else if (e.getActionCommand().equals("Show Spectrogram")) {
+            showSpectrogram(true);
+        } else if (e.getActionCommand().equals("Hide Spectrogram")) {
+            showSpectrogram(false);
         } else if (e.getActionCommand().equals("Play Before")) {
             try {
                 sound.playAtRateInRange
@@ -1143,6 +1181,38 @@ public class SoundExplorer implements MouseMotionListener, ActionListener,
         soundPanel.repaint();
     }
 
+    /**
+     * Method to show or hide the spectrogram below the sound wave(s)
+     * @param show true to show it, false to hide it
+     */
+    private void showSpectrogram(boolean show) {
+        if (spectrogramPanel == null) {
+            spectrogramPanel = new SpectrogramPanel();
+            spectrogramPanel.addMouseMotionListener(this);
+            spectrogramPanel.addMouseListener(this);
+        }
+
+        int rows = inStereo ? 2 : 1;
+        if (show) {
+            rows++;
+            soundPanel.add(spectrogramPanel);
+            spectrogramButton.setText("Hide Spectrogram");
+        } else {
+            soundPanel.remove(spectrogramPanel);
+            spectrogramButton.setText("Show Spectrogram");
+        }
+        soundPanel.setLayout(new GridLayout(rows, 1));
+
+        soundPanelHeight = rows * sampleHeight;
+        soundPanel.setPreferredSize(new Dimension(soundPanel.getPreferredSize().width,
+                                    soundPanelHeight));
+        soundPanel.setSize(soundPanel.getPreferredSize());
+
+        scrollSound.revalidate();
+        soundFrame.pack();
+        soundPanel.repaint();
+    }
+
     /**
      * Method to set the base for the index.  The default is a base of 0.
      * @param base the new base to use (for example use setBase(1))
@@ -1310,6 +1380,220 @@ public class SoundExplorer implements MouseMotionListener, ActionListener,
 
     }//public class SamplingPanel
 
+    /**
+     * Class to display the spectrogram: time goes across (lined up with
+     * the sound wave), frequency goes up, and brighter means louder.
+     * <p>
+     * It's worked out in tiles, on a background thread, only for the
+     * part of the sound that's showing.  Tiles are kept (for each zoom
+     * level), so scrolling and zooming back don't work them out again.
+     */
+    private class SpectrogramPanel extends JPanel {
+
+        private static final long serialVersionUID = 1L;
+
+        /** finished tiles, by zoom level and position, least recently used first */
+        private final Map<String, BufferedImage> tiles =
+            new LinkedHashMap<String, BufferedImage>(16, 0.75f, true) {
+                protected boolean removeEldestEntry(Map.Entry<String, BufferedImage> eldest) {
+                    return size() > SPECTROGRAM_MAX_TILES;
+                }
+            };
+
+        /** tiles that are waiting to be worked out */
+        private final HashSet<String> pending = new HashSet<String>();
+
+        /** the sound's change count when the tiles were worked out */
+        private long tilesChangeCount = sound.getChangeCount();
+
+        /** the thread tiles are worked out on (made when it's needed) */
+        private ExecutorService worker;
+
+        /** only used on the worker thread */
+        private final Spectrum spectrum =
+            new Spectrum(SPECTROGRAM_FFT_SIZE, Spectrum.HANN);
+
+        /** the colour for each brightness, from black through red and yellow to white */
+        private final int[] palette = new int[256];
+
+        public SpectrogramPanel() {
+            setBackground(backgroundColor);
+            for (int i = 0; i < palette.length; i++) {
+                float level = i / 255.0f;
+                int red = (int) (255 * Math.min(1.0f, 3 * level));
+                int green = (int) (255 * Math.max(0.0f, Math.min(1.0f, 3 * level - 1)));
+                int blue = (int) (255 * Math.max(0.0f, Math.min(1.0f, 3 * level - 2)));
+                palette[i] = (red << 16) | (green << 8) | blue;
+            }
+        }
+
+        /**
+         * Method to get the size, which follows the sound wave's
+         * @return the preferred size
+         */
+        public Dimension getPreferredSize() {
+            return new Dimension(sampleWidth, sampleHeight);
+        }
+
+        /**
+         * Method to stop working out tiles (when the window closes)
+         */
+        public void stop() {
+            if (worker != null) {
+                worker.shutdownNow();
+            }
+        }
+
+        /**
+         * Method to draw the tiles that are showing, and ask for the
+         * ones that aren't ready yet
+         * @param g the graphics context
+         */
+        public void paintComponent(Graphics g) {
+            Rectangle rectToPaint = g.getClipBounds();
+            Graphics2D g2 = (Graphics2D)g;
+            g2.setBackground(backgroundColor);
+            g2.clearRect((int)rectToPaint.getX(), (int)rectToPaint.getY(),
+                         (int)rectToPaint.getWidth(), (int)rectToPaint.getHeight());
+
+            //the sound was edited, so the tiles are out of date
+            synchronized (tiles) {
+                if (tilesChangeCount != sound.getChangeCount()) {
+                    tilesChangeCount = sound.getChangeCount();
+                    tiles.clear();
+                }
+            }
+
+            float zoom = framesPerPixel;
+            int firstTile = (int)rectToPaint.getX() / SPECTROGRAM_TILE_WIDTH;
+            int lastTile = (int)(rectToPaint.getX() + rectToPaint.getWidth() - 1) /
+                           SPECTROGRAM_TILE_WIDTH;
+            for (int tile = firstTile; tile <= lastTile; tile++) {
+                BufferedImage image;
+                synchronized (tiles) {
+                    image = tiles.get(tileKey(zoom, tile));
+                }
+                if (image != null) {
+                    g2.drawImage(image, tile * SPECTROGRAM_TILE_WIDTH, 0, null);
+                } else {
+                    requestTile(zoom, tile);
+                }
+            }
+
+            //draw the selection over the top, so the spectrogram shows through
+            if (selectionStart != -1 && selectionStop != -1) {
+                g2.setColor(new Color(128, 128, 128, 96));
+                g2.fillRect(selectionStart, 0,
+                            selectionStop - selectionStart + 1, sampleHeight);
+            }
+
+            //draw the current position
+            g2.setColor(barColor);
+            g2.setStroke(new BasicStroke(1));
+            g2.draw(new Line2D.Double(currentPixelPosition, 0,
+                                      currentPixelPosition, sampleHeight));
+        }
+
+        private String tileKey(float zoom, int tile) {
+            return zoom + ":" + tile;
+        }
+
+        /**
+         * Method to have a tile worked out in the background, and shown
+         * when it's done
+         */
+        private void requestTile(final float zoom, final int tile) {
+            final String key = tileKey(zoom, tile);
+            final long changeCount;
+            synchronized (tiles) {
+                if (!pending.add(key)) {
+                    return;
+                }
+                changeCount = tilesChangeCount;
+            }
+
+            if (worker == null) {
+                worker = Executors.newSingleThreadExecutor(new ThreadFactory() {
+                    public Thread newThread(Runnable r) {
+                        Thread thread = new Thread(r, "Spectrogram");
+                        thread.setDaemon(true);
+                        return thread;
+                    }
+                });
+            }
+
+            worker.execute(new Runnable() {
+                public void run() {
+                    BufferedImage image = null;
+                    // skip tiles nobody will see, since the zoom changed
+                    if (zoom == framesPerPixel) {
+                        try {
+                            image = makeTile(zoom, tile);
+                        } catch (SoundException ex) {
+                            catchException(ex);
+                        }
+                    }
+
+                    synchronized (tiles) {
+                        pending.remove(key);
+                        // a tile of the sound before an edit is thrown away
+                        if (changeCount != tilesChangeCount ||
+                            changeCount != sound.getChangeCount()) {
+                            image = null;
+                        }
+                        if (image != null) {
+                            tiles.put(key, image);
+                        }
+                    }
+
+                    if (image != null) {
+                        SwingUtilities.invokeLater(new Runnable() {
+                            public void run() {
+                                repaint(tile * SPECTROGRAM_TILE_WIDTH, 0,
+                                        SPECTROGRAM_TILE_WIDTH, sampleHeight);
+                            }
+                        });
+                    }
+                }
+            });
+        }
+
+        /**
+         * Method to work out one tile: each column is the spectrum of
+         * the samples around that pixel's index
+         */
+        private BufferedImage makeTile(float zoom, int tile) throws SoundException {
+            int height = sampleHeight;
+            BufferedImage image = new BufferedImage(SPECTROGRAM_TILE_WIDTH, height,
+                                                    BufferedImage.TYPE_INT_RGB);
+            float[] frame = new float[SPECTROGRAM_FFT_SIZE];
+            double[] power = new double[spectrum.getBins()];
+            int[] column = new int[height];
+            int lastBin = spectrum.getBins() - 1;
+
+            for (int x = 0; x < SPECTROGRAM_TILE_WIDTH; x++) {
+                int index = (int)((tile * SPECTROGRAM_TILE_WIDTH + x) * zoom);
+                if (index >= sound.getLengthInFrames()) {
+                    break;
+                }
+
+                spectrum.readFrame(sound, index - SPECTROGRAM_FFT_SIZE / 2, frame);
+                spectrum.power(frame, 0, power);
+
+                for (int y = 0; y < height; y++) {
+                    int bin = (height - 1 - y) * lastBin / (height - 1);
+                    double db = 10 * Math.log10(power[bin] + 1e-20);
+                    double level = 1.0 - db / SPECTROGRAM_FLOOR_DB;
+                    int shade = (int) (255 * Math.max(0.0, Math.min(1.0, level)));
+                    column[y] = palette[shade];
+                }
+                image.setRGB(x, 0, 1, height, column, 0, 1);
+            }
+            return image;
+        }
+
+    }//private class SpectrogramPanel
+
     /*
     public static void main(String args[])
     {
@@ -0,0 +1,394 @@
+import java.io.*;
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import javax.sound.sampled.AudioFileFormat;
+import javax.sound.sampled.AudioFormat;
+
+/**
+ * Writes a WAV or AIFF file a block of samples at a time, so a sound
+ * can be written (or made) without ever having all of it in memory.
+ * <p>
+ * The header is written first with the sizes left at zero, samples
+ * are appended after it, and <code>close</code> goes back and fills
+ * the sizes in.  Samples that were already written can also be
+ * rewritten in place, without touching the rest of the file.
+ * <p>
+ * Samples can be given as bytes in any PCM format with the same sample
+ * size and number of channels (they're converted to the byte order and
+ * signedness the file type uses), or as sample values.
+ *
+ * @see SimpleSound#writeToFile(String)
+ */
+public class SoundWriter {
+
+    /** The size of the header this writes for WAV files. */
+    private static final int WAVE_HEADER_SIZE = 44;
+
+    /** The size of the header this writes for AIFF files. */
+    private static final int AIFF_HEADER_SIZE = 54;
+
+    /** How many bytes are converted at once. */
+    private static final int CHUNK_SIZE = 64 * 1024;
+
+    private final RandomAccessFile file;
+    private final AudioFileFormat.Type type;
+
+    /** The format of the bytes in the file. */
+    private final AudioFormat format;
+
+    private final long dataOffset;
+    private long dataLength;
+
+    /** Whether this writer wrote the header (and so may change it). */
+    private final boolean ownsHeader;
+
+    private byte[] scratch = new byte[0];
+
+    /**
+     * @param format the format of some samples
+     * @param type the type of file to write them to
+     * @return whether a <code>SoundWriter</code> can write them (they
+     *         have to be PCM, and the file WAV or AIFF)
+     */
+    public static boolean canWrite(AudioFormat format, AudioFileFormat.Type type) {
+        int bits = format.getSampleSizeInBits();
+        boolean isPCM = format.getEncoding().equals(AudioFormat.Encoding.PCM_SIGNED) ||
+                        format.getEncoding().equals(AudioFormat.Encoding.PCM_UNSIGNED);
+        return isPCM && (bits == 8 || bits == 16 || bits == 24 || bits == 32) &&
+               (type.equals(AudioFileFormat.Type.WAVE) ||
+                type.equals(AudioFileFormat.Type.AIFF));
+    }
+
+    /**
+     * @param type a file type this can write
+     * @return where the samples start in files of that type written by
+     *         a <code>SoundWriter</code>
+     */
+    public static long getDataOffset(AudioFileFormat.Type type) {
+        return type.equals(AudioFileFormat.Type.WAVE) ? WAVE_HEADER_SIZE : AIFF_HEADER_SIZE;
+    }
+
+    /**
+     * @param format the format of some samples
+     * @param type the type of file to write them to
+     * @return the format those samples are stored in, in that type of
+     *         file (WAV files are little-endian, and use unsigned 8-bit
+     *         samples; AIFF files are big-endian and signed)
+     */
+    public static AudioFormat getFileFormat(AudioFormat format, AudioFileFormat.Type type) {
+        boolean isWave = type.equals(AudioFileFormat.Type.WAVE);
+        boolean signed = !(isWave && format.getSampleSizeInBits() == 8);
+        return new AudioFormat(format.getSampleRate(), format.getSampleSizeInBits(),
+                               format.getChannels(), signed, !isWave);
+    }
+
+    /**
+     * Starts a new file (replacing any file that's already there).
+     *
+     * @param file the file to write
+     * @param format the format of the samples (the file is written in
+     *               the matching format for its type)
+     * @param type <code>AudioFileFormat.Type.WAVE</code> or
+     *             <code>AudioFileFormat.Type.AIFF</code>
+     * @return a writer for the file
+     * @throws IOException if the file can't be written
+     */
+    public static SoundWriter create(File file, AudioFormat format,
+                                     AudioFileFormat.Type type)
+    throws IOException {
+        if (!canWrite(format, type)) {
+            throw new IllegalArgumentException("Can't write " + format + " to a " +
+                                               type + " file");
+        }
+        RandomAccessFile out = new RandomAccessFile(file, "rw");
+        out.setLength(0);
+        SoundWriter writer = new SoundWriter(out, getFileFormat(format, type), type,
+                                             getDataOffset(type), 0, true);
+        writer.writeHeader();
+        return writer;
+    }
+
+    /**
+     * Opens a file that already has samples in it, to change some of
+     * them in place.  Nothing can be appended, and the header is left
+     * as it is.
+     *
+     * @param file the file to change
+     * @param format the format of the samples in the file
+     * @param type the type of the file
+     * @param dataOffset where the samples start in the file
+     * @param dataLength how many bytes of samples there are
+     * @return a writer for the file
+     * @throws IOException if the file can't be written, or is too short
+     */
+    public static SoundWriter reopen(File file, AudioFormat format,
+                                     AudioFileFormat.Type type,
+                                     long dataOffset, long dataLength)
+    throws IOException {
+        RandomAccessFile out = new RandomAccessFile(file, "rw");
+        if (out.length() < dataOffset + dataLength) {
+            out.close();
+            throw new IOException(file + " is shorter than its samples");
+        }
+        return new SoundWriter(out, format, type, dataOffset, dataLength, false);
+    }
+
+    private SoundWriter(RandomAccessFile file, AudioFormat format,
+                        AudioFileFormat.Type type, long dataOffset,
+                        long dataLength, boolean ownsHeader) {
+        this.file = file;
+        this.format = format;
+        this.type = type;
+        this.dataOffset = dataOffset;
+        this.dataLength = dataLength;
+        this.ownsHeader = ownsHeader;
+    }
+
+    /**
+     * @return the format of the samples in the file
+     */
+    public AudioFormat getFormat() {
+        return format;
+    }
+
+    /**
+     * @return the number of sample frames written so far
+     */
+    public long getFrameLength() {
+        return dataLength / format.getFrameSize();
+    }
+
+    /**
+     * Adds samples to the end of the file.
+     *
+     * @param bytes the samples
+     * @param offset where they start in <code>bytes</code>
+     * @param count how many bytes to add (a whole number of frames)
+     * @param from the format of the samples (it must have the same
+     *             sample size and channels as the file)
+     * @throws IOException if they can't be written
+     */
+    public void append(byte[] bytes, int offset, int count, AudioFormat from)
+    throws IOException {
+        if (!ownsHeader) {
+            throw new IOException("Samples can only be changed, not added, in a reopened file");
+        }
+        writeAt(dataLength, bytes, offset, count, from);
+    }
+
+    /**
+     * Adds all of a sound to the end of the file, a block at a time.
+     *
+     * @param sound the sound to add (it must have the same sample size
+     *              and channels as the file)
+     * @throws IOException if it can't be written
+     */
+    public void appendSound(SimpleSound sound) throws IOException {
+        AudioFormat from = sound.getAudioFileFormat().getFormat();
+        SoundBuffer buffer = sound.getSoundBuffer();
+        int chunk = CHUNK_SIZE - CHUNK_SIZE % from.getFrameSize();
+        byte[] bytes = new byte[chunk];
+
+        for (long done = 0; done < buffer.length(); done += chunk) {
+            int n = (int) Math.min(chunk, buffer.length() - done);
+            buffer.get(done, bytes, 0, n);
+            append(bytes, 0, n, from);
+        }
+    }
+
+    /**
+     * Adds sample values to the end of the file.  Values too big for the
+     * sample size are clipped.
+     *
+     * @param samples the samples, <code>samples[channel][frame]</code>
+     * @param count how many frames to add
+     * @throws IOException if they can't be written
+     */
+    public void appendSamples(int[][] samples, int count) throws IOException {
+        int channels = format.getChannels();
+        int sampleSize = format.getSampleSizeInBits() / 8;
+        int frameSize = format.getFrameSize();
+        int framesPerChunk = Math.max(1, CHUNK_SIZE / frameSize);
+        byte[] bytes = new byte[Math.min(count, framesPerChunk) * frameSize];
+        long max = (1L << (format.getSampleSizeInBits() - 1)) - 1;
+
+        for (int done = 0; done < count; done += framesPerChunk) {
+            int n = Math.min(framesPerChunk, count - done);
+            for (int c = 0; c < channels; c++) {
+                int[] row = samples[c];
+                for (int i = 0, at = c * sampleSize; i < n; i++, at += frameSize) {
+                    int value = (int) Math.max(-max - 1, Math.min(max, row[done + i]));
+                    encode(value, bytes, at);
+                }
+            }
+            append(bytes, 0, n * frameSize, format);
+        }
+    }
+
+    /**
+     * Writes one sample value in the file's format.
+     */
+    private void encode(int value, byte[] bytes, int at) {
+        boolean isBigEndian = format.isBigEndian();
+        boolean signed = format.getEncoding().equals(AudioFormat.Encoding.PCM_SIGNED);
+        switch (format.getSampleSizeInBits()) {
+        case 8:
+            bytes[at] = signed ? (byte) value : TConversionTool.intToUnsignedByte(value);
+            break;
+        case 16:
+            TConversionTool.intToBytes16(value, bytes, at, isBigEndian);
+            break;
+        case 24:
+            TConversionTool.intToBytes24(value, bytes, at, isBigEndian);
+            break;
+        default:
+            TConversionTool.intToBytes32(value, bytes, at, isBigEndian);
+        }
+    }
+
+    /**
+     * Changes samples that were already written, in place.
+     *
+     * @param index where the samples start, in bytes from the first
+     *              sample in the file
+     * @param bytes the new samples
+     * @param offset where they start in <code>bytes</code>
+     * @param count how many bytes to write
+     * @param from the format of the new samples
+     * @throws IOException if they can't be written
+     */
+    public void rewrite(long index, byte[] bytes, int offset, int count, AudioFormat from)
+    throws IOException {
+        if (index < 0 || index + count > dataLength) {
+            throw new IndexOutOfBoundsException("Only samples already in the file can be rewritten");
+        }
+        writeAt(index, bytes, offset, count, from);
+    }
+
+    private void writeAt(long index, byte[] bytes, int offset, int count, AudioFormat from)
+    throws IOException {
+        if (from.getSampleSizeInBits() != format.getSampleSizeInBits() ||
+                from.getChannels() != format.getChannels()) {
+            throw new IllegalArgumentException("Samples in " + from +
+                                               " can't be written to a file of " + format);
+        }
+
+        file.seek(dataOffset + index);
+        if (sameLayout(from)) {
+            file.write(bytes, offset, count);
+        } else {
+            if (scratch.length < Math.min(count, CHUNK_SIZE)) {
+                scratch = new byte[Math.min(count, CHUNK_SIZE)];
+            }
+            int chunk = scratch.length - scratch.length % format.getFrameSize();
+            for (int done = 0; done < count; done += chunk) {
+                int n = Math.min(chunk, count - done);
+                convert(bytes, offset + done, n, from);
+                file.write(scratch, 0, n);
+            }
+        }
+        dataLength = Math.max(dataLength, index + count);
+    }
+
+    private boolean sameLayout(AudioFormat from) {
+        return from.getEncoding().equals(format.getEncoding()) &&
+               (format.getSampleSizeInBits() == 8 ||
+                from.isBigEndian() == format.isBigEndian());
+    }
+
+    /**
+     * Copies samples into <code>scratch</code>, changing their byte
+     * order and signedness to the file's.
+     */
+    private void convert(byte[] bytes, int offset, int count, AudioFormat from) {
+        int sampleSize = format.getSampleSizeInBits() / 8;
+        boolean swap = sampleSize > 1 && from.isBigEndian() != format.isBigEndian();
+        boolean flipSign = !from.getEncoding().equals(format.getEncoding());
+        int signByte = format.isBigEndian() ? 0 : sampleSize - 1;
+
+        for (int at = 0; at < count; at += sampleSize) {
+            for (int b = 0; b < sampleSize; b++) {
+                scratch[at + b] = bytes[offset + at + (swap ? sampleSize - 1 - b : b)];
+            }
+            if (flipSign) {
+                scratch[at + signByte] ^= (byte) 0x80;
+            }
+        }
+    }
+
+    /**
+     * Finishes the file: fills in the sizes in the header (if this
+     * writer wrote it), and closes it.
+     *
+     * @throws IOException if the file can't be written
+     */
+    public void close() throws IOException {
+        try {
+            if (ownsHeader) {
+                // Chunks have to have an even number of bytes
+                file.setLength(dataOffset + dataLength + (dataLength & 1));
+                writeHeader();
+            }
+        } finally {
+            file.close();
+        }
+    }
+
+    private void writeHeader() throws IOException {
+        long padded = dataLength + (dataLength & 1);
+        ByteBuffer header;
+
+        if (type.equals(AudioFileFormat.Type.WAVE)) {
+            header = ByteBuffer.allocate(WAVE_HEADER_SIZE).order(ByteOrder.LITTLE_ENDIAN);
+            header.put(ascii("RIFF")).putInt((int) (WAVE_HEADER_SIZE - 8 + padded));
+            header.put(ascii("WAVE"));
+            header.put(ascii("fmt ")).putInt(16);
+            header.putShort((short) 1);     // PCM
+            header.putShort((short) format.getChannels());
+            header.putInt((int) format.getSampleRate());
+            header.putInt((int) format.getSampleRate() * format.getFrameSize());
+            header.putShort((short) format.getFrameSize());
+            header.putShort((short) format.getSampleSizeInBits());
+            header.put(ascii("data")).putInt((int) dataLength);
+        } else {
+            header = ByteBuffer.allocate(AIFF_HEADER_SIZE).order(ByteOrder.BIG_ENDIAN);
+            header.put(ascii("FORM")).putInt((int) (AIFF_HEADER_SIZE - 8 + padded));
+            header.put(ascii("AIFF"));
+            header.put(ascii("COMM")).putInt(18);
+            header.putShort((short) format.getChannels());
+            header.putInt((int) getFrameLength());
+            header.putShort((short) format.getSampleSizeInBits());
+            putExtended(header, format.getSampleRate());
+            header.put(ascii("SSND")).putInt((int) (8 + dataLength));
+            header.putInt(0);               // offset
+            header.putInt(0);               // block size
+        }
+
+        file.seek(0);
+        file.write(header.array());
+    }
+
+    private static byte[] ascii(String id) {
+        try {
+            return id.getBytes("US-ASCII");
+        } catch (UnsupportedEncodingException e) {
+            throw new RuntimeException(e);
+        }
+    }
+
+    /**
+     * Puts a number in the 80-bit extended format AIFF uses for the
+     * sampling rate.
+     */
+    private static void putExtended(ByteBuffer buffer, double value) {
+        if (value <= 0) {
+            buffer.putShort((short) 0).putLong(0);
+            return;
+        }
+        int exponent = Math.getExponent(value);
+        // 63 bits fit in a long; the 64th (always 0 for sampling rates)
+        // is added by the shift
+        long mantissa = ((long) Math.scalb(value, 62 - exponent)) << 1;
+        buffer.putShort((short) (exponent + 16383)).putLong(mantissa);
+    }
+}
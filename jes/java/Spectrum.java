@@ -0,0 +1,419 @@
+import javax.sound.sampled.AudioFormat;
+
+/**
+ * Finds out which frequencies are in a sound, with a fast Fourier
+ * transform (FFT).
+ * <p>
+ * A <code>Spectrum</code> works on frames of a fixed size (a power of
+ * two).  Each frame is shaped by a window function (so the edges of the
+ * frame don't show up as frequencies of their own), and then turned
+ * into the power at each frequency "bin".  Bin <code>k</code> is the
+ * frequency <code>k * samplingRate / size</code>, and there are
+ * <code>size / 2 + 1</code> of them, from 0 up to half the sampling
+ * rate.
+ * <p>
+ * Samples are real numbers, so the transform packs pairs of them into
+ * one complex number and does an FFT half as long, which is about
+ * twice as fast as a complex FFT of the whole frame.
+ * <p>
+ * Powers are scaled so that a sine wave as loud as the sound's format
+ * can hold has a power of about 1 (0 dB).
+ *
+ * @see SimpleSound#getSampleBlock(int, int, int[][])
+ */
+public class Spectrum {
+
+    /** No window: the frame is used as it is. */
+    public static final int RECTANGULAR = 0;
+
+    /** The Hann window, which is good for most things. */
+    public static final int HANN = 1;
+
+    /** The Hamming window. */
+    public static final int HAMMING = 2;
+
+    /** The Blackman window, which leaks the least between bins. */
+    public static final int BLACKMAN = 3;
+
+    /** The lowest pitch <code>estimatePitch</code> looks for, in Hz. */
+    public static final double MIN_PITCH = 50.0;
+
+    /** The highest pitch <code>estimatePitch</code> looks for, in Hz. */
+    public static final double MAX_PITCH = 4000.0;
+
+    /** How many harmonics <code>estimatePitch</code> uses. */
+    private static final int HARMONICS = 3;
+
+    /** The frame size <code>estimatePitch</code> uses, at most. */
+    private static final int PITCH_FRAME = 4096;
+
+    /**
+     * Frames quieter than this (as an average power) are silent, and
+     * don't have a pitch.
+     */
+    private static final double SILENCE = 1e-8;
+
+    private final int size;
+    private final int half;
+    private final float[] window;
+
+    /** What the window scales a full-scale sine wave's power by. */
+    private final double powerScale;
+
+    /** The FFT's twiddle factors (for the half-size transform). */
+    private final double[] cos;
+    private final double[] sin;
+
+    /** The twiddle factors that split the half-size result apart. */
+    private final double[] splitCos;
+    private final double[] splitSin;
+
+    private final int[] bitReverse;
+    private final double[] re;
+    private final double[] im;
+
+    /** Room for reading samples out of a sound, by channel. */
+    private int[][] raw = new int[0][0];
+
+    /**
+     * Makes a spectrum for frames of the given size.
+     *
+     * @param size the number of samples in each frame (a power of two,
+     *             at least 4)
+     * @param windowType <code>RECTANGULAR</code>, <code>HANN</code>,
+     *                   <code>HAMMING</code> or <code>BLACKMAN</code>
+     */
+    public Spectrum(int size, int windowType) {
+        if (size < 4 || (size & (size - 1)) != 0) {
+            throw new IllegalArgumentException("The frame size must be a power of two, at least 4");
+        }
+
+        this.size = size;
+        this.half = size / 2;
+        this.window = makeWindow(size, windowType);
+
+        double sum = 0;
+        for (int i = 0; i < size; i++) {
+            sum += window[i];
+        }
+        this.powerScale = 4.0 / (sum * sum);
+
+        cos = new double[half / 2];
+        sin = new double[half / 2];
+        for (int i = 0; i < half / 2; i++) {
+            cos[i] = Math.cos(2 * Math.PI * i / half);
+            sin[i] = -Math.sin(2 * Math.PI * i / half);
+        }
+
+        splitCos = new double[half + 1];
+        splitSin = new double[half + 1];
+        for (int k = 0; k <= half; k++) {
+            splitCos[k] = Math.cos(Math.PI * k / half);
+            splitSin[k] = -Math.sin(Math.PI * k / half);
+        }
+
+        int bits = Integer.numberOfTrailingZeros(half);
+        bitReverse = new int[half];
+        for (int i = 0; i < half; i++) {
+            bitReverse[i] = (bits == 0) ? 0 : Integer.reverse(i) >>> (32 - bits);
+        }
+
+        re = new double[half];
+        im = new double[half];
+    }
+
+    private static float[] makeWindow(int size, int windowType) {
+        float[] window = new float[size];
+        for (int i = 0; i < size; i++) {
+            double x = 2 * Math.PI * i / size;
+            switch (windowType) {
+            case RECTANGULAR:
+                window[i] = 1.0f;
+                break;
+            case HANN:
+                window[i] = (float) (0.5 - 0.5 * Math.cos(x));
+                break;
+            case HAMMING:
+                window[i] = (float) (0.54 - 0.46 * Math.cos(x));
+                break;
+            case BLACKMAN:
+                window[i] = (float) (0.42 - 0.5 * Math.cos(x) + 0.08 * Math.cos(2 * x));
+                break;
+            default:
+                throw new IllegalArgumentException("Unknown window type " + windowType);
+            }
+        }
+        return window;
+    }
+
+    /**
+     * @return the number of samples in a frame
+     */
+    public int getSize() {
+        return size;
+    }
+
+    /**
+     * @return the number of frequency bins in a power spectrum
+     */
+    public int getBins() {
+        return half + 1;
+    }
+
+    /**
+     * @param bin a frequency bin
+     * @param samplingRate the sampling rate of the sound
+     * @return the frequency of that bin, in Hz
+     */
+    public double getFrequency(int bin, double samplingRate) {
+        return bin * samplingRate / size;
+    }
+
+    /**
+     * Works out the power at each frequency in a frame of samples.
+     *
+     * @param samples the samples, from -1.0 to 1.0
+     * @param offset where the frame starts in <code>samples</code>
+     * @param power where to put the power in each bin; it needs room
+     *              for <code>getBins()</code> of them
+     */
+    public void power(float[] samples, int offset, double[] power) {
+        // Pack even samples into the real parts, and odd ones into the
+        // imaginary parts, in bit-reversed order for the FFT
+        for (int i = 0; i < half; i++) {
+            int j = bitReverse[i];
+            re[j] = samples[offset + 2 * i] * window[2 * i];
+            im[j] = samples[offset + 2 * i + 1] * window[2 * i + 1];
+        }
+        transform();
+
+        // Split the result into the spectrum of the even samples and
+        // the odd ones, and combine those into the real spectrum
+        for (int k = 0; k <= half; k++) {
+            int a = (k == half) ? 0 : k;
+            int b = (k == 0) ? 0 : half - k;
+
+            double evenRe = (re[a] + re[b]) / 2;
+            double evenIm = (im[a] - im[b]) / 2;
+            double oddRe = (im[a] + im[b]) / 2;
+            double oddIm = -(re[a] - re[b]) / 2;
+
+            double c = splitCos[k];
+            double s = splitSin[k];
+            double outRe = evenRe + c * oddRe - s * oddIm;
+            double outIm = evenIm + c * oddIm + s * oddRe;
+
+            power[k] = (outRe * outRe + outIm * outIm) * powerScale;
+        }
+    }
+
+    /**
+     * An in-place radix-2 FFT of <code>re</code> and <code>im</code>,
+     * which are already in bit-reversed order.
+     */
+    private void transform() {
+        for (int length = 2; length <= half; length *= 2) {
+            int stride = half / length;
+            int halfLength = length / 2;
+            for (int start = 0; start < half; start += length) {
+                for (int j = 0; j < halfLength; j++) {
+                    double c = cos[j * stride];
+                    double s = sin[j * stride];
+                    int p = start + j;
+                    int q = p + halfLength;
+
+                    double tRe = re[q] * c - im[q] * s;
+                    double tIm = re[q] * s + im[q] * c;
+                    re[q] = re[p] - tRe;
+                    im[q] = im[p] - tIm;
+                    re[p] += tRe;
+                    im[p] += tIm;
+                }
+            }
+        }
+    }
+
+    /**
+     * Reads a frame of a sound, mixing its channels together and
+     * scaling the samples to between -1.0 and 1.0.  Any part of the
+     * frame before the start or after the end of the sound is silent.
+     *
+     * @param sound the sound to read
+     * @param start the index of the frame's first sample
+     * @param frame where to put the frame's samples (it needs room for
+     *              <code>getSize()</code> of them)
+     * @throws SoundException if the sound's samples can't be read
+     */
+    public void readFrame(SimpleSound sound, int start, float[] frame)
+    throws SoundException {
+        AudioFormat format = sound.getAudioFileFormat().getFormat();
+        int channels = format.getChannels();
+        int from = Math.max(0, start);
+        int to = (int) Math.min((long) start + size, sound.getLengthInFrames());
+
+        java.util.Arrays.fill(frame, 0, size, 0.0f);
+        if (from >= to) {
+            return;
+        }
+
+        if (raw.length != channels || raw[0].length < size) {
+            raw = new int[channels][size];
+        }
+        sound.getSampleBlock(from, to - from, raw);
+
+        float scale = (float) (1.0 / (fullScale(format) * channels));
+        for (int c = 0; c < channels; c++) {
+            int[] row = raw[c];
+            for (int i = from; i < to; i++) {
+                frame[i - start] += row[i - from] * scale;
+            }
+        }
+    }
+
+    /**
+     * @return the biggest sample value a format can hold (roughly)
+     */
+    private static double fullScale(AudioFormat format) {
+        if (format.getEncoding().equals(AudioFormat.Encoding.ALAW) ||
+                format.getEncoding().equals(AudioFormat.Encoding.ULAW)) {
+            return 32768.0;
+        }
+        return Math.pow(2, format.getSampleSizeInBits() - 1);
+    }
+
+    /**
+     * Works out a short-time Fourier transform (STFT) of a sound: the
+     * power spectrum of each frame, one every <code>hop</code> samples.
+     * Frame <code>i</code> starts at sample <code>i * hop</code>; the
+     * last ones run past the end of the sound, which counts as silence.
+     *
+     * @param sound the sound to analyze
+     * @param size the frame size (a power of two)
+     * @param hop how many samples apart frames start
+     * @param windowType the window to shape each frame with
+     * @return the power at each frequency in each frame, as
+     *         <code>result[frame][bin]</code>
+     * @throws SoundException if the sound's samples can't be read
+     */
+    public static float[][] stft(SimpleSound sound, int size, int hop, int windowType)
+    throws SoundException {
+        if (hop < 1) {
+            throw new IllegalArgumentException("The hop must be at least 1");
+        }
+
+        Spectrum spectrum = new Spectrum(size, windowType);
+        int length = sound.getLengthInFrames();
+        int frames = Math.max(1, (length + hop - 1) / hop);
+        float[][] result = new float[frames][spectrum.getBins()];
+        float[] frame = new float[size];
+        double[] power = new double[spectrum.getBins()];
+
+        for (int i = 0; i < frames; i++) {
+            spectrum.readFrame(sound, i * hop, frame);
+            spectrum.power(frame, 0, power);
+            for (int k = 0; k < power.length; k++) {
+                result[i][k] = (float) power[k];
+            }
+        }
+        return result;
+    }
+
+    /**
+     * Works out the average power spectrum of part of a sound.
+     *
+     * @param sound the sound to analyze
+     * @param start the index of the first sample to use
+     * @param count how many samples to use
+     * @param size the frame size (a power of two)
+     * @param windowType the window to shape each frame with
+     * @return the average power at each frequency
+     * @throws SoundException if the sound's samples can't be read
+     */
+    public static double[] averagePower(SimpleSound sound, int start, int count,
+                                        int size, int windowType)
+    throws SoundException {
+        Spectrum spectrum = new Spectrum(size, windowType);
+        double[] total = new double[spectrum.getBins()];
+        double[] power = new double[spectrum.getBins()];
+        float[] frame = new float[size];
+
+        // Frames overlap by half, and the last one may run past the end
+        int hop = size / 2;
+        int frames = Math.max(1, (count - size + hop - 1) / hop + 1);
+        for (int i = 0; i < frames; i++) {
+            spectrum.readFrame(sound, start + i * hop, frame);
+            spectrum.power(frame, 0, power);
+            for (int k = 0; k < power.length; k++) {
+                total[k] += power[k] / frames;
+            }
+        }
+        return total;
+    }
+
+    /**
+     * Estimates the pitch (the fundamental frequency) of part of a sound,
+     * using the product of its harmonics' powers.  The answer can be
+     * given to <code>freqToNote</code> to find the nearest note.
+     *
+     * @param sound the sound to analyze
+     * @param start the index of the first sample to use
+     * @param count how many samples to use
+     * @return the pitch, in Hz, or 0 if that part of the sound is silent
+     * @throws SoundException if the sound's samples can't be read
+     */
+    public static double estimatePitch(SimpleSound sound, int start, int count)
+    throws SoundException {
+        double rate = sound.getSamplingRate();
+
+        // Use the largest frame that fits, but at least enough to tell
+        // the lowest pitches apart
+        int size = PITCH_FRAME;
+        while (size > 1024 && size > count) {
+            size /= 2;
+        }
+
+        double[] power = averagePower(sound, start, count, size, HANN);
+        double total = 0;
+        for (int k = 0; k < power.length; k++) {
+            total += power[k];
+        }
+        if (total / power.length < SILENCE) {
+            return 0.0;
+        }
+
+        double[] level = new double[power.length];
+        for (int k = 0; k < power.length; k++) {
+            level[k] = Math.log(power[k] + 1e-20);
+        }
+
+        int lowest = Math.max(1, (int) Math.floor(MIN_PITCH * size / rate));
+        int highest = Math.min((power.length - 2) / HARMONICS,
+                               (int) Math.ceil(MAX_PITCH * size / rate));
+        int best = -1;
+        double bestScore = Double.NEGATIVE_INFINITY;
+        for (int k = lowest; k <= highest; k++) {
+            double score = 0;
+            for (int h = 1; h <= HARMONICS; h++) {
+                score += level[k * h];
+            }
+            if (score > bestScore) {
+                bestScore = score;
+                best = k;
+            }
+        }
+        if (best < 0) {
+            return 0.0;
+        }
+
+        // Fit a parabola through the peak and its neighbours to find
+        // where between the bins it really is
+        double left = level[best - 1];
+        double middle = level[best];
+        double right = level[best + 1];
+        double curve = left - 2 * middle + right;
+        double shift = (curve == 0) ? 0 : 0.5 * (left - right) / curve;
+        shift = Math.max(-0.5, Math.min(0.5, shift));
+
+        return (best + shift) * rate / size;
+    }
+}
@@ -1,6 +1,4 @@
 import java.awt.Rectangle;
-import java.awt.image.BufferedImage;
-import java.awt.Robot;
 
 /**
  * Class that is Runnable to start Movie Capture and
@@ -17,7 +15,11 @@ public class StartMovieCapture implements Runnable {
     /** the region to capture */
     private Rectangle region = null;
     /** the active thread */
-    private Thread active = null;
+    private volatile Thread active = null;
+    /** captures the screen */
+    private ScreenFrameSource screen = new ScreenFrameSource();
+    /** the pipeline doing the capture */
+    private volatile CapturePipeline pipeline = null;
 
     /**
      * Constructor that takes the frame sequencer, number of
@@ -36,30 +38,33 @@ public class StartMovieCapture implements Runnable {
 
     /**
      * Method to capture a movie until the stop
-     * method is called and sets the active thread
-     * to null
+     * method is called.  Frames are captured at a steady rate
+     * on another thread while this one hands them to the frame
+     * sequencer, which writes them out in the background.
      */
     public void captureMovie() {
-        boolean done = false;
-        BufferedImage image = null;
-        long startTime = 0;
-        long endTime = 0;
-        int timeToSleep = (int)(1000 / framesPerSecond);
-        int actualTime = timeToSleep;
-        int count = 0;
         Thread current = Thread.currentThread();
-        while (current == active) {
-            try {
-                startTime = System.currentTimeMillis();
-                image = new Robot().createScreenCapture(region);
-                frameSequencer.addFrame(new Picture(image));
-                endTime = System.currentTimeMillis();
-                if (endTime - startTime < timeToSleep) {
-                    Thread.sleep(timeToSleep - (endTime - startTime));
-                }
-            } catch (Exception ex) {
-                System.out.println("caught exception in StartMovieCapture");
-                done = true;
+        if (current != active) {
+            return;
+        }
+        pipeline = new CapturePipeline(screen, frameSequencer);
+        if (active == null) {
+            // stop was called before the pipeline was made
+            return;
+        }
+        Rectangle area = (region != null) ? region : ScreenFrameSource.getScreenArea();
+        boolean wasAsynchronous = frameSequencer.isAsynchronous();
+        if (!wasAsynchronous) {
+            frameSequencer.setAsynchronous(true);
+        }
+        try {
+            pipeline.capture(area, framesPerSecond, -1);
+        } finally {
+            if (wasAsynchronous) {
+                frameSequencer.flush();
+            } else {
+                // this writes out the frames still waiting, too
+                frameSequencer.setAsynchronous(false);
             }
         }
     }
@@ -74,9 +79,14 @@ public class StartMovieCapture implements Runnable {
     }
 
     /**
-     * Method to stop the thread
+     * Method to stop the thread.  Frames already captured are still
+     * written out before the thread ends.
      */
     public void stop() {
         active = null;
+        CapturePipeline current = pipeline;
+        if (current != null) {
+            current.stop();
+        }
     }
-}
\ No newline at end of file
+}
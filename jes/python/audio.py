@@ -1,5 +1,5 @@
 ################################################################################################################
-# audio.py      Version 2.1         09-Jun-2016       Chris Benson and Bill Manaris
+# audio.py      Version 2.2         19-Oct-2026       Chris Benson and Bill Manaris
 #
 ###########################################################################
 #
@@ -27,6 +27,11 @@
 #
 # REVISIONS:
 #
+#   2.2     19-Oct-2026 AudioSample now has a pool of voices (see AudioVoicePool in music.py), so it can sound
+#                       several notes at once - see startVoice(), stopVoice(), and setVoiceStealing().  play() also
+#                       plays on a voice of its own, so it no longer cuts off a loop().  Samples of the same
+#                       (unchanged) file now share their audio data, instead of loading it again.
+#
 #   2.1     09-Jun-2016 (cb) Reverted jSyn imports to global level to fix import problem in some JEM installations.
 #
 #   2.0     26-Dec-2015 (bm,cb) Updated the jSyn engine startup to fix an error with some Windows boxes (actually,
@@ -39,6 +44,7 @@
 #   1.0     30-Oct-2014 (bm)    First draft.
 
 from music import *
+from music import __loadFloatSample__   # (underscore names are not imported by *)
 from math import *
 from java.io import *
 from gui import *
@@ -230,10 +236,8 @@ class jSyn_AudioEngine():
    def add(self, sample):
       """Connects an audio sample to the jSyn lineOut unit."""
 
-      self.synth.add( sample.player )   # add the sample's player to the synth
-      self.synth.add( sample.amplitudeSmoother )  # add the sample's amplitude linearRamp to the synth
-      self.synth.add( sample.panLeft )  # add the sample's left pan control to the synth
-      self.synth.add( sample.panRight ) # add the sample's right pan control to the synth
+      for unit in sample.loopVoice.getUnits() + sample.voicePool.getUnits():   # add each voice's player, amplitude linearRamp, and pan controls
+         self.synth.add( unit )
       self.synth.add( sample.lineOut )  # add the sample's output mixer to the synth
       self.samples.append( sample )     # remember this sample
 
@@ -272,7 +276,7 @@ class AudioSample():
    Supported data formats are WAV or AIF files (16, 24 and 32 bit PCM, and 32-bit float).
    """
 
-   def __init__(self, filename, pitch=A4, volume=127):
+   def __init__(self, filename, pitch=A4, volume=127, voices=8, voiceStealing="oldest"):
 
       # ensure the file exists (jSyn will NOT complain on its own)
       if not os.path.isfile(filename):
@@ -284,63 +288,36 @@ class AudioSample():
       # remember is sample is paused or not - needed for function isPaused()
       self.hasPaused = False
 
-      # load and create the audio sample
-      SampleLoader.setJavaSoundPreferred( False )  # use internal jSyn sound processes
-      datafile = File(self.filename)               # get sound file
-      self.sample = SampleLoader.loadFloatSample( datafile )  # load it as a a jSyn sample
+      # load the audio sample (AudioSamples of the same file share it)
+      self.sample = __loadFloatSample__( self.filename )
       self.channels = self.sample.getChannelsPerFrame()       # get number of channels in sample
 
       # create lineOut unit (it mixes output to computer's audio (DAC) card)
       self.lineOut = LineOut()
 
-      # create panning control (we simulate this using two pan controls, one for the left channel and
-      # another for the right channel) - to pan we adjust their respective pan
-      self.panLeft  = Pan()
-      self.panRight = Pan()
-
-      # NOTE: The two pan controls have only one of their outputs (as their names indicate)
-      # connected to LineOut.  This way, we can set their pan value as we would normally, and not worry
-      # about clipping (i.e., doubling the output amplitude).  Also, this works for both mono and
-      # stereo samples.
-
-      # create sample player (mono or stereo, as needed) and connect to lineOut mixer
-      if self.channels == 1:    # mono audio?
-         self.player = VariableRateMonoReader()                  # create mono sample player
-
-         self.player.output.connect( 0, self.panLeft.input, 0)   # connect single channel to pan control
-         self.player.output.connect( 0, self.panRight.input, 0)
-
-      elif self.channels == 2:  # stereo audio?
-         self.player = VariableRateStereoReader()                # create stereo sample player
-
-         self.player.output.connect( 0, self.panLeft.input, 0)   # connect both channels to pan control
-         self.player.output.connect( 1, self.panRight.input, 0)
-
-      else:
-         raise TypeError( "Can only play mono or stereo samples." )
-
-      # now that we have a player, set the default and current pitches
+      # set the default and current pitches
       self.defaultPitch = pitch                                 # the default pitch of the audio sample
       self.pitch = pitch                                        # remember playback pitch (may be different from default pitch)
       self.frequency = self.__convertPitchToFrequency__(pitch)  # and corresponding frequency
+      self.referenceFrequency = self.frequency                  # frequency the sample plays at its recorded rate
+
+      # create the voices (sample players, with their own amplitude smoother and panning) connected to lineOut
+      # (the pool lets us sound several notes at once - see startVoice())
+      self.voicePool = AudioVoicePool(self.sample, self.lineOut, self.referenceFrequency, voices, voiceStealing)
 
-      # now, connect pan control to mixer
-      self.panLeft.output.connect( 0, self.lineOut.input, 0 )
-      self.panRight.output.connect( 1, self.lineOut.input, 1 )
+      # loop() has a voice of its own (outside the pool, so notes never steal it), controlled by setFrequency(),
+      # setVolume(), etc. - play() starts each playback on a pool voice, so it doesn't cut off a loop
+      self.loopVoice = AudioVoice(self.sample, self.lineOut)
+      self.player            = self.loopVoice.player
+      self.amplitudeSmoother = self.loopVoice.amplitudeSmoother
+      self.panLeft           = self.loopVoice.panLeft
+      self.panRight          = self.loopVoice.panRight
+      self.playVoiceID = None          # voice id of the last play() (see __getPlayVoice__())
 
       # now, that panning is set up, initialize it to center
       self.panning = 63                # ranges from 0 (left) to 127 (right) - 63 is center
       self.setPanning( self.panning )  # and initialize
 
-      # smooth out (linearly ramp) changes in player amplitude (without this, we get clicks)
-      self.amplitudeSmoother = LinearRamp()
-      self.amplitudeSmoother.output.connect( self.player.amplitude )   # connect to player's amplitude
-      self.amplitudeSmoother.input.setup( 0.0, 0.5, 1.0 )              # set minimum, current, and maximum settings for control
-      self.amplitudeSmoother.time.set( 0.0002 )                        # and how many seconds to take for smoothing amplitude changes
-
-      # play at original pitch
-      self.player.rate.set( self.sample.getFrameRate() )
-
       self.volume = volume           # holds current volume (0 - 127)
       self.setVolume( self.volume )  # set the desired volume
 
@@ -357,11 +334,15 @@ class AudioSample():
       Play the sample once from the millisecond 'start' until the millisecond 'start'+'size'
       (size == -1 means to the end). If 'start' and 'size' are omitted, play the complete sample.
       """
-      # for faster response, we restart playing (as opposed to queue at the end)
-      if self.isPlaying():      # is another play is on?
-         self.stop()            # yes, so stop it
+      startFrames = self.__msToFrames__(start)
+      sizeFrames = self.__msToFrames__(size)
+      if size == -1:   # to the end?
+         sizeFrames = -1
+
+      self.lineOut.start()   # make sure we are heard
 
-      self.loop(1, start, size)
+      # play on a voice of its own (so a loop, or an earlier play, keeps sounding)
+      self.playVoiceID = self.voicePool.start(self.frequency, self.volume, self.panning, startFrames, sizeFrames)
 
 
    def loop(self, times = -1, start=0, size=-1):
@@ -387,16 +368,18 @@ class AudioSample():
 
    def stop(self):
       """
-      Stop the sample play.
+      Stop the sample play (including any loop, and notes sounding on other voices).
       """
-      self.player.dataQueue.clear()
+      self.loopVoice.stop()
+      self.voicePool.stopAll()
       self.hasPaused = False          # reset
 
    def isPlaying(self):
       """
-      Returns True if the sample is still playing.
+      Returns True if the sample is still playing (or looping).
       """
-      return self.player.dataQueue.hasMore()
+      playVoice = self.__getPlayVoice__()
+      return self.loopVoice.isPlaying() or (playVoice != None and playVoice.isPlaying())
 
    def isPaused(self):
       """
@@ -431,12 +414,11 @@ class AudioSample():
       """
       Set sample's playback frequency.
       """
-      rateChangeFactor = float(freq) / self.frequency      # calculate change on playback rate
-
       self.frequency = freq                                # remember new frequency
       self.pitch = self.__convertFrequencyToPitch__(freq)  # and corresponding pitch
 
-      self.__setPlaybackRate__(self.__getPlaybackRate__() * rateChangeFactor)   # and set new playback rate
+      # set new playback rate relative to the reference frequency (avoids accumulating rounding errors)
+      self.__setPlaybackRate__(self.getFrameRate() * float(freq) / self.referenceFrequency)
 
    def getFrequency(self):
       """
@@ -477,6 +459,10 @@ class AudioSample():
          self.panLeft.pan.set(panValue)                       # and set it
          self.panRight.pan.set(panValue)
 
+         playVoice = self.__getPlayVoice__()                  # also the last play(), if still sounding
+         if playVoice:
+            playVoice.setPanning( panning )
+
    def getPanning(self):
       """
       Return sample's current panning (panning ranges from 0 - 127).
@@ -494,6 +480,10 @@ class AudioSample():
          amplitude = mapValue(self.volume,0,127,0.0,1.0) # map volume to amplitude
          self.amplitudeSmoother.input.set( amplitude )   # and set it
 
+         playVoice = self.__getPlayVoice__()             # also the last play(), if still sounding
+         if playVoice:
+            playVoice.setVolume( volume )
+
    def getVolume(self):
       """
       Return sample's current volume (volume ranges from 0 - 127).
@@ -501,6 +491,59 @@ class AudioSample():
       return self.volume
 
 
+   ### functions to sound several notes at once (one per voice) ######################
+   def startVoice(self, frequency, volume=127, panning=63):
+      """
+      Start a note at the given frequency (in Hz) on a free voice, and return its voice id.
+      If all voices are busy, one is stolen (see setVoiceStealing()).
+      """
+      self.lineOut.start()   # make sure we are heard (sample may have been created after jSyn started)
+      return self.voicePool.start(frequency, volume, panning)
+
+   def setVoiceVolume(self, voiceID, volume, delay = 0.0002):
+      """
+      Set the volume (0 - 127) of the note started with startVoice().
+      """
+      self.voicePool.setVolume(voiceID, volume, delay)
+
+   def setVoiceEnvelope(self, voiceID, segments):
+      """
+      Play a volume envelope on the note started with startVoice(), given as a list of (duration, level)
+      segments - each ramps to 'level' (0.0 - 1.0, relative to the note volume) in 'duration' seconds.
+      """
+      self.voicePool.setEnvelope(voiceID, segments)
+
+   def setVoicePanning(self, voiceID, panning):
+      """
+      Set the panning (0 - 127) of the note started with startVoice().
+      """
+      self.voicePool.setPanning(voiceID, panning)
+
+   def stopVoice(self, voiceID):
+      """
+      Stop the note started with startVoice() (if it has not been stolen already).
+      """
+      self.voicePool.stop(voiceID)
+
+   def stopFrequency(self, frequency):
+      """
+      Stop the oldest note sounding at the given frequency (in Hz).
+      """
+      self.voicePool.stopFrequency(frequency)
+
+   def setVoiceStealing(self, stealing):
+      """
+      Set which voice is stolen when all are busy - "oldest" or "quietest".
+      """
+      self.voicePool.setStealing(stealing)
+
+   def getVoiceStealing(self):
+      """
+      Return which voice is stolen when all are busy - "oldest" or "quietest".
+      """
+      return self.voicePool.getStealing()
+
+
    ### low-level functions related to FrameRate and PlaybackRate  ######################
    def getFrameRate(self):
       """
@@ -514,12 +557,25 @@ class AudioSample():
       """
       self.player.rate.set( newRate )
 
+      playVoice = self.__getPlayVoice__()   # also the last play(), if still sounding
+      if playVoice:
+         playVoice.player.rate.set( newRate )
+
    def __getPlaybackRate__(self):
       """
       Return the sample's playback rate (e.g., 44100.0 Hz).
       """
       return self.player.rate.get()
 
+   def __getPlayVoice__(self):
+      """
+      Return the voice of the last play(), or None if there is none (or it has been given another note since).
+      """
+      playVoice = None
+      if self.playVoiceID != None:
+         playVoice = self.voicePool.getVoice( self.playVoiceID )
+      return playVoice
+
    def __msToFrames__(self, milliseconds):
       """
       Converts milliseconds to frames based on the frame rate of the sample
@@ -1,5 +1,5 @@
 ################################################################################################################
-# gui.py        Version 3.6        20-Feb-2018     Bill Manaris, Dana Hughes, David Johnson, and Kenneth Hanson
+# gui.py        Version 3.7        19-Oct-2026     Bill Manaris, Dana Hughes, David Johnson, and Kenneth Hanson
 
 ###########################################################################
 #
@@ -35,6 +35,11 @@
 #
 # REVISIONS:
 #
+#   3.7     19-Oct-2026 Icon.setPixel(), setPixels(), and rotate() no longer repaint the whole display - changed pixels
+#                       are collected into a dirty rectangle, which is repainted at most once per frame.  Icon.getPixels()
+#                       and setPixels() now access the image's pixels all at once (instead of one Color per pixel).
+#                       The dirty rectangle is kept by DirtyRegion, which guicontrols' cached controls use, too.
+#
 #   3.6     20-Feb-2018 (bm)  Added guicontrols (simply import them at end). 
 #
 #   3.5     26-Dec-2015 (bm)  Added setX(), getX(), setY(), getY() functions to every object.
@@ -2513,8 +2518,85 @@ def fixWorkingDirForJEM( filename ):
 
 from math import *
 #from java.awt import Rectangle as jRectangle   # used in Icon.rotate()
+from jarray import zeros   # needed to create Java int arrays (used in Icon.setPixels())
+from threading import Lock # needed to collect changes from any thread (see DirtyRegion.__addDirtyRegion__())
+
+REFRESH_DELAY = 1000 / 60   # changes are shown at most this often (in milliseconds), i.e., once per frame
 
-class Icon(JPanel, Widget):
+class DirtyRegion:
+   """
+   Common functionality for widgets that change often (e.g., an Icon's pixels, or a control's value).
+   Changed areas are collected into a dirty rectangle (minX, minY, maxX, maxY), which is refreshed at most
+   once per frame (instead of refreshing the whole display for every change).
+
+   Widgets call __initDirtyRegion__() from their constructor, and __addDirtyRegion__() whenever something
+   changes.  Changes may come from any thread, so the rectangle is only read or changed holding dirtyLock.
+   """
+
+   def __initDirtyRegion__(self):
+      """Sets up the dirty rectangle and the refresh timer (call from the widget's constructor)."""
+
+      self.dirtyRegion = None
+      self.dirtyLock = Lock()
+      self.refreshTimer = Timer(REFRESH_DELAY, self.__refreshDirtyRegion__, [], False)
+
+   def __addDirtyRegion__(self, minX, minY, maxX, maxY):
+      """Adds the given rectangle (in our coordinates) to the area to be refreshed on the next frame."""
+
+      self.dirtyLock.acquire()
+      try:
+         if self.dirtyRegion == None:      # first change in this frame?
+            self.dirtyRegion = (minX, minY, maxX, maxY)
+         else:                             # otherwise, grow the rectangle to include the new one
+            oldMinX, oldMinY, oldMaxX, oldMaxY = self.dirtyRegion
+            self.dirtyRegion = (min(oldMinX, minX), min(oldMinY, minY), max(oldMaxX, maxX), max(oldMaxY, maxY))
+
+         if not self.refreshTimer.isRunning():   # refresh on the next frame (if not already scheduled)
+            self.refreshTimer.start()
+      finally:
+         self.dirtyLock.release()
+
+   def __addDirtyWidget__(self):
+      """Adds the whole widget to the area to be refreshed on the next frame."""
+      self.__addDirtyRegion__(0, 0, self.getWidth() - 1, self.getHeight() - 1)
+
+   def __takeDirtyRegion__(self):
+      """Returns the area changed since the last frame (or None), and starts a new one."""
+
+      # take the rectangle, and start a new one, in one step (so no change made meanwhile is lost)
+      self.dirtyLock.acquire()
+      try:
+         region = self.dirtyRegion
+         self.dirtyRegion = None
+      finally:
+         self.dirtyLock.release()
+
+      return region
+
+   def __refreshDirtyRegion__(self):
+      """Refreshes the area that has changed since the last frame (called by self.refreshTimer)."""
+
+      region = self.__takeDirtyRegion__()
+
+      container = self.getParent()   # (repaint through the container, so that whatever is behind us is redrawn too)
+      if region == None or not self.display or container == None:
+         return
+
+      # keep within the widget
+      minX, minY, maxX, maxY = region
+      minX = max(minX, 0)
+      minY = max(minY, 0)
+      maxX = min(maxX, self.getWidth() - 1)
+      maxY = min(maxY, self.getHeight() - 1)
+
+      if minX <= maxX and minY <= maxY:
+         bounds = self.getBounds()      # where we are in the container
+         container.repaint(bounds.x + minX, bounds.y + minY, maxX - minX + 1, maxY - minY + 1)
+
+      Toolkit.getDefaultToolkit().sync()  # sync graphics for animation (once per frame)
+
+
+class Icon(JPanel, Widget, DirtyRegion):
    """
    Create an image object from provided filename, and resize according to width and height.
    """
@@ -2538,6 +2620,9 @@ class Icon(JPanel, Widget):
       
       self.degrees = 0                   # used for icon rotation 
 
+      # changed pixels are refreshed at most once per frame (see DirtyRegion)
+      self.__initDirtyRegion__()
+
       self.icon = ImageIO.read(File(filename))
       iconWidth = self.icon.getWidth(None)
       iconHeight = self.icon.getHeight(None)
@@ -2648,21 +2733,25 @@ class Icon(JPanel, Widget):
       color = Color(RGBlist[0], RGBlist[1], RGBlist[2])  # create color from RGB values
       self.icon.setRGB(col, row, color.getRGB())
 
-      # some pixels have changed, so refresh display
-      if self.display:
-         self.display.display.repaint()
+      # this pixel has changed, so refresh it (soon)
+      self.__addDirtyRegion__(col, row, col, row)
 
    def getPixels(self):
       """Returns a 2D list of pixels (col, row) - each pixel is a list of RGB values, e.g., [255, 0, 0].""" 
       
+      width  = self.getWidth()
+      height = self.getHeight()
+
+      # get all pixels at once (as packed ARGB ints, row after row)
+      packedPixels = self.icon.getRGB(0, 0, width, height, None, 0, width)
+
       pixels = []                      # initialize list of pixels
       #for row in range(self.height-1, 0, -1):   # load pixels from image      
-      for row in range(0, self.getHeight()):   # load pixels from image      
+      for row in range(0, height):   # load pixels from image      
          pixels.append( [] )              # add another empty row
-         for col in range(self.getWidth()):    # populate row with pixels    
-            # RGBlist = self.getPixel(col, row)   # this works also (but slower)    
-            color = Color(self.icon.getRGB(col, row))  # get pixel's color
-            RGBlist = [color.getRed(), color.getGreen(), color.getBlue()]  # create list of RGB values (0-255)
+         start = row * width              # where this row starts
+         for pixel in packedPixels[start:start + width]:    # populate row with pixels    
+            RGBlist = [(pixel >> 16) & 0xFF, (pixel >> 8) & 0xFF, pixel & 0xFF]  # create list of RGB values (0-255)
             pixels[-1].append( RGBlist )   # add a pixel as (R, G, B) values (0-255, each)
 
       # now, 2D list of pixels has been created, so return it
@@ -2674,18 +2763,28 @@ class Icon(JPanel, Widget):
       height = len(pixels)        # get number of rows
       width  = len(pixels[0])     # get number of columns (assume all columns have same length
       
+      # pack all pixels as opaque ARGB ints (row after row), so we can set them at once
+      packedPixels = zeros(width * height, 'i')
+      i = 0
       #for row in range(self.height-1, 0, -1):   # iterate through all rows      
       for row in range(0, height):   # iterate through all rows     
-         for col in range(width):    # iterate through every column on this row
-         
-            RGBlist = pixels[row][col]
+         for RGBlist in pixels[row][:width]:    # iterate through every column on this row
             #self.setPixel(col, row, RGBlist)   # this works also (but slower)
-            color = Color(RGBlist[0], RGBlist[1], RGBlist[2])  # create color from RGB values
-            self.icon.setRGB(col, row, color.getRGB())
+            packedPixels[i] = (RGBlist[0] << 16) | (RGBlist[1] << 8) | RGBlist[2] | -16777216  # (alpha is 0xFF)
+            i = i + 1
 
-      # some pixels have changed, so refresh display
-      if self.display:
-         self.display.display.repaint()
+      self.icon.setRGB(0, 0, width, height, packedPixels, 0, width)
+
+      # these pixels have changed, so refresh them (soon)
+      self.__addDirtyRegion__(0, 0, width - 1, height - 1)
+
+   def __addDirtyRegion__(self, minX, minY, maxX, maxY):
+      """Adds the rectangle of pixels from (minX, minY) to (maxX, maxY) to the ones to be refreshed on the next frame."""
+
+      if self.degrees % 360 != 0:    # rotated?
+         minX, minY, maxX, maxY = (0, 0, self.getWidth() - 1, self.getHeight() - 1)   # changed pixels may be anywhere on the icon
+
+      DirtyRegion.__addDirtyRegion__(self, minX, minY, maxX, maxY)
 
    def setSize(self, width, height):
       """
@@ -2797,8 +2896,8 @@ class Icon(JPanel, Widget):
 #      self.setPreferredSize(Dimension(newWidth, newHeight))
 #      print newWidth, newHeight
 
-      if self.display:
-         self.display.display.repaint()
+      # refresh the icon (soon)
+      self.__addDirtyWidget__()
       
 
    def paint(self, graphics2DContext):
@@ -2817,7 +2916,7 @@ class Icon(JPanel, Widget):
       #graphics2DContext.drawImage(icon, 0, 0, None)
       graphics2DContext.drawImage(self.icon, 0, 0, None)
       
-      Toolkit.getDefaultToolkit().sync()  # sync graphics for animation 
+      # NOTE:  Graphics are synced once per frame (see __refreshDirtyRegion__()), not on every paint.
 
 #   def paint(self, graphicsContext):
 #      """
@@ -1,5 +1,5 @@
 ################################################################################################################
-# guicontrols.py        Version 1.11     17-Mar-2018      Bill Manaris, Marge Marshall, Seth Stoudenmier, and Robert Ziehr
+# guicontrols.py        Version 1.12     19-Oct-2026      Bill Manaris, Marge Marshall, Seth Stoudenmier, and Robert Ziehr
 #
 
 ###########################################################################
@@ -32,6 +32,11 @@
 #
 # REVISIONS:
 #
+#   1.12    19-Oct-2026 HFader, VFader, Rotary, and XYPad now draw their background and outline once, into images
+#                       (see CachedControl), and draw only their value on each paint.  setValue() / setPosition() no
+#                       longer repaint the whole display - the changed area is repainted, at most once per frame.
+#                       (To see how many fader paints per second this gets, run working-on-jes/control-benchmarks.py.)
+#
 #   1.11    17-Mar-2018 (bm, mm) Updated xyPad to remove a couple of drawing bugs and improve its customizability.
 #
 #   1.10    22-Feb-2017 (bm, mm) Updated Push, Toggle drawing to remove a bug.
@@ -141,7 +146,66 @@
 
 from gui import *
 
-class HFader(Rectangle):
+class CachedControl(DirtyRegion):
+   """
+   Common functionality for controls whose background and outline never change.  These are drawn once into
+   images, which are then copied on each paint, so that only the control's value has to be drawn every time.
+   When the value changes, only the area of the control that changed is repainted, at most once per frame
+   (see DirtyRegion).
+
+   Controls provide paintBackground(), paintValue(), and paintOutline() (drawn in this order), and
+   optionally paintFront(), which is drawn on top of the outline.  Their paint() calls paintCached().
+   """
+
+   def __initCache__(self):
+      """Sets up the cached images and the refresh timer (call from the control's constructor)."""
+
+      self.backgroundImage = None    # the background and outline, drawn when first needed
+      self.outlineImage = None
+
+      self.__initDirtyRegion__()     # changed areas are refreshed at most once per frame
+
+   def paintFront(self, graphics2DContext):
+      """Paints whatever goes on top of the outline (nothing, unless a control needs it)."""
+      pass
+
+   def paintCached(self, graphics2DContext):
+      """
+      Paint me on the display, from the cached background and outline, with the current value in between.
+      """
+
+      width  = self.getWidth()
+      height = self.getHeight()
+
+      # (re)draw the cached parts, the first time or if we have been resized
+      if self.backgroundImage == None or self.backgroundImage.getWidth() != width or self.backgroundImage.getHeight() != height:
+         self.backgroundImage = self.__drawLayer__(self.paintBackground, width, height)
+         self.outlineImage = self.__drawLayer__(self.paintOutline, width, height)
+
+      graphics2DContext.drawImage(self.backgroundImage, 0, 0, None)
+
+      graphics2DContext.setRenderingHint(RenderingHints.KEY_ANTIALIASING, RenderingHints.VALUE_ANTIALIAS_ON)
+      self.paintValue(graphics2DContext)
+
+      graphics2DContext.drawImage(self.outlineImage, 0, 0, None)
+
+      self.paintFront(graphics2DContext)
+
+      # NOTE:  Graphics are synced once per frame (see __refreshDirtyRegion__()), not on every paint.
+
+   def __drawLayer__(self, paintFunction, width, height):
+      """Returns a new (transparent) image with 'paintFunction' drawn on it."""
+
+      image = BufferedImage(max(width, 1), max(height, 1), BufferedImage.TYPE_INT_ARGB)
+      graphics2DContext = image.createGraphics()
+      graphics2DContext.setRenderingHint(RenderingHints.KEY_ANTIALIASING, RenderingHints.VALUE_ANTIALIAS_ON)
+      paintFunction(graphics2DContext)
+      graphics2DContext.dispose()
+
+      return image
+
+
+class HFader(Rectangle, CachedControl):
    """
    A horizontal fader specified by two diagonal corners, it min and max values, the function to call when the user interacts with it,
    its various colors (background, foreground, and outline), and its outline thickness.
@@ -189,6 +253,9 @@ class HFader(Rectangle):
       # create internal fader value (holds internal range, which depends on GUI x, y coordinates)
       self.faderValue = 0
 
+      # set up the cached background and outline, and the refresh timer
+      self.__initCache__()
+
       # set fader's initial value
       self.setValue(startValue)
 
@@ -218,11 +285,14 @@ class HFader(Rectangle):
       internalValue = mapValue(externalValue, self.minValue, self.maxValue, 0, self.endX_JPanel)
 
       # and set fader value
+      oldValue = self.faderValue
       self.faderValue = internalValue
 
-      # if we have (been assigned to) a display, let's repaint ourselves to update the changed fader fill
-      if self.display != None:
-         self.display.contentPane.repaint()
+      # refresh the part of the fader fill that changed (soon)
+      margin = self.thickness + 1
+      left  = self.startX_JPanel + min(oldValue, internalValue)
+      right = self.startX_JPanel + max(oldValue, internalValue)
+      self.__addDirtyRegion__(left - margin, 0, right + margin, self.getHeight() - 1)
 
       # also call event handler (if any) with the new value in external world coordinates - very important!
       if self.eventHandler != None:
@@ -249,32 +319,36 @@ class HFader(Rectangle):
 
    def paint(self, graphics2DContext):
       """
-      Paint me on the display.  A rectangle fader consists of three rectangles, the background rectangle,
-      the volume-fill rectangle, and the outline rectangle.  These are drawn in this order to create the
-      visual effect of a unified control.
+      Paint me on the display.  A rectangle fader consists of three rectangles, the background rectangle, the
+      volume-fill rectangle, and the outline rectangle.  These are drawn in this order to create the visual effect
+      of a unified control.  The background and outline are cached (see CachedControl).
       """
 
-      graphics2DContext.setRenderingHint(RenderingHints.KEY_ANTIALIASING, RenderingHints.VALUE_ANTIALIAS_ON)
+      self.paintCached(graphics2DContext)
 
-      # set rounded ends
-      graphics2DContext.setStroke( BasicStroke(self.thickness, BasicStroke.CAP_ROUND, BasicStroke.JOIN_ROUND) )
+   def paintBackground(self, graphics2DContext):
+      """Paints the background rectangle (cached)."""
 
-      # draw background rectangle
       graphics2DContext.setPaint(self.background)
       graphics2DContext.fillRect(self.startX_JPanel, self.startY_JPanel, self.endX_JPanel, self.endY_JPanel+1) # +1 to fix blemish at the bottom
 
-      # draw volume-filled rectangle
+   def paintValue(self, graphics2DContext):
+      """Paints the volume-filled rectangle."""
+
       graphics2DContext.setPaint(self.foreground)
       graphics2DContext.fillRect(self.startX_JPanel, self.startY_JPanel, self.faderValue, self.endY_JPanel)
 
-      # draw outline rectangle
+   def paintOutline(self, graphics2DContext):
+      """Paints the outline rectangle (cached)."""
+
+      # set rounded ends
+      graphics2DContext.setStroke( BasicStroke(self.thickness, BasicStroke.CAP_ROUND, BasicStroke.JOIN_ROUND) )
+
       graphics2DContext.setPaint(self.outline)
       graphics2DContext.drawRect(self.startX_JPanel, self.startY_JPanel, self.endX_JPanel, self.endY_JPanel+1) # +1 to fix blemish at the bottom
 
-      Toolkit.getDefaultToolkit().sync()  # sync graphics for animation
 
-
-class VFader(Rectangle):
+class VFader(Rectangle, CachedControl):
    """
    A vertical fader specified by two diagonal corners, min and max values, a start value, a function to call when the user
    interacts with it, its various colors (background, foreground, and outline), and its outline thickness.
@@ -321,6 +395,9 @@ class VFader(Rectangle):
       # create initial fader value (holds internal range, which depends on GUI x, y coordinates)
       self.faderValue = 0
 
+      # set up the cached background and outline, and the refresh timer
+      self.__initCache__()
+
       # set fader's initial value
       self.setValue(startValue)
 
@@ -349,11 +426,14 @@ class VFader(Rectangle):
       internalValue = mapValue(externalValue, self.minValue, self.maxValue, 0, self.endY_JPanel)
 
       # and set fader value
+      oldValue = self.faderValue
       self.faderValue = internalValue
 
-      # if we have (been assigned to) a display, let's repaint ourselves to update the changed fader fill
-      if self.display != None:
-         self.display.contentPane.repaint()
+      # refresh the part of the fader fill that changed (soon) - the fill's top moves down as the value grows smaller
+      margin = self.thickness + 1
+      top    = (self.endY_JPanel-self.startY_JPanel) - max(oldValue, internalValue) + self.thickness
+      bottom = (self.endY_JPanel-self.startY_JPanel) - min(oldValue, internalValue) + self.thickness
+      self.__addDirtyRegion__(0, top - margin, self.getWidth() - 1, bottom + margin)
 
       # also call event handler (if any) with the new value in external world coordinates - very important!
       if self.eventHandler != None:
@@ -381,32 +461,36 @@ class VFader(Rectangle):
 
    def paint(self, graphics2DContext):
       """
-      Paint me on the display.  A rectangle fader consists of three rectangles, the background rectangle,
-      the volume-fill rectangle, and the outline rectangle.  These are drawn in this order to create the
-      visual effect of a unified control.
+      Paint me on the display.  A rectangle fader consists of three rectangles, the background rectangle, the
+      volume-fill rectangle, and the outline rectangle.  These are drawn in this order to create the visual effect
+      of a unified control.  The background and outline are cached (see CachedControl).
       """
 
-      graphics2DContext.setRenderingHint(RenderingHints.KEY_ANTIALIASING, RenderingHints.VALUE_ANTIALIAS_ON)
+      self.paintCached(graphics2DContext)
 
-      # set rounded ends
-      graphics2DContext.setStroke( BasicStroke(self.thickness, BasicStroke.CAP_ROUND, BasicStroke.JOIN_ROUND) )
+   def paintBackground(self, graphics2DContext):
+      """Paints the background rectangle (cached)."""
 
-      # draw background rectangle
       graphics2DContext.setPaint(self.background)
       graphics2DContext.fillRect(self.startX_JPanel, self.startY_JPanel, self.endX_JPanel, self.endY_JPanel+1) # +1 to fix blemish at the bottom
 
-      # draw volume-filled rectangle
+   def paintValue(self, graphics2DContext):
+      """Paints the volume-filled rectangle."""
+
       graphics2DContext.setPaint(self.foreground)
       graphics2DContext.fillRect(self.startX_JPanel, (self.endY_JPanel-self.startY_JPanel)-self.faderValue+self.thickness, self.endX_JPanel, self.endY_JPanel)
 
-      # draw outline rectangle
+   def paintOutline(self, graphics2DContext):
+      """Paints the outline rectangle (cached)."""
+
+      # set rounded ends
+      graphics2DContext.setStroke( BasicStroke(self.thickness, BasicStroke.CAP_ROUND, BasicStroke.JOIN_ROUND) )
+
       graphics2DContext.setPaint(self.outline)
       graphics2DContext.drawRect(self.startX_JPanel, self.startY_JPanel, self.endX_JPanel, self.endY_JPanel+1) # +1 to fix blemish at the bottom
 
-      Toolkit.getDefaultToolkit().sync()  # sync graphics for animation
 
-
-class Rotary(Arc):
+class Rotary(Arc, CachedControl):
    """
    A rotary is is oriented vertically (with 0 and max at bottom).  It is specified by two diagonal corners,
    a min and max values, the function to call when the user interacts with it,
@@ -481,6 +565,9 @@ class Rotary(Arc):
       # create initial rotary angle; set to 0 so it starts on self.startAngle
       self.rotaryAngle = 0
 
+      # set up the cached background and outline, and the refresh timer
+      self.__initCache__()
+
       # set rotary's initial value
       self.setValue(startValue)
 
@@ -512,9 +599,8 @@ class Rotary(Arc):
       if 0 <= internalValue <= self.relativeEndAngle:
          self.rotaryAngle = internalValue
 
-      # if we have (been assigned to) a display, let's repaint ourselves to update the changed fader fill
-      if self.display != None:
-         self.display.contentPane.repaint()
+      # refresh the rotary (soon)
+      self.__addDirtyWidget__()
 
       # also call event handler (if any) - very important!
       if self.eventHandler != None:
@@ -562,25 +648,32 @@ class Rotary(Arc):
 
    def paint(self, graphics2DContext):
       """
-      Paint me on the display.  A rotary consists of three arcs, the background arc,
-      the volume-fill arc, and the outline arc.  These are drawn in this order to create the
-      visual effect of a unified control.
+      Paint me on the display.  A rotary consists of three arcs, the background arc, the volume-fill arc, and the
+      outline arc. These are drawn in this order to create the visual effect of a unified control.  The background
+      and outline are cached (see CachedControl).
       """
 
-      graphics2DContext.setRenderingHint(RenderingHints.KEY_ANTIALIASING, RenderingHints.VALUE_ANTIALIAS_ON)
+      self.paintCached(graphics2DContext)
 
-      # set rounded ends
-      graphics2DContext.setStroke( BasicStroke(self.thickness, BasicStroke.CAP_ROUND, BasicStroke.JOIN_ROUND) )
+   def paintBackground(self, graphics2DContext):
+      """Paints the background arc (cached)."""
 
-      # draw background arc
       graphics2DContext.setPaint(self.background)
       #graphics2DContext.fillArc(self.startX_JPanel, self.startY_JPanel, self.endX_JPanel, self.endY_JPanel, self.startAngle+self.thickness, -self.relativeEndAngle-self.thickness)
       graphics2DContext.fillArc(self.startX_JPanel, self.startY_JPanel, self.endX_JPanel, self.endY_JPanel, self.startAngle, self.endAngle-self.startAngle-self.thickness)
 
-      # draw volume-filled arc
+   def paintValue(self, graphics2DContext):
+      """Paints the volume-filled arc."""
+
       graphics2DContext.setPaint(self.foreground)
       graphics2DContext.fillArc(self.startX_JPanel, self.startY_JPanel, self.endX_JPanel, self.endY_JPanel, self.startAngle, -int(self.rotaryAngle))
 
+   def paintOutline(self, graphics2DContext):
+      """Paints the outline arc, and the two lines that complete it (cached)."""
+
+      # set rounded ends
+      graphics2DContext.setStroke( BasicStroke(self.thickness, BasicStroke.CAP_ROUND, BasicStroke.JOIN_ROUND) )
+
       # draw outline arc
       graphics2DContext.setPaint(self.outline)
       graphics2DContext.drawArc(self.startX_JPanel, self.startY_JPanel, self.endX_JPanel, self.endY_JPanel, self.startAngle, self.endAngle-self.startAngle-self.thickness/2)
@@ -591,8 +684,7 @@ class Rotary(Arc):
       # This involves some trigonometry (in order to keep everything relative to self.startAngle)
 
       # first, calculate startAngle's arc distance from vertical axis (in radians)
-      # (NOTE: This is expensive to do it in here, as this calculation is repeated with *every* update.
-      #        However, it is ugly to do it elsewhere.)
+      # (NOTE: This is only done when the outline is cached, not with every update.)
       angleFromVertical = radians(270-self.startAngle)
 
       # draw line to the left of vertical axis
@@ -607,8 +699,6 @@ class Rotary(Arc):
       #graphics2DContext.setPaint(self.outline)
       #graphics2DContext.fillArc(self.endX_JPanel * 5/16, self.endY_JPanel * 6/16, self.endX_JPanel * 3/8, self.endY_JPanel * 3/8, 0, 360)
 
-      Toolkit.getDefaultToolkit().sync()  # sync graphics for animation
-
 
 
 class Toggle(Rectangle):
@@ -816,7 +906,7 @@ class Push(Rectangle):
 
 
 
-class XYPad(Rectangle):
+class XYPad(Rectangle, CachedControl):
    """
    An XY-pad specified by two diagonal corners, a function to call when the user
    interacts with it, its various colors (background, foreground, and outline), its outline thickness, and tracker radius.
@@ -861,6 +951,9 @@ class XYPad(Rectangle):
       else:
          self.crosshairsThickness = crosshairsThickness
 
+      # set up the cached background and outline, and the refresh timer
+      self.__initCache__()
+
 
       # register callback function to update XYPad view
       self.onMouseDown( self.__updateXYPad__ )
@@ -886,9 +979,8 @@ class XYPad(Rectangle):
       self.xPos = newX
       self.yPos = newY
 
-      # if we have (been assigned to) a display, let's repaint ourselves to update the changed fader fill
-      if self.display != None:
-         self.display.contentPane.repaint()
+      # refresh the pad (soon) - the crosshairs span all of it
+      self.__addDirtyWidget__()
 
       # also call event handler (if any) - very important!
       if self.eventHandler != None:
@@ -910,26 +1002,37 @@ class XYPad(Rectangle):
 
    def paint(self, graphics2DContext):
       """
-      Paint me on the display.  An XY Pad consists of five parts. The background rectangle, the outline rectangle, the small rectangle tracker, and the two crossing lines. These are drawn in this order to create the visual effect of a unified control.
+      Paint me on the display.  An XY Pad consists of five parts. The background rectangle, the small circle
+      tracker, the outline rectangle, and the two crossing lines. These are drawn in this order to create the visual
+      effect of a unified control.  The background and outline are cached (see CachedControl).
       """
 
-      graphics2DContext.setRenderingHint(RenderingHints.KEY_ANTIALIASING, RenderingHints.VALUE_ANTIALIAS_ON)
+      self.paintCached(graphics2DContext)
 
-      # set outline thickness and rounded ends
-      graphics2DContext.setStroke( BasicStroke(self.outlineThickness, BasicStroke.CAP_ROUND, BasicStroke.JOIN_ROUND) )
+   def paintBackground(self, graphics2DContext):
+      """Paints the background rectangle (cached)."""
 
-      # draw background rectangle
       graphics2DContext.setPaint(self.background)
       graphics2DContext.fillRect(self.startX_JPanel, self.startY_JPanel, self.endX_JPanel, self.endY_JPanel+1) # +1 to fix blemish at the bottom
 
-      # draws small center circle (tracker)
+   def paintValue(self, graphics2DContext):
+      """Paints the small center circle (tracker)."""
+
       graphics2DContext.setPaint(self.foreground)
       graphics2DContext.fillOval(self.xPos-self.trackerRadius/2, self.yPos-self.trackerRadius/2, self.trackerRadius, self.trackerRadius+1)
 
-      # draw outline rectangle
+   def paintOutline(self, graphics2DContext):
+      """Paints the outline rectangle (cached)."""
+
+      # set outline thickness and rounded ends
+      graphics2DContext.setStroke( BasicStroke(self.outlineThickness, BasicStroke.CAP_ROUND, BasicStroke.JOIN_ROUND) )
+
       graphics2DContext.setPaint(self.outline)
       graphics2DContext.drawRect(self.startX_JPanel, self.startY_JPanel, self.endX_JPanel, self.endY_JPanel+1) # +1 to fix blemish at the bottom
 
+   def paintFront(self, graphics2DContext):
+      """Paints the crosshairs lines (on top of the outline)."""
+
       # set crosshairs thickness and rounded ends
       graphics2DContext.setStroke( BasicStroke(self.crosshairsThickness, BasicStroke.CAP_ROUND, BasicStroke.JOIN_ROUND) )
 
@@ -939,8 +1042,6 @@ class XYPad(Rectangle):
          graphics2DContext.drawLine(self.startX_JPanel, self.yPos+1, self.endX_JPanel, self.yPos+1)  # horizontal line
          graphics2DContext.drawLine(self.xPos, self.startY_JPanel+1, self.xPos, self.endY_JPanel+1)  # vertical line
 
-      Toolkit.getDefaultToolkit().sync()  # sync graphics for animation
-
 
 
 
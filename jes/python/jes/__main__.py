@@ -8,6 +8,17 @@ Powers up JES.
 :license:   GNU GPL v2 or later, see jes/help/JESCopyright.txt for details
 """
 
+import sys
+
+# Batch mode doesn't need the GUI at all.
+
+if len(sys.argv) > 1 and sys.argv[1] == '--batch':
+    from java.lang import System
+    from jes.core.batch import main as batchMain
+    # (System.exit, so threads from stopped programs can't keep us alive)
+    System.exit(batchMain(sys.argv[2:]))
+
+
 # Super early startup
 
 from jes.platform.macosx import installOpenHandler, setDockIcon
@@ -17,7 +28,6 @@ setDockIcon()
 # Now, actually start loading stuff
 
 import JESstartup
-import sys
 from jes.program import JESProgram
 
 def usageError():
@@ -14,7 +14,7 @@ import Stoppable
 import StoppableInput
 import StoppableOutput
 from jes.gui.commandwindow.redirect import RedirectStdio
-from jes.gui.components.threading import threadsafe
+from jes.gui.components.threading import asynchronous, threadsafe
 
 class InterpreterControl(Stoppable):
     def __init__(self, gui, interpreter):
@@ -41,7 +41,7 @@ class InterpreterControl(Stoppable):
         StoppableInput.setThingToStop(self)
         StoppableOutput.setThingToStop(self)
 
-    @threadsafe
+    @asynchronous
     def beforeUnlock(self, terp, mode, **_):
         StoppableInput.setThingToStop(None)
         StoppableOutput.setThingToStop(None)
@@ -53,7 +53,7 @@ class InterpreterControl(Stoppable):
         self.gui.setRunning(False)
         self.gui.stopWork()
 
-    @threadsafe
+    @asynchronous
     def showException(self, terp, excRecord, mode, **_):
         msg = excRecord.getExceptionMsg()
         lineno = excRecord.getLineNumber()
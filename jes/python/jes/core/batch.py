@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+jes.core.batch
+==============
+This runs lots of programs (like a section's worth of submissions)
+without the JES window, writing what happened to each one as a line
+of JSON.
+
+The JES startup namespace is built only once. Each program then runs
+in a fresh copy of it, so nothing one program defines is visible to
+the next. Programs run on a pool of worker threads, each with its own
+interpreter, and any program that runs too long is stopped.
+
+The copy is shallow, though, and every worker shares the same imported
+modules. State kept in a module (like the media path set by
+`setMediaPath`, which lives in media's globals) carries over from one
+program to the next, and with more than one worker, programs running
+at the same time share it. So by default (``--jobs 1``) programs run
+one at a time, and more workers should only be used for programs that
+leave such state alone.
+
+While the batch runs, anything printed outside a program (by stray
+threads, or Java code) goes to stderr, so that when the results go to
+stdout, stdout holds nothing but the JSON lines.
+
+:copyright: (C) 2026 the JES contributors
+:license:   GNU GPL v2 or later, see jes/help/JESCopyright.txt for details
+"""
+from __future__ import with_statement
+
+import JESResources
+import argparse
+import json
+import sys
+import time
+from java.lang import System
+from Queue import Queue
+from threading import Lock, Thread, local
+from jes.core.codecache import CodeCache
+from jes.core.interpreter import Interpreter
+
+#: How long (in seconds) a program and its driver may run by default.
+DEFAULT_TIMEOUT = 30.0
+
+#: How long (in seconds) to wait for a program to die after stopping it.
+STOP_GRACE = 5.0
+
+USAGE = "jes --batch [options] PROGRAM [PROGRAM ...]"
+
+
+class ThreadOutput(object):
+    """
+    Stands in for `sys.stdout` and `sys.stderr`. Text written from a
+    thread that has been given a buffer goes there; anything else goes
+    to the original stream.
+    """
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = local()
+
+    def setBuffer(self, buffer):
+        self.local.buffer = buffer
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        if buffer is None:
+            self.stream.write(text)
+        else:
+            buffer.append(text)
+
+    def flush(self):
+        if getattr(self.local, 'buffer', None) is None:
+            self.stream.flush()
+
+
+class BatchRun(object):
+    """
+    What happened when one program (and the driver) ran.
+    """
+    def __init__(self, filename, driver):
+        self.filename = filename
+        self.driver = driver
+        self.status = 'ok'
+        self.error = None
+        self.errorLine = None
+        self.output = []
+        self.seconds = 0.0
+
+    def toJSON(self):
+        return json.dumps({
+            'file':         self.filename,
+            'driver':       self.driver,
+            'status':       self.status,
+            'error':        self.error,
+            'line':         self.errorLine,
+            'output':       ''.join(self.output),
+            'seconds':      round(self.seconds, 3),
+        })
+
+
+class BatchRunner(object):
+    """
+    Runs programs on a pool of worker threads, in copies of a namespace
+    that was only set up once.
+    """
+    def __init__(self, driver=None, workers=1, timeout=DEFAULT_TIMEOUT):
+        self.driver = driver
+        self.workers = max(1, workers)
+        self.timeout = timeout
+
+        # The driver is compiled once, and shared by every worker.
+        self.codeCache = CodeCache()
+        self.stdout = ThreadOutput(sys.stdout)
+
+        self.startup = Interpreter()
+        self.startup.codeCache = self.codeCache
+        self.startup.initialize(initializeStartup)
+
+    def newInterpreter(self):
+        """
+        Makes an interpreter whose initial namespace is the startup one.
+        """
+        terp = Interpreter()
+        terp.codeCache = self.codeCache
+        terp.initialize(lambda terp: terp.namespace.update(self.startup.initialNamespace))
+
+        terp.beforeRun.connect(self._beforeRun)
+        terp.onException.connect(self._onException)
+        return terp
+
+    def runAll(self, filenames, results):
+        """
+        Runs every program, and writes one line of JSON for each to the
+        `results` stream (in the order they finish). Returns the number
+        of programs that didn't finish cleanly.
+        """
+        queue = Queue()
+        for filename in filenames:
+            queue.put(filename)
+
+        writeLock = Lock()
+        failures = [0]
+
+        def work():
+            terp = self.newInterpreter()
+            while True:
+                try:
+                    filename = queue.get_nowait()
+                except Exception:
+                    return
+
+                run, terp = self.runOne(terp, filename)
+                with writeLock:
+                    results.write(run.toJSON() + '\n')
+                    results.flush()
+                    if run.status != 'ok':
+                        failures[0] += 1
+
+        oldStreams = sys.stdout, sys.stderr
+        sys.stdout = sys.stderr = self.stdout
+        try:
+            threads = [Thread(target=work, name='batch-worker-%d' % n)
+                       for n in range(self.workers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.stdout, sys.stderr = oldStreams
+
+        return failures[0]
+
+    def runOne(self, terp, filename):
+        """
+        Runs one program, then the driver, in a fresh copy of the startup
+        namespace. Returns the run, and the interpreter to use next
+        (which is a new one if the program had to be stopped).
+        """
+        run = BatchRun(filename, self.driver)
+        terp.quickReset()
+        terp.batchRun = run
+
+        started = time.time()
+        deadline = started + self.timeout
+
+        for stage in filter(None, [filename, self.driver]):
+            thread = terp.runFile(stage)
+            remaining = deadline - time.time()
+            if remaining > 0:
+                thread.join(long(remaining * 1000))
+
+            if thread.isAlive():
+                run.status = 'timeout'
+                run.error = 'Stopped after %g seconds' % self.timeout
+                self._stop(terp, thread)
+                # The stopped thread may still hold the old interpreter.
+                terp = self.newInterpreter()
+                break
+            elif run.status != 'ok':
+                # Don't run the driver if the program itself failed.
+                break
+
+        run.seconds = time.time() - started
+        terp.batchRun = None
+        return run, terp
+
+    def _stop(self, terp, thread):
+        try:
+            terp.stopThread()
+        except RuntimeError:
+            # It finished on its own after all.
+            pass
+        thread.join(long(STOP_GRACE * 1000))
+
+    def _beforeRun(self, terp, mode):
+        # This is sent on the interpreter's own thread, so it's where
+        # the program's output has to be caught.
+        self.stdout.setBuffer(terp.batchRun.output)
+
+    def _onException(self, terp, mode, excRecord):
+        run = terp.batchRun
+        run.status = 'error'
+        run.error = excRecord.getExceptionMsg()
+        run.errorLine = excRecord.getLineNumber()
+
+
+def initializeStartup(terp):
+    startup = JESResources.getPathTo('python/jes/user-startup.py')
+    terp.runFile(startup, False).join()
+
+
+def main(args):
+    """
+    Runs the batch mode with these command-line arguments, and returns
+    the exit status.
+    """
+    parser = argparse.ArgumentParser(prog='jes --batch', usage=USAGE)
+    parser.add_argument('programs', nargs='+', metavar='PROGRAM',
+                        help="the programs to run")
+    parser.add_argument('-d', '--driver',
+                        help="a file to run after each program, "
+                             "in the same namespace")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="how many programs to run at once (they share "
+                             "module state, like the media path)")
+    parser.add_argument('-t', '--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help="seconds each program (and the driver) may run")
+    parser.add_argument('-o', '--output',
+                        help="where to write the results (default: stdout)")
+    options = parser.parse_args(args)
+
+    # Keep stdout for the results, and send everything else printed
+    # meanwhile (from Python or Java) to stderr.
+    realStdout, javaStdout = sys.stdout, System.out
+    sys.stdout = sys.stderr
+    System.setOut(System.err)
+    try:
+        runner = BatchRunner(options.driver, options.jobs, options.timeout)
+
+        if options.output is None:
+            failures = runner.runAll(options.programs, realStdout)
+        else:
+            with open(options.output, 'w') as results:
+                failures = runner.runAll(options.programs, results)
+    finally:
+        sys.stdout = realStdout
+        System.setOut(javaStdout)
+
+    return 1 if failures else 0
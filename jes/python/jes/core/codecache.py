@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+jes.core.codecache
+==================
+This keeps the code compiled from loaded programs, so that loading a
+program that hasn't changed doesn't compile it again.
+
+Compiled code is found by a hash of the program's text and filename.
+It's kept in memory, and (if a cache directory is given) on disk as the
+JVM class Jython compiles it to, so it survives restarting JES.
+
+:copyright: (C) 2026 the JES contributors
+:license:   GNU GPL v2 or later, see jes/help/JESCopyright.txt for details
+"""
+from __future__ import with_statement
+
+import hashlib
+import os
+import os.path
+import sys
+from threading import Lock
+
+try:
+    from java.io import ByteArrayInputStream
+    from org.python.core import BytecodeLoader, imp as JythonImp
+    from org.python.core.util import StringUtil
+except ImportError:
+    # Not on Jython, so we can't keep compiled code on disk.
+    BytecodeLoader = None
+
+#: How many programs' code is kept in memory.
+MAX_MEMORY_ENTRIES = 32
+
+#: How many programs' code is kept on disk.
+MAX_DISK_ENTRIES = 256
+
+
+class CodeCache(object):
+    """
+    Compiles programs, reusing the code compiled earlier for the same
+    text and filename.
+    """
+    def __init__(self, cacheDir=None):
+        self.cacheDir = cacheDir
+        self.lock = Lock()
+        self.entries = {}
+        self.recent = []        # keys, least recently used first
+
+    def lookup(self, source, filename):
+        """
+        Returns the code compiled earlier from this text and filename,
+        or `None` if it hasn't been compiled yet.
+        """
+        key = self._key(source, filename)
+        with self.lock:
+            code = self.entries.get(key)
+            if code is not None:
+                self._remember(key, code)
+                return code
+
+        code = self._loadFromDisk(key, filename)
+        if code is not None:
+            with self.lock:
+                self._remember(key, code)
+        return code
+
+    def compile(self, source, filename):
+        """
+        Returns the code for this text and filename, compiling it only if
+        it hasn't been compiled before. (Syntax errors are raised as usual.)
+        """
+        code = self.lookup(source, filename)
+        if code is not None:
+            return code
+
+        key = self._key(source, filename)
+        code = self._compileToDisk(key, source, filename)
+        if code is None:
+            code = compile(source, filename, 'exec')
+
+        with self.lock:
+            self._remember(key, code)
+        return code
+
+    def clear(self):
+        """
+        Forgets all the code kept in memory.
+        """
+        with self.lock:
+            self.entries = {}
+            self.recent = []
+
+    def _key(self, source, filename):
+        digest = hashlib.sha1()
+        digest.update(sys.version)
+        digest.update('\0' + os.path.abspath(filename) + '\0')
+        digest.update(source)
+        return digest.hexdigest()
+
+    def _remember(self, key, code):
+        if key in self.entries:
+            self.recent.remove(key)
+        self.entries[key] = code
+        self.recent.append(key)
+
+        while len(self.recent) > MAX_MEMORY_ENTRIES:
+            del self.entries[self.recent.pop(0)]
+
+    def _pathFor(self, key):
+        return os.path.join(self.cacheDir, key + '.class')
+
+    def _loadFromDisk(self, key, filename):
+        if self.cacheDir is None or BytecodeLoader is None:
+            return None
+
+        path = self._pathFor(key)
+        if not os.path.isfile(path):
+            return None
+
+        try:
+            with open(path, 'rb') as fd:
+                data = fd.read()
+            code = BytecodeLoader.makeCode('jesprogram$py', StringUtil.toBytes(data), filename)
+            os.utime(path, None)    # (so it's trimmed last)
+            return code
+        except:
+            # A damaged cache file is as good as none.
+            return None
+
+    def _compileToDisk(self, key, source, filename):
+        # Compiles the program to a JVM class, and keeps the class on disk.
+        # Returns None if that can't be done, so the caller compiles as usual.
+        if self.cacheDir is None or BytecodeLoader is None:
+            return None
+
+        try:
+            stream = ByteArrayInputStream(StringUtil.toBytes(source))
+            data = JythonImp.compileSource('jesprogram', stream, filename)
+            code = BytecodeLoader.makeCode('jesprogram$py', data, filename)
+        except SyntaxError:
+            raise
+        except:
+            return None
+
+        try:
+            if not os.path.isdir(self.cacheDir):
+                os.makedirs(self.cacheDir)
+            with open(self._pathFor(key), 'wb') as fd:
+                fd.write(StringUtil.fromBytes(data))
+            self._trimDisk()
+        except (IOError, OSError):
+            # We still have the code, it just won't outlive JES.
+            pass
+
+        return code
+
+    def _trimDisk(self):
+        paths = [os.path.join(self.cacheDir, name)
+                 for name in os.listdir(self.cacheDir) if name.endswith('.class')]
+        if len(paths) > MAX_DISK_ENTRIES:
+            paths.sort(key=os.path.getmtime)
+            for path in paths[:len(paths) - MAX_DISK_ENTRIES]:
+                os.remove(path)
@@ -13,6 +13,7 @@ import sys
 from .debugger import Debugger
 from blinker import NamedSignal
 from codeop import compile_command
+from jes.core.codecache import CodeCache
 from java.lang import Thread
 from threading import Lock, Semaphore
 from .exceptionrecord import JESExceptionRecord
@@ -31,6 +32,8 @@ class Interpreter(object):
         self.debugger = Debugger(self)
         self.debugMode = False
 
+        self.codeCache = CodeCache()
+
         self.namespace = {}
         self.initialNamespace = {}
         self.initialNames = set()
@@ -81,17 +84,24 @@ class Interpreter(object):
         """
         Restores the context that was present after the last call to
         initialize. (Changes to mutable objects will be included!)
+
+        The copy is shallow: modules (and anything else mutable) are the
+        same objects as before, and interpreters on other threads share
+        them too.
         """
         self.namespace = self.initialNamespace.copy()
 
-    def runFile(self, filename, setDunderFile=True):
+    def runFile(self, filename, setDunderFile=True, source=None):
         """
         Executes a file in the interpreter context (in a separate thread).
+        The file is compiled through the code cache, so if it hasn't
+        changed since it last ran, it isn't compiled again.
 
-        (setDunderFile controls whether the __file__ variable is available.)
+        (setDunderFile controls whether the __file__ variable is available.
+        If the file's text has already been read, pass it as source.)
         """
         extraVars = {'__file__': filename} if setDunderFile else {}
-        thread = ExecFileThread(self, filename, extraVars)
+        thread = ExecFileThread(self, filename, extraVars, source)
         return self._launchThread(thread)
 
     def runCodeFragment(self, fragment):
@@ -173,19 +183,27 @@ class InterpreterThread(Thread):
     def tryStop(self):
         self.stopSignal = True
         from jes.gui.commandwindow.prompt import promptService
-        promptService.commandWindow.cancelPrompt()
+        if promptService.commandWindow is not None:
+            promptService.commandWindow.cancelPrompt()
         self.stop()
 
 
 class ExecFileThread(InterpreterThread):
     mode = 'execfile'
 
-    def __init__(self, interpreter, filename, extraVars):
+    def __init__(self, interpreter, filename, extraVars, source=None):
         super(ExecFileThread, self).__init__(interpreter, extraVars)
         self.filename = filename
+        self.source = source
 
     def execute(self):
-        execfile(self.filename, self.interpreter.namespace)
+        source = self.source
+        if source is None:
+            with open(self.filename, 'rU') as fd:
+                source = fd.read()
+
+        code = self.interpreter.codeCache.compile(source, self.filename)
+        exec code in self.interpreter.namespace
 
 
 class ExecThread(InterpreterThread):
@@ -96,5 +96,6 @@ class Watcher(object):
             self.recordsCropped = True
 
         self.records.append(record)
-        self.onRecorded.send(self, record=record, cropped=cropCount)
+        self.onRecorded.send(self, record=record, cropped=cropCount,
+                             count=len(self.records))
 
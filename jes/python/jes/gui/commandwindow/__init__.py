@@ -14,9 +14,30 @@ from .history import CommandHistory
 from .pane import CommandWindowPane
 from .prompt import promptService
 from jes.gui.components.actions import methodAction
-from jes.gui.components.threading import threadsafe
+from jes.gui.components.threading import coalescing, threadsafe
 from media import * # Debugging
 
+def _mergeDisplay(queued, new):
+    # Text printed in a row in the same style is displayed all at once.
+    # The pieces are collected in a list, and joined once (_joinDisplay),
+    # so long runs of prints aren't copied over and over.
+    self, text, style = queued
+    if new[2] != style:
+        return None
+    elif isinstance(text, list):
+        text.append(new[1])
+        return queued
+    else:
+        return (self, [text, new[1]], style)
+
+
+def _joinDisplay(queued):
+    self, text, style = queued
+    if isinstance(text, list):
+        text = ''.join(text)
+    return (self, text, style)
+
+
 class CommandWindowController(object):
     """
     Encapsulates the command window GUI, editing logic, and history.
@@ -44,11 +65,12 @@ class CommandWindowController(object):
     def requestFocus(self):
         self._textpane.requestFocus()
 
-    @threadsafe
+    @coalescing(_mergeDisplay, _joinDisplay)
     def display(self, text, style):
         """
         Writes text to the command window. If the command window is in
         prompt mode, it prints it, then repeats the prompt.
+        Callers on other threads don't wait for it to be written.
 
         :param text:    The text to print.
         :param style:   The name of the style to print it in.
@@ -4,12 +4,29 @@ jes.gui.components.threading
 ============================
 Utilities for dealing with multithreading and the Swing EDT.
 
+Calls made to the GUI from other threads (like the interpreter thread)
+go through a single dispatcher, which runs them on the EDT in the order
+they were made. Calls that need a result (`threadsafe`) wait for the EDT;
+calls that don't (`asynchronous`, `coalescing`) are queued, and the queue
+is run at most once per frame. If too many calls are waiting (a thread
+printing in a tight loop, say), the caller waits for the EDT too.
+
 :copyright: (C) 2014 Matthew Frazier and Mark Guzdial
 :license:   GNU GPL v2 or later, see jes/help/JESCopyright.txt for details
 """
+from __future__ import absolute_import  # (so we get the standard threading module)
+import traceback
 from functools import wraps
-from java.lang import Runnable
-from javax.swing import SwingUtilities
+from threading import Lock
+from java.lang import Runnable, RuntimeException
+from javax.swing import SwingUtilities, Timer
+
+#: How long (in milliseconds) queued calls may wait before they are run.
+FRAME_DELAY = 1000 // 60
+
+#: How many calls (counting merged ones) may wait to be run, before
+#: callers have to wait for the EDT.
+MAX_QUEUED_CALLS = 1000
 
 class FunctionCall(Runnable):
     def __init__(self, fn, args, kwargs):
@@ -42,6 +59,127 @@ class FunctionCall(Runnable):
             return self.rv
 
 
+class AsyncFunctionCall(FunctionCall):
+    """
+    A call nobody waits for. Since there is no one to raise its
+    exceptions to, they are printed instead.
+
+    If it has a `finish` callable, the (possibly merged) positional
+    arguments are passed through it just before the call.
+    """
+    def __init__(self, fn, args, kwargs, key=None, finish=None):
+        FunctionCall.__init__(self, fn, args, kwargs)
+        self.key = key
+        self.finish = finish
+
+    def run(self):
+        self.started = True
+        try:
+            if self.finish is not None:
+                self.args = self.finish(self.args)
+            self.rv = self.fn(*self.args, **self.kwargs)
+        except:
+            traceback.print_exc()
+        finally:
+            self.done = True
+
+
+class UIDispatcher(object):
+    """
+    Runs calls from other threads on the EDT, in the order they were made.
+
+    Asynchronous calls are queued, and the whole queue is run by a timer
+    at most `delay` milliseconds later. A call with a coalescing key is
+    merged into the call queued just before it, if that one has the same
+    key. Synchronous calls run the queue right away, so that they see
+    the effects of all calls made before them.
+
+    Once `maxQueued` calls (counting merged ones) are waiting, further
+    asynchronous calls wait for the EDT like synchronous ones, so the
+    queue can't grow without bound.
+    """
+    def __init__(self, delay=FRAME_DELAY, maxQueued=MAX_QUEUED_CALLS):
+        self.lock = Lock()
+        self.queue = []
+        self.queued = 0         # calls waiting, counting merged ones
+        self.maxQueued = maxQueued
+        self.timer = Timer(delay, lambda event: self.drain())
+        self.timer.setRepeats(False)
+
+    def invokeAsync(self, fn, args, kwargs, key=None, merge=None,
+                    finish=None):
+        """
+        Queues a call to `fn`, and returns right away (unless the queue
+        is full, in which case it waits for the EDT to run it).
+
+        :param key:     If not `None`, and the last queued call has the
+                        same key, the two calls are merged.
+        :param merge:   A callable taking the positional arguments of the
+                        queued call and the new one, and returning the
+                        arguments of the merged call (or `None` if they
+                        can't be merged).
+        :param finish:  A callable taking the positional arguments of the
+                        queued call (merged or not) when it is run, and
+                        returning the ones to call `fn` with.
+        """
+        if SwingUtilities.isEventDispatchThread():
+            self.drain()
+            fn(*args, **kwargs)
+            return
+
+        with self.lock:
+            full = self.queued >= self.maxQueued
+            if not full:
+                self.queued += 1
+                last = self.queue[-1] if self.queue else None
+                if key is not None and getattr(last, 'key', None) == key:
+                    merged = merge(last.args, args)
+                    if merged is not None:
+                        last.args = merged
+                        last.kwargs = kwargs
+                        return
+
+                self.queue.append(AsyncFunctionCall(fn, args, kwargs, key,
+                                                    finish))
+
+        if full:
+            # Back pressure: wait until the EDT has caught up.
+            self.invokeAndWait(fn, args, kwargs)
+        elif not self.timer.isRunning():
+            self.timer.start()
+
+    def invokeAndWait(self, fn, args, kwargs):
+        """
+        Runs `fn` on the EDT (after everything queued before it), waits
+        for it to finish, and returns its result.
+        """
+        if SwingUtilities.isEventDispatchThread():
+            self.drain()
+            return fn(*args, **kwargs)
+
+        task = FunctionCall(fn, args, kwargs)
+        with self.lock:
+            self.queue.append(task)
+
+        SwingUtilities.invokeAndWait(FunctionCall(self.drain, (), {}))
+        return task.getResult()
+
+    def drain(self):
+        """
+        Runs all the queued calls. This must be called on the EDT.
+        """
+        with self.lock:
+            calls = self.queue
+            self.queue = []
+            self.queued = 0
+
+        for call in calls:
+            call.run()
+
+
+dispatcher = UIDispatcher()
+
+
 def threadCheck(fn):
     @wraps(fn)
     def decorated(*args, **kwargs):
@@ -58,12 +196,11 @@ def invokeLater(fn, *args, **kwargs):
 
 
 def invokeThreadsafe(fn, *args, **kwargs):
-    if SwingUtilities.isEventDispatchThread():
-        return fn(*args, **kwargs)
-    else:
-        task = FunctionCall(fn, args, kwargs)
-        SwingUtilities.invokeAndWait(task)
-        return task.getResult()
+    return dispatcher.invokeAndWait(fn, args, kwargs)
+
+
+def invokeAsync(fn, *args, **kwargs):
+    dispatcher.invokeAsync(fn, args, kwargs)
 
 
 def threadsafe(fn):
@@ -74,10 +211,43 @@ def threadsafe(fn):
     return decorated
 
 
+def asynchronous(fn):
+    """
+    Like `threadsafe`, but callers from other threads don't wait for the
+    EDT. The decorated function always returns `None`.
+    """
+    @wraps(fn)
+    def decorated(*args, **kwargs):
+        dispatcher.invokeAsync(fn, args, kwargs)
+
+    return decorated
+
+
+def coalescing(merge, finish=None):
+    """
+    Like `asynchronous`, but consecutive queued calls to the decorated
+    method on the same object are merged with `merge`. It's given the
+    positional arguments (including `self`) of the queued call and the
+    new one, and returns the arguments for the merged call, or `None`
+    if these two calls can't be merged.
+
+    If `finish` is given, the queued arguments go through it once, just
+    before the call is run (e.g. to join pieces `merge` collected).
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def decorated(self, *args, **kwargs):
+            dispatcher.invokeAsync(fn, (self,) + args, kwargs,
+                                   (fn, id(self)), merge, finish)
+
+        return decorated
+
+    return decorator
+
+
 def runnable(fn):
     @wraps(fn)
     def decorated(*args, **kwargs):
         return FunctionCall(fn, args, kwargs)
 
     return decorated
-
@@ -13,7 +13,7 @@ import JESResources
 from java.awt import Insets
 from java.util import Hashtable
 from javax.swing import JPanel, BoxLayout, JSlider, JButton, JLabel
-from jes.gui.components.threading import threadsafe
+from jes.gui.components.threading import asynchronous, threadsafe
 
 class DebugControlPanel(JPanel):
     BUTTON_SIZE = (50, 50)
@@ -78,18 +78,18 @@ class DebugControlPanel(JPanel):
         if self.debugger.speed != value:
             self.debugger.setSpeed(value)
 
-    @threadsafe
+    @asynchronous
     def _showSpeedSetting(self, debugger, newSpeed, **_):
         if self.slider.getValue() != newSpeed:
             self.slider.setValue(newSpeed)
 
-    @threadsafe
+    @asynchronous
     def _lockControls(self, debugger, **_):
         self.debugPanel.watchVariable.enabled = False
         self.debugPanel.unwatchVariable.enabled = False
         self.debugPanel.fullSpeed.enabled = True
 
-    @threadsafe
+    @asynchronous
     def _unlockControls(self, debugger, **_):
         self.debugPanel.watchVariable.enabled = True
         self.debugPanel.unwatchVariable.enabled = True
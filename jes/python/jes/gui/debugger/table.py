@@ -12,11 +12,17 @@ from java.awt import Color
 from java.lang import Object
 from javax.swing import JLabel, JTable
 from javax.swing.table import AbstractTableModel, TableCellRenderer
-from jes.gui.components.threading import threadsafe
+from jes.gui.components.threading import asynchronous, coalescing
 
 CROP_MESSAGE = "# only the last %d steps are displayed"
 
 
+def _mergeFramesAdded(queued, new):
+    # Rows added in a row are reported all at once, as of the newest.
+    self, watcher, added, cropped, count = queued
+    return (self, watcher, added + new[2], cropped + new[3], new[4])
+
+
 class WatcherTable(JTable):
     def __init__(self, watcher):
         model = self.watcherModel = WatcherTableModel(watcher)
@@ -94,32 +100,31 @@ class WatcherTableModel(AbstractTableModel):
         else:
             raise ValueError("Java asked for nonexistent column %d" % col)
 
-    @threadsafe
+    @asynchronous
     def _varsChanged(self, watcher, var, **_):
         self.fireTableStructureChanged()
 
-    @threadsafe
-    def _frameAdded(self, watcher, record, cropped, **_):
-        if cropped:
-            if not self.displayedCropNotification:
-                self.displayedCropNotification = True
-                if cropped == 1:
-                    # Equivalent to inserting and deleting the first row.
-                    self.fireTableRowsUpdated(0, 0)
-                else:
-                    self.fireTableRowsUpdated(0, 0)
-                    self.fireTableRowsDeleted(1, cropped - 1)
-            else:
-                # These ranges are inclusive.
-                # If 1 was cropped, we get 1, 1. 2 gives us 1, 2, and so on.
-                self.fireTableRowsDeleted(1, cropped)
+    def _frameAdded(self, watcher, record, cropped, count, **_):
+        self._framesAdded(watcher, 1, cropped, count)
 
-        lastIndex = len(watcher.records) - 1
+    @coalescing(_mergeFramesAdded)
+    def _framesAdded(self, watcher, added, cropped, count):
+        if cropped:
+            # The records added may have been cropped themselves, so
+            # just tell the table to start over.
+            self.displayedCropNotification = True
+            self.fireTableDataChanged()
+            return
+
+        # These ranges are inclusive.  (They go by the number of records
+        # when the last one was added, since more may have been added by
+        # now, which will be reported next.)
+        lastIndex = count - 1
         if self.displayedCropNotification:
             lastIndex = lastIndex + 1
-        self.fireTableRowsInserted(lastIndex, lastIndex)
+        self.fireTableRowsInserted(lastIndex - added + 1, lastIndex)
 
-    @threadsafe
+    @asynchronous
     def _framesCleared(self, watcher, **_):
         self.displayedCropNotification = False
         self.fireTableDataChanged()
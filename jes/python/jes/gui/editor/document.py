@@ -22,9 +22,12 @@ import java.awt as awt
 import javax.swing as swing
 import java.time as time
 import HighlightingStyledDocument as HighlightingStyledDocument
+import bisect
 import keyword
 import string
 import java.lang.System as System
+from java.lang import StringBuffer
+from java.util.regex import Matcher, Pattern
 from .undoableedit import UndoableEdit
 
 WORD_BREAKS = [' ', '\n', '\t', '[', ']', '{', '}', ',', '\'', '-', '+', '=',
@@ -64,6 +67,8 @@ NUMBER_COLOR_L = awt.Color(150, 90, 90)
 MATCH_COLOR_L = awt.Color(200, 200, 50)
 
 MATCH_BACK_COLOR = awt.Color(50, 120, 250, 127)
+SEARCH_PAINTER = swing.text.DefaultHighlighter.DefaultHighlightPainter(
+    ERROR_LINE_BACKGROUND_COLOR)
 BACKGROUND_COLOR = awt.Color(41, 44, 51, 0)
 
 
@@ -209,6 +214,10 @@ class JESEditorDocument(HighlightingStyledDocument):
         self.highlightLineStart = -1
         self.highlightLineLen = -1
 
+        # Search matches, and the highlights for the ones being shown.
+        self.searchMatches = []
+        self.searchTags = []
+        self.watchedViewport = None
 
     def setDarkMode(self, enable):
         if enable:
@@ -301,6 +310,8 @@ class JESEditorDocument(HighlightingStyledDocument):
             self.removeErrorHighlighting()
         if self.highlightLineStart >= 0:
             self.removeLineHighlighting()
+        if self.searchMatches or self.searchTags:
+            self.clearSearchHighlights()
 
         canPlaceClosingChar = offset == self.getLength() or not self.getText(offset, 1).isalnum()
         if str == ':':
@@ -431,6 +442,8 @@ class JESEditorDocument(HighlightingStyledDocument):
             self.removeErrorHighlighting()
         if self.highlightLineStart >= 0:
             self.removeLineHighlighting()
+        if self.searchMatches or self.searchTags:
+            self.clearSearchHighlights()
         self.editor.modified = 1
         self.editor.gui.loadButton.enabled = 1
         self.editor.gui.saveButton.enabled = 1
@@ -591,26 +604,8 @@ class JESEditorDocument(HighlightingStyledDocument):
         if self.errorLineStart >= 0:
             self.removeErrorHighlighting()
 
-        # Search for the start offset of the error line
-        docText = self.getText(0, self.getLength())
-
-        line = 1
-        offset = 0
-
-        while line < lineNumber:
-            offset = docText.find('\n', offset) + 1
-            line += 1
-
-        # Search for the end offset of the error line
-        #offset += 1
-        endOffset = docText.find('\n', offset)
-
-        if endOffset == -1:
-            endOffset = len(docText)
-
         # Set error line position and length object variables
-        self.errorLineStart = offset
-        self.errorLineLen = endOffset - offset
+        self.errorLineStart, self.errorLineLen = self.getLineBounds(lineNumber)
 
         # Set the correct text attribute for the error line
         self.setCharacterAttributes(self.errorLineStart, self.errorLineLen,
@@ -651,85 +646,250 @@ class JESEditorDocument(HighlightingStyledDocument):
 # Parameters:
 #      -lineNumber: number of the line that should be highlighted
 # Description:
-#     When this function is called, the specified line will be highlighted so
-#     that the user can tell which line contains an error.
+#     When this function is called, the caret moves to the start of the
+#     specified line, so that it's visible.
 ##########################################################################
 
     def gotoLine(self, lineNumber):
-        # Search for the start offset of the error line
-        docText = self.getText(0, self.getLength())
+        # Set target line position and length object variables
+        self.targetLineStart, self.targetLineLen = self.getLineBounds(lineNumber)
 
-        line = 1
-        offset = 0
+        # Set cursor to target line to ensure that the error line will be
+        # visible
+        self.editor.setCaretPosition(self.targetLineStart)
 
-        while line < lineNumber:
-            offset = docText.find('\n', offset) + 1
-            line += 1
+##########################################################################
+# Function name: getLineBounds
+# Parameters:
+#      -lineNumber: number of the line (starting at 1)
+# Return:
+#     The offset where that line starts, and its length (without the
+#     newline). Line numbers past either end are moved to the nearest line.
+# Description:
+#     The document's root element keeps the start of every line up to
+#     date as the text changes, so this doesn't need to look at the text.
+##########################################################################
+    def getLineBounds(self, lineNumber):
+        root = self.getDefaultRootElement()
+        index = min(max(lineNumber - 1, 0), root.getElementCount() - 1)
+        element = root.getElement(index)
 
-        # Search for the end offset of the target line
-        #offset += 1
-        endOffset = docText.find('\n', offset)
+        start = element.getStartOffset()
+        end = min(element.getEndOffset() - 1, self.getLength())
+        return start, end - start
 
-        if endOffset == -1:
-            endOffset = len(docText)
+##########################################################################
+# Function name: compileSearch
+# Parameters:
+#      -toFind: the text (or regular expression) to search for
+#      -regex: whether toFind is a (Java) regular expression
+#      -matchCase: whether upper and lower case letters must match
+# Return:
+#     A java.util.regex.Pattern for the search.
+##########################################################################
+    def compileSearch(self, toFind, regex=False, matchCase=True):
+        flags = 0
+        if not regex:
+            flags |= Pattern.LITERAL
+        if not matchCase:
+            flags |= Pattern.CASE_INSENSITIVE | Pattern.UNICODE_CASE
+        return Pattern.compile(toFind, flags)
+
+    def getSegment(self, offset=0, length=None):
+        # A Segment is a view of the document's own characters, so the
+        # search can read them without copying the text into a string.
+        if length is None:
+            length = self.getLength() - offset
+        segment = swing.text.Segment()
+        self.getText(offset, length, segment)
+        return segment
 
-        # Set target line position and length object variables
-        self.targetLineStart = offset
-        self.targetLineLen = endOffset - offset
+##########################################################################
+# Function name: findNext
+# Parameters:
+#      -toFind: the text (or regular expression) to search for
+#      -forward: whether to search after the caret (or before it)
+#      -regex, matchCase: as for compileSearch
+# Return:
+#     The (start, end) offsets of the match, or None if there wasn't one.
+# Description:
+#     Finds the next match after (or before) the caret, starting again
+#     from the other end of the document if it has to, highlights it,
+#     and moves the caret to it.
+##########################################################################
+    def findNext(self, toFind, forward=True, regex=False, matchCase=True):
+        if not toFind:
+            return None
 
-        # Set cursor to target line to ensure that the error line will be
-        # visible
-        self.editor.setCaretPosition(self.targetLineStart)
+        matcher = self.compileSearch(toFind, regex, matchCase).matcher(self.getSegment())
+        caret = self.editor.getCaretPosition()
+        found = None
 
-    def searchForward(self, toFind):
-        try:
-            offset = self.editor.getCaretPosition()
-            text = self.getText(offset, self.getLength() - offset)
-            location = text.find(toFind)
-            if location != -1:
-                # Highlight Text
-                self.setCharacterAttributes(0,
-                                            self.getLength(),
-                                            self.textAttrib,
-                                            0)
-                self.setCharacterAttributes(location + offset,
-                                            len(toFind),
-                                            self.errorLineAttrib,
-                                            0)
-                self.editor.setCaretPosition(location + offset + len(toFind))
+        if forward:
+            if matcher.find(caret) or matcher.find(0):
+                found = (matcher.start(), matcher.end())
+        else:
+            # Take the last match that starts before the caret;
+            # if there isn't one, the last match in the document.
+            before = last = None
+            while matcher.find():
+                last = (matcher.start(), matcher.end())
+                if last[0] < caret:
+                    before = last
+                elif before is not None:
+                    break
+            found = before or last
+
+        self.clearSearchHighlights()
+        if found is not None:
+            start, end = found
+            self.addSearchHighlight(start, end)
+            if forward:
+                self.editor.setCaretPosition(end)
             else:
-                if self.editor.getCaretPosition() > 1:
-                    self.editor.setCaretPosition(1)
-                    self.searchForward(toFind)
-        except:
-            print "Exception thrown in searchForward"
-            import sys
-            a, b, c = sys.exc_info()
-            print a, b, c
+                self.editor.setCaretPosition(start)
+        return found
 
-    def searchBackward(self, toFind):
-        try:
-            offset = self.editor.getCaretPosition()
-            text = self.getText(0, offset)
-            location = text.rfind(toFind)
-            if location != -1:
-                # Unhighlight Text
-                self.setCharacterAttributes(0,
-                                            self.getLength(),
-                                            self.textAttrib,
-                                            0)
-                # Highlight Text
-                self.setCharacterAttributes(location,
-                                            len(toFind),
-                                            self.errorLineAttrib,
-                                            0)
-                self.editor.setCaretPosition(location)
-            else:
-                if self.editor.getCaretPosition() < self.getLength():
-                    self.editor.setCaretPosition(self.getLength())
-                    self.searchBackward(toFind)
-        except:
-            import sys
-            a, b, c = sys.exc_info()
-            print a, b, c
-            print "Exception thrown in searchBackward"
+    def searchForward(self, toFind, regex=False, matchCase=True):
+        return self.findNext(toFind, True, regex, matchCase)
+
+    def searchBackward(self, toFind, regex=False, matchCase=True):
+        return self.findNext(toFind, False, regex, matchCase)
+
+##########################################################################
+# Function name: findAll
+# Parameters:
+#      -toFind: the text (or regular expression) to search for
+#      -regex, matchCase: as for compileSearch
+# Return:
+#     A list of (start, end) offsets of every match.
+# Description:
+#     Finds every match in the document. Only the matches that are
+#     scrolled into view are highlighted (and the rest are highlighted
+#     when they are scrolled to).
+##########################################################################
+    def findAll(self, toFind, regex=False, matchCase=True):
+        self.clearSearchHighlights()
+        if not toFind:
+            return []
+
+        matcher = self.compileSearch(toFind, regex, matchCase).matcher(self.getSegment())
+        matches = []
+        while matcher.find():
+            if matcher.end() == matcher.start():
+                continue
+            matches.append((matcher.start(), matcher.end()))
+
+        self.searchMatches = matches
+        self.watchViewport()
+        self.highlightVisibleMatches()
+        return matches
+
+##########################################################################
+# Function name: replaceAll
+# Parameters:
+#      -toFind: the text (or regular expression) to search for
+#      -replacement: what to replace each match with (when regex is set,
+#                    $1 and so on refer to groups, as in Java)
+#      -regex, matchCase: as for compileSearch
+# Return:
+#     The number of matches that were replaced.
+# Description:
+#     Replaces every match as a single edit, so that one undo puts all
+#     of them back.
+##########################################################################
+    def replaceAll(self, toFind, replacement, regex=False, matchCase=True):
+        self.clearSearchHighlights()
+        if not toFind:
+            return 0
+
+        if not regex:
+            replacement = Matcher.quoteReplacement(replacement)
+
+        matcher = self.compileSearch(toFind, regex, matchCase).matcher(self.getSegment())
+        buffer = StringBuffer()
+        count = 0
+        first = last = None
+
+        while matcher.find():
+            if first is None:
+                first = matcher.start()
+            last = matcher.end()
+            matcher.appendReplacement(buffer, replacement)
+            count += 1
+        matcher.appendTail(buffer)
+
+        if count == 0:
+            return 0
+
+        # Only the stretch from the first match to the last one changes.
+        oldText = self.getText(first, last - first)
+        newText = buffer.substring(first, buffer.length() - (self.getLength() - last))
+        self.replaceRange(first, oldText, newText)
+        return count
+
+    def replaceRange(self, offset, oldText, newText):
+        # Swaps oldText (at offset) for newText, as one significant undo
+        # event, without the typing conveniences insertString adds.
+        if self.errorLineStart >= 0:
+            self.removeErrorHighlighting()
+        if self.highlightLineStart >= 0:
+            self.removeLineHighlighting()
+        if self.searchMatches or self.searchTags:
+            self.clearSearchHighlights()
+
+        self.editor.modified = 1
+        self.editor.gui.loadButton.enabled = 1
+        self.editor.gui.saveButton.enabled = 1
+
+        self.lastUndoTime = None
+        self.editor.gui.editorChanged()
+        self.undoManager.addEdit(
+            UndoableEdit(self, 1, REPLACE_EVENT, offset, newText, oldText))
+
+        self.editor.matchingCharPos.append(-1)
+        HighlightingStyledDocument.remove(self, offset, len(oldText))
+        HighlightingStyledDocument.insertString(self, offset, newText, self.textAttrib)
+        self.editor.setCaretPosition(offset + len(newText))
+        self.editor.setTitleModified(True)
+
+    def addSearchHighlight(self, start, end):
+        tag = self.editor.getHighlighter().addHighlight(start, end, SEARCH_PAINTER)
+        self.searchTags.append(tag)
+
+    def clearSearchHighlights(self):
+        highlighter = self.editor.getHighlighter()
+        for tag in self.searchTags:
+            highlighter.removeHighlight(tag)
+        self.searchTags = []
+        self.searchMatches = []
+
+    def watchViewport(self):
+        if self.watchedViewport is None:
+            viewport = swing.SwingUtilities.getAncestorOfClass(
+                swing.JViewport, self.editor)
+            if viewport is not None:
+                viewport.addChangeListener(lambda event: self.highlightVisibleMatches())
+                self.watchedViewport = viewport
+
+    def highlightVisibleMatches(self):
+        if not self.searchMatches:
+            return
+
+        highlighter = self.editor.getHighlighter()
+        for tag in self.searchTags:
+            highlighter.removeHighlight(tag)
+        self.searchTags = []
+
+        visible = self.editor.getVisibleRect()
+        top = self.editor.viewToModel(visible.getLocation())
+        bottom = self.editor.viewToModel(
+            awt.Point(visible.x + visible.width, visible.y + visible.height))
+
+        index = bisect.bisect_left(self.searchMatches, (top, 0))
+        if index > 0 and self.searchMatches[index - 1][1] > top:
+            index -= 1
+        for start, end in self.searchMatches[index:]:
+            if start > bottom:
+                break
+            self.addSearchHighlight(start, end)
@@ -30,10 +30,13 @@ JES_API_SECTIONS = [
                   'addRectFilled', 'addText', 'addTextWithStyle', 'copyInto', 'duplicatePicture', 'getHeight', 'getWidth',
                   'getPixel', 'getPixels', 'getPixelAt', 'makePicture', 'makeEmptyPicture', 'makeStyle', 'show', 'repaint',
                   'writePictureTo', 'openPictureTool', 'setAllPixelsToAColor', 'explore']),
-    ('Sound', ['blockingPlay', 'duplicateSound', 'getDuration', 'getLength', 'getNumSamples', 'getSampleObjectAt', 'getSamples', 'getSampleValue', 'getSampleValueAt',
-               'getSamplingRate', 'getSound', 'makeEmptySound', 'makeEmptySoundBySeconds', 'makeSound', 'play', 'playNote',
+    ('Sound', ['appendSound', 'blockingPlay', 'changeVolume', 'clipSound', 'closeSoundWriter', 'crossfadeSounds',
+               'duplicateSound', 'echoSound', 'fadeIn', 'fadeOut', 'getDuration', 'getLength', 'getNumSamples', 'getPitch', 'getSampleObjectAt', 'getSamples', 'getSampleValue',
+               'getSampleValueAt', 'getSamplingRate', 'getSound', 'getSpectrogram', 'getSpectrum', 'insertSound',
+               'makeEmptySound', 'makeEmptySoundBySeconds', 'makeSound', 'mixSounds', 'normalizeSound', 'play', 'playNote',
                #           'playInRange', 'blockingPlayInRange', 'playAtRateInRange', 'blockingPlayAtRateInRange',
-               'setSampleValue', 'setSampleValueAt', 'stopPlaying', 'writeSoundTo', 'openSoundTool', 'explore'])]
+               'openSoundWriter', 'resampleSound', 'reverseSound', 'setSampleValue', 'setSampleValueAt', 'stopPlaying',
+               'writeSoundTo', 'openSoundTool', 'explore'])]
 
 
 def buildJESFunctionsMenu(action):
@@ -36,6 +36,7 @@ import Pixel
 from java.awt import Event
 from java.awt.event import ActionListener, FocusListener, KeyEvent
 from java.lang import Short, System, Thread
+from java.util.regex import PatternSyntaxException
 from javax.swing import Action, UIManager, SwingUtilities
 
 from jes.gui.commandwindow import CommandWindowController
@@ -254,8 +255,11 @@ class JESUI(swing.JFrame, FocusListener):
         self.linefield = swing.JTextField()
         self.searchFrame = None
         self.searchfield = swing.JTextField()
+        self.replacefield = swing.JTextField()
         self.up = swing.JRadioButton("Search Up")
         self.down = swing.JRadioButton("Search Down", 1)
+        self.matchCase = swing.JCheckBox("Match Case", 1)
+        self.useRegex = swing.JCheckBox("Regular Expression")
 
         splitterPane.orientation = swing.JSplitPane.VERTICAL_SPLIT
         splitterPane.setDividerSize(SPLITTER_SIZE)
@@ -1373,10 +1377,14 @@ class JESUI(swing.JFrame, FocusListener):
     def search(self):
         if self.searchFrame == None:
             self.searchFrame = swing.JFrame("Search for Text")
-            self.searchFrame.contentPane.layout = awt.GridLayout(3, 2)
-            self.searchFrame.size = (200, 100)
+            self.searchFrame.contentPane.layout = awt.GridLayout(5, 2)
+            self.searchFrame.size = (320, 200)
             findbutton = swing.JButton("Find", preferredSize=(100, 20),
                                        actionPerformed=self.searchButtonPressed)
+            findallbutton = swing.JButton("Find All", preferredSize=(100, 20),
+                                          actionPerformed=self.searchButtonPressed)
+            replaceallbutton = swing.JButton("Replace All", preferredSize=(100, 20),
+                                             actionPerformed=self.searchButtonPressed)
             donebutton = swing.JButton("Cancel", preferredSize=(100, 20),
                                        actionPerformed=self.searchButtonPressed)
             group = swing.ButtonGroup()
@@ -1386,11 +1394,20 @@ class JESUI(swing.JFrame, FocusListener):
             buttonpanel.layout = awt.GridLayout(0, 1)
             buttonpanel.add(self.up)
             buttonpanel.add(self.down)
+            optionpanel = swing.JPanel()
+            optionpanel.layout = awt.GridLayout(0, 1)
+            optionpanel.add(self.matchCase)
+            optionpanel.add(self.useRegex)
             searchlabel = swing.JLabel("Text to Find:")
+            replacelabel = swing.JLabel("Replace With:")
             self.searchFrame.contentPane.add(searchlabel)
             self.searchFrame.contentPane.add(self.searchfield)
+            self.searchFrame.contentPane.add(replacelabel)
+            self.searchFrame.contentPane.add(self.replacefield)
             self.searchFrame.contentPane.add(buttonpanel)
-            self.searchFrame.contentPane.add(swing.JLabel())
+            self.searchFrame.contentPane.add(optionpanel)
+            self.searchFrame.contentPane.add(findallbutton)
+            self.searchFrame.contentPane.add(replaceallbutton)
             self.searchFrame.contentPane.add(donebutton)
             self.searchFrame.contentPane.add(findbutton)
             self.searchFrame.show()
@@ -1398,13 +1415,25 @@ class JESUI(swing.JFrame, FocusListener):
             self.searchFrame.show()
 
     def searchButtonPressed(self, event):
-        if event.source.text == 'Find':
+        if event.source.text != 'Cancel':
             try:
                 toFind = self.searchfield.text
-                if self.up.isSelected():
-                    self.editor.document.searchBackward(toFind)
+                regex = self.useRegex.isSelected()
+                matchCase = self.matchCase.isSelected()
+                document = self.editor.document
+                if event.source.text == 'Find All':
+                    document.findAll(toFind, regex, matchCase)
+                elif event.source.text == 'Replace All':
+                    document.replaceAll(toFind, self.replacefield.text,
+                                        regex, matchCase)
+                elif self.up.isSelected():
+                    document.searchBackward(toFind, regex, matchCase)
                 else:
-                    self.editor.document.searchForward(toFind)
+                    document.searchForward(toFind, regex, matchCase)
+            except PatternSyntaxException, e:
+                swing.JOptionPane.showMessageDialog(
+                    self.searchFrame, e.getDescription(),
+                    "Search for Text", swing.JOptionPane.ERROR_MESSAGE)
             except:
                 self.searchfield.text = ''
                 self.searchFrame.hide()
@@ -33,6 +33,7 @@ from javax.swing import JOptionPane
 from jes.bridge.replbuffer import REPLBuffer
 from jes.bridge.terpactions import addInterpreterActions
 from jes.bridge.terpcontrol import InterpreterControl
+from jes.core.codecache import CodeCache
 from jes.core.interpreter import Interpreter
 from jes.core.interpreter.exceptionrecord import JESExceptionRecord
 from jes.core.interpreter.messages import TAB_ERROR_MESSAGE
@@ -42,13 +43,18 @@ from jes.gui.components.threading import threadsafe
 from jes.gui.dialogs.intro import introController
 from jes.gui.filemanager import FileManager
 from jes.gui.mainwindow import JESUI
-from jes.util.tabnanny import check as checkTabs
+from jes.util.tabnanny import checkSource as checkTabs
 
 ERROR_LOADING_FILE = '\nThere was an error loading the file. It may not actually exist. FILENAME: '
 ERROR_NO_FILE = ('\nNo file has been selected.\n '
                  'You must open a saved file, or save the opened file,\n'
                  'before clicking LOAD\n')
 
+# Compiled programs are kept here (next to the settings), so unchanged
+# programs load without compiling, even after restarting JES.
+CODE_CACHE_DIR = os.path.join(
+    JESConfig.getConfigFile().getAbsoluteFile().getParent(), '.jes-code-cache')
+
 class JESProgram:
     def __init__(self, initialFilename=None):
         JESProgram.activeInstance = self
@@ -60,6 +66,7 @@ class JESProgram:
 
         # Set up the interpreter
         self.interpreter = terp = Interpreter()
+        terp.codeCache = CodeCache(CODE_CACHE_DIR)
         self.debugger = terp.debugger
         self.watcher = Watcher(self.debugger)
 
@@ -172,7 +179,7 @@ class JESProgram:
         else:  # error 1. didn't occur
 
             try:
-                file = open(self.fileManager.filename, 'r')
+                file = open(self.fileManager.filename, 'rU')
                 fileText = file.read()
                 file.close()
             except:
@@ -180,7 +187,13 @@ class JESProgram:
 
             else:  # error 2. didn't occur
                 try:
-                    lineWithError = checkTabs(self.fileManager.filename)
+                    # The tab check is its own tokenize pass: the compiler
+                    # tokenizes the text again, and doesn't report ambiguous
+                    # tabs, so the two can't share one pass. It runs even
+                    # when the compiled code is cached (the cache doesn't
+                    # know whether this text passed it), so the warning
+                    # shows up on every load.
+                    lineWithError = checkTabs(fileText)
 
                 except:
 
@@ -206,7 +219,7 @@ class JESProgram:
                 self.gui.commandWindow.cancelPrompt()
                 self.gui.commandWindow.display(
                     "======= Loading Program =======\n", 'system-message')
-                self.interpreter.runFile(self.fileManager.filename)
+                self.interpreter.runFile(self.fileManager.filename, source=fileText)
                 self.interpreter.debugger.setTargetFilenames([self.fileManager.filename])
                 self.gui.commandWindow.requestFocus()
                 self.gui.editor.getDocument().removeErrorHighlighting()
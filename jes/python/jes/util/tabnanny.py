@@ -15,8 +15,9 @@ import os
 import sys
 import getopt
 import tokenize
+from StringIO import StringIO
 
-__all__ = ["check"]
+__all__ = ["check", "checkSource"]
 
 verbose = 0
 filename_only = 0
@@ -51,17 +52,31 @@ def check(file):
         return
 
     f = open(file)
+    try:
+        return checkLines(f.readline)
+    finally:
+        f.close()
+
+
+def checkSource(source):
+    """
+    Like `check`, but for source code that has already been read,
+    so the file isn't opened and read again.
+    """
+    return checkLines(StringIO(source).readline)
+
 
+def checkLines(readline):
+    # Returns the number of the first badly indented line, or None.
     reset_globals()
     try:
-        tokenize.tokenize(f.readline, tokeneater)
+        tokenize.tokenize(readline, tokeneater)
 
     except NannyNag, nag:
         badline = nag.get_lineno()
 
         return badline
 
-    f.close()
     return None
 
 
@@ -65,6 +65,18 @@
 # 11 July 2007: Removed showMediaFolder and showMediaPath for no-arg version of getMediaPath/getMediaFolder.
 #               Added generic explore method.
 # 15 July 2007: Added no-arg option for setLibPath
+# 19 Oct 2026: Replaced the 600 second limit on empty sounds with the largest
+#              number of samples a sound can have, since long sounds are paged
+#              Added resampleSound
+#              Added getSpectrum, getSpectrogram and getPitch
+#              Added sound editing functions that work on whole blocks of samples:
+#              changeVolume, normalizeSound, reverseSound, insertSound, mixSounds,
+#              echoSound, fadeIn, fadeOut, crossfadeSounds and clipSound
+#              Added openSoundWriter, appendSound and closeSoundWriter, for writing
+#              long sounds a piece at a time
+#              Movie.play reads frames as they're shown instead of loading them all
+#              Movie.writeFramesToDirectory writes frames in the background
+#              Movies can have pictures as frames, and writeAVI encodes them in memory
 
 # TODO:
 # Fix HSV/RGB conversions -- getting a divide by zero error when max=min
@@ -83,6 +95,8 @@ import java.awt.Font
 import java.awt as awt
 import javax.swing as swing
 import java.util
+import java.io
+from javax.sound.sampled import AudioFileFormat, AudioFormat
 import sys
 import os
 import math
@@ -95,10 +109,14 @@ import StoppableInput
 import StoppableOutput
 import Sample
 import Samples
+import Resampler
+import Spectrum
+import SoundWriter
 import MoviePlayer
 import MovieWriter
 import FileChooser
 import random
+import jarray
 
 from jes.tools.framesequencer import FrameSequencerTool
 
@@ -200,6 +218,9 @@ def makeSound(filename, maxIndex=100):
     return Sound(filename)
 
 # MMO (1 Dec 2005): capped size of sound to 600
+# (19 Oct 2026): long sounds are paged now, so they're only capped by the
+# number of samples a sound can hold
+MAX_SOUND_SAMPLES = 2 ** 31 - 1
 # Brian O (29 Apr 2008): changed first argument to be number of samples,
 # added optional 2nd argument of sampling rate
 
@@ -208,8 +229,8 @@ def makeEmptySound(numSamples, samplingRate=Sound.SAMPLE_RATE):
     if numSamples <= 0 or samplingRate <= 0:
         print "makeEmptySound(numSamples[, samplingRate]): numSamples and samplingRate must each be greater than 0"
         raise ValueError
-    if (numSamples / samplingRate) > 600:
-        print "makeEmptySound(numSamples[, samplingRate]): Created sound must be less than 600 seconds"
+    if numSamples > MAX_SOUND_SAMPLES:
+        print "makeEmptySound(numSamples[, samplingRate]): Created sound must have at most %d samples" % MAX_SOUND_SAMPLES
         raise ValueError
     return Sound(numSamples, samplingRate)
 
@@ -220,8 +241,8 @@ def makeEmptySoundBySeconds(seconds, samplingRate=Sound.SAMPLE_RATE):
     if seconds <= 0 or samplingRate <= 0:
         print "makeEmptySoundBySeconds(numSamples[, samplingRate]): numSamples and samplingRate must each be greater than 0"
         raise ValueError
-    if seconds > 600:
-        print "makeEmptySoundBySeconds(numSamples[, samplingRate]): Created sound must be less than 600 seconds"
+    if seconds * samplingRate > MAX_SOUND_SAMPLES:
+        print "makeEmptySoundBySeconds(numSamples[, samplingRate]): Created sound must be at most %g seconds" % (float(MAX_SOUND_SAMPLES) / samplingRate)
         raise ValueError
     return Sound(seconds * samplingRate, samplingRate)
 
@@ -234,6 +255,178 @@ def duplicateSound(sound):
         raise ValueError
     return Sound(sound)
 
+#: The qualities resampleSound can use, fastest first.
+RESAMPLE_QUALITIES = {'linear': Resampler.LINEAR,
+                      'medium': Resampler.MEDIUM,
+                      'high':   Resampler.HIGH}
+
+
+def resampleSound(sound, samplingRate, channels=None, quality="high"):
+    if not isinstance(sound, Sound):
+        print "resampleSound(sound, samplingRate[, channels, quality]): Input is not a sound"
+        raise ValueError
+    if samplingRate <= 0:
+        print "resampleSound(sound, samplingRate[, channels, quality]): samplingRate must be greater than 0"
+        raise ValueError
+    if channels is None:
+        channels = sound.getChannels()
+    if channels not in (1, 2):
+        print "resampleSound(sound, samplingRate[, channels, quality]): channels must be 1 or 2"
+        raise ValueError
+    if quality not in RESAMPLE_QUALITIES:
+        print "resampleSound(sound, samplingRate[, channels, quality]): quality must be 'linear', 'medium' or 'high'"
+        raise ValueError
+    if sound.getLength() * float(samplingRate) / sound.getSamplingRate() > MAX_SOUND_SAMPLES:
+        print "resampleSound(sound, samplingRate[, channels, quality]): Created sound must have at most %d samples" % MAX_SOUND_SAMPLES
+        raise ValueError
+    return Resampler.resample(sound, samplingRate, channels, RESAMPLE_QUALITIES[quality])
+
+#: The window functions the spectrum functions can shape frames with.
+SPECTRUM_WINDOWS = {'rectangular': Spectrum.RECTANGULAR,
+                    'hann':        Spectrum.HANN,
+                    'hamming':     Spectrum.HAMMING,
+                    'blackman':    Spectrum.BLACKMAN}
+
+
+def _checkSpectrumArgs(fn, sound, size, window):
+    # (the frame size and window checks shared by the spectrum functions)
+    if not isinstance(sound, Sound):
+        print fn + ": First input is not a sound"
+        raise ValueError
+    if size < 4 or size & (size - 1):
+        print fn + ": size must be a power of two (like 512, 1024 or 2048)"
+        raise ValueError
+    if window not in SPECTRUM_WINDOWS:
+        print fn + ": window must be 'rectangular', 'hann', 'hamming' or 'blackman'"
+        raise ValueError
+    return SPECTRUM_WINDOWS[window]
+
+# Bin k of a spectrum is the frequency k * getSamplingRate(sound) / size
+
+
+def getSpectrum(sound, index=Sound._SoundIndexOffset, size=2048, window="hann"):
+    windowType = _checkSpectrumArgs("getSpectrum(sound[, index, size, window])", sound, size, window)
+    if not Sound._SoundIndexOffset <= index < getLength(sound) + Sound._SoundIndexOffset:
+        print "getSpectrum(sound[, index, size, window]): index must be in the range [" + str(Sound._SoundIndexOffset) + "," + str(getLength(sound) - 1 + Sound._SoundIndexOffset) + "]"
+        raise ValueError
+    spectrum = Spectrum(size, windowType)
+    frame = jarray.zeros(size, 'f')
+    power = jarray.zeros(spectrum.getBins(), 'd')
+    spectrum.readFrame(sound, index - Sound._SoundIndexOffset, frame)
+    spectrum.power(frame, 0, power)
+    return list(power)
+
+
+def getSpectrogram(sound, size=1024, hop=None, window="hann"):
+    windowType = _checkSpectrumArgs("getSpectrogram(sound[, size, hop, window])", sound, size, window)
+    if hop is None:
+        hop = size // 4
+    if hop < 1:
+        print "getSpectrogram(sound[, size, hop, window]): hop must be at least 1"
+        raise ValueError
+    # (a Java array, so long sounds don't need millions of Python floats)
+    return Spectrum.stft(sound, size, hop, windowType)
+
+
+def getPitch(sound, start=Sound._SoundIndexOffset, end=None):
+    if not isinstance(sound, Sound):
+        print "getPitch(sound[, start, end]): First input is not a sound"
+        raise ValueError
+    if end is None:
+        end = getLength(sound) - 1 + Sound._SoundIndexOffset
+    if not Sound._SoundIndexOffset <= start <= end < getLength(sound) + Sound._SoundIndexOffset:
+        print "getPitch(sound[, start, end]): start and end must be in the range [" + str(Sound._SoundIndexOffset) + "," + str(getLength(sound) - 1 + Sound._SoundIndexOffset) + "], with start before end"
+        raise ValueError
+    return Spectrum.estimatePitch(sound, start - Sound._SoundIndexOffset, end - start + 1)
+
+
+def changeVolume(sound, factor):
+    if not isinstance(sound, Sound):
+        print "changeVolume(sound, factor): First input is not a sound"
+        raise ValueError
+    sound.changeVolume(factor)
+
+
+def normalizeSound(sound):
+    if not isinstance(sound, Sound):
+        print "normalizeSound(sound): Input is not a sound"
+        raise ValueError
+    sound.normalize()
+
+
+def reverseSound(sound):
+    if not isinstance(sound, Sound):
+        print "reverseSound(sound): Input is not a sound"
+        raise ValueError
+    sound.reverse()
+
+
+def insertSound(sound, other, index):
+    if not isinstance(sound, Sound) or not isinstance(other, Sound):
+        print "insertSound(sound, other, index): First two inputs must be sounds"
+        raise ValueError
+    if not Sound._SoundIndexOffset <= index <= getLength(sound) + Sound._SoundIndexOffset:
+        print "insertSound(sound, other, index): index must be in the range [" + str(Sound._SoundIndexOffset) + "," + str(getLength(sound) + Sound._SoundIndexOffset) + "]"
+        raise ValueError
+    return sound.insert(other, index - Sound._SoundIndexOffset)
+
+
+def mixSounds(sound, other, index=Sound._SoundIndexOffset, gain=1.0, otherGain=1.0):
+    if not isinstance(sound, Sound) or not isinstance(other, Sound):
+        print "mixSounds(sound, other[, index, gain, otherGain]): First two inputs must be sounds"
+        raise ValueError
+    if not Sound._SoundIndexOffset <= index < getLength(sound) + Sound._SoundIndexOffset:
+        print "mixSounds(sound, other[, index, gain, otherGain]): index must be in the range [" + str(Sound._SoundIndexOffset) + "," + str(getLength(sound) - 1 + Sound._SoundIndexOffset) + "]"
+        raise ValueError
+    sound.mix(other, index - Sound._SoundIndexOffset, gain, otherGain)
+
+
+def echoSound(sound, delay, decay=0.5):
+    if not isinstance(sound, Sound):
+        print "echoSound(sound, delay[, decay]): First input is not a sound"
+        raise ValueError
+    if delay <= 0:
+        print "echoSound(sound, delay[, decay]): delay must be greater than 0"
+        raise ValueError
+    sound.echo(delay, decay)
+
+
+def fadeIn(sound, numSamples):
+    if not isinstance(sound, Sound):
+        print "fadeIn(sound, numSamples): First input is not a sound"
+        raise ValueError
+    if numSamples < 0:
+        print "fadeIn(sound, numSamples): numSamples can't be negative"
+        raise ValueError
+    sound.fadeIn(numSamples)
+
+
+def fadeOut(sound, numSamples):
+    if not isinstance(sound, Sound):
+        print "fadeOut(sound, numSamples): First input is not a sound"
+        raise ValueError
+    if numSamples < 0:
+        print "fadeOut(sound, numSamples): numSamples can't be negative"
+        raise ValueError
+    sound.fadeOut(numSamples)
+
+
+def crossfadeSounds(sound, other, overlap):
+    if not isinstance(sound, Sound) or not isinstance(other, Sound):
+        print "crossfadeSounds(sound, other, overlap): First two inputs must be sounds"
+        raise ValueError
+    if overlap < 0:
+        print "crossfadeSounds(sound, other, overlap): overlap can't be negative"
+        raise ValueError
+    return sound.crossfade(other, overlap)
+
+
+def clipSound(sound, limit):
+    if not isinstance(sound, Sound):
+        print "clipSound(sound, limit): First input is not a sound"
+        raise ValueError
+    sound.clip(limit)
+
 
 def getSamples(sound):
     if not isinstance(sound, Sound):
@@ -441,6 +634,50 @@ def writeSoundTo(sound, filename):
     sound.writeToFile(filename)
 
 
+def openSoundWriter(filename, samplingRate=Sound.SAMPLE_RATE, numChannels=1):
+    global mediaFolder
+    if not os.path.isabs(filename):
+        filename = mediaFolder + filename
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.wav':
+        fileType = AudioFileFormat.Type.WAVE
+    elif extension in ('.aif', '.aiff'):
+        fileType = AudioFileFormat.Type.AIFF
+    else:
+        print "openSoundWriter(filename[, samplingRate, numChannels]): filename must end in .wav, .aif or .aiff"
+        raise ValueError
+    if samplingRate <= 0 or numChannels not in (1, 2):
+        print "openSoundWriter(filename[, samplingRate, numChannels]): samplingRate must be greater than 0, and numChannels 1 or 2"
+        raise ValueError
+    # (16-bit samples, like the sounds makeEmptySound makes)
+    audioFormat = AudioFormat(samplingRate, 16, numChannels, True, False)
+    return SoundWriter.create(java.io.File(filename), audioFormat, fileType)
+
+
+def appendSound(writer, sound):
+    if not isinstance(writer, SoundWriter):
+        print "appendSound(writer, sound): First input is not a sound writer"
+        raise ValueError
+    if not isinstance(sound, Sound):
+        print "appendSound(writer, sound): Second input is not a sound"
+        raise ValueError
+    soundFormat = sound.getAudioFileFormat().getFormat()
+    if soundFormat.getSampleSizeInBits() != writer.getFormat().getSampleSizeInBits() or soundFormat.getChannels() != writer.getFormat().getChannels():
+        print "appendSound(writer, sound): The sound must have the same sample size and number of channels as the writer"
+        raise ValueError
+    if soundFormat.getSampleRate() != writer.getFormat().getSampleRate():
+        print "appendSound(writer, sound): The sound must have the same sampling rate as the writer (try resampleSound)"
+        raise ValueError
+    writer.appendSound(sound)
+
+
+def closeSoundWriter(writer):
+    if not isinstance(writer, SoundWriter):
+        print "closeSoundWriter(writer): Input is not a sound writer"
+        raise ValueError
+    writer.close()
+
+
 def randomSamples(someSound, number):
     samplelist = []
     samples = getSamples(someSound)
@@ -1336,14 +1573,23 @@ def printNow(text):
 
 
 class Movie(object):
-    def __init__(self):  # frames are filenames
+    def __init__(self):  # frames are filenames or pictures
         self.frames = []
         self.dir = None
 
     def addFrame(self, frame):
+        if isinstance(frame, Picture):
+            # Keep the picture as it is now, even if it's changed for the next frame
+            frame = Picture(MovieWriter.copyFrame(frame.getBufferedImage()))
         self.frames.append(frame)
         self.dir = None
 
+    def _hasPictureFrames(self):
+        for frame in self.frames:
+            if isinstance(frame, Picture):
+                return 1
+        return 0
+
     def __len__(self):
         return len(self.frames)
 
@@ -1362,16 +1608,34 @@ class Movie(object):
         # for frameindex in range(0, self.listModel.size()):
         # fs.addFrame(Picture(self.listModel.get(frameindex)))
         # fs.play(self.fps)
+        # Encode frames in the background while the next ones are read
+        fs.setAsynchronous(True)
         for frameindex in range(0, len(self.frames)):
-            fs.addFrame(Picture(self.frames[frameindex]))
+            frame = self.frames[frameindex]
+            if not isinstance(frame, Picture):
+                frame = Picture(frame)
+            fs.addFrame(frame)
+        # Wait for the last frames to be written, before writeAVI reads them
+        fs.setAsynchronous(False)
         self.dir = directory
 
     def play(self):
-        import java.util.ArrayList as ArrayList
-        list = ArrayList()
+        # Pass the player file names for frames in files, not pictures,
+        # so those frames are read only as they're shown
+        global mediaFolder
+        if self.frames == []:
+            print "playMovie(movie): Movie has no frames"
+            raise ValueError
+        frames = java.util.ArrayList()
         for f in self.frames:
-            list.add(makePicture(f))
-        MoviePlayer(list).playMovie()
+            if not isinstance(f, Picture):
+                if not os.path.isabs(f):
+                    f = mediaFolder + f
+                if not os.path.isfile(f):
+                    print "playMovie(movie): There is no frame at " + f
+                    raise ValueError
+            frames.add(f)
+        MoviePlayer(frames).playMovie()
 
     def writeQuicktime(self, destPath, framesPerSec=16):
         global mediaFolder
@@ -1384,6 +1648,9 @@ class Movie(object):
         if self.frames == []:  # Is movie empty?
             print "writeQuicktime(path[, framesPerSec]): Movie has no frames. Cannot write empty Movie"
             raise ValueError
+        elif self.dir == None and self._hasPictureFrames():
+            print "writeQuicktime(path[, framesPerSec]): Your movie has frames that aren't saved in files. Call writeFramesToDirectory() first, then try again."
+            raise ValueError
         # Is movie only 1 frame but never written out
         elif self.dir == None and len(self.frames) == 1:
             frame = self.frames[0]
@@ -1424,33 +1691,19 @@ class Movie(object):
         if self.frames == []:  # Is movie empty?
             print "writeAVI(path[, framesPerSec]): Movie has no frames. Cannot write empty Movie"
             raise ValueError
-        # Is movie only 1 frame but never written out
-        elif self.dir == None and len(self.frames) == 1:
-            frame = self.frames[0]
-            self.dir = frame[:(frame.rfind(os.sep))]
-        # Are movie frames all in the same directory?
-        elif self.dir == None and len(self.frames) > 1:
-            sameDir = 1
-            frame = self.frames[0]
-            frame = frame.replace('/', os.sep)
-            # Parse directory of first frame
-            framesDir = frame[:(frame.rfind(os.sep))]
-            thisDir = framesDir
-            frameNum = 1
-            while(sameDir and frameNum < len(self.frames)):
-                frame = self.frames[frameNum]
-                frame = frame.replace('/', os.sep)
-                thisDir = frame[:(frame.rfind(os.sep))]
-                frameNum = frameNum + 1
-                if(framesDir <> thisDir):
-                    sameDir = 0
-            if(sameDir):  # Loop ended because we ran out of frames
-                self.dir = framesDir
-            else:  # Loop ended because sameDir became false
-                print "writeAVI(path[, framesPerSec]): Your frames are in different directories. Call writeFramesToDirectory() first, then try again."
-                raise ValueError
-        writer = MovieWriter(self.dir, framesPerSec, destPath)
-        writer.writeAVI()
+        # The frames go straight into the movie: pictures are encoded in
+        # memory and JPEG files are copied, so they needn't share a directory
+        frames = java.util.ArrayList()
+        for frame in self.frames:
+            if not isinstance(frame, Picture) and not os.path.isabs(frame):
+                frame = mediaFolder + frame
+            frames.add(frame)
+        writer = MovieWriter(None, framesPerSec, destPath)
+        try:
+            writer.writeAVI(frames)
+        except (java.io.IOException, java.lang.IllegalArgumentException), e:
+            print "writeAVI(path[, framesPerSec]): " + e.getMessage()
+            raise ValueError
 
 
 def playMovie(movie):
@@ -1518,9 +1771,9 @@ def addFrameToMovie(a, b):
         movie = b
         frame = a
 
-    if not (isinstance(movie, Movie) and isinstance(frame, String)):
+    if not (isinstance(movie, Movie) and (isinstance(frame, String) or isinstance(frame, Picture))):
        # if movie.__class__ != Movie or frame.__class__ != String:
-        print "addFrameToMovie(frame, movie): frame is not a string or movie is not a Movie object"
+        print "addFrameToMovie(frame, movie): frame is not a string or picture, or movie is not a Movie object"
         raise ValueError
 
     movie.addFrame(frame)
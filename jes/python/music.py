@@ -1,5 +1,5 @@
 ################################################################################################################
-# music.py      Version 4.11         21-Mar-2017       Bill Manaris, Marge Marshall, Chris Benson, and Kenneth Hanson
+# music.py      Version 4.18         19-Oct-2026       Bill Manaris, Marge Marshall, Chris Benson, and Kenneth Hanson
 
 ###########################################################################
 #
@@ -28,6 +28,52 @@
 #
 # REVISIONS:
 #
+# 4.18  19-Oct-2026 Read.midi() now remembers the scores it reads (by path, size, and modification time - see
+#                   MAX_CACHED_MIDI_FILES), and copies them when the same (unchanged) file is read again, instead of
+#                   parsing it again.  Added Read.midiNotes(), to go through the notes in a MIDI file without building
+#                   a score (e.g., for statistics over many files), and Read.clearMidiCache().  (To see how much
+#                   faster this is, run working-on-jes/midi-benchmarks.py.)
+#
+# 4.17  19-Oct-2026 Added Render.sound() and Render.file(), to render a Score (or Part, Phrase, or Note) offline to a
+#                   Sound or straight into a WAV file, with a simple wavetable synthesizer (see ScoreRenderer in JES).
+#                   Rendering runs much faster than real time, and always gives the same samples.  Render.getSpeed()
+#                   returns how many times faster than real time the last render was.
+#
+# 4.16  19-Oct-2026 Added ScoreIndex, a flattened, time-sorted list of the notes in a Score (start, duration, frequency,
+#                   velocity, channel, instrument, panning, part number), with queries for the notes sounding at a time
+#                   or in a time window.  Play.midi() now gets its notes from a ScoreIndex - pass it one to play a
+#                   score again without collecting and sorting its notes (otherwise, the score is indexed afresh,
+#                   so that changes made directly through jMusic are always heard).  ScoreIndex.forScore() reuses
+#                   indexes; changes made through Mod functions and Note setters are counted, so that indexes know
+#                   when they are out of date (see ScoreIndex.changed()).  Mod.retrograde() now finds each part's
+#                   start and end time once, instead of for every phrase.
+#
+# 4.15  19-Oct-2026 MidiSequence and Play.midi2() now share a pool of MidiSynths (see MidiSynthPool), which is grown
+#                   only as needed (up to MAX_MIDI_SYNTHS), and whose MidiSynths are initialized only once and then reused.
+#                   A MidiSequence acquires a MidiSynth when it plays (preferably the one it had before), instead of
+#                   creating (and initializing) its own when it is created.  MidiSynthPool.acquire() may also wait for
+#                   a MidiSynth to become available, or preempt (stop) the oldest one.  A MidiSynth is found and handed
+#                   over under a lock, so two threads never acquire the same one at once.
+#
+# 4.14  19-Oct-2026 Metronome is now driven by a timer.FixedRateTimer (absolute times of a monotonic clock), so its
+#                   tempo no longer drifts under load - late ticks are made right away ("catchup") or dropped ("skip").
+#                   Beats are now divided into ticks (ticksPerBeat, default 24), and Metronome.add() accepts a desiredTick
+#                   to call functions in between beats.  Functions are kept in buckets by the tick they are due on,
+#                   so each tick only looks at the functions due (instead of counting down all of them).
+#
+# 4.13  19-Oct-2026 AudioSample now has a pool of voices (see AudioVoicePool), so Play.audioNote() and Play.audioOn()
+#                   can sound overlapping notes and chords on the same sample.  When all voices are busy, the oldest
+#                   (or quietest) one is stolen - see AudioSample.setVoiceStealing().  AudioSample.play() also plays on
+#                   a voice of its own, so it no longer cuts off a loop().  AudioSamples of the same (unchanged) file
+#                   now share their audio data, instead of loading it again (the most recently loaded files are kept -
+#                   see MAX_CACHED_AUDIO_FILES).
+#
+# 4.12  19-Oct-2026 Play.audioNote() now schedules note-on, envelope, and note-off events on the audio clock of the
+#                   jSyn synthesizer playing the AudioSample (see timer.scheduleAudioTask()), instead of creating a Timer2
+#                   per event.  On samples with voices, the whole envelope is handed to the note's voice at note-on, and
+#                   played by a jSyn envelope unit (see AudioVoice.setEnvelope()), so it is sample accurate and is not
+#                   affected by GUI load.
+#
 # 4.11  21-Mar-2017 (bm)  Fixed Play.setPitchBend() to actually set the pitch bend, as it should.
 #
 # 4.10  16-Jan-2017 (bm)  Fixed Note.getPitch() to return REST for rest notes, as it should.
@@ -855,11 +901,14 @@ class Mod(jMod):
 
          return maxEndTime   # so return it
 
-      def retrogradePart(part):
-         """Helper function to retrograde a single part."""
+ 
+      def retrogradePart(part, startTime=None, endTime=None):
+         """Helper function to retrograde a single part (its start and end time may be given, if known)."""
 
-         startTime = getPartStartTime(part)  # the earliest start time among all phrases
-         endTime   = getPartEndTime(part)    # the latest end time among all phrases
+         if startTime == None:
+            startTime = getPartStartTime(part)  # the earliest start time among all phrases
+         if endTime == None:
+            endTime   = getPartEndTime(part)    # the latest end time among all phrases
  
          # retrograde each phrase and adjust its start time accordingly
          for phrase in part.getPhraseList():
@@ -877,23 +926,30 @@ class Mod(jMod):
       def retrogradeScore(score):
          """Helper function to retrograde a score."""
 
+         # find each part's start and end time (once - retrograding a part does not change them)
+         parts = score.getPartList()
+         partStartTimes = [getPartStartTime(part) for part in parts]
+         partEndTimes   = [getPartEndTime(part) for part in parts]
+
          # calculate the score's start and end times
          startTime = 10000000000.0   # holds the earliest start time among all parts (initialize to a very large value)
          endTime   = 0.0             # holds the latest end time among all parts
-         for part in score.getPartList():
-            startTime = min(startTime, getPartStartTime(part))   # accumulate the earliest start time, so far
-            endTime   = max(endTime, getPartEndTime(part))       # accumulate the latest end time, so far
+         for i in range(len(parts)):
+            startTime = min(startTime, partStartTimes[i])   # accumulate the earliest start time, so far
+            endTime   = max(endTime, partEndTimes[i])       # accumulate the latest end time, so far
          # now, startTime and endTime hold the score's start and end time, respectively
 
          print "score startTime =", startTime, "endTime =", endTime
 
          # retrograde each part and adjust its start time accordingly
-         for part in score.getPartList():
+         for i in range(len(parts)):
+            part = parts[i]
+
             # get this part's distance from the score end
-            distanceFromEnd = endTime - (getPartEndTime(part) + getPartStartTime(part)) 
+            distanceFromEnd = endTime - (partEndTimes[i] + partStartTimes[i]) 
             
             # retrograde this part
-            retrogradePart(part)                              
+            retrogradePart(part, partStartTimes[i], partEndTimes[i])
 
             # the retrograded part needs to start as far as 
             # the orignal part's distance from the score end
@@ -921,6 +977,27 @@ class Mod(jMod):
    shift = Callable(shift)  
    merge = Callable(merge)
    retrograde = Callable(retrograde)
+
+
+# Every Mod function changes the material given to it, so count each call as a change (see ScoreIndex).
+# This covers our own Mod functions (above), and those inherited from jMusic (e.g., Mod.transpose()).
+
+from java.lang import Object as jObject   # (to skip methods every Java class has)
+
+def __countingChanges__(function):
+   """Returns a function that calls 'function', and then counts a change to jMusic material."""
+
+   def countingFunction(*arguments):
+      result = function(*arguments)
+      __materialChanged__()
+      return result
+
+   return countingFunction
+
+for __modFunctionName__ in dir(Mod):      # (jMusic's Mod functions, and ours)
+   if not __modFunctionName__.startswith("_") and __modFunctionName__ not in dir(jObject) and \
+      callable(getattr(Mod, __modFunctionName__)):
+      setattr(Mod, __modFunctionName__, Callable(__countingChanges__(getattr(Mod, __modFunctionName__))))
    
    
 ######################################################################################
@@ -974,19 +1051,194 @@ from image import *                # import Image class and related Java librari
 # Create Read.image("test.jpg") to return an image, in addition to Read's default functionality.
 # This class is not meant to be instantiated, hence no "self" in function definitions.
 # Functions are made callable through class Callable, above.
+#
+# Read.midi() remembers the scores it has read (see MAX_CACHED_MIDI_FILES), so that reading
+# the same file again (unchanged, i.e., with the same size and modification time) copies the
+# remembered score, instead of parsing the file again.
+#
+# Read.midiNotes("test.mid") goes through the notes in a MIDI file one at a time, without
+# building a score (e.g., to collect statistics over many MIDI files).
+
+MAX_CACHED_MIDI_FILES = 256   # how many scores Read.midi() remembers (the least recently read are forgotten)
+
+__midiCache__ = []   # (path, size, modification time) and score of each file read, most recently read last
+
 class Read(jRead):
 
    def midi(score, filename):
-      """Import a standard MIDI file to a jMusic score."""
+      """Import a standard MIDI file to a jMusic score.  Files read before (and unchanged since)
+         are copied from the scores read then, instead of being parsed again."""
       
       # JEM working directory fix (see above)
       filename = fixWorkingDirForJEM( filename )   # does nothing if not in JEM
-      
-      # use fixed filename with jMusic's Read.midi() 
-      jRead.midi(score, filename)
 
-   # make this function callable without having to instantiate this class
+      # identify this version of the file by path, size, and modification time
+      try:
+         path = os.path.abspath( filename )
+         status = os.stat( path )
+         key = (path, status.st_size, status.st_mtime)
+      except OSError:
+         key = None   # no such file (jMusic will report it)
+
+      # look for it among the files read before (forgetting older versions of it)
+      cached = None
+      if key != None and score != None:
+         for i in range(len(__midiCache__) - 1, -1, -1):
+            if __midiCache__[i][0][0] == path:
+               if __midiCache__[i][0] == key:
+                  cached = __midiCache__[i]
+               del __midiCache__[i]   # (if still current, it is put back as most recently read, below)
+               break
+
+      if cached != None:
+         Read.__copyScore__(cached[1], score)   # already read, so copy it
+      else:
+         # use fixed filename with jMusic's Read.midi() 
+         jRead.midi(score, filename)
+         if key != None and score != None:
+            cached = (key, score.copy())   # remember a copy, so changes to this score don't affect it
+
+      # remember it as most recently read
+      if cached != None:
+         __midiCache__.append(cached)
+         while len(__midiCache__) > max(MAX_CACHED_MIDI_FILES, 0):
+            del __midiCache__[0]
+
+      __materialChanged__()   # the score has new notes (see ScoreIndex)
+
+   def __copyScore__(source, target):
+      """Makes target a copy of source (both jMusic scores)."""
+
+      copy = source.copy()
+      target.empty()
+      target.setTitle( source.getTitle() )
+      target.setTempo( source.getTempo() )
+      target.setNumerator( source.getNumerator() )
+      target.setDenominator( source.getDenominator() )
+      target.setKeySignature( source.getKeySignature() )
+      target.setKeyQuality( source.getKeyQuality() )
+      for part in copy.getPartArray():
+         target.addPart( part )
+
+   def clearMidiCache():
+      """Forgets the scores remembered by Read.midi()."""
+
+      del __midiCache__[:]
+
+   def midiNotes(filename):
+      """Goes through the notes in a standard MIDI file, one at a time, without building a jMusic score
+         (e.g., for statistics over many files, like pitch histograms or Zipf slopes).  Each note is a tuple
+         (start, duration, pitch, velocity, channel), with start and duration in beats (quarter notes), as
+         in jMusic.  Notes come track by track, and within each track in the order they end."""
+
+      # JEM working directory fix (see above)
+      filename = fixWorkingDirForJEM( filename )   # does nothing if not in JEM
+
+      midiFile = open(filename, "rb")
+      try:
+         # header - format, number of tracks, and ticks per beat
+         chunkType, data = Read.__readChunk__(midiFile)
+         if chunkType != "MThd" or len(data) < 6:
+            raise ValueError( filename + " is not a standard MIDI file." )
+         numberOfTracks = (ord(data[2]) << 8) | ord(data[3])
+         ticksPerBeat = (ord(data[4]) << 8) | ord(data[5])
+         if ticksPerBeat & 0x8000 or ticksPerBeat == 0:
+            raise ValueError( filename + " uses SMPTE time, which is not supported." )
+
+         # tracks, one at a time (skipping any other chunks)
+         track = 0
+         while track < numberOfTracks:
+            chunkType, data = Read.__readChunk__(midiFile)
+            if chunkType == None:   # file ended early?
+               break
+            if chunkType == "MTrk":
+               for note in Read.__trackNotes__(data, float(ticksPerBeat)):
+                  yield note
+               track = track + 1
+
+      finally:
+         midiFile.close()
+
+   def __readChunk__(midiFile):
+      """Reads the next chunk of a MIDI file, and returns its type and data ((None, None) at the end of the file)."""
+
+      header = midiFile.read(8)
+      if len(header) < 8:
+         return (None, None)
+      length = (ord(header[4]) << 24) | (ord(header[5]) << 16) | (ord(header[6]) << 8) | ord(header[7])
+      return (header[:4], midiFile.read(length))
+
+   def __readVariableLength__(data, position):
+      """Returns the variable-length number at this position in MIDI data, and the position after it."""
+
+      value = 0
+      byte = 0x80
+      while byte & 0x80:
+         byte = ord(data[position])
+         value = (value << 7) | (byte & 0x7F)
+         position = position + 1
+      return (value, position)
+
+   def __trackNotes__(data, ticksPerBeat):
+      """Goes through the notes in the data of a MIDI track, as they end (see midiNotes())."""
+
+      sounding = {}   # start tick and velocity of notes sounding, oldest first, by (channel, pitch)
+      tick = 0        # current time, in ticks
+      status = None   # last channel message status (for running status)
+      position = 0
+      while position < len(data):
+
+         delta, position = Read.__readVariableLength__(data, position)
+         tick = tick + delta
+         byte = ord(data[position])
+
+         if byte == 0xFF:                   # meta event (tempo, text, end of track, etc.)
+            length, position = Read.__readVariableLength__(data, position + 2)
+            position = position + length
+            status = None                        # (cancels running status, like system exclusive)
+
+         elif byte == 0xF0 or byte == 0xF7:   # system exclusive
+            length, position = Read.__readVariableLength__(data, position + 1)
+            position = position + length
+            status = None                        # (cancels running status)
+
+         else:                                # channel message
+            if byte & 0x80:                      # new status?
+               status = byte
+               position = position + 1
+            elif status == None:                 # no status to repeat
+               raise ValueError( "Bad MIDI track data at byte " + str(position) + "." )
+
+            kind = status & 0xF0
+            channel = status & 0x0F
+            if kind == 0xC0 or kind == 0xD0:     # program change and channel pressure have one data byte
+               position = position + 1
+            else:
+               pitch = ord(data[position])
+               velocity = ord(data[position + 1])
+               position = position + 2
+
+               if kind == 0x90 and velocity > 0:                # note on
+                  sounding.setdefault((channel, pitch), []).append((tick, velocity))
+               elif kind == 0x80 or kind == 0x90:               # note off (or note on with velocity 0)
+                  starts = sounding.get((channel, pitch))
+                  if starts:
+                     start, velocity = starts.pop(0)
+                     yield (start / ticksPerBeat, (tick - start) / ticksPerBeat, pitch, velocity, channel)
+
+      # notes never turned off end with the track
+      for (channel, pitch), starts in sorted(sounding.items()):
+         for start, velocity in starts:
+            yield (start / ticksPerBeat, (tick - start) / ticksPerBeat, pitch, velocity, channel)
+
+   # make these functions callable without having to instantiate this class
    midi = Callable(midi)  
+   __copyScore__ = Callable(__copyScore__)
+   clearMidiCache = Callable(clearMidiCache)
+   midiNotes = Callable(midiNotes)
+   __readChunk__ = Callable(__readChunk__)
+   __readVariableLength__ = Callable(__readVariableLength__)
+   __trackNotes__ = Callable(__trackNotes__)
 
 ######################################################################################
 #### jMusic Write extensions #########################################################
@@ -1163,6 +1415,27 @@ class Note(jNote):
       jNote.setDuration(self, duration )
       self.setLength(duration * lengthFactor )
 
+   # count changes to notes, so that ScoreIndexes know when they are out of date (see ScoreIndex)
+   def setPitch(self, pitch):
+      jNote.setPitch(self, pitch)
+      __materialChanged__()
+
+   def setFrequency(self, frequency):
+      jNote.setFrequency(self, frequency)
+      __materialChanged__()
+
+   def setLength(self, length):
+      jNote.setLength(self, length)
+      __materialChanged__()
+
+   def setDynamic(self, dynamic):
+      jNote.setDynamic(self, dynamic)
+      __materialChanged__()
+
+   def setPan(self, pan):
+      jNote.setPan(self, pan)
+      __materialChanged__()
+
    # fix error message returned from getPitch() if frequency and pitch are not equivalent
    def getPitch(self):
    
@@ -1260,6 +1533,328 @@ class Phrase(jPhrase):
 # Do NOT make these functions callable - Phrase class is meant to be instantiated,
 # i.e., we will always call these from a Phrase object - not the class, e.g., as in Mod.
 
+
+######################################################################################
+#### ScoreIndex ######################################################################
+######################################################################################
+
+from bisect import bisect_left, bisect_right
+
+# Changes to jMusic material made through this module (Mod functions, Note setters) are counted,
+# so that a ScoreIndex can tell it is out of date.  Changes made otherwise (e.g., directly through jMusic)
+# may be counted with ScoreIndex.changed().
+__materialChanges__ = 0
+
+def __materialChanged__():
+   """Counts a change to jMusic material."""
+   global __materialChanges__
+
+   __materialChanges__ = __materialChanges__ + 1
+
+def __asScore__(material):
+   """Returns 'material' (Note, Phrase, Part, or Score) wrapped in a Score, or None, if it is not jMusic material."""
+
+   # do necessary datatype wrapping
+   if type(material) == Note:
+      material = Phrase(material)
+   if type(material) == jNote:    # (also wrap jMusic default Notes, in addition to our own)
+      material = Phrase(material)
+   if type(material) == Phrase:   # no elif - we need to successively wrap from Note to Score
+      material = Part(material)
+      material.setInstrument(-1)     # indicate no default instrument (needed to access global instrument)
+   if type(material) == jPhrase:  # (also wrap jMusic default Phrases, in addition to our own)
+      material = Part(material)
+      material.setInstrument(-1)     # indicate no default instrument (needed to access global instrument)
+   if type(material) == Part:     # no elif - we need to successively wrap from Note to Score
+      material = Score(material)
+
+   if type(material) == Score:
+      return material
+   else:
+      return None
+
+MAX_SCORE_INDEXES = 8     # how many ScoreIndexes ScoreIndex.forScore() keeps for reuse
+__scoreIndexes__ = []     # the ScoreIndexes kept (most recently used last)
+
+class ScoreIndex():
+   """
+   A flattened view of the notes in a Score (or Part, Phrase, or Note), sorted by start time.
+   Each note is a tuple (start, duration, frequency, velocity, channel, instrument, panning, partNumber),
+   where start and duration are in milliseconds (with the tempo applied), instrument is -1 if not set
+   (i.e., the channel's instrument is used), and partNumber is the part's position in the score.
+
+   Rests are left out, and chord notes (notes with no duration, followed by the note giving the chord
+   its duration) get the chord's duration - this is how Play.midi() plays them.
+
+   Notes sounding at a time, or in a time window, are found with a binary search on start times,
+   and a tree of the latest end time of each group of notes (so that groups that have ended are skipped).
+   """
+
+   def __init__(self, material):
+
+      self.score = __asScore__(material)
+      if self.score == None:
+         raise TypeError( "Unrecognized material type " + str(type(material)) + " - expected Note, Phrase, Part, or Score." )
+
+      # remember what the score looked like, to tell if it has changed since (see isCurrent())
+      self.changes = __materialChanges__
+      self.shape = ScoreIndex.__getShape__(self.score)
+
+      self.notes = self.__collectNotes__()
+
+      # start times, for binary search
+      self.startTimes = [note[0] for note in self.notes]
+
+      # build the tree of latest end times - leaves are the notes (padded to a power of two), and each node
+      # holds the latest end time of the notes below it (node i has children 2i and 2i+1, the root is node 1)
+      self.leaves = 1
+      while self.leaves < len(self.notes):
+         self.leaves = self.leaves * 2
+
+      self.latestEnd = [-1] * (2 * self.leaves)
+      for i in range(len(self.notes)):
+         start, duration = self.notes[i][0], self.notes[i][1]
+         self.latestEnd[self.leaves + i] = start + duration
+      for node in range(self.leaves - 1, 0, -1):
+         self.latestEnd[node] = max(self.latestEnd[2 * node], self.latestEnd[2 * node + 1])
+
+   def __collectNotes__(self):
+      """Returns a list of all notes in the score, sorted by start time, with chords resolved."""
+
+      # loop through all parts and phrases to get all notes
+      noteList = []                     # holds all notes
+      tempo = self.score.getTempo()     # get global tempo (can be overidden by part and phrase tempos)
+      partNumber = 0
+      for part in self.score.getPartArray():   # traverse all parts
+         channel = part.getChannel()        # get part channel
+         instrument = part.getInstrument()  # get part instrument (-1 if not set, i.e., use the channel's)
+         if part.getTempo() > -1:           # has the part tempo been set?
+            tempo = part.getTempo()            # yes, so update tempo
+         for phrase in part.getPhraseArray():   # traverse all phrases in part
+            if phrase.getInstrument() > -1:        # is this phrase's instrument set?
+               instrument = phrase.getInstrument()    # yes, so it takes precedence
+            if phrase.getTempo() > -1:          # has the phrase tempo been set?
+               tempo = phrase.getTempo()           # yes, so update tempo
+
+            # time factor to convert time from jMusic Score units to milliseconds
+            # (this needs to happen here every time, as we may be using the tempo from score, part, or phrase)
+            FACTOR = 1000 * 60.0 / tempo
+
+            # process notes in this phrase
+            startTime = phrase.getStartTime() * FACTOR   # in milliseconds
+            for note in phrase.getNoteArray():
+               frequency = note.getFrequency()
+               panning = note.getPan()
+               panning = mapValue(panning, 0.0, 1.0, 0, 127)    # map from range 0.0..1.0 (Note panning) to range 0..127 (as expected by Java synthesizer)
+               start = int(startTime)                           # remember this note's start time (in milliseconds)
+
+               # NOTE:  Below we use note length as opposed to duration (getLength() vs. getDuration())
+               # since note length gives us a more natural sounding note (with proper decay), whereas
+               # note duration captures the more formal (printed score) duration (which sounds unnatural).
+               duration = int(note.getLength() * FACTOR)             # get note length (as oppposed to duration!) and convert to milliseconds
+               startTime = startTime + note.getDuration() * FACTOR   # update start time (in milliseconds)
+               velocity = note.getDynamic()
+
+               # accumulate non-REST notes
+               if (frequency != REST):
+                  noteList.append((start, duration, frequency, velocity, channel, instrument, panning, partNumber))   # put start time first and duration second, so we can sort easily by start time (below),
+                  # and so that notes that are members of a chord as denoted by having a duration of 0 come before the note that gives the specified chord duration
+
+         partNumber = partNumber + 1
+
+      # sort notes by start time
+      noteList.sort()
+
+      # handle chords
+      # Chords are denoted by a sequence of notes having the same start time and 0 duration (except the last note
+      # of the chord), so give them the duration of the last note.
+      notes = []
+      chordNotes = []      # used to process notes belonging in a chord
+      for note in noteList:
+         duration = note[1]
+         if duration == 0:                 # does this note belong in a chord?
+            chordNotes.append(note)           # yes, so wait for the note giving the chord's duration
+         else:
+            for chordNote in chordNotes:      # give the chord's duration to all notes in the chord (if any)
+               notes.append(chordNote[:1] + (duration,) + chordNote[2:])
+            chordNotes = []
+            notes.append(note)
+
+      return notes
+
+   def __getShape__(score):
+      """
+      Returns what can be quickly read of a score's structure (tempos, instruments, channels, and the start time,
+      end time, and size of each phrase) - if this changes, the score has changed.
+      """
+
+      shape = [score.getTempo()]
+      for part in score.getPartArray():
+         shape.append( (part.getChannel(), part.getInstrument(), part.getTempo()) )
+         for phrase in part.getPhraseArray():
+            shape.append( (id(phrase), phrase.getStartTime(), phrase.getEndTime(), phrase.size(),
+                           phrase.getInstrument(), phrase.getTempo()) )
+      return shape
+
+   def isCurrent(self):
+      """
+      Returns True if the score has not changed since it was indexed, i.e., no changes have been counted
+      (see ScoreIndex.changed()), and its structure is the same (e.g., no notes added or removed).
+      """
+
+      return self.changes == __materialChanges__ and self.shape == ScoreIndex.__getShape__(self.score)
+
+   def getScore(self):
+      """Returns the indexed score."""
+      return self.score
+
+   def getNotes(self):
+      """Returns all notes, sorted by start time."""
+      return list(self.notes)
+
+   def getEndTime(self):
+      """Returns when the last note ends (in milliseconds)."""
+      return max(self.latestEnd[1], 0)
+
+   def __len__(self):
+      return len(self.notes)
+
+   def getNotesAt(self, time):
+      """Returns the notes sounding at 'time' (in milliseconds), sorted by start time."""
+
+      # notes that start at or before time, and end after it
+      return self.__getNotesEndingAfter__(bisect_right(self.startTimes, time), time)
+
+   def getNotesBetween(self, startTime, endTime):
+      """
+      Returns the notes sounding between 'startTime' and 'endTime' (in milliseconds), sorted by start time,
+      i.e., the notes that start before 'endTime' and end after 'startTime'.
+      """
+
+      return self.__getNotesEndingAfter__(bisect_left(self.startTimes, endTime), startTime)
+
+   def __getNotesEndingAfter__(self, count, time):
+      """Returns those of the first 'count' notes that end after 'time'."""
+
+      notes = []
+      stack = [(1, 0, self.leaves)]      # tree nodes to visit, with the range of notes below them
+      while stack:
+         node, first, last = stack.pop()
+
+         # skip notes that start too late, and groups of notes that have all ended
+         if first >= count or self.latestEnd[node] <= time:
+            continue
+
+         if node >= self.leaves:         # a note?
+            notes.append(self.notes[first])
+         else:                           # visit the earlier half first
+            middle = (first + last) / 2
+            stack.append((2 * node + 1, middle, last))
+            stack.append((2 * node, first, middle))
+
+      return notes
+
+   def forScore(material):
+      """
+      Returns a ScoreIndex for 'material' - the one made last time, if the score has not changed since.
+      Notes changed directly through jMusic (e.g., jm.music.data.Note.setPitch()) are not noticed, unless
+      reported with ScoreIndex.changed().
+      """
+
+      for index in __scoreIndexes__:
+         if index.score is material:
+            __scoreIndexes__.remove(index)
+            if index.isCurrent():              # still current, so reuse it
+               __scoreIndexes__.append(index)
+               return index
+            break
+
+      # make a new index, and remember it (forgetting the least recently used one, if needed)
+      index = ScoreIndex(material)
+      if type(material) == Score:
+         __scoreIndexes__.append(index)
+         if len(__scoreIndexes__) > MAX_SCORE_INDEXES:
+            del __scoreIndexes__[0]
+
+      return index
+
+   def changed():
+      """
+      Tells all ScoreIndexes that jMusic material has changed, and they may be out of date.  Call this after
+      changing notes directly through jMusic (changes through Mod functions and Note setters are counted already).
+      """
+
+      __materialChanged__()
+
+   # make these functions callable without having to instantiate this class
+   __getShape__ = Callable(__getShape__)
+   forScore = Callable(forScore)
+   changed = Callable(changed)
+
+######################################################################################
+#### Offline rendering ###############################################################
+######################################################################################
+
+# Render.sound(material) renders a Score (or Part, Phrase, or Note) to a Sound, and
+# Render.file(material, "test.wav") renders it straight into a WAV file, without playing it.
+#
+# Notes are synthesized (all with the same simple wavetable, whatever their instrument) by the
+# Java class ScoreRenderer, as fast as possible, and always to exactly the same samples.
+# This class is not meant to be instantiated, hence no "self" in function definitions.
+# Functions are made callable through class Callable, above.
+
+class Render():
+
+   # how many times faster than real time the last render was
+   speed = 0.0
+
+   def __getRenderer__(material, sampleRate):
+      """Returns a ScoreRenderer with the notes of this material (Score, Part, Phrase, or Note)."""
+
+      import ScoreRenderer   # (part of JES, so imported only when needed)
+
+      if isinstance(material, ScoreIndex):   # already indexed?
+         index = material
+      else:
+         score = __asScore__(material)
+         if score == None:
+            raise TypeError( "Unrecognized material type " + str(type(material)) + " - expected Note, Phrase, Part, or Score." )
+         index = ScoreIndex(score)   # (not forScore() - changes made directly through jMusic are not counted)
+
+      renderer = ScoreRenderer(sampleRate, 2, ScoreRenderer.DEFAULT_HARMONICS)
+      for start, duration, frequency, velocity, channel, instrument, panning, partNumber in index.getNotes():
+         renderer.addNote(start, duration, frequency, velocity, int(panning))
+      return renderer
+
+   def sound(material, sampleRate=22050):
+      """Renders this material (Score, Part, Phrase, or Note) to a new (stereo) Sound, and returns it."""
+
+      renderer = Render.__getRenderer__(material, sampleRate)
+      sound = renderer.renderToSound()
+      Render.speed = renderer.getRenderSpeed()
+      return sound
+
+   def file(material, filename, sampleRate=22050):
+      """Renders this material (Score, Part, Phrase, or Note) straight into a (stereo) WAV file."""
+
+      # JEM working directory fix (see above)
+      filename = fixWorkingDirForJEM( filename )   # does nothing if not in JEM
+
+      renderer = Render.__getRenderer__(material, sampleRate)
+      renderer.renderToFile(filename)
+      Render.speed = renderer.getRenderSpeed()
+
+   def getSpeed():
+      """Returns how many times faster than real time the last render was (0.0 if nothing has been rendered)."""
+
+      return Render.speed
+
+   # make these functions callable without having to instantiate this class
+   __getRenderer__ = Callable(__getRenderer__)
+   sound = Callable(sound)
+   file = Callable(file)
+   getSpeed = Callable(getSpeed)
+
 ######################################################################################
 #### jMusic Play extensions ##########################################################
 ######################################################################################
@@ -1310,44 +1905,144 @@ for i in range(16):
 # play music functionality from basic elements.
 
 from jm.midi import MidiSynth  # needed to play and loop MIDI
+from threading import Lock     # MidiSynthPool may be used by several threads
 from time import sleep         # needed to implement efficient busy-wait loops (see below)
 from timer import *            # needed to schedule future tasks
 
-# allocate enough MidiSynths and reuse them (when available)
-__midiSynths__ = []            # holds all available jMusic MidiSynths 
+# MidiSynths are expensive (each loads its own synthesizer and soundbank), so we keep a pool of them and reuse them
 MAX_MIDI_SYNTHS = 12           # max number of concurrent MidiSynths allowed 
                                # NOTE: This is an empirical value - not documented - may change.                               
+
+def __setMidiSynthVolume__(midiSynth, volume):
+   """Sets the volume (0 - 127) of all MIDI channels of this MidiSynth."""
+
+   # NOTE:  Setting volume through a MidiSynth is problematic.  
+   #        Here we use a solution by Howard Amos (posted 8/16/2012) in
+   #        http://www.coderanch.com/t/272584/java/java/MIDI-volume-control-difficulties
+   volumeMessage = ShortMessage()    # create a MIDI message
+   #receiver = midiSynth.getSequencer().getTransmitters().iterator().next().getReceiver()  # get the MidiSynth receiver
+   receiver = midiSynth.getSequencer().getTransmitters()[0].getReceiver()  # get the MidiSynth receiver
+
+   for channel in range(16):   # change volume of all the MIDI channels
+      volumeMessage.setMessage(0xB0 + channel, 7, volume)   # set coarse volume control for this channel
+      receiver.send (volumeMessage, -1)                     # and communicate it to the receiver
+
+class MidiSynthPool():
+   """Holds MidiSynths to be shared by everything that plays MIDI material (e.g., MidiSequence, Play.midi2()).
+      MidiSynths are created only when needed (up to maxSynths), and they are initialized only once - after that,
+      their synthesizer (and soundbank) is reused.  A MidiSynth is available when it is not playing.
+   """
+
+   def __init__(self, maxSynths=MAX_MIDI_SYNTHS):
+      self.maxSynths  = maxSynths
+      self.midiSynths = []     # MidiSynths created so far
+      self.owners     = []     # who acquired each of them last (parallel list)
+      self.acquired   = []     # and when (parallel list - to find the oldest, when preempting)
+      self.acquisitions = 0    # counts acquisitions
+      self.lock       = Lock() # finding a MidiSynth and handing it over are done by one thread at a time
+
+   def acquire(self, owner=None, wait=0, preempt=False):
+      """Returns an available MidiSynth (preferably, the one this owner had last), or None.  If all are busy,
+         it waits up to 'wait' milliseconds for one to become available, and then (if 'preempt' is True)
+         it stops the one acquired the longest time ago, and returns it."""
+
+      midiSynth = self.__tryAcquire__(owner, False)
+
+      # if all are busy, wait for one to become available (if so asked)
+      waited = 0
+      while midiSynth == None and waited < wait:
+         sleep(0.01)                     # efficient busy-wait (without holding the lock)
+         waited = waited + 10
+         midiSynth = self.__tryAcquire__(owner, False)
+
+      # still busy, so stop the oldest (if so asked)
+      if midiSynth == None and preempt:
+         midiSynth = self.__tryAcquire__(owner, True)
+
+      return midiSynth   # (hopefully, they will use it right away)
+
+   def __tryAcquire__(self, owner, preempt):
+      """Finds an available MidiSynth (or, if 'preempt' is True, stops the oldest one) and hands it to this owner,
+         all under the lock, so that two threads never get the same MidiSynth.  Returns it, or None."""
+
+      self.lock.acquire()
+      try:
+         index = self.__findAvailable__(owner)
+
+         if index == None and preempt and self.midiSynths != []:
+            index = self.acquired.index( min(self.acquired) )
+            self.midiSynths[index].stop()
+
+         if index == None:    # none available?
+            return None
+
+         # let the owner have it
+         midiSynth = self.midiSynths[index]
+         if self.owners[index] is not owner:      # has it changed hands?
+            __setMidiSynthVolume__(midiSynth, 100)   # yes, so reset volume (previous owner may have changed it)
+            midiSynth.getSequencer().setTempoFactor(1.0)   # and tempo factor (previous owner may have paused it)
+         self.owners[index] = owner
+         self.acquisitions = self.acquisitions + 1
+         self.acquired[index] = self.acquisitions
+
+         return midiSynth
+      finally:
+         self.lock.release()
+
+   def isOwner(self, midiSynth, owner):
+      """Returns True if this owner acquired this MidiSynth last (i.e., it has not been handed to someone else)."""
+      self.lock.acquire()
+      try:
+         return midiSynth in self.midiSynths and self.owners[ self.midiSynths.index(midiSynth) ] is owner
+      finally:
+         self.lock.release()
+
+   def stopAll(self):
+      """Stops all MidiSynths from playing."""
+      for midiSynth in self.midiSynths:
+         if midiSynth.isPlaying():    # if playing, stop it
+            midiSynth.stop()
+
+   def __findAvailable__(self, owner):
+      """Returns the index of an available MidiSynth (creating one, if needed and allowed), or None.
+         (Call only while holding the lock.)"""
+
+      available = [i for i in range(len(self.midiSynths)) if not self.midiSynths[i].isPlaying()]
+
+      # prefer the one this owner had last (it is set up for them)
+      for i in available:
+         if owner != None and self.owners[i] is owner:
+            return i
+
+      if available != []:
+         return available[0]
+
+      # all are busy, so create another one (if allowed)
+      if len(self.midiSynths) < self.maxSynths:
+         midiSynth = MidiSynth()    # create a new MIDI synthesizer
+
+         # NOTE: Since we need access to the "guts" of the MidiSynth object, it is important to initialize it.
+         #       This happens automatically the first time we play something through it, so let's play an empty score.
+         midiSynth.play( Score() )
+
+         self.midiSynths.append( midiSynth )
+         self.owners.append( None )
+         self.acquired.append( 0 )
+         return len(self.midiSynths) - 1
+
+      return None
+
+# the pool of MidiSynths used by everything (created lazily - see MidiSynthPool)
+__midiSynthPool__ = MidiSynthPool(MAX_MIDI_SYNTHS)
                                
 def __getMidiSynth__():
    """Returns the next available MidiSynth (if any), or None."""
-         
-   # make sure all possible MidiSynths are allocated 
-   if __midiSynths__ == []:
-      for i in range(MAX_MIDI_SYNTHS):
-         __midiSynths__.append( MidiSynth() )   # create a new MIDI synthesizer
-   # now, all MidiSynths are allocated
-      
-   # find an available MidiSynth to play the material (it's possible that all are allocated,
-   # since this function may be called repeatedly, while other music is still sounding
-   i = 0
-   while i < MAX_MIDI_SYNTHS and __midiSynths__[i].isPlaying():
-      i = i + 1     # check if the next MidiSynth is available
-   # now, i either points to the next available MidiSynth, or MAX_MIDI_SYNTHS if none is available
-      
-   # did we find an available MidiSynth?
-   if i < MAX_MIDI_SYNTHS:
-      midiSynth = __midiSynths__[i]
-   else:
-      midiSynth = None
-
-   return midiSynth    # let them have it (hopefully, they will use it right away)
+   return __midiSynthPool__.acquire()
 
 # Provide a way to stop all MidiSynths from playing.
 def __stopMidiSynths__():
    """Stops all MidiSynths from playing."""
-   for midiSynth in __midiSynths__:
-      if midiSynth.isPlaying():    # if playing, stop it
-         midiSynth.stop()
+   __midiSynthPool__.stopAll()
    
 
 #########
@@ -1461,103 +2156,42 @@ class Play(jPlay):
 
    # redefine Play.midi to fix jMusic bug (see above) - now, we can play as many times as we wish.
    def midi(material):
-      """Play jMusic material (Score, Part, Phrase, Note) using our own Play.note() function."""
+      """Play jMusic material (Score, Part, Phrase, Note, or a ScoreIndex) using our own Play.note() function."""
       
-      # do necessary datatype wrapping (MidiSynth() expects a Score)
-      if type(material) == Note:
-         material = Phrase(material)
-      if type(material) == jNote:    # (also wrap jMusic default Notes, in addition to our own)
-         material = Phrase(material)
-      if type(material) == Phrase:   # no elif - we need to successively wrap from Note to Score
-         material = Part(material)
-         material.setInstrument(-1)     # indicate no default instrument (needed to access global instrument)
-      if type(material) == jPhrase:  # (also wrap jMusic default Phrases, in addition to our own)
-         material = Part(material)
-         material.setInstrument(-1)     # indicate no default instrument (needed to access global instrument)
-      if type(material) == Part:     # no elif - we need to successively wrap from Note to Score
-         material = Score(material)
-      if type(material) == Score:
-
-         # we are good - let's play it then!
-
-         score = material   # by now, material is a score, so create an alias (for readability)
+      # do necessary datatype wrapping (see ScoreIndex)
+      if isinstance(material, ScoreIndex):
+         index = material              # (played as indexed, even if the score has changed since)
+      else:
+         index = None
+         score = __asScore__(material)
+         if score != None:
+            # get all notes, sorted by start time, with chords resolved (indexed afresh, since notes may have been
+            # changed directly through jMusic, which is not counted - to play the same score again and again, pass
+            # its ScoreIndex instead)
+            index = ScoreIndex(score)
 
+      if index != None:
 
-         # loop through all parts and phrases to get all notes
-         noteList = []               # holds all notes
-         tempo = score.getTempo()    # get global tempo (can be overidden by part and phrase tempos)
-         for part in score.getPartArray():   # traverse all parts
-            channel = part.getChannel()        # get part channel
-            instrument = Play.getInstrument(channel)  # get global instrument for this channel
-            if part.getInstrument() > -1:      # has the part instrument been set?
-               instrument = part.getInstrument()  # yes, so it takes precedence
-            if part.getTempo() > -1:           # has the part tempo been set?
-               tempo = part.getTempo()            # yes, so update tempo
-            for phrase in part.getPhraseArray():   # traverse all phrases in part
-               if phrase.getInstrument() > -1:        # is this phrase's instrument set?
-                  instrument = phrase.getInstrument()    # yes, so it takes precedence
-               if phrase.getTempo() > -1:          # has the phrase tempo been set?
-                  tempo = phrase.getTempo()           # yes, so update tempo
-     
-               # time factor to convert time from jMusic Score units to milliseconds
-               # (this needs to happen here every time, as we may be using the tempo from score, part, or phrase)
-               FACTOR = 1000 * 60.0 / tempo   
+         # we are good - let's play it then!
 
-               # process notes in this phrase
-               startTime = phrase.getStartTime() * FACTOR   # in milliseconds
-               for note in phrase.getNoteArray():
-                  frequency = note.getFrequency()
-                  panning = note.getPan()
-                  panning = mapValue(panning, 0.0, 1.0, 0, 127)    # map from range 0.0..1.0 (Note panning) to range 0..127 (as expected by Java synthesizer)
-                  start = int(startTime)                           # remember this note's start time (in milliseconds)
+         notes = index.getNotes()
 
-                  # NOTE:  Below we use note length as opposed to duration (getLength() vs. getDuration())
-                  # since note length gives us a more natural sounding note (with proper decay), whereas 
-                  # note duration captures the more formal (printed score) duration (which sounds unnatural).
-                  duration = int(note.getLength() * FACTOR)             # get note length (as oppposed to duration!) and convert to milliseconds
-                  startTime = startTime + note.getDuration() * FACTOR   # update start time (in milliseconds)
-                  velocity = note.getDynamic()
-                   
-                  # accumulate non-REST notes
-                  if (frequency != REST):
-                     noteList.append((start, duration, frequency, velocity, channel, instrument, panning))   # put start time first and duration second, so we can sort easily by start time (below),
-                     # and so that notes that are members of a chord as denoted by having a duration of 0 come before the note that gives the specified chord duration
-                   
-         # sort notes by start time
-         noteList.sort()
+         # parts and phrases with no instrument set use the global instrument of their channel - get these
+         # before scheduling, since setting the instruments of earlier notes (below) changes them
+         globalInstruments = {}
+         for start, duration, pitch, velocity, channel, instrument, panning, partNumber in notes:
+            if instrument == -1 and channel not in globalInstruments:
+               globalInstruments[channel] = Play.getInstrument(channel)
 
-         # Schedule playing all notes in noteList
-         chordNotes = []      # used to process notes belonging in a chord
-         for start, duration, pitch, velocity, channel, instrument, panning in noteList:
+         # Schedule playing all notes
+         for start, duration, pitch, velocity, channel, instrument, panning, partNumber in notes:
             # set appropriate instrument for this channel
+            if instrument == -1:                        # no instrument set for this part or phrase?
+               instrument = globalInstruments[channel]     # so, use the global instrument for this channel
             Play.setInstrument(instrument, channel)
 
-            # handle chord (if any)
-            # Chords are denoted by a sequence of notes having the same start time and 0 duration (except the last note
-            # of the chord).
-            if duration == 0:   # does this note belong in a chord?
-               chordNotes.append([start, duration, pitch, velocity, channel, panning])  # add it to the list of chord notes
-               
-            elif chordNotes == []:   # is this a regular, solo note (not part of a chord)?
-               
-               # yes, so schedule it to play via a Play.note event
-               Play.note(pitch, start, duration, velocity, channel, panning)
-               #print "Play.note(" + str(pitch) + ", " + str(int(start * FACTOR)) + ", " + str(int(duration * FACTOR)) + ", " + str(velocity) + ", " + str(channel) + ")"
-
-            else:   # note has a normal duration and it is part of a chord
-
-               # first, add this note together with this other chord notes
-               chordNotes.append([start, duration, pitch, velocity, channel, panning])
-               
-               # now, schedule all notes in the chord list using last note's duration
-               for start, ignoreThisDuration, pitch, velocity, channel, panning in chordNotes:
-                  # schedule this note using chord's duration (provided by the last note in the chord)
-                  Play.note(pitch, start, duration, velocity, channel, panning)
-                  #print "Chord: Play.note(" + str(pitch) + ", " + str(int(start * FACTOR)) + ", " + str(int(duration * FACTOR)) + ", " + str(velocity) + ", " + str(channel) + ")"
-               # now, all chord notes have been scheduled
-
-               # so, clear chord notes to continue handling new notes (if any)
-               chordNotes = []
+            # schedule it to play via a Play.note event
+            Play.note(pitch, start, duration, velocity, channel, panning)
    
          # now, all notes have been scheduled for future playing - scheduled notes can always be stopped using
          # JEM's stop button - this will stop all running timers (used by Play.note() to schedule playing of notes)
@@ -1599,7 +2233,7 @@ class Play(jPlay):
             print "Play.midi(): Unrecognized type" + str(type(material)) + ", expected Note, Phrase, Part, or Score."
 
       else:   # error check    
-         print "Play.midi(): All", MAX_MIDI_SYNTHS, "MIDI synthesizers are busy - (try again later?)"
+         print "Play.midi(): All", __midiSynthPool__.maxSynths, "MIDI synthesizers are busy - (try again later?)"
          
       return midiSynth  # return midiSynth playing
    
@@ -2030,42 +2664,89 @@ class Play(jPlay):
          # get absolute release time
          absoluteReleaseTime = duration - envelope.getRelease()
 
-         # create list of timers to perform volume changes
-         attackTimers = []
+         # schedule note-on, volume changes, and note-off on the audio clock of the synthesizer playing
+         # this sample (as opposed to a timer per event) - this way, timing is sample-block accurate,
+         # and is not affected by GUI load
+         synth = audioSample.player.getSynthesizer()
+         noteTime = synth.getCurrentTime() + start / 1000.0    # audio time (in seconds) the note starts
 
-         # first, create timers for envelope attack 
-         for i in range( len(relativeAttackValues) ):
-             timerOffset = envelope.__getAbsoluteAttackTimes__()[i]
-             volume = relativeAttackValues[i]
-             delay = attackDelays[i]
-             timer = Timer2(start+timerOffset, audioSample.setVolume, [volume, delay], False)
-             attackTimers.append( timer )
- 
-         # now, create timers for envelope sustain and release
-         sustainTimer = Timer2(start + envelope.__getAbsoluteDelay__(), audioSample.setVolume, [relativeSustainValue, delayDelay], False)
-         releaseTimer = Timer2(start + absoluteReleaseTime, audioSample.setVolume, [0, releaseDelay], False)
-  
-         # finally, create timers for note-on and note-off events
-         audioOn  = Timer2(start, Play.audioOn, [pitch, audioSample, velocity, panning], False)
-         audioOff = Timer2(start+duration, Play.audioOff, [pitch, audioSample], False)
-         
-         # everything is ready, so start timers to schedule playng of note
-         audioOn.start()
-         for i in range(len(attackTimers)):
-           attackTimers[i].start()
-         sustainTimer.start()
-         releaseTimer.start()
-         audioOff.start()
+         # each note gets its own voice of the sample, so overlapping notes (and chords) do not cut each other off -
+         # the voice id is only known once the note starts, so the scheduled events share it through this list
+         note = []
+
+         if hasattr(audioSample, "setVoiceEnvelope"):   # can the note's voice play the envelope itself?
+
+            # yes, so hand the whole envelope to the voice at note-on, as (duration, level) segments - it is
+            # played by a jSyn envelope unit (instead of a volume change event per envelope point)
+            segments = []
+            for i in range( len(attackDelays) ):
+               segments.append( (attackDelays[i], envelope.getAttackValues()[i]) )   # attack
+            segments.append( (delayDelay, envelope.sustainValue) )                    # delay
+            holdDelay = (absoluteReleaseTime - envelope.__getAbsoluteDelay__()) / 1000.0
+            segments.append( (holdDelay, envelope.sustainValue) )                     # sustain
+            segments.append( (releaseDelay, 0.0) )                                    # and release
+
+            # schedule note-on event (with envelope)
+            scheduleAudioTask(noteTime, Play.__audioNoteOn__, [note, pitch, audioSample, velocity, panning, segments], synth)
+
+         else:
+
+            # otherwise, schedule note-on event
+            scheduleAudioTask(noteTime, Play.__audioNoteOn__, [note, pitch, audioSample, velocity, panning], synth)
+
+            # then, envelope attack
+            absoluteAttackTimes = envelope.__getAbsoluteAttackTimes__()
+            for i in range( len(relativeAttackValues) ):
+                attackTime = noteTime + absoluteAttackTimes[i] / 1000.0
+                scheduleAudioTask(attackTime, Play.__audioNoteVolume__, [note, audioSample, relativeAttackValues[i], attackDelays[i]], synth)
+
+            # now, envelope sustain and release
+            sustainTime = noteTime + envelope.__getAbsoluteDelay__() / 1000.0
+            releaseTime = noteTime + absoluteReleaseTime / 1000.0
+            scheduleAudioTask(sustainTime, Play.__audioNoteVolume__, [note, audioSample, relativeSustainValue, delayDelay], synth)
+            scheduleAudioTask(releaseTime, Play.__audioNoteVolume__, [note, audioSample, 0, releaseDelay], synth)
+
+         # finally, note-off event
+         scheduleAudioTask(noteTime + duration / 1000.0, Play.__audioNoteOff__, [note, audioSample], synth)
+
+   def __audioNoteOn__(note, pitch, audioSample, velocity, panning, segments = None):
+      """Helper for audioNote() - starts the note, and remembers its voice id (if any) in 'note'.
+         If given, the envelope 'segments' are played on the note's voice."""
+      note.append( Play.audioOn(pitch, audioSample, velocity, panning) )
+      if segments and note[0] != None:                     # was the note started on a voice?
+         audioSample.setVoiceEnvelope(note[0], segments)      # yes, so let it play the envelope
+
+   def __audioNoteVolume__(note, audioSample, volume, delay):
+      """Helper for audioNote() - changes the volume of the note (only its voice, if it has one)."""
+      if note and note[0] != None:                          # was the note started on a voice?
+         audioSample.setVoiceVolume(note[0], volume, delay)    # yes, so change only that voice
+      else:
+         audioSample.setVolume(volume, delay)                  # otherwise, change the whole sample
+
+   def __audioNoteOff__(note, audioSample):
+      """Helper for audioNote() - stops the note (only its voice, if it has one)."""
+      if note and note[0] != None:                          # was the note started on a voice?
+         audioSample.stopVoice(note[0])                        # yes, so stop only that voice
+      else:
+         audioSample.stop()                                    # otherwise, stop the whole sample
          
 
    def audioOn(pitch, audioSample, velocity = 127, panning = -1):
-      """Start playing a specific pitch at a given volume using provided audio sample."""
+      """Start playing a specific pitch at a given volume using provided audio sample.
+         If the sample has several voices, the pitch is started on a voice of its own (and its voice id is returned)."""
+
+      if (type(pitch) == int) and (0 <= pitch <= 127):   # a MIDI pitch?
+         # yes, so convert pitch from MIDI number (int) to Hertz (float)
+         pitch = noteToFreq(pitch)
+
+      if panning == -1:                              # if we do not have a specific panning...
+         panning = Play.getPanning()                    # use the global / default panning
 
-      if panning != -1:                              # if we have a specific panning...
-         audioSample.setPanning(panning)                # then, use it (otherwise let default / global panning stand
-      else:                                          # otherwise...
-         audioSample.setPanning( Play.getPanning() )    # use the global / default panning
+      if hasattr(audioSample, "startVoice"):         # can the sample play several pitches at once?
+         return audioSample.startVoice(pitch, velocity, panning)   # yes, so start pitch on a voice of its own
 
+      # otherwise, use the sample as a single voice
+      audioSample.setPanning(panning)                # set the panning
       audioSample.setFrequency(pitch)                # set the sample to the specified frequency
       audioSample.setVolume(velocity)                # and specified volume
       
@@ -2074,8 +2755,14 @@ class Play(jPlay):
    def audioOff(pitch, audioSample):
       """Stop playing the specified pitch on the provided audio sample."""
 
-      # NOTE: For now we ignore pitch...
-      audioSample.stop()
+      if (type(pitch) == int) and (0 <= pitch <= 127):   # a MIDI pitch?
+         # yes, so convert pitch from MIDI number (int) to Hertz (float)
+         pitch = noteToFreq(pitch)
+
+      if hasattr(audioSample, "stopFrequency"):      # can the sample play several pitches at once?
+         audioSample.stopFrequency(pitch)               # yes, so stop only this pitch
+      else:
+         audioSample.stop()                             # otherwise, stop the sample
 
    def allAudioNotesOff():
       """It turns off all notes on all audio samples."""
@@ -2117,6 +2804,9 @@ class Play(jPlay):
    audio = Callable(audio)
    audioOn = Callable(audioOn)
    audioOff = Callable(audioOff)
+   __audioNoteOn__ = Callable(__audioNoteOn__)
+   __audioNoteVolume__ = Callable(__audioNoteVolume__)
+   __audioNoteOff__ = Callable(__audioNoteOff__)
    allAudioNotesOff = Callable(allAudioNotesOff)
 
 
@@ -2192,10 +2882,8 @@ class jSyn_AudioEngine():
    def add(self, sample):
       """Connects an audio sample to the jSyn lineOut unit."""
       
-      self.synth.add( sample.player )   # add the sample's player to the synth
-      self.synth.add( sample.amplitudeSmoother )  # add the sample's amplitude linearRamp to the synth
-      self.synth.add( sample.panLeft )  # add the sample's left pan control to the synth
-      self.synth.add( sample.panRight ) # add the sample's right pan control to the synth
+      for unit in sample.loopVoice.getUnits() + sample.voicePool.getUnits():   # add each voice's player, amplitude linearRamp, and pan controls
+         self.synth.add( unit )
       self.synth.add( sample.lineOut )  # add the sample's output mixer to the synth
       self.samples.append( sample )     # remember this sample
    
@@ -2211,10 +2899,283 @@ jSyn.start()                 # should this be happening here? (or inside the Aud
 # JEM's Stop button is pressed
 __ActiveAudioSamples__ = []     # holds active AudioSample and LiveSample objects
 
-##### AudioSample class ######################################
-
 import os   # to check if provided filename exists
 
+# holds loaded jSyn samples, so that AudioSamples of the same (unchanged) file share the audio data
+# (AudioSamples keep their own sample, so forgetting one here only means it is loaded again, if needed)
+MAX_CACHED_AUDIO_FILES = 16   # how many loaded files are kept (the least recently used are forgotten)
+__FloatSamples__ = []         # (path, modification time) and jSyn sample of each file, most recently used last
+
+def __loadFloatSample__(filename):
+   """Returns the jSyn FloatSample for this audio file (it is loaded only once, unless the file changes)."""
+
+   from com.jsyn.util import SampleLoader
+
+   path = os.path.abspath(filename)
+   key = (path, os.path.getmtime(filename))   # a changed file has a new modification time
+
+   # look for it among the files loaded before (forgetting older versions of it)
+   cached = None
+   for i in range(len(__FloatSamples__) - 1, -1, -1):
+      if __FloatSamples__[i][0][0] == path:
+         if __FloatSamples__[i][0] == key:
+            cached = __FloatSamples__[i]
+         del __FloatSamples__[i]   # (if still current, it is put back as most recently used, below)
+         break
+
+   if cached == None:      # first time?
+      SampleLoader.setJavaSoundPreferred( False )  # use internal jSyn sound processes
+      cached = (key, SampleLoader.loadFloatSample( File(filename) ))  # load it as a a jSyn sample
+
+   # remember it as most recently used
+   __FloatSamples__.append(cached)
+   while len(__FloatSamples__) > max(MAX_CACHED_AUDIO_FILES, 0):
+      del __FloatSamples__[0]
+
+   return cached[1]
+
+
+##### AudioVoice class ######################################
+
+class AudioVoice():
+   """
+   A sample player (mono or stereo, as needed), with its own amplitude smoother and panning, reading
+   the audio data of a jSyn sample into a lineOut unit.  AudioSamples have a pool of these
+   (see AudioVoicePool), so that they may sound several notes at once.
+   """
+
+   def __init__(self, sample, lineOut):
+
+      # import jSyn stuff here, so as to not polute the global namespace
+      from com.jsyn.unitgen import Pan, VariableRateMonoReader, VariableRateStereoReader, LinearRamp, Multiply
+
+      self.sample = sample    # the audio data to read (may be shared with other voices)
+
+      # create panning control (we simulate this using two pan controls, one for the left channel and
+      # another for the right channel) - to pan we adjust their respective pan
+      self.panLeft  = Pan()
+      self.panRight = Pan()
+
+      # NOTE: The two pan controls have only one of their outputs (as their names indicate)
+      # connected to LineOut.  This way, we can set their pan value as we would normally, and not worry
+      # about clipping (i.e., doubling the output amplitude).  Also, this works for both mono and
+      # stereo samples.
+
+      # create sample player (mono or stereo, as needed) and connect to lineOut mixer
+      if self.sample.getChannelsPerFrame() == 1:    # mono audio?
+         self.player = VariableRateMonoReader()                  # create mono sample player
+
+         self.player.output.connect( 0, self.panLeft.input, 0)   # connect single channel to pan control
+         self.player.output.connect( 0, self.panRight.input, 0)
+
+      elif self.sample.getChannelsPerFrame() == 2:  # stereo audio?
+         self.player = VariableRateStereoReader()                # create stereo sample player
+
+         self.player.output.connect( 0, self.panLeft.input, 0)   # connect both channels to pan control
+         self.player.output.connect( 1, self.panRight.input, 0)
+
+      else:
+         raise TypeError( "Can only play mono or stereo samples." )
+
+      # now, connect pan control to mixer
+      self.panLeft.output.connect( 0, lineOut.input, 0 )
+      self.panRight.output.connect( 1, lineOut.input, 1 )
+
+      # smooth out (linearly ramp) changes in player amplitude (without this, we get clicks)
+      self.amplitudeSmoother = LinearRamp()
+      self.amplitudeSmoother.input.setup( 0.0, 0.5, 1.0 )              # set minimum, current, and maximum settings for control
+      self.amplitudeSmoother.time.set( 0.0002 )                        # and how many seconds to take for smoothing amplitude changes
+
+      # the note's volume envelope (see setEnvelope()) is played by an envelope player, and scales
+      # the smoothed amplitude - so, setVolume() still applies to the note as a whole
+      self.envelopePlayer = VariableRateMonoReader()
+      self.envelopePlayer.rate.set( 1.0 )                              # envelope segment durations are in seconds
+      self.amplitudeScaler = Multiply()
+      self.amplitudeSmoother.output.connect( self.amplitudeScaler.inputA )
+      self.envelopePlayer.output.connect( self.amplitudeScaler.inputB )
+      self.amplitudeScaler.output.connect( self.player.amplitude )     # connect to player's amplitude
+      self.clearEnvelope()                                             # no envelope (i.e., full level) to begin with
+
+      # play at original pitch
+      self.player.rate.set( self.sample.getFrameRate() )
+
+      self.frequency  = None    # frequency of the note sounding (None means not started via AudioVoicePool)
+      self.volume     = 0       # current volume (0 - 127)
+      self.noteCount  = 0       # how many notes this voice has been given (identifies the current note)
+      self.startOrder = 0       # when the current note started (relative to other voices in the pool)
+
+      self.setPanning( 63 )     # initialize panning to center
+
+   def getUnits(self):
+      """Returns the jSyn units of this voice (so they can be added to a synthesizer)."""
+      return [self.player, self.amplitudeSmoother, self.envelopePlayer, self.amplitudeScaler, self.panLeft, self.panRight]
+
+   def play(self, rate, startFrame=0, numFrames=-1):
+      """Play the sample once at the given playback rate (e.g., 44100.0 Hz), from 'startFrame' for 'numFrames'
+         frames (-1 means to the end)."""
+      if numFrames == -1:   # to the end?
+         numFrames = self.sample.getNumFrames() - startFrame
+      self.player.dataQueue.clear()                                       # restart (as opposed to queue at the end)
+      self.player.rate.set( rate )
+      self.player.dataQueue.queue( self.sample, startFrame, numFrames )
+
+   def stop(self):
+      """Stop the voice play."""
+      self.player.dataQueue.clear()
+
+   def isPlaying(self):
+      """Returns True if the voice is still playing."""
+      return self.player.dataQueue.hasMore()
+
+   def setVolume(self, volume, delay = 0.0002):
+      """Set voice's volume (volume ranges from 0 - 127), reaching it in 'delay' seconds."""
+      self.volume = volume                            # remember new volume
+      amplitude = mapValue(self.volume,0,127,0.0,1.0) # map volume to amplitude
+      self.amplitudeSmoother.input.set( amplitude )   # and set it
+      self.amplitudeSmoother.time.set( delay )        # set delay time
+
+   def setEnvelope(self, segments):
+      """Play a volume envelope on the voice, given as a list of (duration, level) segments - each segment ramps
+         from the previous level to 'level' (0.0 - 1.0, relative to the voice volume) in 'duration' seconds.
+         The last level is held.  Replaces any earlier envelope."""
+
+      # import jSyn stuff here, so as to not polute the global namespace
+      from com.jsyn.data import SegmentedEnvelope
+      from jarray import array
+
+      pairs = []
+      for duration, level in segments:
+         pairs.append( max(float(duration), 0.0002) )   # (envelope segments need some duration, to avoid clicks)
+         pairs.append( float(level) )
+
+      self.envelopePlayer.dataQueue.clear()             # drop what is left of any earlier envelope
+      self.envelopePlayer.dataQueue.queue( SegmentedEnvelope( array(pairs, 'd') ) )
+
+   def clearEnvelope(self):
+      """Remove the voice's volume envelope (i.e., play at full voice volume)."""
+      self.setEnvelope( [(0.0002, 1.0)] )
+
+   def setPanning(self, panning):
+      """Set panning of voice (panning ranges from 0 - 127)."""
+      panValue = mapValue(panning, 0, 127, -1.0, 1.0) # map panning from 0,127 to -1.0,1.0
+      self.panLeft.pan.set(panValue)                  # and set it
+      self.panRight.pan.set(panValue)
+
+
+##### AudioVoicePool class ######################################
+
+class AudioVoicePool():
+   """
+   A fixed pool of AudioVoices sharing one jSyn sample and one lineOut unit.  Each note started gets
+   its own voice (with its own playback rate, volume envelope, and panning), so notes may overlap.
+   When all voices are busy, a new note takes over (steals) the "oldest" or the "quietest" voice.
+   Notes are identified by voice ids, (voice index, note count) pairs - once a voice has been stolen,
+   operations on the ids of its earlier notes are ignored.
+   """
+
+   def __init__(self, sample, lineOut, referenceFrequency, numVoices=8, stealing="oldest"):
+
+      if numVoices < 1:
+         raise ValueError("Number of voices (" + str(numVoices) + ") should be at least 1.")
+
+      self.sample = sample
+      self.referenceFrequency = referenceFrequency     # frequency sounding at the sample's original rate
+      self.voices = [AudioVoice(sample, lineOut) for i in range(numVoices)]
+      self.setStealing( stealing )
+      self.notesStarted = 0         # counts notes started (used to find the oldest voice)
+
+   def getUnits(self):
+      """Returns the jSyn units of all voices (so they can be added to a synthesizer)."""
+      units = []
+      for voice in self.voices:
+         units.extend( voice.getUnits() )
+      return units
+
+   def setStealing(self, stealing):
+      """Set which busy voice to take over when all are busy ("oldest" or "quietest")."""
+      if stealing not in ["oldest", "quietest"]:
+         raise ValueError("Voice stealing (" + str(stealing) + ") should be \"oldest\" or \"quietest\".")
+      self.stealing = stealing
+
+   def getStealing(self):
+      """Return which busy voice is taken over when all are busy ("oldest" or "quietest")."""
+      return self.stealing
+
+   def start(self, frequency, volume=127, panning=63, startFrame=0, numFrames=-1):
+      """Start sounding the sample at 'frequency' (in Hz) on a free (or stolen) voice, from 'startFrame' for
+         'numFrames' frames (-1 means to the end).  Returns the voice id."""
+
+      # find a free voice (if any), otherwise steal one
+      index = 0
+      while index < len(self.voices) and self.voices[index].isPlaying():
+         index = index + 1
+
+      if index == len(self.voices):     # all busy?
+         if self.stealing == "oldest":
+            index = min(range(len(self.voices)), key=lambda i: self.voices[i].startOrder)
+         else:
+            index = min(range(len(self.voices)), key=lambda i: self.voices[i].volume)
+      # now, index points to the voice to use
+
+      voice = self.voices[index]
+      self.notesStarted = self.notesStarted + 1
+      voice.noteCount  = voice.noteCount + 1       # any older ids of this voice are now stale
+      voice.startOrder = self.notesStarted
+      voice.frequency  = frequency
+
+      voice.setPanning( panning )
+      voice.setVolume( volume )
+      voice.clearEnvelope()                        # (in case a stolen note had an envelope)
+      voice.play( self.sample.getFrameRate() * float(frequency) / self.referenceFrequency, startFrame, numFrames )
+
+      return (index, voice.noteCount)
+
+   def getVoice(self, voiceID):
+      """Returns the voice with this id, or None if the voice has been given another note since."""
+      index, noteCount = voiceID
+      voice = self.voices[index]
+      if voice.noteCount != noteCount:
+         voice = None
+      return voice
+
+   def setVolume(self, voiceID, volume, delay = 0.0002):
+      """Set the volume (0 - 127) of the note with this voice id, reaching it in 'delay' seconds."""
+      voice = self.getVoice( voiceID )
+      if voice:
+         voice.setVolume( volume, delay )
+
+   def setPanning(self, voiceID, panning):
+      """Set the panning (0 - 127) of the note with this voice id."""
+      voice = self.getVoice( voiceID )
+      if voice:
+         voice.setPanning( panning )
+
+   def setEnvelope(self, voiceID, segments):
+      """Play a volume envelope on the note with this voice id (see AudioVoice.setEnvelope())."""
+      voice = self.getVoice( voiceID )
+      if voice:
+         voice.setEnvelope( segments )
+
+   def stop(self, voiceID):
+      """Stop the note with this voice id."""
+      voice = self.getVoice( voiceID )
+      if voice:
+         voice.stop()
+
+   def stopFrequency(self, frequency):
+      """Stop the oldest note sounding at 'frequency' (in Hz), if any."""
+      sounding = [voice for voice in self.voices if voice.frequency == frequency and voice.isPlaying()]
+      if sounding != []:
+         min(sounding, key=lambda voice: voice.startOrder).stop()
+
+   def stopAll(self):
+      """Stop all voices."""
+      for voice in self.voices:
+         voice.stop()
+
+
+##### AudioSample class ######################################
+
 class AudioSample():
    """
    Encapsulates a sound object created from an external audio file, which can be played once,
@@ -2225,13 +3186,10 @@ class AudioSample():
    Supported data formats are WAV or AIF files (16, 24 and 32 bit PCM, and 32-bit float).
    """
    
-   def __init__(self, filename, referencePitch=A4, volume=127):
+   def __init__(self, filename, referencePitch=A4, volume=127, voices=8, voiceStealing="oldest"):
    
       # import jSyn stuff here, so as to not polute the global namespace
-      from com.jsyn import JSyn
-      from com.jsyn.data import FloatSample
-      from com.jsyn.unitgen import LineOut, Pan, VariableRateMonoReader, VariableRateStereoReader, LinearRamp, FixedRateMonoWriter, FixedRateStereoWriter
-      from com.jsyn.util import SampleLoader
+      from com.jsyn.unitgen import LineOut
 
       # ensure the file exists (jSyn will NOT complain on its own)
       if not os.path.isfile(filename):
@@ -2243,43 +3201,13 @@ class AudioSample():
       # remember is sample is paused or not - needed for function isPaused()
       self.hasPaused = False
 
-      # load and create the audio sample
-      SampleLoader.setJavaSoundPreferred( False )  # use internal jSyn sound processes
-      datafile = File(self.filename)               # get sound file 
-      self.sample = SampleLoader.loadFloatSample( datafile )  # load it as a a jSyn sample     
+      # load the audio sample (AudioSamples of the same file share it)
+      self.sample = __loadFloatSample__( self.filename )
       self.channels = self.sample.getChannelsPerFrame()       # get number of channels in sample
 
       # create lineOut unit (it mixes output to computer's audio (DAC) card)
       self.lineOut = LineOut()    
 
-      # create panning control (we simulate this using two pan controls, one for the left channel and
-      # another for the right channel) - to pan we adjust their respective pan
-      self.panLeft  = Pan()
-      self.panRight = Pan()
-
-      # NOTE: The two pan controls have only one of their outputs (as their names indicate)
-      # connected to LineOut.  This way, we can set their pan value as we would normally, and not worry
-      # about clipping (i.e., doubling the output amplitude).  Also, this works for both mono and
-      # stereo samples.
-
-      # create sample player (mono or stereo, as needed) and connect to lineOut mixer
-      if self.channels == 1:    # mono audio?
-         self.player = VariableRateMonoReader()                  # create mono sample player
-
-         self.player.output.connect( 0, self.panLeft.input, 0)   # connect single channel to pan control 
-         self.player.output.connect( 0, self.panRight.input, 0) 
-
-      elif self.channels == 2:  # stereo audio?
-         self.player = VariableRateStereoReader()                # create stereo sample player
-
-         self.player.output.connect( 0, self.panLeft.input, 0)   # connect both channels to pan control 
-         self.player.output.connect( 1, self.panRight.input, 0) 
-
-      else:
-         raise TypeError( "Can only play mono or stereo samples." )
-
-      # now that we have a player, set the default and current pitches
-
       # check if the reference is a midi pitch (int) or a frequency (float)
       if (type(referencePitch) == int) and (0 <= referencePitch <= 127):    # is reference pitch in MIDI (an int)?
          self.referencePitch     = referencePitch                               # remember reference pitch
@@ -2294,25 +3222,23 @@ class AudioSample():
       else:                                                                 # otherwise this is an error, so let them know
          raise TypeError("Reference pitch (" + str(referencePitch) + ") should be an int (range 0 and 127) or float (such as 440.0).")
 
-         print "Panning (" + str(panning) + ") should range from 0 to 127."
+      # create the voices (sample players, with their own amplitude smoother and panning) connected to lineOut
+      # (the pool lets us sound several notes at once - see startVoice())
+      self.voicePool = AudioVoicePool(self.sample, self.lineOut, self.referenceFrequency, voices, voiceStealing)
 
-      # now, connect pan control to mixer
-      self.panLeft.output.connect( 0, self.lineOut.input, 0 ) 
-      self.panRight.output.connect( 1, self.lineOut.input, 1 ) 
+      # loop() has a voice of its own (outside the pool, so notes never steal it), controlled by setFrequency(),
+      # setVolume(), etc. - play() starts each playback on a pool voice, so it doesn't cut off a loop
+      self.loopVoice = AudioVoice(self.sample, self.lineOut)
+      self.player            = self.loopVoice.player
+      self.amplitudeSmoother = self.loopVoice.amplitudeSmoother
+      self.panLeft           = self.loopVoice.panLeft
+      self.panRight          = self.loopVoice.panRight
+      self.playVoiceID = None          # voice id of the last play() (see __getPlayVoice__())
 
       # now, that panning is set up, initialize it to center
       self.panning = 63                # ranges from 0 (left) to 127 (right) - 63 is center
       self.setPanning( self.panning )  # and initialize
        
-      # smooth out (linearly ramp) changes in player amplitude (without this, we get clicks)
-      self.amplitudeSmoother = LinearRamp()
-      self.amplitudeSmoother.output.connect( self.player.amplitude )   # connect to player's amplitude
-      self.amplitudeSmoother.input.setup( 0.0, 0.5, 1.0 )              # set minimum, current, and maximum settings for control
-      self.amplitudeSmoother.time.set( 0.0002 )                        # and how many seconds to take for smoothing amplitude changes
-             
-      # play at original pitch
-      self.player.rate.set( self.sample.getFrameRate() )  
-
       self.volume = volume           # holds current volume (0 - 127)
       self.setVolume( self.volume )  # set the desired volume      
 
@@ -2329,11 +3255,15 @@ class AudioSample():
       Play the sample once from the millisecond 'start' until the millisecond 'start'+'size' 
       (size == -1 means to the end). If 'start' and 'size' are omitted, play the complete sample.
       """
-      # for faster response, we restart playing (as opposed to queue at the end)
-      if self.isPlaying():      # is another play is on?
-         self.stop()            # yes, so stop it
+      startFrames = self.__msToFrames__(start)
+      sizeFrames = self.__msToFrames__(size)
+      if size == -1:   # to the end?
+         sizeFrames = -1
 
-      self.loop(1, start, size)
+      self.lineOut.start()   # make sure we are heard
+
+      # play on a voice of its own (so a loop, or an earlier play, keeps sounding)
+      self.playVoiceID = self.voicePool.start(self.frequency, self.volume, self.panning, startFrames, sizeFrames)
       
 
    def loop(self, times = -1, start=0, size=-1):
@@ -2359,16 +3289,18 @@ class AudioSample():
          
    def stop(self):
       """
-      Stop the sample play.
+      Stop the sample play (including any loop, and notes sounding on other voices).
       """
-      self.player.dataQueue.clear()   
+      self.loopVoice.stop()
+      self.voicePool.stopAll()   
       self.hasPaused = False          # reset
       
    def isPlaying(self):
       """
-      Returns True if the sample is still playing.
+      Returns True if the sample is still playing (or looping).
       """
-      return self.player.dataQueue.hasMore()   
+      playVoice = self.__getPlayVoice__()
+      return self.loopVoice.isPlaying() or (playVoice != None and playVoice.isPlaying())
       
    def isPaused(self):
       """
@@ -2403,12 +3335,11 @@ class AudioSample():
       """
       Set sample's playback frequency.
       """
-      rateChangeFactor = float(freq) / self.frequency      # calculate change on playback rate
-      
       self.frequency = freq                                # remember new frequency
       self.pitch = self.__convertFrequencyToPitch__(freq)  # and corresponding pitch
 
-      self.__setPlaybackRate__(self.__getPlaybackRate__() * rateChangeFactor)   # and set new playback rate
+      # set new playback rate relative to the reference frequency (avoids accumulating rounding errors)
+      self.__setPlaybackRate__(self.getFrameRate() * float(freq) / self.referenceFrequency)
       
    def getFrequency(self):
       """
@@ -2454,6 +3385,10 @@ class AudioSample():
       
          self.panLeft.pan.set(panValue)                       # and set it
          self.panRight.pan.set(panValue)
+
+         playVoice = self.__getPlayVoice__()                  # also the last play(), if still sounding
+         if playVoice:
+            playVoice.setPanning( panning )
       
    def getPanning(self):
       """
@@ -2474,6 +3409,10 @@ class AudioSample():
          amplitude = mapValue(self.volume,0,127,0.0,1.0) # map volume to amplitude
          self.amplitudeSmoother.input.set( amplitude )   # and set it
          self.amplitudeSmoother.time.set(delay)          # set delay time
+
+         playVoice = self.__getPlayVoice__()             # also the last play(), if still sounding
+         if playVoice:
+            playVoice.setVolume( volume, delay )
      
    def getVolume(self):
       """
@@ -2482,6 +3421,59 @@ class AudioSample():
       return self.volume
       
       
+   ### functions to sound several notes at once (one per voice) ######################
+   def startVoice(self, frequency, volume=127, panning=63):
+      """
+      Start a note at the given frequency (in Hz) on a free voice, and return its voice id.
+      If all voices are busy, one is stolen (see setVoiceStealing()).
+      """
+      self.lineOut.start()   # make sure we are heard (sample may have been created after jSyn started)
+      return self.voicePool.start(frequency, volume, panning)
+
+   def setVoiceVolume(self, voiceID, volume, delay = 0.0002):
+      """
+      Set the volume (0 - 127) of the note started with startVoice().
+      """
+      self.voicePool.setVolume(voiceID, volume, delay)
+
+   def setVoiceEnvelope(self, voiceID, segments):
+      """
+      Play a volume envelope on the note started with startVoice(), given as a list of (duration, level)
+      segments - each ramps to 'level' (0.0 - 1.0, relative to the note volume) in 'duration' seconds.
+      """
+      self.voicePool.setEnvelope(voiceID, segments)
+
+   def setVoicePanning(self, voiceID, panning):
+      """
+      Set the panning (0 - 127) of the note started with startVoice().
+      """
+      self.voicePool.setPanning(voiceID, panning)
+
+   def stopVoice(self, voiceID):
+      """
+      Stop the note started with startVoice() (if it has not been stolen already).
+      """
+      self.voicePool.stop(voiceID)
+
+   def stopFrequency(self, frequency):
+      """
+      Stop the oldest note sounding at the given frequency (in Hz).
+      """
+      self.voicePool.stopFrequency(frequency)
+
+   def setVoiceStealing(self, stealing):
+      """
+      Set which voice is stolen when all are busy - "oldest" or "quietest".
+      """
+      self.voicePool.setStealing(stealing)
+
+   def getVoiceStealing(self):
+      """
+      Return which voice is stolen when all are busy - "oldest" or "quietest".
+      """
+      return self.voicePool.getStealing()
+      
+      
    ### low-level functions related to FrameRate and PlaybackRate  ######################
    def getFrameRate(self):
       """
@@ -2494,6 +3486,19 @@ class AudioSample():
       Set the sample's playback rate (e.g., 44100.0 Hz).
       """
       self.player.rate.set( newRate )
+
+      playVoice = self.__getPlayVoice__()   # also the last play(), if still sounding
+      if playVoice:
+         playVoice.player.rate.set( newRate )
+
+   def __getPlayVoice__(self):
+      """
+      Return the voice of the last play(), or None if there is none (or it has been given another note since).
+      """
+      playVoice = None
+      if self.playVoiceID != None:
+         playVoice = self.voicePool.getVoice( self.playVoiceID )
+      return playVoice
          
    def __getPlaybackRate__(self):
       """
@@ -2625,12 +3630,12 @@ class MidiSequence():
 
       # now, self.score contains a Score object
       
-      # create Midi sequencer to playback this sample
-      self.midiSynth = self.__initMidiSynth__()
+      # the Midi sequencer to playback this sample is acquired from the shared pool when we play (see __acquireMidiSynth__())
+      self.midiSynth = None
       
-      # get access to the MidiSynth's internal components (neededd for some of our operations)
-      self.sequencer = self.midiSynth.getSequencer()
-      self.synthesizer = self.midiSynth.getSynthesizer()
+      # access to the MidiSynth's internal components (neededd for some of our operations)
+      self.sequencer = None
+      self.synthesizer = None
       
       # set tempo factor
       self.tempoFactor = 1.0   # scales whatever tempo is set for the sequence (1.0 means no change) 
@@ -2641,6 +3646,7 @@ class MidiSequence():
       # set volume 
       self.volume = volume           # holds volume (0-127)
       #self.setVolume( self.volume )  # set desired volume     
+      self.volumeChanged = False     # True once setVolume() is called (so we set it again, when we get a MidiSynth)
       
       # set MIDI score's default pitch
       self.pitch = pitch                         # remember provided pitch
@@ -2649,22 +3655,39 @@ class MidiSequence():
       __ActiveMidiSequences__.append(self)
       
 
-   def __initMidiSynth__(self):
-      """Creates and initializes a MidiSynth object."""
-      
-      # NOTE: Since we need access to the "guts" of the MidiSynth object, it is important to initialize it.
-      #       This happens automatically the first time we play something through it, so let's play an empty score.
-      midiSynth = MidiSynth()   # create it
-      midiSynth.play( Score() ) # and initialize it      
-      return midiSynth
+   def __acquireMidiSynth__(self):
+      """Acquires a MidiSynth from the shared pool (the one we had, if still available).  Returns True if successful."""
+
+      # make sure only one play is active at a time
+      if self.isPlaying():               # is another play is on?
+         self.stop()                        # yes, so stop it
+
+      midiSynth = __midiSynthPool__.acquire(self)
+      if midiSynth == None:   # error check
+         print "MidiSequence: All", __midiSynthPool__.maxSynths, "MIDI synthesizers are busy - (try again later?)"
+         return False
+
+      self.midiSynth = midiSynth
+
+      # get access to the MidiSynth's internal components (neededd for some of our operations)
+      self.sequencer = self.midiSynth.getSequencer()
+      self.synthesizer = self.midiSynth.getSynthesizer()
+
+      if self.volumeChanged:     # and bring it up to date (someone else may have used it since)
+         self.setVolume( self.volume )
+
+      return True
+
+   def __hasMidiSynth__(self):
+      """Returns True if we have a MidiSynth (i.e., the pool has not handed it to someone else since we played)."""
+      return self.midiSynth != None and __midiSynthPool__.isOwner(self.midiSynth, self)
    
 
    def play(self):
       """Play the MIDI score."""
 
-      # make sure only one play is active at a time
-      if self.midiSynth.isPlaying():     # is another play is on?
-         self.stop()                        # yes, so stop it
+      if not self.__acquireMidiSynth__():
+         return
          
       #self.sequencer.setLoopCount(0)     # set to no repetition (needed, in case we are called after loop())
       self.midiSynth.setCycle(False)     # turn off looping (just in case)
@@ -2673,9 +3696,8 @@ class MidiSequence():
    def loop(self):
       """Repeat the score indefinitely."""
       
-      # make sure only one play is active at a time
-      if self.midiSynth.isPlaying():     # is another play is on?
-         self.stop()                        # yes, so stop it
+      if not self.__acquireMidiSynth__():
+         return
          
       # Due to an apparent Java Sequencer bug in setting tempo, we can only loop indefinitely (not a specified 
       # number of times).  Looping a specified number of times causes the second iteration to playback at 120 BPM.
@@ -2687,12 +3709,13 @@ class MidiSequence():
       """
       Returns True if the sequence is still playing.
       """
-      return self.midiSynth.isPlaying()   
+      return self.__hasMidiSynth__() and self.midiSynth.isPlaying()   
       
    def stop(self):
       """Stop the MIDI score play."""
 
-      self.midiSynth.stop()   
+      if self.__hasMidiSynth__():   # (otherwise, it is not playing our score)
+         self.midiSynth.stop()   
 
    def pause(self):
       """Pause the MIDI sequence play."""
@@ -2709,7 +3732,8 @@ class MidiSequence():
       """
       Set MIDI sequence's tempo factor (1.0 means default, i.e., no change).
       """
-      self.sequencer.setTempoFactor( factor )
+      if self.__hasMidiSynth__():
+         self.sequencer.setTempoFactor( factor )
       
 
    def setPitch(self, pitch):
@@ -2718,12 +3742,13 @@ class MidiSequence():
       semitones = pitch - self.pitch          # get the pitch change in semitones       
       Mod.transpose( self.score, semitones )  # update score pitch appropriately
       
-      # do some low-level work inside MidiSynth
-      updatedSequence = self.midiSynth.scoreToSeq( self.score )  # get new Midi sequence from updated score            
-      self.positionInMicroseconds = self.sequencer.getMicrosecondPosition()  # remember where to resume
-      self.sequencer.setSequence(updatedSequence)                # update the sequence - this restarts playing...
-      self.sequencer.setMicrosecondPosition( self.positionInMicroseconds )   # ...so reset playing to where we left off
-      self.sequencer.setTempoInBPM( self.playbackTempo )         # set tempo (needed for the first (partial) iteration)
+      # do some low-level work inside MidiSynth (if we are not playing, the updated score is played next time)
+      if self.__hasMidiSynth__():
+         updatedSequence = self.midiSynth.scoreToSeq( self.score )  # get new Midi sequence from updated score            
+         self.positionInMicroseconds = self.sequencer.getMicrosecondPosition()  # remember where to resume
+         self.sequencer.setSequence(updatedSequence)                # update the sequence - this restarts playing...
+         self.sequencer.setMicrosecondPosition( self.positionInMicroseconds )   # ...so reset playing to where we left off
+         self.sequencer.setTempoInBPM( self.playbackTempo )         # set tempo (needed for the first (partial) iteration)
 
       # finally, remember new pitch
       self.pitch = pitch
@@ -2748,8 +3773,9 @@ class MidiSequence():
       # Unable to solve the problem in the general case, below is an attempt to fix it for some cases (e.g.,
       # for looping continuously, but not for looping a specified number of times).
       self.playbackTempo = beatsPerMinute               # keep track of new playback tempo
-      self.sequencer.setTempoInBPM( beatsPerMinute )    # and set it
-      self.midiSynth.setTempo( beatsPerMinute )         # and set it again (this seems redundant, but see above)
+      if self.__hasMidiSynth__():
+         self.sequencer.setTempoInBPM( beatsPerMinute )    # and set it
+         self.midiSynth.setTempo( beatsPerMinute )         # and set it again (this seems redundant, but see above)
       self.score.setTempo( beatsPerMinute )             # and set it again (this seems redundant, but see above)
 
    def getTempo(self):   
@@ -2769,17 +3795,11 @@ class MidiSequence():
       """Sets the volume for the MidiSequence (volume ranges from 0 - 127)."""
       
       self.volume = volume    # remember new volume
+      self.volumeChanged = True
 
-      # NOTE:  Setting volume through a MidiSynth is problematic.  
-      #        Here we use a solution by Howard Amos (posted 8/16/2012) in
-      #        http://www.coderanch.com/t/272584/java/java/MIDI-volume-control-difficulties
-      volumeMessage = ShortMessage()    # create a MIDI message
-      #receiver = self.sequencer.getTransmitters().iterator().next().getReceiver()  # get the MidiSynth receiver
-      receiver = self.sequencer.getTransmitters()[0].getReceiver()  # get the MidiSynth receiver
-
-      for channel in range(16):   # change volume of all the MIDI channels
-         volumeMessage.setMessage(0xB0 + channel, 7, volume)   # set coarse volume control for this channel
-         receiver.send (volumeMessage, -1)                     # and communicate it to the receiver
+      # and set it (if we are not playing, it is set when we play next)
+      if self.__hasMidiSynth__():
+         __setMidiSynthVolume__(self.midiSynth, volume)
 
    def getVolume(self):
       """Returns the volume for the MidiSequence (volume ranges from 0 - 127)."""
@@ -2827,31 +3847,36 @@ __ActiveMetronomes__ = []     # holds active MidiSequence objects
 ##### Metronome class ######################################
 
 from timer import Timer
+from threading import RLock
 #from gui import Display     # for Metronome tick visualization
       
 class Metronome():
    """Creates a metronome object used in scheduling and synchronizing function call (intended for starting blocks of musical
       material together, but could be really used for anything (e.g., GUI animzation).  This is based on the Timer class,
       but is higher-level, based on tempo (e.g., 60 BPM), and time signatures (e.g., 4/4).  
+      Each beat is divided into 'ticksPerBeat' ticks (PPQ), so functions may also be called in between beats.
+      Ticks happen at absolute times of a monotonic clock (see timer.FixedRateTimer), so the metronome does not drift.
+      Late ticks are either made right away ("catchup"), or dropped ("skip") - functions due on dropped ticks are not
+      called (but, if repeated, they are rescheduled as usual).
    """
 
    #def __init__(self, tempo=60, timeSignature=[4, 4], displaySize=50, displayTickColor=Color.RED):
-   def __init__(self, tempo=60, timeSignature=[4, 4]):
+   def __init__(self, tempo=60, timeSignature=[4, 4], ticksPerBeat=24, lateness="catchup"):
       
       # remember title, tempo and time signature
       self.tempo = tempo
       self.timeSignature = timeSignature  # a list (first item is numerator, second is denominator)
+      self.ticksPerBeat = ticksPerBeat    # how many ticks in a beat (PPQ)
 
-      # list of functions (we are asked to synchronize) and their information (parallel lists)
-      self.functions        = []    # functions to call
-      self.parameters       = []    # their corresponding parameters
-      self.desiredBeats     = []    # on which beat to call them (0 means now)
-      self.repeatFlags      = []    # if they are meant to be called repeatedly
-      self.beatCountdowns   = []    # holds beat countdown until call
+      # functions (we are asked to synchronize) are kept in buckets, one per tick they are to be called on - so, on every
+      # tick, we only look at the functions due (no matter how many others are waiting for later beats)
+      self.buckets        = {}      # maps tick (since start) to list of functions (and their information) to call on it
+      self.tick           = 0       # next tick to happen (counting from start)
+      self.functionsAdded = 0       # counts functions added (to remove them in the order they were added)
+      self.lock           = RLock() # buckets are updated by both the metronome and its users
 
       # create timer, upon which to base our operation
-      delay = int((60.0 / self.tempo) * 1000)   # in milliseconds
-      self.timer = Timer2(delay, self.__callFunctions__, [], True)
+      self.timer = FixedRateTimer(self.__getTickDelay__(), self.__callFunctions__, [], True, lateness)
 
       # set up metronome visualization
 #      self.display = Display("Metronome", displaySize, displaySize+20, 0, 0)
@@ -2875,21 +3900,22 @@ class Metronome():
       __ActiveMetronomes__.append(self)
       
 
-   def add(self, function, parameters=[], desiredBeat=0, repeatFlag=False):
+   def add(self, function, parameters=[], desiredBeat=0, repeatFlag=False, desiredTick=0):
       """It schedules the provided function to be called by the metronome (passing the provided parameters to it) on the
          desired beat (0 means right away, 1 means first (strong) beat, 2 means second beat, etc.), and whether to keep
-         calling in it every time the desired beat comes around.
+         calling in it every time the desired beat comes around.  Optionally, the function may be called 'desiredTick'
+         ticks after the desired beat (0 up to, but not including, ticks per beat).
       """
-      self.functions.append( function )
-      self.parameters.append( parameters )
-      self.desiredBeats.append( desiredBeat )
-      self.repeatFlags.append( repeatFlag )
-      
-      # calculate beat countdown
-      beatCountdown = self.__calculateBeatCountdown__( desiredBeat )              
-         
-      # store beat countdown for this function
-      self.beatCountdowns.append( beatCountdown )
+      if not 0 <= desiredTick < self.ticksPerBeat:
+         raise ValueError("Desired tick (" + str(desiredTick) + ") should be at least 0 and less than " + str(self.ticksPerBeat) + ".")
+
+      self.lock.acquire()
+      try:
+         self.functionsAdded = self.functionsAdded + 1
+         entry = [function, parameters, desiredBeat, repeatFlag, desiredTick, self.functionsAdded]
+         self.__schedule__( entry )
+      finally:
+         self.lock.release()
 
    def remove(self, function):
       """It removes the provided function from the list of functions scheduled (via add) to be called by the metronome.
@@ -2897,31 +3923,43 @@ class Metronome():
          will be needed to remove all scheduled instances - a design choice).  If the function is not scheduled, it throws
          an error.
       """
-      index = self.functions.index( function )   # find index of leftmost occurrence
-      self.functions.pop( index )                # and remove it and all info 
-      self.parameters.pop( index ) 
-      self.desiredBeats.pop( index ) 
-      self.repeatFlags.pop( index ) 
-      self.beatCountdowns.pop( index )
+      self.lock.acquire()
+      try:
+         # find the earliest added instance of this function
+         earliest = None
+         for tick, entries in self.buckets.items():
+            for entry in entries:
+               if entry[0] == function and (earliest == None or entry[5] < earliest[1][5]):
+                  earliest = (tick, entry)
+
+         if earliest == None:
+            raise ValueError("Metronome.remove(): function is not scheduled.")
+
+         # and remove it and all info
+         tick, entry = earliest
+         self.buckets[tick].remove( entry )
+         if self.buckets[tick] == []:
+            del self.buckets[tick]
+      finally:
+         self.lock.release()
 
    def removeAll(self):
       """It removes all provided functions to be called by the metronome."""
 
       # reinitialize all function related information
-      self.functions        = []    
-      self.parameters       = []  
-      self.desiredBeats     = []   
-      self.repeatFlags      = []  
-      self.beatCountdowns   = []   
+      self.lock.acquire()
+      try:
+         self.buckets = {}
+      finally:
+         self.lock.release()
 
    def setTempo(self, tempo):
       """It sets the metronome's tempo."""
       
       self.tempo = tempo        # remember new tempo
 
-      # and set it
-      delay = int((60.0 / self.tempo) * 1000)   # in milliseconds
-      self.timer.setDelay(delay)
+      # and set it (it takes effect from the next tick on)
+      self.timer.setDelay( self.__getTickDelay__() )
 
    def getTempo(self):
       """It returns the metronome's tempo."""
@@ -2936,6 +3974,10 @@ class Metronome():
       """It returns the metronome's time signature."""      
       return self.timeSignature
 
+   def getTicksPerBeat(self):
+      """It returns how many ticks there are in a beat (PPQ)."""      
+      return self.ticksPerBeat
+
    def start(self):
       """It starts the metronome."""
       self.timer.start()
@@ -2973,77 +4015,90 @@ class Metronome():
 
 
    def __callFunctions__(self):
-      """Calls all functions we are asked to synchronize."""
-      
-      # do visualization / sonification tasks (if any)
-      if self.visualize:   # do we need to print out current beat?
-         print self.currentBeat
-
-      if self.sonify:   # do we need to sound out current beat?
-         if self.currentBeat == 1:    # strong (first) beat?
-            Play.note(self.sonifyPitch, 0, 200, self.sonifyVolume, self.sonifyChannel)   # louder
-         else:
-            Play.note(self.sonifyPitch, 0, 200, int(self.sonifyVolume * 0.7), self.sonifyChannel)   # softer
-
-      #***
-      #print "self.desiredBeats, self.beatCountdowns = ", 
-      #print self.desiredBeats, self.beatCountdowns  
+      """Calls all functions we are asked to synchronize (called by the timer on every tick)."""
 
-      # NOTE:  The following uses several for loops so that all functions are given quick service.
-      #        Once they've been called, we can loop again to do necessary book-keeping...
-      
-      # first, iterate to call all functions with their (provided) parameters
-      nonRepeatedFunctions = []   # holds indices of functions to be called only once (so we can remove them later)
-      for i in range( len(self.functions) ):
-      
-        # see if current function needs to be called right away
-        if self.beatCountdowns[i] == 0:
-           
-           # yes, so call this function!!!
-           self.functions[i]( *(self.parameters[i]) )   # strange syntax, but does the trick...
-
-           # check if function was meant to be called only once, and if so remove from future consideration
-           if not self.repeatFlags[i]:  # call only once?
-
-              nonRepeatedFunctions.append( i )   # mark it for deletion (so it is not called again)
-
-      # now, all functions who needed to be called have been called
-      
-      # next, iterate to remove any functions that were meant to be called once
-      for i in nonRepeatedFunctions:
-         self.functions.pop( i )   
-         self.parameters.pop( i ) 
-         self.desiredBeats.pop( i ) 
-         self.repeatFlags.pop( i ) 
-         self.beatCountdowns.pop( i )
-      
-
-      ###########################################################################################
-      # NOTE:  This belongs exactly here (before updating countdown timers below)      
-
-      # advance to next beat (in anticipation...)
-      self.currentBeat = (self.currentBeat % self.timeSignature[0]) + 1  # wrap around as needed
+      # first, go through any ticks the timer dropped (we were too late for them), without calling anything
+      for i in range( self.timer.getSkipped() ):
+         self.__advanceTick__( False )
 
-      ###########################################################################################
+      # then, do the current tick
+      self.__advanceTick__( True )
 
-      # finally, iterate to update countdown timers for all remaining functions
-      for i in range( len(self.functions) ):
-           
-        # if this function was just called
-        if self.beatCountdowns[i] == 0:
-        
-           # reinitialize its beat countdown counter, i.e., reschedule it for its next call
-              
-           # calculate beat countdown
-           self.beatCountdowns[i] = self.__calculateBeatCountdown__( self.desiredBeats[i] )              
+   def __advanceTick__(self, callFlag):
+      """Calls the functions due on the current tick (if callFlag is True), and moves on to the next tick."""
 
-        else:   # it's not time to call this function, so update its information
+      beatFlag = (self.tick % self.ticksPerBeat == 0)   # is this tick on a beat?
 
-           # reduce ticks remaining to call it
-           self.beatCountdowns[i] = self.beatCountdowns[i] - 1     # we are now one tick closer to calling it
+      # do visualization / sonification tasks (if any)
+      if callFlag and beatFlag:
+         if self.visualize:   # do we need to print out current beat?
+            print self.currentBeat
+
+         if self.sonify:   # do we need to sound out current beat?
+            if self.currentBeat == 1:    # strong (first) beat?
+               Play.note(self.sonifyPitch, 0, 200, self.sonifyVolume, self.sonifyChannel)   # louder
+            else:
+               Play.note(self.sonifyPitch, 0, 200, int(self.sonifyVolume * 0.7), self.sonifyChannel)   # softer
+
+      # get the functions due on this tick (only these are looked at)
+      self.lock.acquire()
+      try:
+         dueEntries = self.buckets.pop( self.tick, [] )
+      finally:
+         self.lock.release()
+
+      # iterate to call all functions with their (provided) parameters
+      # (an error in one is reported, and does not stop the others - and whatever happens, the metronome
+      # still moves on to the next tick, and repeated functions are still rescheduled, below)
+      try:
+         if callFlag:
+            for entry in dueEntries:
+               try:
+                  entry[0]( *(entry[1]) )   # strange syntax, but does the trick...
+               except Exception, e:
+                  # print error to console (since, otherwise, error is hidden, due to this happening in the timer's thread)
+                  print "Metronome: error calling " + str(getattr(entry[0], "__name__", entry[0])) + "() -", repr(e)
+
+      finally:
+         ###########################################################################################
+         # NOTE:  This belongs exactly here (before rescheduling repeated functions below)      
+
+         # advance to next beat (in anticipation...)
+         if beatFlag:
+            self.currentBeat = (self.currentBeat % self.timeSignature[0]) + 1  # wrap around as needed
+
+         self.tick = self.tick + 1   # and next tick
+
+         ###########################################################################################
+
+         # finally, reschedule functions meant to be called repeatedly (the others are done)
+         self.lock.acquire()
+         try:
+            for entry in dueEntries:
+               if entry[3]:   # call repeatedly?
+                  self.__schedule__( entry )
+         finally:
+            self.lock.release()
+
+   def __schedule__(self, entry):
+      """Puts the function (and its information) in the bucket of the tick it is to be called on."""
+
+      # find the next tick on a beat (this is the beat self.currentBeat refers to)
+      nextBeatTick = ((self.tick + self.ticksPerBeat - 1) / self.ticksPerBeat) * self.ticksPerBeat
+
+      # calculate tick to call function on
+      desiredBeat, desiredTick = entry[2], entry[4]
+      tick = nextBeatTick + self.__calculateBeatCountdown__( desiredBeat ) * self.ticksPerBeat + desiredTick
+
+      # and store function there
+      if tick in self.buckets:
+         self.buckets[tick].append( entry )
+      else:
+         self.buckets[tick] = [entry]
 
-      # now, all functions who needed to be called have been called, and all beat countdowns
-      # have been updated. 
+   def __getTickDelay__(self):
+      """Returns the time between ticks (in milliseconds) for the current tempo."""
+      return (60.0 / self.tempo) * 1000 / self.ticksPerBeat
 
 
    def __calculateBeatCountdown__(self, desiredBeat):
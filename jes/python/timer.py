@@ -1,5 +1,5 @@
 ###############################################################################
-# timer.py        Version 1.7     12-Aug-2016     Tobias Kohn, Bill Manaris, and Chris Benson
+# timer.py        Version 1.9     19-Oct-2026     Tobias Kohn, Bill Manaris, and Chris Benson
 
 ###########################################################################
 #
@@ -27,6 +27,21 @@
 #
 # REVISIONS:
 #
+#   1.9     19-Oct-2026 Added FixedRateTimer(), which schedules calls at absolute times of the monotonic
+#                 clock (System.nanoTime()), in its own thread, so it does not drift.  Late calls are either made
+#                 right away ("catchup"), or dropped ("skip").  Time intervals may be fractional.
+#
+#   1.8     19-Oct-2026 Added AudioTimer() and scheduleAudioTask(), which schedule tasks against the audio clock of
+#                 the jSyn synthesizer (instead of the Swing event-dispatch thread, or java.util.Timer).  Tasks run
+#                 inside the synthesizer, when their (absolute) audio time comes, so they are sample-block accurate,
+#                 do not drift, and are not affected by GUI load.  EnvelopeTimer() now schedules each envelope point
+#                 at its own time (instead of ticking at the GCD of all envelope times), and OscillatorTimer()
+#                 is now driven by an AudioTimer().  Both call their functions on the audio thread, so their timing
+#                 does not depend on GUI load - functions that update the GUI should ask for the Swing event-dispatch
+#                 thread instead (see their 'swingThread' parameter).  Tasks of scheduleAudioTask() are forgotten
+#                 once they have run (instead of waiting for Stop).  Also added AudioLFO(), which oscillates a
+#                 jSyn unit input (e.g., a voice's amplitude or panning) with a sine oscillator unit - i.e., per sample.
+#
 #   1.7     12-Aug-2016 (bm and tk) Timer() is again the original Swing timer.  Timer2() is the new and improved
 #                 based on java.util.Timer.  Timer2() now is more efficient (using only one class-level Timer, 
 #                 and instead instantiating TimerTasks).  Timer() is good for GUI animation.
@@ -347,9 +362,378 @@ class Timer2:
          self._running = False        # we are done running! (do this last)
 
 
+###############################################################################
+
+### Below, jSyn-based classes (tasks are scheduled against the synthesizer's audio clock)
+
+from com.softsynth.shared.time import ScheduledCommand as JScheduledCommand
+
+# AudioTask
+#
+# Command for the jSyn synthesizer.  run() is called by the synthesizer when the audio time
+# the task was scheduled for arrives.
+# Implements jSyn's ScheduledCommand interface.
+
+class AudioTask(JScheduledCommand):
+
+   def __init__(self, eventFunction, parameters=[]):
+      """
+      Creates task that executes eventFunction with provided parameters when run() is called.
+      """
+      self.eventFunction = eventFunction
+      self.parameters = parameters
+      self.cancelled = False       # True means do not call eventFunction (jSyn cannot unschedule a command)
+
+   def run(self):
+      """
+      Call the eventFunction (unless cancelled).
+      """
+      if not self.cancelled:
+         try:
+            self.eventFunction(*self.parameters)
+         except Exception, e:
+            # print error to console (since, otherwise, error is hidden, due to this happening inside Java)
+            print repr(e)
+
+      # we are done, so no need for JEM to stop us (see scheduleAudioTask())
+      try:
+         __ActiveTimers__.remove(self)
+      except ValueError:
+         pass    # not registered (or already removed by the Stop button)
+
+   def cancel(self):
+      """
+      Prevents this task from executing (if it has not executed yet).
+      """
+      self.cancelled = True
+
+   def stop(self):
+      """
+      Same as cancel() - needed to stop the task when JEM's Stop button is pressed.
+      """
+      self.cancel()
+
+
+# SwingCall
+#
+# Calls a function with parameters on the Swing event-dispatch thread (see __callOnSwingThread__()).
+# Implements Java's Runnable interface.
+
+from java.lang import Runnable
+from javax.swing import SwingUtilities
+
+class SwingCall(Runnable):
+
+   def __init__(self, function, parameters=[]):
+      self.function = function
+      self.parameters = parameters
+
+   def run(self):
+      try:
+         self.function(*self.parameters)
+      except Exception, e:
+         # print error to console (since, otherwise, error is hidden, due to this happening inside Java)
+         print repr(e)
+
+def __callOnSwingThread__(function, parameters=[]):
+   """Calls 'function' with 'parameters' on the Swing event-dispatch thread - right away, if already there, or
+      else as soon as possible, without waiting for it.  Audio-clock timers use it (if asked) for functions that
+      update the GUI (Swing is not thread-safe), so that the audio thread is not blocked by the GUI either."""
+
+   if SwingUtilities.isEventDispatchThread():
+      function(*parameters)
+   else:
+      SwingUtilities.invokeLater( SwingCall(function, parameters) )
+
+
+def __callFunction__(function, parameters=[], swingThread=False):
+   """Calls 'function' with 'parameters' right away (e.g., on the audio thread), or, if 'swingThread' is True,
+      on the Swing event-dispatch thread (see __callOnSwingThread__())."""
+
+   if swingThread:
+      __callOnSwingThread__(function, parameters)
+   else:
+      function(*parameters)
+
+
+def getAudioSynth(synth=None):
+   """Returns the provided jSyn synthesizer, or (if None) the one music.py creates for everything."""
+
+   if synth == None:
+      import music             # import here, since music.py imports this module (before it creates its synthesizer)
+      synth = music.jSyn.synth
+
+   return synth
+
+def getAudioTime(synth=None):
+   """Returns the current audio time (in seconds) of the provided jSyn synthesizer."""
+   return getAudioSynth(synth).getCurrentTime()
+
+def scheduleAudioTask(time, function, parameters=[], synth=None):
+   """Schedules 'function' to be called with 'parameters' inside the jSyn synthesizer, when
+      the synthesizer's audio clock reaches 'time' (an absolute audio time, in seconds - see getAudioTime()).
+      Returns the AudioTask, so that it may be cancelled (until it runs, it is stopped by JEM's Stop button)."""
+
+   task = AudioTask(function, parameters)
+   getAudioSynth(synth).scheduleCommand(time, task)
+
+   # remember that this task has been created and is active (so that it can be stopped/terminated by JEM, if desired)
+   __ActiveTimers__.append(task)
+
+   return task
+
+
+###############################################################################
+# AudioTimer
+#
+# Class for creating a timer (for use to schedule tasks to be executed after
+# a given time interval, repeatedly or once), driven by the audio clock of a jSyn synthesizer.
+# It has the same methods as Timer2.
+#
+# Every call is scheduled at an absolute audio time (previous time + time interval), so the
+# timer does not drift, no matter how long the task (or anything else) takes.
+#
+# NOTE:  The function is called from inside the synthesizer, so it should return quickly
+# (e.g., set a volume, panning, or frequency) - long tasks delay the audio itself.
 #####################################################################################
 
-### Below, other useful Timer-based classes 
+class AudioTimer:
+   """Timer used to schedule tasks to be run at fixed (audio) time intervals."""
+
+   def __init__(self, timeInterval, function, parameters=[], repeat=True, synth=None):
+      """Specify time interval (in milliseconds), which function to call when the time interval has passed
+         and the parameters to pass this function, and whether to repeat (True) or do it only once.
+         Optionally, specify the jSyn synthesizer to use (default is the one created by music.py)."""
+
+      self._timeInterval = timeInterval
+      self._function     = function
+      self._parameters   = parameters
+      self._repeat       = repeat
+      self._running      = False         # True when Timer is running, False otherwise
+      self._synth        = getAudioSynth(synth)
+      self._task         = None          # next task to be executed (created in start() below)
+      self._nextTime     = 0.0           # audio time (in seconds) the next task is scheduled for
+
+      # remember that this timer has been created and is active (so that it can be stopped/terminated by JEM, if desired)
+      __ActiveTimers__.append(self)
+
+   def setFunction(self, eventFunction, parameters=[]):
+      """Sets the function to execute.  The optional parameter parameters is a list of parameters to pass to the function (when called)."""
+      self._function   = eventFunction     # takes effect on the next call (no need to restart)
+      self._parameters = parameters
+
+   def getRepeat(self):
+      """Returns True if timer is set to repeat, False otherwise."""
+      return self._repeat
+
+   def setRepeat(self, flag):
+      """Timer is set to repeat if flag is True, and not to repeat if flag is False."""
+      self._repeat = flag    # takes effect on the next call (no need to restart)
+
+   def getDelay(self):
+      """Returns the delay time interval (in milliseconds)."""
+      return self._timeInterval
+
+   def setDelay(self, timeInterval):
+      """Sets a new delay time interval for timer t (in milliseconds).
+         This allows to change the speed of the animation, after some event occurs.."""
+      self._timeInterval = timeInterval    # takes effect on the next call (no need to restart)
+
+   def isRunning(self):
+      """Returns True if timer is still running, False otherwise."""
+      return self._running
+
+   def start(self):
+      """Schedules the desired task as specified (in terms of timeInterval and repeat)."""
+
+      # make sure we are not running already - otherwise, we will schedule a run-away task
+      if not self._running:
+
+         self._running = True        # we are starting! (do this first)
+
+         # like Timer2, a repeating timer fires right away, a single-shot timer after the time interval
+         self._nextTime = self._synth.getCurrentTime()
+         if not self._repeat:
+            self._nextTime = self._nextTime + self._timeInterval / 1000.0
+
+         self.__schedule__()
+
+   def stop(self):
+      """Stops scheduled task from executing."""
+
+      if self._running:       # make sure we are running (otherwise, there is nothing to do)
+
+         self._task.cancel()
+         self._running = False        # we are done running! (do this last)
+
+   def __schedule__(self):
+      """Schedules the next task at self._nextTime."""
+      self._task = AudioTask(self.__tick__)
+      self._synth.scheduleCommand(self._nextTime, self._task)
+
+   def __tick__(self):
+      """Reschedules the timer (if repeating) and calls the function."""
+
+      if self._repeat:
+         # advance from the previous (scheduled) time, not from now, so we do not drift
+         self._nextTime = self._nextTime + self._timeInterval / 1000.0
+         self.__schedule__()
+      else:
+         self._running = False
+
+      self._function(*self._parameters)
+
+
+###############################################################################
+# FixedRateTimer
+#
+# Class for creating a timer (for use to schedule tasks to be executed after
+# a given time interval, repeatedly or once), driven by its own thread and the JVM's
+# monotonic clock (System.nanoTime()).  It has the same methods as Timer2.
+#
+# Every call is scheduled at an absolute time (previous time + time interval), so the
+# timer does not drift, no matter how long the task (or anything else) takes.  Time intervals
+# may be fractional (e.g., 20.8333 milliseconds).
+#
+# When calls are late (e.g., the task took longer than the time interval), the lateness
+# policy decides what happens:
+#
+#   "catchup" - the missed calls are made right away (one after the other), and
+#               the timer continues on its original schedule.
+#   "skip"    - the missed calls are dropped, and the timer continues on its original
+#               schedule (see getSkipped() for how many calls were dropped).
+#####################################################################################
+
+from java.lang import System as JSystem
+from java.lang import Thread as JThread
+from java.util.concurrent.locks import LockSupport
+
+class FixedRateTimer:
+   """Timer used to schedule tasks to be run at fixed (monotonic) time intervals, without drifting."""
+
+   def __init__(self, timeInterval, function, parameters=[], repeat=True, lateness="catchup"):
+      """Specify time interval (in milliseconds), which function to call when the time interval has passed
+         and the parameters to pass this function, whether to repeat (True) or do it only once, and
+         what to do with late calls ("catchup" or "skip")."""
+
+      self._timeInterval = timeInterval
+      self._function     = function
+      self._parameters   = parameters
+      self._repeat       = repeat
+      self._running      = False         # True when Timer is running, False otherwise
+      self._thread       = None          # thread making the calls (created in start() below)
+      self._skipped      = 0             # number of calls dropped right before the current one
+      self.setLateness(lateness)
+
+      # remember that this timer has been created and is active (so that it can be stopped/terminated by JEM, if desired)
+      __ActiveTimers__.append(self)
+
+   def setFunction(self, eventFunction, parameters=[]):
+      """Sets the function to execute.  The optional parameter parameters is a list of parameters to pass to the function (when called)."""
+      self._function   = eventFunction     # takes effect on the next call (no need to restart)
+      self._parameters = parameters
+
+   def getRepeat(self):
+      """Returns True if timer is set to repeat, False otherwise."""
+      return self._repeat
+
+   def setRepeat(self, flag):
+      """Timer is set to repeat if flag is True, and not to repeat if flag is False."""
+      self._repeat = flag    # takes effect on the next call (no need to restart)
+
+   def getDelay(self):
+      """Returns the delay time interval (in milliseconds)."""
+      return self._timeInterval
+
+   def setDelay(self, timeInterval):
+      """Sets a new delay time interval for timer t (in milliseconds).
+         This allows to change the speed of the animation, after some event occurs.."""
+      self._timeInterval = timeInterval    # takes effect from the next call on (no need to restart)
+
+   def getLateness(self):
+      """Returns what happens to late calls ("catchup" or "skip")."""
+      return self._lateness
+
+   def setLateness(self, lateness):
+      """Sets what happens to late calls - "catchup" makes them right away, "skip" drops them."""
+      if lateness not in ["catchup", "skip"]:
+         raise ValueError("Lateness (" + str(lateness) + ") should be \"catchup\" or \"skip\".")
+      self._lateness = lateness
+
+   def getSkipped(self):
+      """Returns how many calls were dropped (due to lateness) right before the current one."""
+      return self._skipped
+
+   def isRunning(self):
+      """Returns True if timer is still running, False otherwise."""
+      return self._running
+
+   def start(self):
+      """Starts a thread to perform the desired task as specified (in terms of timeInterval and repeat)."""
+
+      # make sure we are not running already - otherwise, we will create a run-away thread
+      if not self._running:
+
+         self._running = True        # we are starting! (do this first)
+
+         self._thread = JThread(self.__run__, "FixedRateTimer")
+         self._thread.setDaemon(True)      # do not keep the JVM alive
+         self._thread.start()
+
+   def stop(self):
+      """Stops scheduled task from executing."""
+
+      if self._running:       # make sure we are running (otherwise, there is nothing to do)
+
+         self._running = False        # we are done running!
+         LockSupport.unpark(self._thread)   # and wake up the thread (if waiting), so it may end
+         self._thread = None
+
+   def __run__(self):
+      """Calls the function at absolute times, until stopped (runs in its own thread)."""
+
+      thread = JThread.currentThread()   # if the timer is restarted, a new thread takes over (and this one ends)
+
+      # like Timer2, a repeating timer fires right away, a single-shot timer after the time interval
+      nextTime = JSystem.nanoTime()
+      if not self._repeat:
+         nextTime = nextTime + long(self._timeInterval * 1000000)
+
+      while self._thread is thread:
+
+         waitTime = nextTime - JSystem.nanoTime()
+         if waitTime > 0:                    # is it too early?
+            LockSupport.parkNanos(waitTime)     # yes, so wait (we may wake up early, so check again)
+            continue
+
+         try:
+            self._function(*self._parameters)
+         except Exception, e:
+            # print error to console (since, otherwise, error is hidden, due to this happening inside Java)
+            print repr(e)
+
+         if not self._repeat:                # done?
+            if self._thread is thread:
+               self._running = False
+               self._thread = None
+            break
+
+         # advance from the previous (scheduled) time, not from now, so we do not drift
+         interval = long(self._timeInterval * 1000000)
+         nextTime = nextTime + interval
+
+         # drop any calls we are too late for (if so asked)
+         self._skipped = 0
+         if self._lateness == "skip" and interval > 0:
+            lateTime = JSystem.nanoTime() - nextTime
+            if lateTime > 0:
+               self._skipped = int(lateTime / interval) + 1
+               nextTime = nextTime + self._skipped * interval
+
+
+#####################################################################################
+
+### Below, other useful Timer-based classes
 
 class EnvelopeTimer:
    """It calls a provided function giving it specified values at specified times.
@@ -370,16 +754,22 @@ class EnvelopeTimer:
       This function is passed one argument, namely the current value of the envelope.
       If the function expects, say, two arguments (e.g., circle.setPosition(x, y) ),
       then the envelope values should specify values accordingly, e.g., [(10, 20), ...].
+
+      The envelope points are timed by the audio clock of the jSyn synthesizer (see AudioTimer), and
+      the function is called on the audio thread, so it should return quickly.  If the function updates
+      the GUI, set 'swingThread' to True to call it on the Swing event-dispatch thread instead.
    """
    
-   def __init__(self, function, values, times, repeat=False):
+   def __init__(self, function, values, times, repeat=False, swingThread=False):
       """Specify a 'function' to call with 'values' and at 'times', with 'repeat' specifying if to cycle.
           
          This function is passed on argument, namely the current value of the envelope.
          If the function expects more arguments, specify them in the envelope values as tuples.
+         If 'swingThread' is True, the function is called on the Swing event-dispatch thread.
       """
          
       self.function = function    
+      self.swingThread = swingThread
       self.envelopeValues = values
       self.envelopeTimes  = times
       self.repeat = repeat
@@ -400,91 +790,110 @@ class EnvelopeTimer:
             raise ValueError("The envelope needs increasing times -- sublist " + str(self.envelopeTimes) \
                              + " should consist of increasing absolute times (in milliseconds).")
 
-      # find the minimum tick needed (how often to check elapsed time) - for efficiency
-      self.tick = reduce(self.__gcd__, self.envelopeTimes)     # how often to check elapsed time
+      # find the time tick of the envelope - when repeating, the envelope restarts one tick after its last point
+      self.tick = max(1, reduce(self.__gcd__, self.envelopeTimes))
 
-      self.elapsedTime = 0         # accumulates total elapsed time
+      self.elapsedTime = 0         # elapsed time (in milliseconds) when paused
       self.envelopeIndex = 0       # remembers which envelope entry comes next
       
       # check how to pass arguments to function
       self.envelopeValuesAreTuples = type(self.envelopeValues[0]) == type([]) or type(self.envelopeValues[0]) == type(())  # list or tuple?
       
-      # remember if we are paused
+      # remember if we are running or paused
+      self.running = False
       self.hasPaused = False
-       
-      # define timer
-      self.timer = Timer(self.tick, self.__advance__, [], True)    # keep repeating (remember, __advance()__ handles envelope repeat)
+
+      # each envelope point is scheduled at its own (absolute) time on the audio clock of the jSyn synthesizer
+      # (as opposed to checking elapsed time every tick)
+      self.synth = getAudioSynth()
+      self.startTime = 0.0         # audio time (in seconds) of the envelope's beginning
+      self.task = None             # task for the next envelope point
 
       # remember that this timer has been created and is active (so that it can be stopped/terminated by JEM, if desired)
       __ActiveTimers__.append(self)
       
-         
+
+   def __schedule__(self):
+      """It schedules the next envelope point at its audio time."""
+
+      pointTime = self.startTime + self.envelopeTimes[ self.envelopeIndex ] / 1000.0
+      self.task = AudioTask(self.__advance__)
+      self.synth.scheduleCommand(pointTime, self.task)
+
    def __advance__(self):
-      """It calls the callback function with the current envelope value, if enough time has elapsed."""
+      """It calls the callback function with the current envelope value, and schedules the next one."""
       
-      self.elapsedTime += self.tick
+      # check how many arguments to pass
+      if self.envelopeValuesAreTuples:                 
+         # envelope values are typles (or lists), unpack them when calling function
+         __callFunction__( self.function, list(self.envelopeValues[ self.envelopeIndex ]), self.swingThread )
+      else:
+         # envelope values are atomic, so call function with a single argument
+         __callFunction__( self.function, [self.envelopeValues[ self.envelopeIndex ]], self.swingThread )
+
+      # we have served this envelope point, so let's go to next one (if any)
+      self.envelopeIndex += 1
 
       # do we have more envelope points?
       if self.envelopeIndex < self.numEnvelopePoints:
 
-         # is it time to call function?
-         if self.elapsedTime >= self.envelopeTimes[ self.envelopeIndex ]:
-      
-            # yes, so check how many arguments to pass
-            if self.envelopeValuesAreTuples:                 
-               # envelope values are typles (or lists), unpack them when calling function
-               self.function( *self.envelopeValues[ self.envelopeIndex ] )            
-            else:
-               # envelope values are atomic, so call function with a single argument
-               self.function( self.envelopeValues[ self.envelopeIndex ] )            
-         
-            # we have served this envelope point, so let's go to next one (if any)
-            self.envelopeIndex += 1
-         
+         self.__schedule__()
+
       elif self.repeat:   # we have finished all envelope points, so check if to repeat
-      
-         # yes, so reset
-         self.elapsedTime = 0
+
+         # yes, so restart envelope (one tick after its last point)
+         self.startTime = self.startTime + (self.envelopeTimes[-1] + self.tick) / 1000.0
          self.envelopeIndex = 0
-         
+         self.__schedule__()
+
       else:   # we have finished all envelope points, and not repeat is needed
       
          # shut down
-         self.stop()
+         self.running = False
 
 
    def start(self):
       """(Re)start EnvelopeTimer to begin calling function."""
-      self.elapsedTime = 0     # reset
-      self.envelopeIndex = 0
-      self.timer.start()
+      self.stop()              # reset
+      self.startTime = self.synth.getCurrentTime()
+      self.running = True
+      self.__schedule__()
    
    def stop(self):
       """Stop envelopeTimer."""
+      if self.task:
+         self.task.cancel()
       self.elapsedTime = 0     # reset
       self.envelopeIndex = 0
-      self.timer.stop()
+      self.running = False
+      self.hasPaused = False
    
    def pause(self):
       """Pause EnvelopeTimer, so it may be resume (if desired)."""
-      self.hasPaused = True
-      self.timer.stop()
+      if self.running:
+         self.task.cancel()
+         self.elapsedTime = (self.synth.getCurrentTime() - self.startTime) * 1000.0   # remember where we are
+         self.running = False
+         self.hasPaused = True
    
    def resume(self):
       """Resume envelopeTimer from where it was paused."""
-      self.timer.start()
-      self.hasPaused = False
+      if self.hasPaused:
+         self.startTime = self.synth.getCurrentTime() - self.elapsedTime / 1000.0   # continue where we left off
+         self.running = True
+         self.hasPaused = False
+         self.__schedule__()
       
    def isRunning(self):
       """Returns True if timer is running (has been started), False otherwise."""
-      return self.timer.isRunning()
+      return self.running
 
    def isPaused(self):
       """Returns True if timer is paused, False otherwise."""
       return self.hasPaused
    
    # Helper function - calculates the greatest common divisor between two numbers
-   # (used to find the maximum time tick to advance, given all specified envelope times - for efficiency)
+   # (used to find the time tick of the envelope, given all specified envelope times)
    def __gcd__(self, a, b):
       while b != 0:
          (a, b) = (b, a%b)
@@ -498,15 +907,21 @@ from math import cos, pi
 class OscillatorTimer:
    """It calls a provided function giving it an oscillating value at timed intervals.
       It may be used to fluctuate volume, panning, or frequency of sounds, among other things.
+
+      The function is called on the audio thread (see AudioTimer), so it should return quickly.  If the
+      function updates the GUI, set 'swingThread' to True to call it on the Swing event-dispatch thread instead.
+      To oscillate a jSyn unit input smoothly (per sample, instead of per time interval), see AudioLFO.
    """
    
-   def __init__(self, delay, minValue, maxValue, step, function):
+   def __init__(self, delay, minValue, maxValue, step, function, swingThread=False):
       """Specify a time interval ('delay', in milliseconds), the min and max values within which to oscillate,
          the 'step' increment by which to advance the oscillating value at every time interval, and finally
          the function to call when the time interval has passed.  
          This function is passed on argument, namely the current value of the oscillator.
+         If 'swingThread' is True, the function is called on the Swing event-dispatch thread.
       """
          
+      self.swingThread = swingThread
       self.minValue = minValue     # the lowest point of the oscillating value
       self.maxValue = maxValue     # the highest point of the oscillating value
          
@@ -521,8 +936,8 @@ class OscillatorTimer:
       #       or larger does not make much sense.
       self.stepPhase = mapValue(step, 0.0, self.maxValue-self.minValue, 0.0, 2*pi)
          
-      # define timer
-      self.timer = Timer(delay, self.__oscillate__, [], True)
+      # define timer (driven by the audio clock, so the oscillation is steady, regardless of GUI load)
+      self.timer = AudioTimer(delay, self.__oscillate__, [], True)
          
       # remember that this timer has been created and is active (so that it can be stopped/terminated by JEM, if desired)
       __ActiveTimers__.append(self)
@@ -534,7 +949,7 @@ class OscillatorTimer:
       # ***
       #print "phase =", self.oscillatorPhase, ", value =", self.oscillatingValue
       
-      self.function( self.oscillatingValue )
+      __callFunction__( self.function, [self.oscillatingValue], self.swingThread )
       
       # advance angle and wrap around
       self.oscillatorPhase  = (self.oscillatorPhase + self.stepPhase) % (2*pi)
@@ -557,6 +972,83 @@ class OscillatorTimer:
    def getDelay(self):
       """Get current time interval to wait before advancing oscillating value."""
       return self.timer.getDelay()
+
+
+#####################################################################################
+
+class AudioLFO:
+   """A low-frequency oscillator unit, which oscillates a jSyn unit input (e.g., the amplitude or pan
+      of a sample player) between two values, inside the synthesizer.  Unlike OscillatorTimer, no
+      function is called - the input follows a sine oscillator sample by sample, so the oscillation
+      is smooth and steady, regardless of GUI (or Python) load.
+
+      AudioLFO(port, minValue, maxValue, frequency)
+
+      For example, given a jSyn Pan unit p,
+
+      AudioLFO(port=p.pan, minValue=-1.0, maxValue=1.0, frequency=0.5)
+
+      will pan p from left to right and back every 2 seconds (once started).
+
+      NOTE:  While the LFO is running, it drives the port (values set on the port are ignored).
+   """
+
+   def __init__(self, port, minValue, maxValue, frequency, synth=None):
+      """Specify the jSyn unit input 'port' to drive, the min and max values within which to oscillate,
+         and the oscillation 'frequency' (in Hz).
+      """
+
+      # import jSyn stuff here, so as to not polute the global namespace
+      from com.jsyn.unitgen import SineOscillator, MultiplyAdd
+
+      self.port = port
+      self.synth = getAudioSynth(synth)
+
+      # the sine oscillator swings between -1.0 and 1.0, so scale it to the range around its center
+      self.oscillator = SineOscillator()
+      self.oscillator.amplitude.set(1.0)
+      self.scaler = MultiplyAdd()
+      self.oscillator.output.connect(self.scaler.inputA)
+      self.scaler.inputB.set( (maxValue - minValue) / 2.0 )   # depth
+      self.scaler.inputC.set( (maxValue + minValue) / 2.0 )   # center
+      self.setFrequency(frequency)
+
+      self.synth.add(self.oscillator)
+      self.synth.add(self.scaler)
+
+      self.running = False
+
+      # remember that this timer has been created and is active (so that it can be stopped/terminated by JEM, if desired)
+      __ActiveTimers__.append(self)
+
+   def start(self):
+      """Start the oscillation (i.e., connect the LFO to its port)."""
+      if not self.running:
+         self.oscillator.phase.set(0.0)       # begin at the center, going up
+         self.scaler.output.connect(self.port)
+         self.oscillator.start()
+         self.scaler.start()
+         self.running = True
+
+   def stop(self):
+      """Stop the oscillation (i.e., disconnect the LFO from its port)."""
+      if self.running:
+         self.scaler.output.disconnect(self.port)
+         self.scaler.stop()
+         self.oscillator.stop()
+         self.running = False
+
+   def setFrequency(self, frequency):
+      """Set the oscillation frequency (in Hz)."""
+      self.oscillator.frequency.set(frequency)
+
+   def getFrequency(self):
+      """Returns the oscillation frequency (in Hz)."""
+      return self.oscillator.frequency.get()
+
+   def isRunning(self):
+      """Returns True if the LFO is running (has been started), False otherwise."""
+      return self.running
                
 
 ######################################################################################
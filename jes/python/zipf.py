@@ -1,5 +1,5 @@
 ###############################################################################
-# zipf.py       Version 1.5          24-Dec-2008    Bill Manaris, Dana Hughes, J.R. Armstrong, 
+# zipf.py       Version 1.6          19-Oct-2026    Bill Manaris, Dana Hughes, J.R. Armstrong, 
 #                                                   Thomas Zalonis, Luca Pellicoro, 
 #                                                   Chris Wagner, Chuck McCormick
 
@@ -39,6 +39,10 @@
 # Usage: Call bySize(sizes, counts) and/or byRank(counts) functions 
 # Output: slope and R2 
 # 
+# To follow the byRank slope and R2 of a stream of events (e.g., notes as they
+# are played), add each event to a ZipfAccumulator and call its getSlopeR2()
+# as often as needed.  This avoids sorting all the counts again for every event.
+# 
 # WARNING:  If an error occurs the current code will NOT raise an exception;
 #           it will only print an error message (for ShedSkin compatibility).
 #           This may cause problems, if the error messages go undetected
@@ -46,6 +50,10 @@
 # 
 # Authors: Chris Wagner and Bill Manaris (based on VB code by Chuck McCormick and Bill Manaris)
 # 
+# version 1.6 (October 19, 2026)
+#     - Added ZipfAccumulator, which keeps the byRank slope and R2 of a stream of events up to date,
+#       in constant time per event (instead of calling byRank() again on all the counts).
+# 
 # version 1.5 (December 24, 2008)  J.R. Armstrong and Bill Manaris
 #     - Now we are differentiating between monotonous and random phenomena (vertical vs. horizontal trendlines).
 #       In the first case, we return slope = 0 and r2 = 0.
@@ -192,6 +200,117 @@ def getSlopeR2(ranks, counts):
         
     return slope, r2, yint
 
+
+class ZipfAccumulator:
+    '''
+    Calculates the byRank slope and R^2 of a stream of events, one event at a time.
+
+    It keeps the count of each event, and the sums used by getSlopeR2(), and updates
+    them as each event is added, so the slope and R^2 are available at any time without
+    sorting the counts again.  The results are the same as byRank(counts), where counts
+    are the number of times each (different) event has been added.
+
+    Ranks are never stored.  All events with the same count share a block of consecutive
+    ranks (since counts are sorted), so when an event's count goes from c to c+1, only the
+    first rank of block c changes hands (it now holds c+1), and only that block moves.
+    '''
+
+    def __init__(self, events=[]):
+        self.counts = {}          # count of each event
+        self.countOfCount = {}    # how many events have each count
+        self.firstRank = {}       # the first (smallest) rank of each count
+
+        # sums of the log-log (rank, count) points, as in getSlopeR2()
+        self.sumX = self.sumY = self.sumXY = self.sumX2 = self.sumY2 = 0.0
+
+        for event in events:
+            self.add(event)
+
+    def add(self, event):
+        '''
+        Add one occurrence of 'event' (any hashable value).
+        '''
+
+        count = self.counts.get(event, 0)
+        self.counts[event] = count + 1
+
+        if count == 0:
+            # a new event, with the (new) highest rank - rank and count sums change,
+            # but sumXY does not, since log(1) is 0
+            rank = len(self.counts)
+            self.sumX += log(rank,10)
+            self.sumX2 += log(rank,10)**2
+
+            if self.countOfCount.get(1, 0) == 0:
+                self.firstRank[1] = rank
+            self.countOfCount[1] = self.countOfCount.get(1, 0) + 1
+
+        else:
+            # the event takes the first rank of its block (all events with the same count),
+            # so the point at that rank goes up by one count
+            rank = self.firstRank[count]
+            oldY = log(count,10)
+            newY = log(count + 1,10)
+            self.sumY += newY - oldY
+            self.sumXY += log(rank,10) * (newY - oldY)
+            self.sumY2 += newY**2 - oldY**2
+
+            # move the event to the next block
+            if self.countOfCount.get(count + 1, 0) == 0:
+                self.firstRank[count + 1] = rank
+            self.countOfCount[count + 1] = self.countOfCount.get(count + 1, 0) + 1
+
+            self.countOfCount[count] = self.countOfCount[count] - 1
+            if self.countOfCount[count] == 0:
+                del self.countOfCount[count]
+                del self.firstRank[count]
+            else:
+                self.firstRank[count] = rank + 1
+
+    def getCounts(self):
+        '''
+        Return a list of the counts of all events added so far (in no particular order).
+        '''
+
+        return self.counts.values()
+
+    def getSlopeR2(self):
+        '''
+        Return the byRank slope, R^2, and trendline y-intercept of the events added so far,
+        as byRank() would for their counts.
+        '''
+
+        numberOfRanks = len(self.counts)
+
+        if numberOfRanks == 0:  raise ValueError, 'Counts should contain at least one element'
+
+        # same extreme cases as getSlopeR2() - one event (monotonous), or all counts equal (uniform)
+        if numberOfRanks == 1:
+            return 0.0, 0.0, 0.0
+        if len(self.countOfCount) == 1:
+            return 0.0, 1.0, 0.0
+
+        sumX, sumY, sumXY, sumX2, sumY2 = self.sumX, self.sumY, self.sumXY, self.sumX2, self.sumY2
+
+        # calculate the slope
+        if ((numberOfRanks * sumX2 - sumX * sumX) == 0.0):
+            slope = 0.0
+        else:
+            slope = ((numberOfRanks * sumXY - sumX * sumY) / (numberOfRanks * sumX2 - sumX * sumX))
+
+        # calculate the r2
+        if(sqrt((numberOfRanks * sumX2 - sumX * sumX) * (numberOfRanks * sumY2 - sumY * sumY)) == 0.0):
+            r2 = 0.0
+        else:
+            r = (numberOfRanks * sumXY - sumX * sumY) / sqrt((numberOfRanks * sumX2 - sumX * sumX) * (numberOfRanks * sumY2 - sumY * sumY))
+            r2 = r * r
+
+        # calulate y-intercept
+        yint = (sumY - slope * sumX) / numberOfRanks
+
+        return slope, r2, yint
+
+
 if __name__ == '__main__':
     #print "Enter sequence of numbers to calculate its Zipfian distribution."
     #print "The rank-frequency distribution is calculated based on how many times each number appears."
@@ -225,6 +344,11 @@ if __name__ == '__main__':
     sizes = histogram.keys()
     slope, r2, yint = bySize(sizes, counts)
     print "The bySize slope is", slope, "and the R^2 is", r2
+
+    # finally, calculate the byRank distribution again, one event at a time
+    accumulator = ZipfAccumulator(phenomenon)
+    slope, r2, yint = accumulator.getSlopeR2()
+    print "The incremental byRank slope is", slope, "and the R^2 is", r2
        
     
     
@@ -0,0 +1,101 @@
+import unittest
+import time
+import FramePlayer
+import java.awt.image.BufferedImage as BufferedImage
+import java.lang.Thread
+
+##########################################################################
+#   UTILITY CLASSES
+##########################################################################
+
+
+class SyntheticFrames(FramePlayer.Frames):
+    '''Makes small blank frames, optionally taking a while over each one,
+    and remembers how far ahead of the display it got.'''
+
+    def __init__(self, count, decodeMillis=0):
+        self.count = count
+        self.decodeMillis = decodeMillis
+        self.lastDecoded = -1
+
+    def size(self):
+        return self.count
+
+    def getFrame(self, index):
+        if self.decodeMillis:
+            java.lang.Thread.sleep(self.decodeMillis)
+        self.lastDecoded = index
+        return BufferedImage(8, 8, BufferedImage.TYPE_INT_RGB)
+
+
+class RecordingDisplay(FramePlayer.Display):
+    '''Records which frames were shown, and how far decoding had got.'''
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.shown = []
+        self.maxAhead = 0
+
+    def show(self, index, image):
+        self.shown.append(index)
+        self.maxAhead = max(self.maxAhead, self.frames.lastDecoded - index)
+
+##########################################################################
+#   TESTS
+##########################################################################
+
+
+class Test_FramePlayer(unittest.TestCase):
+
+    def testTiming(self):
+        '''Frames are shown on time, and the movie takes as long as it should'''
+        frames = SyntheticFrames(60)
+        display = RecordingDisplay(frames)
+        player = FramePlayer(frames, 4)
+
+        start = time.time()
+        player.play(0, 30, FramePlayer.DROP_LATE, display)
+        elapsed = time.time() - start
+
+        self.assertEquals(range(60), display.shown)
+        self.assertEquals(60, player.getFramesShown())
+        self.assertEquals(0, player.getFramesDropped())
+        self.assertTrue(player.getMaxLateness() < 50,
+                        "frames up to %.1f ms late" % player.getMaxLateness())
+        self.assertTrue(1.8 < elapsed < 2.5, "took %.2f s" % elapsed)
+
+    def testBufferIsBounded(self):
+        '''Decoding never gets more than a buffer ahead of the display'''
+        frames = SyntheticFrames(100)
+        display = RecordingDisplay(frames)
+        player = FramePlayer(frames, 4)
+        player.play(0, 100, FramePlayer.SHOW_ALL, display)
+
+        self.assertEquals(100, len(display.shown))
+        # The buffer, plus the frame being decoded
+        self.assertTrue(display.maxAhead <= 5, "%d ahead" % display.maxAhead)
+
+    def testSlowDecodingDropsFrames(self):
+        '''Frames that can't be decoded in time are dropped and counted'''
+        frames = SyntheticFrames(40, 25)
+        display = RecordingDisplay(frames)
+        player = FramePlayer(frames, 4)
+        player.play(0, 100, FramePlayer.DROP_LATE, display)
+
+        self.assertTrue(player.getFramesDropped() > 0)
+        self.assertEquals(40, player.getFramesShown() + player.getFramesDropped())
+        self.assertEquals(sorted(display.shown), display.shown)
+
+    def testSlowDecodingShowAll(self):
+        '''With SHOW_ALL every frame is shown, however slow decoding is'''
+        frames = SyntheticFrames(20, 15)
+        display = RecordingDisplay(frames)
+        player = FramePlayer(frames, 4)
+        player.play(5, 100, FramePlayer.SHOW_ALL, display)
+
+        self.assertEquals(range(5, 20), display.shown)
+        self.assertEquals(0, player.getFramesDropped())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import time
+import JavaMusic
+import javax.sound.midi.MidiChannel as MidiChannel
+
+##########################################################################
+#   UTILITY CLASSES
+##########################################################################
+
+
+class RecordingChannel(MidiChannel):
+    '''Records each note on and off, and when it happened (in ms).'''
+
+    def __init__(self):
+        self.start = time.time()
+        self.events = []
+
+    def noteOn(self, note, velocity):
+        self.events.append(("on", note, (time.time() - self.start) * 1000))
+
+    def noteOff(self, note, velocity=0):
+        self.events.append(("off", note, (time.time() - self.start) * 1000))
+
+    def allNotesOff(self):
+        pass
+
+    def eventsWithoutTimes(self):
+        return [(kind, note) for kind, note, when in self.events]
+
+    def timeOf(self, kind, note):
+        return [when for k, n, when in self.events if (k, n) == (kind, note)]
+
+##########################################################################
+#   TESTS
+##########################################################################
+
+# how far off (in ms) an event may be from when it was due
+JITTER = 30
+
+
+class Test_JavaMusic(unittest.TestCase):
+
+    def assertAbout(self, expected, actual):
+        self.assertTrue(abs(expected - actual) < JITTER,
+                        "%.1f ms instead of %.1f ms" % (actual, expected))
+
+    def testStartNoteReturnsRightAway(self):
+        '''A chord: all notes start at once, and stop after their duration'''
+        channel = RecordingChannel()
+        for note in [60, 64, 67]:
+            JavaMusic.startNote(channel, note, 300, 64)
+        self.assertEquals([("on", 60), ("on", 64), ("on", 67)],
+                          channel.eventsWithoutTimes())
+        self.assertTrue(channel.timeOf("on", 67)[0] < JITTER)
+
+        time.sleep(0.5)
+        self.assertEquals(6, len(channel.events))
+        for note in [60, 64, 67]:
+            self.assertAbout(300, channel.timeOf("off", note)[0])
+
+    def testRetriggerCancelsNoteOff(self):
+        '''A note started again keeps sounding until its new duration is over'''
+        channel = RecordingChannel()
+        JavaMusic.startNote(channel, 60, 200, 64)
+        time.sleep(0.1)
+        JavaMusic.startNote(channel, 60, 200, 64)
+        time.sleep(0.4)
+
+        self.assertEquals([("on", 60), ("on", 60), ("off", 60)],
+                          channel.eventsWithoutTimes())
+        self.assertAbout(300, channel.timeOf("off", 60)[0])
+
+    def testPlayNotes(self):
+        '''A phrase plays in order, each note starting as the last one ends'''
+        channel = RecordingChannel()
+        JavaMusic.playNotes(channel, [60, 62, 64, 65], [100, 100, 200, 100],
+                            [64, 64, 64, 64])
+        time.sleep(0.7)
+
+        # each note is turned off before the next is turned on
+        self.assertEquals([("on", 60), ("off", 60), ("on", 62), ("off", 62),
+                           ("on", 64), ("off", 64), ("on", 65), ("off", 65)],
+                          channel.eventsWithoutTimes())
+        for note, start, end in [(60, 0, 100), (62, 100, 200), (64, 200, 400), (65, 400, 500)]:
+            self.assertAbout(start, channel.timeOf("on", note)[0])
+            self.assertAbout(end, channel.timeOf("off", note)[0])
+
+    def testCleanUpTurnsOffHeldNotes(self):
+        '''Notes still held are turned off by cleanUp, on their own channels'''
+        channel = RecordingChannel()
+        JavaMusic.startNote(channel, 60, 10000, 64)
+        JavaMusic.startNote(channel, 64, 10000, 64)
+        JavaMusic.cleanUp()
+
+        offs = [note for kind, note in channel.eventsWithoutTimes() if kind == "off"]
+        offs.sort()
+        self.assertEquals([60, 64], offs)
+
+    def testPlayNotesNeedsMatchingArrays(self):
+        '''Every note needs a duration and an intensity'''
+        self.assertRaises(Exception, JavaMusic.playNotes, RecordingChannel(),
+                          [60, 62], [100], [64, 64])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import music
+from music import *
+
+##########################################################################
+#   TESTS
+##########################################################################
+
+
+class Test_MidiSynthPool(unittest.TestCase):
+
+    def setUp(self):
+        # a pool of one MidiSynth, so every sequence gets the same one
+        self.sharedPool = music.__midiSynthPool__
+        music.__midiSynthPool__ = MidiSynthPool(1)
+
+    def tearDown(self):
+        music.__midiSynthPool__.stopAll()
+        music.__midiSynthPool__ = self.sharedPool
+
+    def testPausedSynthIsResetForNextOwner(self):
+        '''A MidiSynth paused by one sequence plays at normal speed for the next'''
+        first = MidiSequence(Phrase(Note(C4, WN)))
+        first.play()
+        first.pause()
+        first.stop()
+        self.assertNotEquals(1.0, first.midiSynth.getSequencer().getTempoFactor())
+
+        second = MidiSequence(Phrase(Note(E4, QN)))
+        second.play()
+        self.assertTrue(second.midiSynth is first.midiSynth)
+        self.assertEquals(1.0, second.midiSynth.getSequencer().getTempoFactor())
+        self.assertFalse(first.isPlaying())
+        second.stop()
+
+    def testSameOwnerGetsItsSynthBack(self):
+        '''A sequence playing again gets the MidiSynth it had before'''
+        sequence = MidiSequence(Phrase(Note(C4, QN)))
+        sequence.play()
+        sequence.stop()
+        midiSynth = sequence.midiSynth
+        self.assertTrue(music.__midiSynthPool__.acquire(sequence) is midiSynth)
+
+
+if __name__ == '__main__':
+    unittest.main()
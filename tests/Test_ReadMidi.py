@@ -0,0 +1,99 @@
+import unittest
+import os
+import tempfile
+import struct
+from music import *
+
+##########################################################################
+#   UTILITY FUNCTIONS
+##########################################################################
+
+
+def writeMelody(filename, pitches):
+    '''Writes a MIDI file with these pitches, as quarter notes.'''
+    phrase = Phrase(0.0)
+    for pitch in pitches:
+        phrase.addNote(Note(pitch, QN))
+    Write.midi(Score(Part(phrase)), filename)
+
+
+def writeTrack(filename, events):
+    '''Writes a MIDI file with one track of raw events (delta times included).'''
+    events = events + "\x00\xFF\x2F\x00"    # end of track
+    midiFile = open(filename, "wb")
+    midiFile.write("MThd\x00\x00\x00\x06\x00\x00\x00\x01\x00\x60")
+    midiFile.write("MTrk" + struct.pack(">I", len(events)) + events)
+    midiFile.close()
+
+
+def pitchesOf(score):
+    '''Returns the pitches in a score, in order.'''
+    return [note.getPitch() for part in score.getPartArray()
+            for phrase in part.getPhraseArray()
+            for note in phrase.getNoteArray()]
+
+##########################################################################
+#   TESTS
+##########################################################################
+
+
+class Test_ReadMidi(unittest.TestCase):
+
+    def setUp(self):
+        self.filename = os.path.join(tempfile.gettempdir(), "Test_ReadMidi.mid")
+        writeMelody(self.filename, [C4, E4, G4, C5])
+        Read.clearMidiCache()
+
+    def tearDown(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def testCachedReadIsACopy(self):
+        '''Reading a file again gives the same notes, in a score of its own'''
+        first = Score()
+        Read.midi(first, self.filename)
+        first.getPart(0).getPhrase(0).getNote(0).setPitch(D4)
+
+        second = Score()
+        Read.midi(second, self.filename)
+        self.assertEquals([C4, E4, G4, C5], pitchesOf(second))
+        self.assertEquals(first.getTempo(), second.getTempo())
+
+    def testChangedFileIsReadAgain(self):
+        '''A file changed since it was read is parsed again'''
+        Read.midi(Score(), self.filename)
+        writeMelody(self.filename, [A4, B4])
+        os.utime(self.filename, (0, 0))   # in case the clock is coarse
+
+        score = Score()
+        Read.midi(score, self.filename)
+        self.assertEquals([A4, B4], pitchesOf(score))
+
+    def testMidiNotes(self):
+        '''Notes are read one at a time, in beats, without a score'''
+        notes = list(Read.midiNotes(self.filename))
+        self.assertEquals([C4, E4, G4, C5], [note[2] for note in notes])
+        self.assertEquals([0.0, 1.0, 2.0, 3.0], [note[0] for note in notes])
+        for note in notes:
+            self.assertTrue(0.0 < note[1] <= 1.0)
+
+    def testMidiNotesNeedsAMidiFile(self):
+        '''Other files are rejected'''
+        open(self.filename, "w").write("not a MIDI file")
+        self.assertRaises(ValueError, list, Read.midiNotes(self.filename))
+
+    def testSysExCancelsRunningStatus(self):
+        '''A system exclusive message ends running status, so data bytes after it are bad'''
+        writeTrack(self.filename, "\x00\x90\x3C\x40" +      # note on
+                                  "\x60\x3C\x00" +          # note off, with running status
+                                  "\x00\xF0\x01\xF7" +      # system exclusive
+                                  "\x00\x3E\x40")           # no status to repeat
+        self.assertRaises(ValueError, list, Read.midiNotes(self.filename))
+
+        writeTrack(self.filename, "\x00\x90\x3C\x40" +
+                                  "\x60\x3C\x00")
+        self.assertEquals([(0.0, 1.0, 60, 64, 0)], list(Read.midiNotes(self.filename)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import Sound
+import Resampler
+import math
+
+##########################################################################
+#   UTILITY FUNCTIONS
+##########################################################################
+
+
+def makeSine(frequency, numSamples, samplingRate, amplitude=10000):
+    sound = Sound(numSamples, samplingRate)
+    for index in range(numSamples):
+        value = amplitude * math.sin(2 * math.pi * frequency * index / samplingRate)
+        sound.setSampleValueAt(index, int(round(value)))
+    return sound
+
+
+def measureFrequency(sound):
+    '''Measures the frequency of a sine from its rising zero crossings (in the
+       middle half of the sound, away from the filter's edges).'''
+    rate = sound.getSamplingRate()
+    first = sound.getLength() / 4
+    last = 3 * sound.getLength() / 4
+    crossings = []
+    previous = sound.getSampleValueAt(first)
+    for index in range(first + 1, last):
+        value = sound.getSampleValueAt(index)
+        if previous < 0 <= value:
+            # where the line between the two samples crosses zero
+            crossings.append(index - 1 + float(-previous) / (value - previous))
+        previous = value
+    return (len(crossings) - 1) / ((crossings[-1] - crossings[0]) / rate)
+
+
+def getMaxAmplitude(sound, start, end):
+    return max([abs(sound.getSampleValueAt(index)) for index in range(start, end)])
+
+##########################################################################
+
+print '''Run Tests on Resampler'''
+
+
+class Test_Resampler(unittest.TestCase):
+
+    def setUp(self):
+        self.sine = makeSine(441.0, 22050, 22050)
+
+    def testLengthUp(self):
+        '''Test resampling up keeps the duration'''
+        result = Resampler.resample(self.sine, 44100.0, 1, Resampler.HIGH)
+        self.assertEquals(result.getLength(), 44100,
+                          'Length is %s != 44100' % result.getLength())
+        self.assertEquals(result.getSamplingRate(), 44100,
+                          'Sampling rate is %s != 44100' % result.getSamplingRate())
+
+    def testLengthDown(self):
+        '''Test resampling down keeps the duration (rounding the length)'''
+        result = Resampler.resample(self.sine, 16000.0, 1, Resampler.HIGH)
+        expected = int(round(22050 * 16000.0 / 22050))
+        self.assertEquals(result.getLength(), expected,
+                          'Length is %s != %s' % (result.getLength(), expected))
+
+    def testLengthOdd(self):
+        '''Test the length of a sound whose rates do not divide evenly'''
+        sound = makeSine(441.0, 10001, 22050)
+        result = Resampler.resample(sound, 8000.0, 1, Resampler.MEDIUM)
+        expected = int(round(10001 * 8000.0 / 22050))
+        self.assertEquals(result.getLength(), expected,
+                          'Length is %s != %s' % (result.getLength(), expected))
+
+    def testFrequency(self):
+        '''Test a sine keeps its frequency, at every quality'''
+        for quality in [Resampler.LINEAR, Resampler.MEDIUM, Resampler.HIGH]:
+            for rate in [8000.0, 16000.0, 44100.0, 48000.0]:
+                result = Resampler.resample(self.sine, rate, 1, quality)
+                frequency = measureFrequency(result)
+                self.assertTrue(abs(frequency - 441.0) < 0.5,
+                                'Frequency at %s Hz (quality %s) is %s != 441' % (rate, quality, frequency))
+
+    def testAmplitude(self):
+        '''Test a sine well below the cutoff keeps its amplitude'''
+        result = Resampler.resample(self.sine, 16000.0, 1, Resampler.HIGH)
+        amplitude = getMaxAmplitude(result, 4000, 12000)
+        self.assertTrue(abs(amplitude - 10000) < 200,
+                        'Amplitude is %s != 10000' % amplitude)
+
+    def testAliasing(self):
+        '''Test a sine above the new Nyquist frequency is filtered out'''
+        sound = makeSine(9000.0, 22050, 22050)
+        result = Resampler.resample(sound, 8000.0, 1, Resampler.HIGH)
+        amplitude = getMaxAmplitude(result, 2000, 6000)
+        self.assertTrue(amplitude < 500,
+                        'Amplitude of aliased sine is %s (should be filtered out)' % amplitude)
+
+    def testChannels(self):
+        '''Test resampling to stereo'''
+        result = Resampler.resample(self.sine, 44100.0, 2, Resampler.HIGH)
+        self.assertEquals(result.getChannels(), 2,
+                          'Channels are %s != 2' % result.getChannels())
+        self.assertEquals(result.getLength(), 44100,
+                          'Length is %s != 44100' % result.getLength())
+
+#suite = unittest.makeSuite(Test_Resampler)
+#results = unittest.TextTestRunner(verbosity=2).run(suite)
+
+##########################################################################
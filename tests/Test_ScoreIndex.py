@@ -0,0 +1,108 @@
+import unittest
+import random
+from music import *
+from jm.music.data import Note as jNote
+
+##########################################################################
+#   UTILITY FUNCTIONS
+##########################################################################
+
+
+def randomScore(seed):
+    '''Returns a score of a few parts, with random notes, rests, and chords.'''
+    random.seed(seed)
+    score = Score("Random", 120.0)
+    for channel in range(random.randint(1, 3)):
+        part = Part(PIANO, channel)
+        for i in range(random.randint(1, 3)):
+            phrase = Phrase(random.randint(0, 8) * 0.5)
+            for j in range(random.randint(1, 20)):
+                duration = random.choice([SN, EN, QN, HN])
+                if random.random() < 0.2:
+                    phrase.addChord([C4, E4, G4], duration)
+                else:
+                    phrase.addNote(Note(random.choice([REST, C4, D4, E4, A4]), duration))
+            part.addPhrase(phrase)
+        score.addPart(part)
+    return score
+
+##########################################################################
+#   TESTS
+##########################################################################
+
+
+class Test_ScoreIndex(unittest.TestCase):
+
+    def testNotesAreSorted(self):
+        '''Notes are sorted by start time, without rests, and chords get a duration'''
+        index = ScoreIndex(randomScore(1))
+        notes = index.getNotes()
+        self.assertEquals(sorted([note[0] for note in notes]), [note[0] for note in notes])
+        self.assertTrue(min([note[1] for note in notes]) > 0)
+        self.assertEquals(max([note[0] + note[1] for note in notes]), index.getEndTime())
+
+    def testQueriesMatchBruteForce(self):
+        '''Notes sounding at a time, or in a window, are the ones a full scan finds'''
+        for seed in range(10):
+            index = ScoreIndex(randomScore(seed))
+            notes = index.getNotes()
+            for i in range(50):
+                time = random.randint(-100, index.getEndTime() + 100)
+                self.assertEquals([note for note in notes if note[0] <= time < note[0] + note[1]],
+                                  index.getNotesAt(time))
+
+                endTime = time + random.randint(0, 2000)
+                self.assertEquals([note for note in notes if note[0] < endTime and note[0] + note[1] > time],
+                                  index.getNotesBetween(time, endTime))
+
+    def testForScoreReusesCurrentIndex(self):
+        '''forScore() reuses an index until its score is changed'''
+        score = randomScore(3)
+        index = ScoreIndex.forScore(score)
+        self.assertTrue(index.isCurrent())
+        self.assertTrue(ScoreIndex.forScore(score) is index)
+
+        # a note added
+        score.getPart(0).getPhrase(0).addNote(Note(C5, QN))
+        self.assertFalse(index.isCurrent())
+        index = ScoreIndex.forScore(score)
+        self.assertTrue(ScoreIndex.forScore(score) is index)
+
+        # a Mod function
+        Mod.transpose(score, 2)
+        self.assertFalse(index.isCurrent())
+        index = ScoreIndex.forScore(score)
+
+        # a change made through jMusic, and reported
+        ScoreIndex.changed()
+        self.assertFalse(index.isCurrent())
+
+    def testNoteChangesAreCounted(self):
+        '''Changing a note's pitch makes indexes out of date'''
+        score = randomScore(4)
+        index = ScoreIndex(score)
+        score.getPart(0).getPhrase(0).getNote(0).setPitch(C6)
+        self.assertFalse(index.isCurrent())
+
+    def testPlayMidiHearsJMusicChanges(self):
+        '''Play.midi() plays a note changed directly through jMusic, unreported'''
+        note = Note(C4, QN)
+        score = Score(Part(Phrase(note)))
+        played = []
+        playNote = Play.note
+        Play.note = Callable(lambda frequency, start, duration, *rest: played.append(frequency))
+        try:
+            Play.midi(score)
+            jNote.setPitch(note, E4)
+            Play.midi(score)
+        finally:
+            Play.note = playNote
+        self.assertEquals([jNote(C4, QN).getFrequency(), note.getFrequency()], played)
+
+    def testUnrecognizedMaterial(self):
+        '''Only jMusic material can be indexed'''
+        self.assertRaises(TypeError, ScoreIndex, "not a score")
+
+
+if __name__ == '__main__':
+    unittest.main()
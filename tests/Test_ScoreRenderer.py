@@ -0,0 +1,78 @@
+import unittest
+import os
+import tempfile
+import jarray
+import ScoreRenderer
+
+##########################################################################
+#   UTILITY FUNCTIONS
+##########################################################################
+
+
+def scaleRenderer():
+    '''Returns a stereo renderer with a C major scale, panned left to right.'''
+    renderer = ScoreRenderer()
+    frequencies = [261.63, 293.66, 329.63, 349.23, 392.0, 440.0, 493.88, 523.25]
+    for i in range(len(frequencies)):
+        renderer.addNote(i * 250, 250, frequencies[i], 100, i * 127 / 7)
+    return renderer
+
+
+def samplesOf(sound):
+    '''Returns all the samples of a sound, one list per channel.'''
+    numFrames = sound.getLengthInFrames()
+    samples = [jarray.zeros(numFrames, 'i') for channel in range(sound.getChannels())]
+    samples = jarray.array(samples, jarray.zeros(0, 'i').__class__)
+    sound.getSampleBlock(0, numFrames, samples)
+    return [list(channel) for channel in samples]
+
+##########################################################################
+#   TESTS
+##########################################################################
+
+
+class Test_ScoreRenderer(unittest.TestCase):
+
+    def testRendersAreIdentical(self):
+        '''The same notes always render to exactly the same samples'''
+        renderer = scaleRenderer()
+        first = samplesOf(renderer.renderToSound())
+        second = samplesOf(scaleRenderer().renderToSound())
+        self.assertEquals(first, second)
+        self.assertTrue(renderer.getRenderSpeed() > 1.0)
+
+    def testLengthIncludesRelease(self):
+        '''The sound lasts until the last note has faded out'''
+        renderer = scaleRenderer()
+        rate = ScoreRenderer.DEFAULT_SAMPLE_RATE
+        # the last note's start, length, and release, each truncated to frames
+        # as the renderer does, and then the silent frame that ends the release
+        expected = (1750 * rate / 1000) + (250 * rate / 1000) + \
+                   (ScoreRenderer.RELEASE_MILLIS * rate / 1000) + 1
+        self.assertEquals(expected, renderer.getLengthInFrames())
+        sound = renderer.renderToSound()
+        self.assertEquals(expected, sound.getLengthInFrames())
+
+        # the end of the release is silent, and the notes start on the left
+        left, right = samplesOf(sound)
+        self.assertEquals(0, left[-1])
+        self.assertEquals(0, right[-1])
+        self.assertTrue(max(left[:rate / 8]) > 0)
+        self.assertEquals(0, max(right[:rate / 8]))
+
+    def testRenderToFileMatchesSound(self):
+        '''Rendering to a file gives the same length as rendering to a sound'''
+        fileName = os.path.join(tempfile.gettempdir(), "Test_ScoreRenderer.wav")
+        try:
+            renderer = scaleRenderer()
+            renderer.renderToFile(fileName)
+            header = 44
+            self.assertEquals(header + renderer.getLengthInFrames() * 2 * 2,
+                              os.path.getsize(fileName))
+        finally:
+            if os.path.exists(fileName):
+                os.remove(fileName)
+
+
+if __name__ == '__main__':
+    unittest.main()
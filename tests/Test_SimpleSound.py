@@ -1501,6 +1501,23 @@ class Test_Buffer(unittest.TestCase):
                 self.assertEquals(simpleBuffer[index], bytes[index],
                                   'Buffer is different at index %s' % index)
 
+    def testBufferAfterPlay(self):
+        '''Test edits through getBuffer are written after the sound is played'''
+        fileName = OUTPUT + "testBufferAfterPlay.wav"
+        simple = SimpleSound(SOUNDS + "preamble.wav")
+        simpleBuffer = simple.getBuffer()
+        simple.playAtRateDur(1.0, 100)
+        simple.write(fileName)
+
+        for index in range(200, 210):
+            simpleBuffer[index] = 42
+        simple.write(fileName)
+
+        readBack = SimpleSound(fileName).getBuffer()
+        for index in range(200, 210):
+            self.assertEquals(readBack[index], 42,
+                              'Buffer read back is %s != 42 at index %s' % (readBack[index], index))
+
 #suite = unittest.makeSuite(Test_Buffer)
 #results = unittest.TextTestRunner(verbosity=2).run(suite)
 
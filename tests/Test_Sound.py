@@ -0,0 +1,189 @@
+import unittest
+import Sound
+import math
+
+# more than two blocks' worth (Sound works on 4096 samples at a time), and odd
+LENGTH = 9999
+
+##########################################################################
+#   UTILITY FUNCTIONS
+##########################################################################
+
+
+def makeValues(length, seed):
+    '''Returns a list of repeatable pseudo-random sample values.'''
+    values = []
+    value = seed
+    for index in range(length):
+        value = (value * 1103515245 + 12345) % 2147483648
+        values.append(value % 40001 - 20000)
+    return values
+
+
+def makeTestSound(values):
+    sound = Sound(len(values))
+    for index in range(len(values)):
+        sound.setSampleValueAt(index, values[index])
+    return sound
+
+
+def getValues(sound):
+    return [sound.getSampleValueAt(index) for index in range(sound.getLength())]
+
+
+def javaRound(value):
+    '''Rounds like Java's Math.round (halves go up).'''
+    return int(math.floor(value + 0.5))
+
+
+def clip(value):
+    return max(-32768, min(32767, value))
+
+
+def ramp(values, start, numSamples, startFactor, endFactor):
+    '''Scales part of values gradually, like Sound.changeVolume.'''
+    values = list(values)
+    step = 0.0
+    if numSamples > 1:
+        step = (endFactor - startFactor) / (numSamples - 1)
+    for k in range(numSamples):
+        factor = startFactor + k * step
+        values[start + k] = clip(javaRound(values[start + k] * factor))
+    return values
+
+##########################################################################
+
+print '''Run Tests on Sound block operations'''
+
+
+class Test_Sound_Blocks(unittest.TestCase):
+
+    def setUp(self):
+        self.values = makeValues(LENGTH, 1)
+        self.sound = makeTestSound(self.values)
+
+    def assertValues(self, expected, sound):
+        actual = getValues(sound)
+        self.assertEquals(len(expected), len(actual),
+                          'Length is %s != %s' % (len(actual), len(expected)))
+        for index in range(len(expected)):
+            if actual[index] != expected[index]:
+                self.fail('Sample %s is %s != %s' % (index, actual[index], expected[index]))
+
+    def testChangeVolume(self):
+        '''Test changeVolume multiplies every sample, clipping big ones'''
+        self.sound.changeVolume(2.0)
+        self.assertValues(ramp(self.values, 0, LENGTH, 2.0, 2.0), self.sound)
+
+    def testFadeIn(self):
+        '''Test fadeIn ramps the start up from silence'''
+        self.sound.fadeIn(5000)
+        self.assertValues(ramp(self.values, 0, 5000, 0.0, 1.0), self.sound)
+        self.assertEquals(self.sound.getSampleValueAt(0), 0,
+                          'First sample is %s != 0' % self.sound.getSampleValueAt(0))
+
+    def testFadeOut(self):
+        '''Test fadeOut ramps the end down to silence'''
+        self.sound.fadeOut(5000)
+        self.assertValues(ramp(self.values, LENGTH - 5000, 5000, 1.0, 0.0), self.sound)
+        self.assertEquals(self.sound.getSampleValueAt(LENGTH - 1), 0,
+                          'Last sample is %s != 0' % self.sound.getSampleValueAt(LENGTH - 1))
+
+    def testFadeLongerThanSound(self):
+        '''Test fades longer than the sound fade all of it'''
+        self.sound.fadeIn(2 * LENGTH)
+        self.assertValues(ramp(self.values, 0, LENGTH, 0.0, 1.0), self.sound)
+
+    def testNormalize(self):
+        '''Test normalize makes the biggest sample the biggest possible'''
+        largest = max([abs(value) for value in self.values])
+        self.sound.normalize()
+        factor = 32767.0 / largest
+        self.assertValues(ramp(self.values, 0, LENGTH, factor, factor), self.sound)
+        self.assertEquals(self.sound.getMaxAmplitude(), 32767,
+                          'Biggest sample is %s != 32767' % self.sound.getMaxAmplitude())
+
+    def testNormalizeSilence(self):
+        '''Test normalize leaves a silent sound alone'''
+        silence = Sound(LENGTH)
+        silence.normalize()
+        self.assertValues([0] * LENGTH, silence)
+
+    def testClip(self):
+        '''Test clip limits samples to between -limit and limit'''
+        self.sound.clip(1000)
+        self.assertValues([max(-1000, min(1000, value)) for value in self.values], self.sound)
+
+    def testReverse(self):
+        '''Test reverse across blocks, with an odd number of samples'''
+        self.sound.reverse()
+        expected = list(self.values)
+        expected.reverse()
+        self.assertValues(expected, self.sound)
+
+    def testReverseTwice(self):
+        '''Test reversing twice gives the sound back'''
+        self.sound.reverse()
+        self.sound.reverse()
+        self.assertValues(self.values, self.sound)
+
+    def testInsert(self):
+        '''Test insert makes a new sound, leaving both inputs alone'''
+        otherValues = makeValues(5000, 2)
+        other = makeTestSound(otherValues)
+        inserted = self.sound.insert(other, 4500)
+        self.assertValues(self.values[:4500] + otherValues + self.values[4500:], inserted)
+        self.assertValues(self.values, self.sound)
+        self.assertValues(otherValues, other)
+
+    def testInsertAtEnds(self):
+        '''Test insert before and after the sound'''
+        other = makeTestSound([1, 2, 3])
+        self.assertValues([1, 2, 3] + self.values, self.sound.insert(other, 0))
+        self.assertValues(self.values + [1, 2, 3], self.sound.insert(other, LENGTH))
+
+    def testMix(self):
+        '''Test mix adds as much of the other sound as fits'''
+        otherValues = makeValues(6000, 2)
+        other = makeTestSound(otherValues)
+        self.sound.mix(other, 5000, 0.5, 0.75)
+        expected = list(self.values)
+        for k in range(LENGTH - 5000):
+            expected[5000 + k] = clip(javaRound(0.5 * self.values[5000 + k] + 0.75 * otherValues[k]))
+        self.assertValues(expected, self.sound)
+
+    def testEcho(self):
+        '''Test echo adds each echoed sample delay samples later'''
+        self.sound.echo(3000, 0.5)
+        expected = list(self.values)
+        for index in range(3000, LENGTH):
+            expected[index] = clip(javaRound(self.values[index] + 0.5 * expected[index - 3000]))
+        self.assertValues(expected, self.sound)
+
+    def testEchoLongerThanSound(self):
+        '''Test an echo that comes after the sound ends changes nothing'''
+        self.sound.echo(LENGTH, 0.5)
+        self.assertValues(self.values, self.sound)
+
+    def testCrossfade(self):
+        '''Test crossfade overlaps the end of one sound with the start of another'''
+        otherValues = makeValues(7000, 2)
+        other = makeTestSound(otherValues)
+        faded = self.sound.crossfade(other, 5000)
+
+        start = LENGTH - 5000
+        fadingOut = ramp(self.values, start, 5000, 1.0, 0.0)
+        fadingIn = ramp(otherValues, 0, 5000, 0.0, 1.0)
+        expected = fadingOut[:start]
+        for k in range(5000):
+            expected.append(clip(fadingOut[start + k] + fadingIn[k]))
+        expected = expected + otherValues[5000:]
+
+        self.assertValues(expected, faded)
+        self.assertValues(self.values, self.sound)
+        self.assertValues(otherValues, other)
+
+#suite = unittest.makeSuite(Test_Sound_Blocks)
+#results = unittest.TextTestRunner(verbosity=2).run(suite)
+
+##########################################################################
@@ -0,0 +1,285 @@
+import unittest
+import SoundBuffer
+import DecodedMP3
+import SimpleSound
+import Sound
+import os.path
+import jarray
+import java.io.File as File
+import java.lang.UnsupportedOperationException
+
+TEST_DIRECTORY = os.path.dirname(__file__) + "/"
+OUTPUT = TEST_DIRECTORY + "test-output/"
+
+PAGE_SIZE = SoundBuffer.PAGE_SIZE
+
+##########################################################################
+#   UTILITY FUNCTIONS
+##########################################################################
+
+
+def pageValue(page):
+    '''The byte a test puts in (or expects of) a page.'''
+    return page % 200 - 100
+
+
+def writePagedFile(fileName, headerSize, numPages):
+    '''Writes a file of headerSize zeros, followed by numPages pages, each
+       filled with its pageValue.'''
+    out = open(fileName, "wb")
+    out.write("\0" * headerSize)
+    for page in range(numPages):
+        out.write(chr(pageValue(page) % 256) * PAGE_SIZE)
+    out.close()
+
+
+# A silent MPEG-1 Layer III frame: 128 kbit/s, 44100 Hz, mono, with no
+# data (so it decodes to 1152 zero samples)
+MP3_FRAME = "\xff\xfb\x90\xc0" + "\0" * (417 - 4)
+MP3_FRAME_SAMPLES = 1152
+
+
+def writeMP3(fileName, numFrames):
+    out = open(fileName, "wb")
+    out.write(MP3_FRAME * numFrames)
+    out.close()
+
+##########################################################################
+
+print '''Run Tests on SoundBuffer'''
+
+
+class Test_SoundBuffer(unittest.TestCase):
+
+    def testAllocate(self):
+        '''Test short buffers are arrays, and long ones paged'''
+        short = SoundBuffer.allocate(1000)
+        self.assertTrue(short.hasArray(), 'Short buffer is not an array')
+        self.assertEquals(short.length(), 1000,
+                          'Length is %s != 1000' % short.length())
+
+        paged = SoundBuffer.allocate(SoundBuffer.IN_MEMORY_LIMIT + 1)
+        self.assertFalse(paged.hasArray(), 'Long buffer is not paged')
+        self.assertEquals(paged.length(), SoundBuffer.IN_MEMORY_LIMIT + 1,
+                          'Length is %s != %s' % (paged.length(), SoundBuffer.IN_MEMORY_LIMIT + 1))
+        paged.close()
+
+    def testWrap(self):
+        '''Test a wrapped array is shared, not copied'''
+        bytes = jarray.zeros(10, 'b')
+        buffer = SoundBuffer.wrap(bytes)
+        buffer.put(3, 42)
+        self.assertEquals(bytes[3], 42, 'Byte in array is %s != 42' % bytes[3])
+        bytes[4] = 7
+        self.assertEquals(buffer.get(4), 7, 'Byte in buffer is %s != 7' % buffer.get(4))
+
+    def testPageEviction(self):
+        '''Test changed pages survive being evicted (to the scratch file)'''
+        buffer = SoundBuffer.allocate(SoundBuffer.IN_MEMORY_LIMIT + PAGE_SIZE / 2)
+        numPages = int((buffer.length() + PAGE_SIZE - 1) / PAGE_SIZE)
+        self.assertTrue(numPages > SoundBuffer.MAX_RESIDENT_PAGES,
+                        'Test needs more pages (%s) than are kept in memory' % numPages)
+
+        # change the first and last byte of every page (more pages than fit in memory)
+        for page in range(numPages):
+            last = min((page + 1) * PAGE_SIZE, buffer.length()) - 1
+            buffer.put(page * PAGE_SIZE, pageValue(page))
+            buffer.put(last, pageValue(page))
+
+        # and read them all back (so evicted pages are read again)
+        for page in range(numPages):
+            last = min((page + 1) * PAGE_SIZE, buffer.length()) - 1
+            self.assertEquals(buffer.get(page * PAGE_SIZE), pageValue(page),
+                              'First byte of page %s is wrong' % page)
+            self.assertEquals(buffer.get(last), pageValue(page),
+                              'Last byte of page %s is wrong' % page)
+            self.assertEquals(buffer.get(page * PAGE_SIZE + 1), 0,
+                              'Unchanged byte of page %s is not silent' % page)
+        buffer.close()
+
+    def testPutAcrossPages(self):
+        '''Test bulk puts and gets that span a page boundary'''
+        buffer = SoundBuffer.allocate(SoundBuffer.IN_MEMORY_LIMIT + 1)
+        bytes = jarray.array([1, 2, 3, 4, 5, 6], 'b')
+        buffer.put(PAGE_SIZE - 3, bytes, 0, 6)
+        readBack = jarray.zeros(6, 'b')
+        buffer.get(PAGE_SIZE - 3, readBack, 0, 6)
+        self.assertEquals(list(readBack), [1, 2, 3, 4, 5, 6],
+                          'Bytes read back are %s' % list(readBack))
+        buffer.close()
+
+    def testPagedFromFile(self):
+        '''Test a buffer paged from a file reads it, and never changes it'''
+        fileName = OUTPUT + "testPaged.raw"
+        numPages = SoundBuffer.MAX_RESIDENT_PAGES + 6
+        writePagedFile(fileName, 10, numPages)
+        file = File(fileName)
+
+        buffer = SoundBuffer.page(file, 10, numPages * PAGE_SIZE)
+        self.assertTrue(buffer.readsFrom(file), 'Buffer does not read from its file')
+        self.assertEquals(buffer.get(0), pageValue(0), 'First byte is wrong')
+        self.assertEquals(buffer.get(5 * PAGE_SIZE + 7), pageValue(5), 'Byte of page 5 is wrong')
+
+        # change two pages, then read every page (evicting the changed ones)
+        buffer.put(0, 1)
+        buffer.put(5 * PAGE_SIZE, 2)
+        for page in range(numPages):
+            self.assertEquals(buffer.get(page * PAGE_SIZE + 1), pageValue(page),
+                              'Byte of page %s is wrong' % page)
+        self.assertEquals(buffer.get(0), 1, 'Changed byte of page 0 was lost')
+        self.assertEquals(buffer.get(5 * PAGE_SIZE), 2, 'Changed byte of page 5 was lost')
+        buffer.close()
+
+        # the file itself is unchanged
+        data = open(fileName, "rb").read()
+        self.assertEquals(data[10], chr(pageValue(0) % 256), 'File was changed')
+        self.assertEquals(data[10 + 5 * PAGE_SIZE], chr(pageValue(5) % 256), 'File was changed')
+        os.remove(fileName)
+
+    def testView(self):
+        '''Test a view shows part of its buffer, and shares changes with it'''
+        base = SoundBuffer.wrap(jarray.array(range(100), 'b'))
+        view = base.view(10, 20)
+        self.assertEquals(view.length(), 20, 'Length is %s != 20' % view.length())
+        self.assertEquals(view.get(0), 10, 'First byte is %s != 10' % view.get(0))
+        self.assertEquals(view.get(19), 29, 'Last byte is %s != 29' % view.get(19))
+
+        view.put(1, -1)
+        self.assertEquals(base.get(11), -1, 'Change through view is not in base')
+        base.put(12, -2)
+        self.assertEquals(view.get(2), -2, 'Change in base is not in view')
+
+    def testViewAcrossPages(self):
+        '''Test a view of a paged buffer across a page boundary'''
+        base = SoundBuffer.allocate(SoundBuffer.IN_MEMORY_LIMIT + 1)
+        view = base.view(PAGE_SIZE - 2, 4)
+        view.put(0, jarray.array([1, 2, 3, 4], 'b'), 0, 4)
+        self.assertEquals(base.get(PAGE_SIZE - 2), 1, 'First byte is not in base')
+        self.assertEquals(base.get(PAGE_SIZE + 1), 4, 'Last byte is not in base')
+        base.close()
+
+    def testCopyOnWrite(self):
+        '''Test changing a copy-on-write copy leaves the original alone'''
+        base = SoundBuffer.wrap(jarray.array(range(100), 'b'))
+        copy = base.copyOnWrite()
+        copy.put(5, -5)
+        self.assertEquals(copy.get(5), -5, 'Copy was not changed')
+        self.assertEquals(base.get(5), 5, 'Original was changed')
+        self.assertEquals(copy.get(6), 6, 'Unchanged byte of copy is %s != 6' % copy.get(6))
+
+        bytes = jarray.zeros(10, 'b')
+        copy.get(0, bytes, 0, 10)
+        self.assertEquals(list(bytes), [0, 1, 2, 3, 4, -5, 6, 7, 8, 9],
+                          'Bytes of copy are %s' % list(bytes))
+
+    def testCopyOnWriteManyPages(self):
+        '''Test a copy changed in more pages than it keeps becomes a copy of its own'''
+        base = SoundBuffer.allocate(SoundBuffer.IN_MEMORY_LIMIT + 1)
+        copy = base.copyOnWrite()
+        numPages = SoundBuffer.MAX_RESIDENT_PAGES + 2
+        for page in range(numPages):
+            copy.put(page * PAGE_SIZE, pageValue(page) or 1)
+        for page in range(numPages):
+            self.assertEquals(copy.get(page * PAGE_SIZE), pageValue(page) or 1,
+                              'Change to page %s was lost' % page)
+            self.assertEquals(base.get(page * PAGE_SIZE), 0,
+                              'Original was changed in page %s' % page)
+        copy.close()
+        base.close()
+
+    def testStream(self):
+        '''Test reading a buffer as a stream, with mark and reset'''
+        stream = SoundBuffer.wrap(jarray.array(range(10), 'b')).openStream()
+        self.assertEquals(stream.read(), 0, 'First byte read is wrong')
+        stream.mark(100)
+        bytes = jarray.zeros(4, 'b')
+        self.assertEquals(stream.read(bytes, 0, 4), 4, 'Did not read 4 bytes')
+        self.assertEquals(list(bytes), [1, 2, 3, 4], 'Bytes read are %s' % list(bytes))
+        stream.reset()
+        self.assertEquals(stream.read(), 1, 'Reset did not go back to the mark')
+        self.assertEquals(stream.available(), 8, 'Available is %s != 8' % stream.available())
+
+    def testLongSoundRoundTrip(self):
+        '''Test writing and reading back a sound longer than fits in an array'''
+        fileName = OUTPUT + "testLongSound.wav"
+        numSamples = int(SoundBuffer.IN_MEMORY_LIMIT / 2 + 1000)
+        indices = [0, PAGE_SIZE / 2 - 1, PAGE_SIZE / 2, numSamples / 2, numSamples - 1]
+
+        sound = Sound(numSamples)
+        for index in indices:
+            sound.setSampleValueAt(index, index % 30000 - 15000)
+        sound.write(fileName)
+
+        readBack = SimpleSound(fileName)
+        self.assertEquals(readBack.getLength(), numSamples,
+                          'Length is %s != %s' % (readBack.getLength(), numSamples))
+        for index in indices:
+            self.assertEquals(readBack.getSampleValueAt(index), index % 30000 - 15000,
+                              'Sample %s is wrong' % index)
+        self.assertEquals(readBack.getSampleValueAt(1), 0, 'Unchanged sample is not silent')
+
+#suite = unittest.makeSuite(Test_SoundBuffer)
+#results = unittest.TextTestRunner(verbosity=2).run(suite)
+
+##########################################################################
+
+print '''Run Tests on DecodedMP3'''
+
+
+class Test_DecodedMP3(unittest.TestCase):
+
+    def setUp(self):
+        self.fileName = OUTPUT + "testSilence.mp3"
+        writeMP3(self.fileName, 20)
+
+    def testFormat(self):
+        '''Test the format and length come from the frame headers'''
+        mp3 = DecodedMP3.open(File(self.fileName))
+        self.assertEquals(mp3.getFormat().getSampleRate(), 44100,
+                          'Sampling rate is %s != 44100' % mp3.getFormat().getSampleRate())
+        self.assertEquals(mp3.getFormat().getChannels(), 1,
+                          'Channels are %s != 1' % mp3.getFormat().getChannels())
+        self.assertEquals(mp3.getFrameLength(), 20 * MP3_FRAME_SAMPLES,
+                          'Frame length is %s != %s' % (mp3.getFrameLength(), 20 * MP3_FRAME_SAMPLES))
+        self.assertEquals(mp3.length(), 20 * MP3_FRAME_SAMPLES * 2,
+                          'Length is %s != %s' % (mp3.length(), 20 * MP3_FRAME_SAMPLES * 2))
+
+    def testDecodes(self):
+        '''Test samples are decoded as they are asked for'''
+        mp3 = DecodedMP3.open(File(self.fileName))
+        self.assertEquals(mp3.get(mp3.length() - 1), 0, 'Silence did not decode to 0')
+
+    def testShared(self):
+        '''Test opening an unchanged file again reuses its samples'''
+        first = DecodedMP3.open(File(self.fileName))
+        second = DecodedMP3.open(File(self.fileName))
+        self.assertTrue(first.equals(second), 'Unchanged file was decoded again')
+
+    def testChangedFile(self):
+        '''Test opening a changed file decodes it again'''
+        first = DecodedMP3.open(File(self.fileName))
+        writeMP3(self.fileName, 30)
+        second = DecodedMP3.open(File(self.fileName))
+        self.assertFalse(first.equals(second), 'Changed file was not decoded again')
+        self.assertEquals(second.getFrameLength(), 30 * MP3_FRAME_SAMPLES,
+                          'Frame length is %s != %s' % (second.getFrameLength(), 30 * MP3_FRAME_SAMPLES))
+
+    def testReadOnly(self):
+        '''Test the shared samples cannot be changed'''
+        mp3 = DecodedMP3.open(File(self.fileName))
+        self.assertRaises(java.lang.UnsupportedOperationException, mp3.put, 0, 1)
+
+    def testSoundsKeepTheirChanges(self):
+        '''Test sounds of the same file change copies of the shared samples'''
+        first = SimpleSound(self.fileName)
+        second = SimpleSound(self.fileName)
+        first.setSampleValueAt(100, 1234)
+        self.assertEquals(first.getSampleValueAt(100), 1234, 'Sound was not changed')
+        self.assertEquals(second.getSampleValueAt(100), 0, 'Other sound of the file was changed')
+        self.assertEquals(SimpleSound(self.fileName).getSampleValueAt(100), 0,
+                          'New sound of the file was changed')
+
+#suite = unittest.makeSuite(Test_DecodedMP3)
+#results = unittest.TextTestRunner(verbosity=2).run(suite)
+
+##########################################################################
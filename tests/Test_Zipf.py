@@ -0,0 +1,65 @@
+import unittest
+import random
+import zipf
+
+##########################################################################
+#   UTILITY FUNCTIONS
+##########################################################################
+
+
+def histogram(events):
+    '''Returns the number of times each event occurs.'''
+    counts = {}
+    for event in events:
+        counts[event] = counts.get(event, 0) + 1
+    return counts.values()
+
+
+def randomEvents(length, numberOfEvents):
+    '''Returns random events, skewed so that some are much more common.'''
+    return [int(random.paretovariate(1.0)) % numberOfEvents
+            for i in range(length)]
+
+##########################################################################
+#   TESTS
+##########################################################################
+
+
+class Test_Zipf(unittest.TestCase):
+
+    def assertSameSlopeR2(self, expected, actual, message=""):
+        for name, e, a in zip(["slope", "r2", "yint"], expected, actual):
+            self.assertAlmostEqual(e, a, 9, "%s %s: %r != %r" % (message, name, e, a))
+
+    def testMatchesByRankAfterEveryEvent(self):
+        '''The accumulator agrees with byRank as each event is added'''
+        random.seed(26)
+        for trial in range(20):
+            events = randomEvents(random.randint(1, 300), random.randint(1, 40))
+            accumulator = zipf.ZipfAccumulator()
+            for i in range(len(events)):
+                accumulator.add(events[i])
+                self.assertSameSlopeR2(zipf.byRank(histogram(events[:i + 1])),
+                                       accumulator.getSlopeR2(),
+                                       "trial %d, event %d:" % (trial, i))
+
+    def testMatchesByRankOnLongStreams(self):
+        '''The running sums don't drift over many events'''
+        random.seed(46)
+        for numberOfEvents in [2, 10, 1000]:
+            events = randomEvents(20000, numberOfEvents)
+            accumulator = zipf.ZipfAccumulator(events)
+            self.assertSameSlopeR2(zipf.byRank(histogram(events)),
+                                   accumulator.getSlopeR2())
+            self.assertEquals(sorted(histogram(events)),
+                              sorted(accumulator.getCounts()))
+
+    def testExtremeCases(self):
+        '''Monotonous and uniform events give the same answers as byRank'''
+        self.assertEquals((0.0, 0.0, 0.0), zipf.ZipfAccumulator([1, 1, 1]).getSlopeR2())
+        self.assertEquals((0.0, 1.0, 0.0), zipf.ZipfAccumulator([2, 2, 2, 3, 3, 3]).getSlopeR2())
+        self.assertRaises(ValueError, zipf.ZipfAccumulator().getSlopeR2)
+
+
+if __name__ == '__main__':
+    unittest.main()
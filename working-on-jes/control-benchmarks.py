@@ -0,0 +1,52 @@
+# control-benchmarks.py
+# Sets a number of faders to random values, and paints only the area that
+# changed (into an image, instead of a display) as a display would - so you
+# can gauge how many fader paints per second guicontrols gets.  Pass the
+# number of faders (default 50).
+import sys
+import random
+from guicontrols import *
+from time import time as now
+
+
+def runBenchmarks(numFaders, numRounds=200):
+    faders = []
+    for i in range(numFaders):
+        faders.append(HFader(x1=10, y1=10, x2=310, y2=40, minValue=0, maxValue=999, startValue=0))
+
+    image = BufferedImage(faders[0].getWidth(), faders[0].getHeight(), BufferedImage.TYPE_INT_ARGB)
+    graphics2DContext = image.createGraphics()
+
+    paints = 0
+    dirtyArea = 0
+    start = now()
+    for round in range(numRounds):
+        for fader in faders:
+            fader.setValue(random.randint(0, 999))
+
+            # paint only the area that changed, as the display would
+            minX, minY, maxX, maxY = fader.__takeDirtyRegion__()
+            minX = max(minX, 0)
+            maxX = min(maxX, fader.getWidth() - 1)
+            graphics2DContext.setClip(minX, minY, maxX - minX + 1, maxY - minY + 1)
+            fader.paint(graphics2DContext)
+
+            paints = paints + 1
+            dirtyArea = dirtyArea + (maxX - minX + 1) * (maxY - minY + 1)
+    elapsedTime = now() - start
+    graphics2DContext.dispose()
+
+    for fader in faders:
+        fader.refreshTimer.stop()
+
+    faderArea = faders[0].getWidth() * faders[0].getHeight()
+    print >>sys.stderr, numFaders, "faders,", paints, "paints in %.2f s" % elapsedTime
+    print >>sys.stderr, "   %.0f paints per second, %.0f%% of each fader repainted on average" % \
+        (paints / elapsedTime, 100.0 * dirtyArea / (paints * faderArea))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        runBenchmarks(int(sys.argv[1]))
+    else:
+        runBenchmarks(50)
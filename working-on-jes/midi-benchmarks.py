@@ -0,0 +1,69 @@
+# midi-benchmarks.py
+# Reads a generated corpus of MIDI files three ways - parsing each file,
+# copying the scores Read.midi() remembers, and going through the notes
+# with Read.midiNotes() without building scores - so you can gauge the
+# speed of MIDI reading.  Pass the number of files (default 1000).
+import os
+import sys
+import tempfile
+import music
+import zipf
+from music import *
+from random import Random
+from time import time as now
+
+
+def makeCorpus(folder, numberOfFiles):
+    generator = Random(50)
+    filenames = []
+    for i in range(numberOfFiles):
+        phrase = Phrase(0.0)
+        for j in range(generator.randint(50, 200)):
+            phrase.addNote(Note(generator.randint(48, 84),
+                                generator.choice([SN, EN, QN, HN])))
+        filenames.append(os.path.join(folder, "corpus" + str(i) + ".mid"))
+        Write.midi(Score(Part(phrase)), filenames[-1])
+    return filenames
+
+
+def runBenchmarks(numberOfFiles):
+    music.MAX_CACHED_MIDI_FILES = numberOfFiles   # remember the whole corpus
+
+    folder = tempfile.mkdtemp()
+    filenames = makeCorpus(folder, numberOfFiles)
+    try:
+        Read.clearMidiCache()
+        start = now()
+        for filename in filenames:
+            Read.midi(Score(), filename)
+        parseTime = now() - start
+
+        start = now()
+        for filename in filenames:
+            Read.midi(Score(), filename)
+        cacheTime = now() - start
+
+        start = now()
+        pitches = zipf.ZipfAccumulator()
+        for filename in filenames:
+            for note in Read.midiNotes(filename):
+                pitches.add(note[2])
+        streamTime = now() - start
+    finally:
+        for filename in filenames:
+            os.remove(filename)
+        os.rmdir(folder)
+
+    print >>sys.stderr, "Read", numberOfFiles, "MIDI files:"
+    print >>sys.stderr, "   parsed into scores:   %.2f s" % parseTime
+    print >>sys.stderr, "   copied from cache:    %.2f s  (%.1fx faster)" % \
+        (cacheTime, parseTime / max(cacheTime, 0.001))
+    print >>sys.stderr, "   notes only (Zipf):    %.2f s  (%.1fx faster), pitch slope %.3f" % \
+        (streamTime, parseTime / max(streamTime, 0.001), pitches.getSlopeR2()[0])
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        runBenchmarks(int(sys.argv[1]))
+    else:
+        runBenchmarks(1000)